@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Startup benchmark: start Spyder several times with an offscreen Qt
+platform, report where the startup time goes and fail if it's slower than
+a maximum time or than a baseline trace.
+
+Examples:
+    python benchmark_startup.py --save baseline.json
+    python benchmark_startup.py --baseline baseline.json --tolerance 0.2
+"""
+
+from __future__ import print_function
+
+# Standard library imports
+import argparse
+import io
+import json
+import os
+import os.path as osp
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+
+HERE = osp.dirname(osp.abspath(__file__))
+
+# Code run in a new interpreter to start Spyder and quit it once the main
+# window is set up
+START_CODE = """
+from spyder.app.cli_options import get_options
+from spyder.utils import timing
+options, _args = get_options()
+timing.start(report=False, trace_filename=options.startup_trace)
+
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QApplication
+from spyder.app import mainwindow
+
+def quit_after_startup():
+    if timing.STARTUP_TIMER is not None:
+        # Spyder is still starting
+        QTimer.singleShot(100, quit_after_startup)
+        return
+    for widget in QApplication.topLevelWidgets():
+        if isinstance(widget, mainwindow.MainWindow):
+            widget.close()
+    QApplication.quit()
+
+QTimer.singleShot(100, quit_after_startup)
+mainwindow.main()
+"""
+
+
+def run_spyder(trace_filename, home=None, timeout=300):
+    """
+    Start and quit Spyder, saving its startup trace to *trace_filename*
+
+    Return the trace, or None if Spyder failed to start.
+    """
+    env = os.environ.copy()
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    env['PYTHONPATH'] = os.pathsep.join([HERE, env.get('PYTHONPATH', '')])
+    if home is not None:
+        env['HOME'] = env['USERPROFILE'] = home
+    args = [sys.executable, '-c', START_CODE, '--new-instance',
+            '--startup-trace', trace_filename]
+    process = subprocess.Popen(args, env=env, cwd=HERE)
+    start = time.time()
+    while process.poll() is None:
+        if time.time() - start > timeout:
+            # Probably waiting for a dialog to be closed
+            process.kill()
+            print("Spyder didn't start in %d s" % timeout, file=sys.stderr)
+            return
+        time.sleep(0.1)
+    if not osp.isfile(trace_filename):
+        print("Spyder failed to start (exit code %s)" % process.returncode,
+              file=sys.stderr)
+        return
+    return load_trace(trace_filename)
+
+
+def load_trace(filename):
+    """Load a startup trace saved with --startup-trace"""
+    with io.open(filename, encoding='utf-8') as fdesc:
+        return json.load(fdesc)
+
+
+def save_trace(trace, filename):
+    """Save a startup trace"""
+    with io.open(filename, 'w', encoding='utf-8') as fdesc:
+        fdesc.write(u'%s' % json.dumps(trace, indent=1))
+
+
+def median_trace(traces):
+    """Return the trace of the run with the median total time"""
+    traces = sorted(traces, key=lambda trace: trace['total'])
+    return traces[(len(traces) - 1) // 2]
+
+
+def summary(trace, count=15):
+    """Return a text summary of a startup trace"""
+    lines = ["Total: %.3f s" % trace['total'], "", "Sections (in ms):"]
+    for item in trace['sections']:
+        lines.append("  %8.1f  %s" % (1000 * item['duration'], item['name']))
+    if trace['totals']:
+        lines += ["", "Totals (in ms):"]
+        for item in trace['totals']:
+            lines.append("  %8.1f  %s (%d calls)" % (
+                1000 * item['duration'], item['name'], item['count']))
+    lines += ["", "Slowest imports (self, in ms):"]
+    imports = sorted(trace['imports'], key=lambda item: item['self'],
+                     reverse=True)
+    for item in imports[:count]:
+        lines.append("  %8.1f  %s" % (1000 * item['self'], item['name']))
+    return '\n'.join(lines)
+
+
+def check_regression(trace, max_time=None, baseline=None, tolerance=0.25):
+    """
+    Return a list of messages describing how *trace* is slower than
+    *max_time* or than the *baseline* trace by more than *tolerance*
+    """
+    errors = []
+    total = trace['total']
+    if max_time is not None and total > max_time:
+        errors.append("Startup took %.3f s, more than the maximum of %.3f s"
+                      % (total, max_time))
+    if baseline is not None:
+        limit = baseline['total'] * (1 + tolerance)
+        if total > limit:
+            errors.append("Startup took %.3f s, more than %.3f s (baseline "
+                          "of %.3f s + %d%%)" % (total, limit,
+                                                 baseline['total'],
+                                                 100 * tolerance))
+        durations = dict((item['name'], item['duration'])
+                         for item in baseline['sections'])
+        for item in trace['sections']:
+            reference = durations.get(item['name'])
+            # Sections taking less than 0.1 s are too noisy to be checked
+            if (reference is not None and item['duration'] > 0.1 and
+                    item['duration'] > reference * (1 + tolerance)):
+                errors.append("%s took %.3f s instead of %.3f s" % (
+                    item['name'], item['duration'], reference))
+    return errors
+
+
+def main():
+    """Run the startup benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=3,
+                        help="Number of times Spyder is started (default: 3)")
+    parser.add_argument('--max-time', type=float, default=None,
+                        help="Fail if the startup takes more seconds")
+    parser.add_argument('--baseline', default=None,
+                        help="Fail if the startup is slower than this trace")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Slowdown allowed with respect to the baseline "
+                             "(default: 0.25, i.e. 25%%)")
+    parser.add_argument('--save', default=None,
+                        help="Save the trace of the median run to this file, "
+                             "e.g. to be used later as a baseline")
+    parser.add_argument('--clean-config', action='store_true',
+                        help="Start Spyder with a new configuration, in a "
+                             "temporary home directory")
+    parser.add_argument('--timeout', type=int, default=300,
+                        help="Seconds to wait for each startup")
+    options = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix='spyder-benchmark-')
+    home = osp.join(tmpdir, 'home') if options.clean_config else None
+    if home is not None:
+        os.makedirs(home)
+    try:
+        traces = []
+        for run in range(options.runs):
+            trace_filename = osp.join(tmpdir, 'trace%d.json' % run)
+            trace = run_spyder(trace_filename, home=home,
+                               timeout=options.timeout)
+            if trace is None:
+                return 2
+            print("Run %d: %.3f s" % (run + 1, trace['total']))
+            traces.append(trace)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    trace = median_trace(traces)
+    print()
+    print(summary(trace))
+    if options.save:
+        save_trace(trace, options.save)
+
+    baseline = None
+    if options.baseline:
+        baseline = load_trace(options.baseline)
+    errors = check_regression(trace, options.max_time, baseline,
+                              options.tolerance)
+    if errors:
+        print()
+        print('\n'.join(["FAILED: " + error for error in errors]))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,12 +8,15 @@ from gettext_helpers import do_rescan, do_rescan_files
 
 if __name__ == "__main__":
     do_rescan("spyder")
-    do_rescan_files(["spyder_pylint/pylint.py",
+    do_rescan_files(["spyder_pylint/__init__.py",
+                     "spyder_pylint/pylint.py",
                      "spyder_pylint/widgets/pylintgui.py"],
                      "pylint", "spyder_pylint")
-    do_rescan_files(["spyder_profiler/profiler.py",
+    do_rescan_files(["spyder_profiler/__init__.py",
+                     "spyder_profiler/profiler.py",
                      "spyder_profiler/widgets/profilergui.py"],
                      "profiler", "spyder_profiler")
-    do_rescan_files(["spyder_breakpoints/breakpoints.py",
+    do_rescan_files(["spyder_breakpoints/__init__.py",
+                     "spyder_breakpoints/breakpoints.py",
                      "spyder_breakpoints/widgets/breakpointsgui.py"],
                      "breakpoints", "spyder_breakpoints")
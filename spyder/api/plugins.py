@@ -12,11 +12,14 @@ Here, 'plugins' are Qt widgets designed specifically for Spyder
 """
 
 # Standard library imports
+import importlib
 import inspect
 import os
+import sys
+import traceback
 
 # Third party imports
-from qtpy.QtCore import Qt, Signal
+from qtpy.QtCore import Qt, QTimer, Signal
 from qtpy.QtGui import QCursor
 from qtpy.QtWidgets import QApplication, QMainWindow
 
@@ -27,7 +30,10 @@ from spyder.config.user import NoDefault
 from spyder.plugins.base import BasePluginWidget
 from spyder.py3compat import configparser, is_text_string
 from spyder.utils import icon_manager as ima
-from spyder.utils.qthelpers import toggle_actions
+from spyder.utils import timing
+from spyder.utils.qthelpers import (create_action, MENU_SEPARATOR,
+                                    toggle_actions)
+from spyder.widgets.dock import SpyderDockWidget
 
 
 class PluginWidget(BasePluginWidget):
@@ -284,3 +290,197 @@ class SpyderPluginWidget(PluginWidget):
         This must be reimplemented by plugins that need to adjust their fonts.
         """
         pass
+
+
+class LazyPluginWidget(BasePluginWidget):
+    """
+    Stand-in for a third-party plugin whose module is imported on first use.
+
+    Plugin packages opt in by defining these names instead of PLUGIN_CLASS:
+      * PLUGIN_CLASS_PATH: dotted path of the plugin class (required)
+      * PLUGIN_CONF_SECTION: CONF_SECTION of the plugin class (required)
+      * PLUGIN_TITLE: plugin title (required)
+      * PLUGIN_ICON: name of the plugin icon, looked for in its images
+        directory (optional)
+      * PLUGIN_ACTIONS: menu actions of the plugin (optional), as dicts with
+          - 'text' and 'method': action text and plugin method it calls
+          - 'menu': main window list of actions to add it to, e.g.
+            'run_menu_actions'
+          - 'before': entry of that list to insert the action before
+          - 'separator': add a separator before the action
+          - 'shortcut': (context, name) of the action shortcut
+          - 'icon': show the plugin icon in the action
+          - 'python_only': enable the action only for Python files
+
+    A placeholder dock with the object name of the plugin dock is created
+    at startup, so the saved window layout places it. The plugin is built
+    the first time this dock is shown, one of its actions is used or the
+    Preferences are opened, and then takes the dock over.
+    """
+
+    def __init__(self, main, module):
+        BasePluginWidget.__init__(self, main)
+        self.main = main
+        self.module = module
+        self.CONF_SECTION = module.PLUGIN_CONF_SECTION
+        self.plugin = None
+        self.dockwidget = None
+        self.ismaximized = False
+        self.shortcut = None
+        self.create_toggle_view_action()
+        self.setWindowTitle(self.get_plugin_title())
+
+    def get_plugin_title(self):
+        """Return plugin title"""
+        return self.module.PLUGIN_TITLE
+
+    def get_plugin_icon(self):
+        """Return plugin icon"""
+        name = getattr(self.module, 'PLUGIN_ICON', None)
+        if name is None:
+            return ima.icon('outline_explorer')
+        path = os.path.join(os.path.dirname(self.module.__file__),
+                            SpyderPluginWidget.IMG_PATH)
+        return ima.icon(name, icon_path=path)
+
+    def get_option(self, option, default=NoDefault):
+        """Get a plugin option from configuration file"""
+        return CONF.get(self.CONF_SECTION, option, default)
+
+    def set_option(self, option, value):
+        """Set a plugin option in configuration file"""
+        CONF.set(self.CONF_SECTION, str(option), value)
+
+    def create_dockwidget(self):
+        """Create the placeholder dock of the plugin"""
+        classname = self.module.PLUGIN_CLASS_PATH.rsplit('.', 1)[-1]
+        dock = SpyderDockWidget(self.get_plugin_title(), self.main)
+        dock.setObjectName(classname + "_dw")
+        dock.setAllowedAreas(self.ALLOWED_AREAS)
+        dock.setFeatures(self.FEATURES)
+        dock.setWidget(self)
+        dock.visibilityChanged.connect(self.visibility_changed)
+        dock.plugin_closed.connect(self.plugin_closed)
+        self.dockwidget = dock
+        return (dock, self.LOCATION)
+
+    def register_plugin(self):
+        """Add the placeholder dock and the plugin actions to the main
+        window"""
+        self.main.add_dockwidget(self)
+        for spec in getattr(self.module, 'PLUGIN_ACTIONS', []):
+            self.create_plugin_action(spec)
+
+    def create_plugin_action(self, spec):
+        """Create a menu action building the plugin when it's triggered"""
+        method = spec['method']
+
+        def run_plugin_method():
+            plugin = self.load_plugin()
+            if plugin is not None:
+                getattr(plugin, method)()
+
+        icon = self.get_plugin_icon() if spec.get('icon') else None
+        action = create_action(self, spec['text'], icon=icon,
+                               triggered=run_plugin_method)
+        if 'shortcut' in spec:
+            context, name = spec['shortcut']
+            self.main.register_shortcut(action, context, name)
+        actions = getattr(self.main, spec['menu'])
+        if 'before' in spec:
+            index = actions.index(spec['before'])
+        else:
+            index = len(actions)
+        if spec.get('separator'):
+            actions[index:index] = [MENU_SEPARATOR, action]
+        else:
+            actions.insert(index, action)
+        if spec.get('python_only'):
+            self.main.editor.pythonfile_dependent_actions.append(action)
+        return action
+
+    def on_first_registration(self):
+        """Tabify the plugin, hidden, with Help"""
+        if self.main.help is not None:
+            self.main.tabify_plugins(self.main.help, self)
+        self.dockwidget.hide()
+
+    def visibility_changed(self, enable):
+        """Build the plugin once its dock has been shown"""
+        if enable and self.plugin is None:
+            QTimer.singleShot(0, self.load_plugin)
+
+    def update_margins(self):
+        """The placeholder has no contents"""
+        pass
+
+    def update_font(self):
+        """The placeholder has no contents"""
+        pass
+
+    def closing_plugin(self, cancelable=False):
+        """Perform actions before parent main window is closed"""
+        return True
+
+    def create_configwidget(self, parent):
+        """Build the plugin to create its preferences page"""
+        plugin = self.load_plugin()
+        if plugin is not None:
+            return plugin.create_configwidget(parent)
+
+    def load_plugin(self):
+        """
+        Import and build the plugin, which takes the placeholder dock over
+
+        Return the plugin, or None if it couldn't be built.
+        """
+        if self.plugin is not None:
+            return self.plugin
+        main = self.main
+        dock = self.dockwidget
+        # The menus were built with our actions: drop the ones the plugin
+        # adds to the lists they were built from
+        action_lists = [value for name, value in sorted(vars(main).items())
+                        if name.endswith(('_menu_actions', '_toolbar_actions'))
+                        and isinstance(value, list)]
+        saved_lists = [list(actions) for actions in action_lists]
+        main.lazy_dockwidgets[dock.objectName()] = dock
+        try:
+            with timing.section("Plugin: %s" % self.module.__name__):
+                modname, classname = self.module.PLUGIN_CLASS_PATH.rsplit(
+                    '.', 1)
+                plugin_class = getattr(importlib.import_module(modname),
+                                       classname)
+                plugin = plugin_class(main)
+                plugin.register_plugin()
+        except Exception:
+            main.lazy_dockwidgets.pop(dock.objectName(), None)
+            traceback.print_exc(file=sys.stderr)
+            return
+        finally:
+            for actions, saved in zip(action_lists, saved_lists):
+                actions[:] = saved
+        self.plugin = plugin
+        dock.visibilityChanged.disconnect(self.visibility_changed)
+        dock.plugin_closed.disconnect(self.plugin_closed)
+        self.hide()
+
+        # Take our place in the plugin lists and in the Panes menu
+        for plugins in (main.widgetlist, main.thirdparty_plugins):
+            if plugin in plugins:
+                plugins.remove(plugin)
+            if self in plugins:
+                plugins[plugins.index(self)] = plugin
+        if self.toggle_view_action in main.plugins_menu.actions():
+            main.plugins_menu.insertAction(self.toggle_view_action,
+                                           plugin.toggle_view_action)
+            main.plugins_menu.removeAction(self.toggle_view_action)
+        menu_actions = getattr(main, 'plugins_menu_actions', [])
+        if self.toggle_view_action in menu_actions:
+            index = menu_actions.index(self.toggle_view_action)
+            menu_actions[index] = plugin.toggle_view_action
+        plugin.toggle_view_action.setChecked(dock.isVisible())
+        main.apply_panes_settings()
+        if dock.isVisible():
+            plugin.visibility_changed(True)
+        return plugin
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for plugins.py"""
+
+import types
+
+import pytest
+from qtpy.QtCore import Qt
+from qtpy.QtWidgets import QMainWindow, QMenu, QVBoxLayout, QWidget
+
+import spyder.plugins  # analysis:ignore
+from spyder.api.plugins import LazyPluginWidget, SpyderPluginWidget
+from spyder.utils.qthelpers import create_action
+
+
+class DummyPlugin(SpyderPluginWidget):
+    """Plugin counting its instances and the calls of its action method"""
+
+    CONF_SECTION = 'lazy_dummy'
+    instances = 0
+
+    def __init__(self, parent=None):
+        SpyderPluginWidget.__init__(self, parent)
+        DummyPlugin.instances += 1
+        self.calls = 0
+        layout = QVBoxLayout()
+        layout.addWidget(QWidget(self))
+        self.setLayout(layout)
+        self.initialize_plugin()
+
+    def get_plugin_title(self):
+        return "Dummy"
+
+    def get_plugin_actions(self):
+        return []
+
+    def register_plugin(self):
+        self.main.add_dockwidget(self)
+        self.main.run_menu_actions.append(
+            create_action(self, "Run dummy", triggered=self.run_dummy))
+
+    def refresh_plugin(self):
+        pass
+
+    def run_dummy(self):
+        self.calls += 1
+
+
+class EditorMock(object):
+    def __init__(self):
+        self.pythonfile_dependent_actions = []
+
+
+class MainWindowMock(QMainWindow):
+    """The parts of Spyder's main window plugins use"""
+
+    def __init__(self):
+        QMainWindow.__init__(self)
+        self.help = None
+        self.editor = EditorMock()
+        self.widgetlist = []
+        self.thirdparty_plugins = []
+        self.lazy_dockwidgets = {}
+        self.run_menu_actions = []
+        self.shortcut_data = []
+        self.plugins_menu = QMenu(self)
+
+    def add_dockwidget(self, child):
+        dockwidget, location = child.create_dockwidget()
+        if self.dockWidgetArea(dockwidget) == Qt.NoDockWidgetArea:
+            self.addDockWidget(location, dockwidget)
+        self.widgetlist.append(child)
+
+    def register_shortcut(self, qaction, context, name, add_sc_to_tip=False):
+        self.shortcut_data.append((qaction, context, name))
+
+    def apply_panes_settings(self):
+        pass
+
+
+@pytest.fixture
+def lazy_plugin(qtbot, monkeypatch):
+    """Register a LazyPluginWidget for DummyPlugin in a main window"""
+    monkeypatch.setattr(DummyPlugin, 'instances', 0)
+    module = types.ModuleType('spyder_dummy')
+    module.PLUGIN_CLASS_PATH = __name__ + '.DummyPlugin'
+    module.PLUGIN_CONF_SECTION = 'lazy_dummy'
+    module.PLUGIN_TITLE = "Dummy"
+    module.PLUGIN_ACTIONS = [
+        {'text': "Run dummy", 'method': 'run_dummy',
+         'menu': 'run_menu_actions', 'shortcut': ("Dummy", "Run dummy"),
+         'python_only': True}]
+    main = MainWindowMock()
+    qtbot.addWidget(main)
+    placeholder = LazyPluginWidget(main, module)
+    main.thirdparty_plugins.append(placeholder)
+    placeholder.register_plugin()
+    main.plugins_menu.addAction(placeholder.toggle_view_action)
+    return main, placeholder
+
+
+def test_lazy_plugin_registration(lazy_plugin):
+    main, placeholder = lazy_plugin
+    assert DummyPlugin.instances == 0
+    assert placeholder.dockwidget.objectName() == 'DummyPlugin_dw'
+    assert main.dockWidgetArea(placeholder.dockwidget) != Qt.NoDockWidgetArea
+    assert main.widgetlist == [placeholder]
+    action = main.run_menu_actions[0]
+    assert action.text() == "Run dummy"
+    assert main.shortcut_data == [(action, "Dummy", "Run dummy")]
+    assert main.editor.pythonfile_dependent_actions == [action]
+
+
+def test_lazy_plugin_action(lazy_plugin):
+    main, placeholder = lazy_plugin
+    dock = placeholder.dockwidget
+    action = main.run_menu_actions[0]
+    action.triggered.emit(False)
+    plugin = placeholder.plugin
+    assert DummyPlugin.instances == 1
+    assert plugin.calls == 1
+    assert plugin.dockwidget is dock
+    assert dock.widget() is plugin
+    assert main.widgetlist == [plugin]
+    assert main.thirdparty_plugins == [plugin]
+    assert main.lazy_dockwidgets == {}
+    assert main.plugins_menu.actions() == [plugin.toggle_view_action]
+    # The menus keep the actions they were built with
+    assert main.run_menu_actions == [action]
+    action.triggered.emit(False)
+    assert DummyPlugin.instances == 1
+    assert plugin.calls == 2
+
+
+def test_lazy_plugin_shown(qtbot, lazy_plugin):
+    main, placeholder = lazy_plugin
+    main.show()
+    placeholder.dockwidget.show()
+    qtbot.waitUntil(lambda: placeholder.plugin is not None)
+    assert DummyPlugin.instances == 1
+    assert placeholder.plugin.toggle_view_action.isChecked()
+
+
+def test_lazy_plugin_import_error(lazy_plugin, capsys):
+    main, placeholder = lazy_plugin
+    placeholder.module.PLUGIN_CLASS_PATH = 'spyder_dummy_missing.Dummy'
+    assert placeholder.load_plugin() is None
+    assert 'spyder_dummy_missing' in capsys.readouterr().err
+    assert main.widgetlist == [placeholder]
+    assert main.lazy_dockwidgets == {}
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -35,6 +35,13 @@ def get_options():
     parser.add_option('--profile', action='store_true', default=False,
                       help="Profile mode (internal test, "
                            "not related with Python profiling)")
+    parser.add_option('--startup-timing', action='store_true', default=False,
+                      help="Print the time spent importing modules and "
+                           "setting up plugins at startup")
+    parser.add_option('--startup-trace', dest="startup_trace", default=None,
+                      metavar="FILE",
+                      help="Save the times spent in each phase of the "
+                           "startup to FILE, in JSON format")
     parser.add_option('--window-title', type=str, default=None,
                       help="String to show in the main window title")
     parser.add_option('-p', '--project', default=None, type=str,
@@ -151,6 +151,7 @@ from spyder.utils import icon_manager as ima
 from spyder.utils.introspection import module_completion
 from spyder.utils.programs import is_module_installed
 from spyder.utils.misc import select_port
+from spyder.utils import timing
 
 #==============================================================================
 # Local gui imports
@@ -246,6 +247,7 @@ class MainWindow(QMainWindow):
     sig_resized = Signal("QResizeEvent")  # related to interactive tour
     sig_moved = Signal("QMoveEvent")      # related to interactive tour
 
+    @timing.timed("MainWindow.__init__")
     def __init__(self, options=None):
         QMainWindow.__init__(self)
 
@@ -321,6 +323,9 @@ class MainWindow(QMainWindow):
         self.variableexplorer = None
         self.findinfiles = None
         self.thirdparty_plugins = []
+        # Placeholder docks of the third-party plugins built on first use,
+        # by object name, until their plugin takes them over
+        self.lazy_dockwidgets = {}
 
         # Tour  # TODO: Should I consider it a plugin?? or?
         self.tour = None
@@ -499,6 +504,7 @@ class MainWindow(QMainWindow):
     def debug_print(self, message):
         """Debug prints"""
         debug_print(message)
+        timing.mark(message.strip(' *.'))
 
     #---- Window setup
     def create_toolbar(self, title, object_name, iconsize=24):
@@ -509,6 +515,7 @@ class MainWindow(QMainWindow):
         self.toolbarslist.append(toolbar)
         return toolbar
 
+    @timing.timed("MainWindow.setup")
     def setup(self):
         """Setup main window"""
         self.debug_print("*** Start of MainWindow setup ***")
@@ -758,46 +765,52 @@ class MainWindow(QMainWindow):
 
         # Internal console plugin
         self.debug_print("  ..plugin: internal console")
-        from spyder.plugins.console import Console
-        self.console = Console(self, namespace, exitfunc=self.closing,
-                            profile=self.profile,
-                            multithreaded=self.multithreaded,
-                            message=_("Spyder Internal Console\n\n"
-                                    "This console is used to report application\n"
-                                    "internal errors and to inspect Spyder\n"
-                                    "internals with the following commands:\n"
-                                    "  spy.app, spy.window, dir(spy)\n\n"
-                                    "Please don't use it to run your code\n\n"))
-        self.console.register_plugin()
+        with timing.section("Plugin: internal console"):
+            from spyder.plugins.console import Console
+            self.console = Console(
+                self, namespace, exitfunc=self.closing, profile=self.profile,
+                multithreaded=self.multithreaded,
+                message=_("Spyder Internal Console\n\n"
+                          "This console is used to report application\n"
+                          "internal errors and to inspect Spyder\n"
+                          "internals with the following commands:\n"
+                          "  spy.app, spy.window, dir(spy)\n\n"
+                          "Please don't use it to run your code\n\n"))
+            self.console.register_plugin()
 
         # Working directory plugin
         self.debug_print("  ..plugin: working directory")
-        from spyder.plugins.workingdirectory import WorkingDirectory
-        self.workingdirectory = WorkingDirectory(self, self.init_workdir, main=self)
-        self.workingdirectory.register_plugin()
+        with timing.section("Plugin: working directory"):
+            from spyder.plugins.workingdirectory import WorkingDirectory
+            self.workingdirectory = WorkingDirectory(self, self.init_workdir,
+                                                     main=self)
+            self.workingdirectory.register_plugin()
         self.toolbarslist.append(self.workingdirectory.toolbar)
 
         # Help plugin
         if CONF.get('help', 'enable'):
             self.set_splash(_("Loading help..."))
-            from spyder.plugins.help import Help
-            self.help = Help(self)
-            self.help.register_plugin()
+            with timing.section("Plugin: help"):
+                from spyder.plugins.help import Help
+                self.help = Help(self)
+                self.help.register_plugin()
 
         # Outline explorer widget
         if CONF.get('outline_explorer', 'enable'):
             self.set_splash(_("Loading outline explorer..."))
-            from spyder.plugins.outlineexplorer import OutlineExplorer
-            fullpath_sorting = CONF.get('editor', 'fullpath_sorting', True)
-            self.outlineexplorer = OutlineExplorer(self,
-                                        fullpath_sorting=fullpath_sorting)
-            self.outlineexplorer.register_plugin()
+            with timing.section("Plugin: outline explorer"):
+                from spyder.plugins.outlineexplorer import OutlineExplorer
+                fullpath_sorting = CONF.get('editor', 'fullpath_sorting', True)
+                self.outlineexplorer = OutlineExplorer(
+                    self, fullpath_sorting=fullpath_sorting)
+                self.outlineexplorer.register_plugin()
 
         # Editor plugin
         self.set_splash(_("Loading editor..."))
-        from spyder.plugins.editor import Editor
-        self.editor = Editor(self)
-        self.editor.register_plugin()
+        with timing.section("Plugin: editor"):
+            from spyder.plugins.editor import Editor
+            self.editor = Editor(self)
+            self.editor.register_plugin()
 
         # Populating file menu entries
         quit_action = create_action(self, _("&Quit"),
@@ -819,29 +832,33 @@ class MainWindow(QMainWindow):
         self.debug_print("  ..widgets")
         # Find in files
         if CONF.get('find_in_files', 'enable'):
-            from spyder.plugins.findinfiles import FindInFiles
-            self.findinfiles = FindInFiles(self)
-            self.findinfiles.register_plugin()
+            with timing.section("Plugin: find in files"):
+                from spyder.plugins.findinfiles import FindInFiles
+                self.findinfiles = FindInFiles(self)
+                self.findinfiles.register_plugin()
 
         # External console
         self.set_splash(_("Loading external console..."))
-        from spyder.plugins.externalconsole import ExternalConsole
-        self.extconsole = ExternalConsole(self)
-        self.extconsole.register_plugin()
+        with timing.section("Plugin: external console"):
+            from spyder.plugins.externalconsole import ExternalConsole
+            self.extconsole = ExternalConsole(self)
+            self.extconsole.register_plugin()
 
         # Explorer
         if CONF.get('explorer', 'enable'):
             self.set_splash(_("Loading file explorer..."))
-            from spyder.plugins.explorer import Explorer
-            self.explorer = Explorer(self)
-            self.explorer.register_plugin()
+            with timing.section("Plugin: file explorer"):
+                from spyder.plugins.explorer import Explorer
+                self.explorer = Explorer(self)
+                self.explorer.register_plugin()
 
         # History log widget
         if CONF.get('historylog', 'enable'):
             self.set_splash(_("Loading history plugin..."))
-            from spyder.plugins.history import HistoryLog
-            self.historylog = HistoryLog(self)
-            self.historylog.register_plugin()
+            with timing.section("Plugin: history log"):
+                from spyder.plugins.history import HistoryLog
+                self.historylog = HistoryLog(self)
+                self.historylog.register_plugin()
 
         # Online help widget
         try:    # Qt >= v4.4
@@ -850,36 +867,47 @@ class MainWindow(QMainWindow):
             OnlineHelp = None  # analysis:ignore
         if CONF.get('onlinehelp', 'enable') and OnlineHelp is not None:
             self.set_splash(_("Loading online help..."))
-            self.onlinehelp = OnlineHelp(self)
-            self.onlinehelp.register_plugin()
+            with timing.section("Plugin: online help"):
+                self.onlinehelp = OnlineHelp(self)
+                self.onlinehelp.register_plugin()
 
         # Project explorer widget
         self.set_splash(_("Loading project explorer..."))
-        from spyder.plugins.projects import Projects
-        self.projects = Projects(self)
-        self.projects.register_plugin()
+        with timing.section("Plugin: projects"):
+            from spyder.plugins.projects import Projects
+            self.projects = Projects(self)
+            self.projects.register_plugin()
         self.project_path = self.projects.get_pythonpath(at_start=True)
 
         # Namespace browser
         self.set_splash(_("Loading namespace browser..."))
-        from spyder.plugins.variableexplorer import VariableExplorer
-        self.variableexplorer = VariableExplorer(self)
-        self.variableexplorer.register_plugin()
+        with timing.section("Plugin: variable explorer"):
+            from spyder.plugins.variableexplorer import VariableExplorer
+            self.variableexplorer = VariableExplorer(self)
+            self.variableexplorer.register_plugin()
 
         # IPython console
         if QTCONSOLE_INSTALLED:
             self.set_splash(_("Loading IPython console..."))
-            from spyder.plugins.ipythonconsole import IPythonConsole
-            self.ipyconsole = IPythonConsole(self)
-            self.ipyconsole.register_plugin()
+            with timing.section("Plugin: IPython console"):
+                from spyder.plugins.ipythonconsole import IPythonConsole
+                self.ipyconsole = IPythonConsole(self)
+                self.ipyconsole.register_plugin()
 
         # Third-party plugins
         self.set_splash(_("Loading third-party plugins..."))
-        for mod in get_spyderplugins_mods():
+        with timing.section("Importing third-party plugins"):
+            from spyder.api.plugins import LazyPluginWidget
+            plugin_mods = get_spyderplugins_mods()
+        for mod in plugin_mods:
             try:
-                plugin = mod.PLUGIN_CLASS(self)
-                self.thirdparty_plugins.append(plugin)
-                plugin.register_plugin()
+                with timing.section("Plugin: %s" % mod.__name__):
+                    if hasattr(mod, 'PLUGIN_CLASS'):
+                        plugin = mod.PLUGIN_CLASS(self)
+                    else:
+                        plugin = LazyPluginWidget(self, mod)
+                    self.thirdparty_plugins.append(plugin)
+                    plugin.register_plugin()
             except Exception as error:
                 print("%s: %s" % (mod, str(error)), file=STDERR)
                 traceback.print_exc(file=STDERR)
@@ -1136,6 +1164,7 @@ class MainWindow(QMainWindow):
         self.debug_print("*** End of MainWindow setup ***")
         self.is_starting_up = False
 
+    @timing.timed("MainWindow.post_visible_setup")
     def post_visible_setup(self):
         """Actions to be performed only after the main window's `show` method
         was triggered"""
@@ -2148,6 +2177,7 @@ class MainWindow(QMainWindow):
         self.dialog_manager.close_all()
         if self.toolbars_visible:
             self.save_visible_toolbars()
+        CONF.flush()
         self.already_closed = True
         return True
 
@@ -2157,7 +2187,10 @@ class MainWindow(QMainWindow):
         if CONF.get('main', 'vertical_dockwidget_titlebars'):
             dockwidget.setFeatures(dockwidget.features()|
                                    QDockWidget.DockWidgetVerticalTitleBar)
-        self.addDockWidget(location, dockwidget)
+        # The placeholder dock of a plugin built on first use is already
+        # in place
+        if self.dockWidgetArea(dockwidget) == Qt.NoDockWidgetArea:
+            self.addDockWidget(location, dockwidget)
         self.widgetlist.append(child)
 
     @Slot()
@@ -2902,9 +2935,13 @@ def run_spyder(app, options, args):
                 pass
         raise
 
-    main.show()
+    with timing.section("MainWindow.show"):
+        main.show()
     main.post_visible_setup()
 
+    # Print the startup timing report and save the trace, if asked for
+    timing.stop()
+
     if main.console:
         main.console.shell.interpreter.namespace['spy'] = \
                                                     Spy(app=app, window=main)
@@ -2941,6 +2978,11 @@ def main():
     # It's important to collect options before monkey patching sys.exit,
     # otherwise, optparse won't be able to exit if --help option is passed
     options, args = get_options()
+    if options.startup_timing or options.startup_trace:
+        # Only what's done from now on is timed if Spyder wasn't started
+        # with spyder.app.start
+        timing.start(report=options.startup_timing,
+                     trace_filename=options.startup_trace)
 
     if set_attached_console_visible is not None:
         set_attached_console_visible(DEBUG or options.show_console \
@@ -11,8 +11,8 @@ import time
 # Local imports
 from spyder.app.cli_options import get_options
 from spyder.config.base import get_conf_path, running_in_mac_app
-from spyder.config.main import CONF
 from spyder.utils.external import lockfile
+from spyder.utils import timing
 from spyder.py3compat import is_unicode
 
 
@@ -24,6 +24,7 @@ def send_args_to_spyder(args):
     Args can be Python scripts or files with these extensions: .spydata, .mat,
     .npy, or .h5, which can be imported by the Variable Explorer.
     """
+    from spyder.config.main import CONF
     port = CONF.get('main', 'open_files_port')
 
     # Wait ~50 secs for the server to be up
@@ -54,6 +55,12 @@ def main():
     """
     # Parse command line options
     options, args = get_options()
+    if options.startup_timing or options.startup_trace:
+        timing.start(report=options.startup_timing,
+                     trace_filename=options.startup_trace)
+
+    # Imported here to time the configuration loading
+    from spyder.config.main import CONF
 
     # Store variable to be used in self.restart (restart spyder instance)
     os.environ['SPYDER_ARGS'] = str(sys.argv[1:])
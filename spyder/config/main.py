@@ -656,15 +656,18 @@ DEFAULTS = [
 # 3. You don't need to touch this value if you're just adding a new option
 CONF_VERSION = '34.0.0'
 
+# Seconds between saves of the configuration
+SAVE_DELAY = 1.0
+
 # Main configuration instance
 try:
     CONF = UserConfig('spyder', defaults=DEFAULTS, load=(not TEST),
                       version=CONF_VERSION, subfolder=SUBFOLDER, backup=True,
-                      raw_mode=True)
+                      raw_mode=True, save_delay=SAVE_DELAY)
 except:
     CONF = UserConfig('spyder', defaults=DEFAULTS, load=False,
                       version=CONF_VERSION, subfolder=SUBFOLDER, backup=True,
-                      raw_mode=True)
+                      raw_mode=True, save_delay=SAVE_DELAY)
 
 # Removing old .spyder.ini location:
 old_location = osp.join(get_home_dir(), '.spyder.ini')
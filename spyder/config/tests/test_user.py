@@ -47,6 +47,36 @@ def test_userconfig_set_with_string(userconfig):
         expected += "[section]\noption = new value\n\n"
     assert iniContents == expected
 
+def test_userconfig_get_returns_copies_of_cached_values(userconfig):
+    userconfig.set('section', 'list', [1, 2])
+    value = userconfig.get('section', 'list')
+    value.append(3)
+    assert userconfig.get('section', 'list') == [1, 2]
+    userconfig.set('section', 'list', [4])
+    assert userconfig.get('section', 'list') == [4]
+
+def test_userconfig_notifies_observers_of_changes(userconfig):
+    changes = []
+    userconfig.add_observer(lambda *args: changes.append(args),
+                            section='section')
+    userconfig.set('section', 'option', 'new value')
+    userconfig.set('section', 'option', 'new value')
+    userconfig.set('main', 'other', 1)
+    assert changes == [('section', 'option', 'new value')]
+
+def test_userconfig_saves_after_delay(tmpdir, monkeypatch):
+    monkeypatch.setattr('spyder.config.user.get_conf_path', lambda: str(tmpdir))
+    config = UserConfig('foo', defaults={'option': 0}, subfolder=True,
+                        version='1.0.0', raw_mode=True, save_delay=60)
+    inifile = tmpdir.join('foo.ini')
+    inifile.write('')
+    config.set('main', 'option', 1)
+    config.set('main', 'option', 2)
+    assert inifile.read() == ''
+    config.flush()
+    assert 'option = 2' in inifile.read()
+    assert not tmpdir.join('foo.ini.tmp').check()
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -14,15 +14,20 @@ from __future__ import print_function
 
 # Std imports
 import ast
+import atexit
+import copy
+import io
 import os
 import re
 import os.path as osp
 import shutil
+import threading
 import time
 
 # Local imports
 from spyder.config.base import (get_conf_path, get_home_dir,
                                 get_module_source_path, TEST)
+from spyder.utils import timing
 from spyder.utils.programs import check_version
 from spyder.py3compat import configparser as cp
 from spyder.py3compat import PY2, is_text_string, to_text_string
@@ -39,6 +44,18 @@ class NoDefault:
     pass
 
 
+#==============================================================================
+# Auxiliary functions
+#==============================================================================
+def replace_file(src, dst):
+    """Atomically replace *dst* by *src*"""
+    if PY2 and os.name == 'nt' and osp.isfile(dst):
+        # os.rename can't overwrite files on Windows and Python 2 has no
+        # os.replace
+        os.remove(dst)
+    getattr(os, 'replace', os.rename)(src, dst)
+
+
 #==============================================================================
 # Defaults class
 #==============================================================================
@@ -85,6 +102,21 @@ class DefaultsConfig(cp.ConfigParser):
             print('%s[ %s ] = %s' % (section, option, value))
         cp.ConfigParser.set(self, section, option, value)
 
+    def _contents(self):
+        """
+        Return the contents of the .ini file, encoded in utf-8
+        """
+        if PY2:
+            # Python 2
+            buffer = io.BytesIO()
+            self._write(codecs.getwriter('utf-8')(buffer))
+            return buffer.getvalue()
+        else:
+            # Python 3
+            buffer = io.StringIO()
+            self.write(buffer)
+            return buffer.getvalue().encode('utf-8')
+
     def _save(self):
         """
         Save config into the associated .ini file
@@ -96,20 +128,19 @@ class DefaultsConfig(cp.ConfigParser):
         # See Issue 1086 and 1242 for background on why this
         # method contains all the exception handling.
         fname = self.filename()
+        contents = self._contents()
 
         def _write_file(fname):
-            if PY2:
-                # Python 2
-                with codecs.open(fname, 'w', encoding='utf-8') as configfile:
-                    self._write(configfile)
-            else:
-                # Python 3
-                with open(fname, 'w', encoding='utf-8') as configfile:
-                    self.write(configfile)
+            # Write a temporary file first, so that the .ini file is never
+            # left half written
+            tmpname = fname + '.tmp'
+            with open(tmpname, 'wb') as configfile:
+                configfile.write(contents)
+            replace_file(tmpname, fname)
 
         try: # the "easy" way
             _write_file(fname)
-        except IOError:
+        except (IOError, OSError):
             try: # the "delete and sleep" way
                 if osp.isfile(fname):
                     os.remove(fname)
@@ -174,14 +205,29 @@ class UserConfig(DefaultsConfig):
               *or* list of tuples (section_name, options)
     version: version of the configuration file (X.Y.Z format)
     subfolder: configuration file will be saved in %home%/subfolder/%name%.ini
+    save_delay: if not None, changes are saved in a background thread, at
+                most once every save_delay seconds (see 'flush')
     
     Note that 'get' and 'set' arguments number and type
     differ from the overriden methods
+
+    Values returned by 'get' are cached, and observers added with
+    'add_observer' are called when 'set' changes a value.
     """
     DEFAULT_SECTION_NAME = 'main'
+    @timing.timed("UserConfig loading")
     def __init__(self, name, defaults=None, load=True, version=None,
                  subfolder=None, backup=False, raw_mode=False,
-                 remove_obsolete=False):
+                 remove_obsolete=False, save_delay=None):
+        # Typed values returned by get, by (section, option)
+        self._cache = {}
+        self._observers = []
+        # Lock protecting the parser contents while they're being saved
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._save_delay = save_delay
+        self._save_timer = None
+        self._save_pending = False
         DefaultsConfig.__init__(self, name, subfolder)
         self.raw = 1 if raw_mode else 0
         if (version is not None) and (re.match('^(\d+).(\d+).(\d+)$', version) is None):
@@ -224,6 +270,8 @@ class UserConfig(DefaultsConfig):
             if defaults is None:
                 # If no defaults are defined, set .ini file settings as default
                 self.set_as_defaults()
+        if save_delay is not None:
+            atexit.register(self.flush)
         
     def get_version(self, version='0.0.0'):
         """Return configuration (not application!) version"""
@@ -252,6 +300,7 @@ class UserConfig(DefaultsConfig):
                 self.read(self.filename(), encoding='utf-8')
         except cp.MissingSectionHeaderError:
             print("Warning: File contains no section headers.")
+        self._cache.clear()
     
     def _load_old_defaults(self, old_version):
         """Read old defaults"""
@@ -305,12 +354,98 @@ class UserConfig(DefaultsConfig):
         """
         Remove .ini file associated to config
         """
+        self._cancel_save()
         os.remove(self.filename())
 
+    #---- Saving
+    def _contents(self):
+        """
+        Return the contents of the .ini file, encoded in utf-8
+        """
+        with self._lock:
+            return DefaultsConfig._contents(self)
+
+    def _save(self):
+        """
+        Save config into the associated .ini file, now or after save_delay
+        seconds in a background thread
+        """
+        if self._save_delay is None:
+            with self._save_lock:
+                DefaultsConfig._save(self)
+            return
+        with self._lock:
+            # Changes made in the meantime are saved together
+            self._save_pending = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self._save_delay,
+                                                   self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _cancel_save(self):
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._save_pending = False
+
+    def flush(self):
+        """
+        Save the changes not saved yet to the .ini file
+        """
+        with self._save_lock:
+            with self._lock:
+                pending = self._save_pending
+                self._cancel_save()
+            if pending:
+                DefaultsConfig._save(self)
+
+    #---- Change notifications
+    def add_observer(self, callback, section=None, option=None):
+        """
+        Call callback(section, option, value) when 'set' changes an option
+
+        section, option: only notify changes of this section or option
+        """
+        self._observers.append((section, option, callback))
+
+    def remove_observer(self, callback):
+        """Stop notifying callback of changes"""
+        self._observers = [observer for observer in self._observers
+                           if observer[2] != callback]
+
+    def _notify(self, section, option):
+        observers = [callback for sec, opt, callback in self._observers
+                     if sec in (None, section) and opt in (None, option)]
+        if observers:
+            value = self.get(section, option)
+            for callback in observers:
+                callback(section, option, value)
+
+    def _raw_value(self, section, option):
+        try:
+            return cp.ConfigParser.get(self, section, option, raw=True)
+        except (cp.NoSectionError, cp.NoOptionError):
+            return NoDefault
+
+    def _set(self, section, option, value, verbose):
+        """
+        Private set method
+        """
+        with self._lock:
+            old_value = self._raw_value(section, option)
+            DefaultsConfig._set(self, section, option, value, verbose)
+            self._cache.pop(self._cache_key(section, option), None)
+            changed = self._raw_value(section, option) != old_value
+        if changed and self._observers:
+            self._notify(section, option)
+
     def set_as_defaults(self):
         """
         Set defaults from the current config
         """
+        self._cache.clear()
         self.defaults = []
         for section in self.sections():
             secdict = {}
@@ -364,11 +499,19 @@ class UserConfig(DefaultsConfig):
         """
         section = self._check_section_option(section, option)
 
+        try:
+            value = self._cache[self._cache_key(section, option)]
+        except KeyError:
+            pass
+        else:
+            return self._copy(value)
+
         if not self.has_section(section):
             if default is NoDefault:
                 raise cp.NoSectionError(section)
             else:
-                self.add_section(section)
+                with self._lock:
+                    self.add_section(section)
         
         if not self.has_option(section, option):
             if default is NoDefault:
@@ -398,7 +541,22 @@ class UserConfig(DefaultsConfig):
                 value = ast.literal_eval(value)
             except (SyntaxError, ValueError):
                 pass
-        return value
+        self._cache[self._cache_key(section, option)] = value
+        return self._copy(value)
+
+    def _cache_key(self, section, option):
+        return (section, self.optionxform(option))
+
+    def _copy(self, value):
+        """
+        Return a copy of mutable values, so that the cached ones can't be
+        modified by callers
+        """
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if is_text_string(value):
+            return value
+        return copy.deepcopy(value)
 
     def set_default(self, section, option, default_value):
         """
@@ -406,6 +564,7 @@ class UserConfig(DefaultsConfig):
         -> called when a new (section, option) is set and no default exists
         """
         section = self._check_section_option(section, option)
+        self._cache.pop(self._cache_key(section, option), None)
         for sec, options in self.defaults:
             if sec == section:
                 options[ option ] = default_value
@@ -438,9 +597,15 @@ class UserConfig(DefaultsConfig):
             self._save()
             
     def remove_section(self, section):
-        cp.ConfigParser.remove_section(self, section)
+        with self._lock:
+            cp.ConfigParser.remove_section(self, section)
+            for key in list(self._cache):
+                if key[0] == section:
+                    del self._cache[key]
         self._save()
             
     def remove_option(self, section, option):
-        cp.ConfigParser.remove_option(self, section, option)
+        with self._lock:
+            cp.ConfigParser.remove_option(self, section, option)
+            self._cache.pop(self._cache_key(section, option), None)
         self._save()
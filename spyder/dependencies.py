@@ -17,7 +17,11 @@ class Dependency(object):
     """Spyder's dependency
 
     version may starts with =, >=, > or < to specify the exact requirement ;
-    multiple conditions may be separated by ';' (e.g. '>=0.13;<1.0')"""
+    multiple conditions may be separated by ';' (e.g. '>=0.13;<1.0')
+
+    installed_version may be a function returning it. The installed version
+    is only looked for when needed, so that dependencies (which are often
+    slow to import) are not imported when Spyder starts."""
 
     OK = 'OK'
     NOK = 'NOK'
@@ -28,16 +32,28 @@ class Dependency(object):
         self.features = features
         self.required_version = required_version
         self.optional = optional
-        if installed_version is None:
-            try:
-                self.installed_version = programs.get_module_version(modname)
-            except:
-                # NOTE: Don't add any exception type here!
-                # Modules can fail to import in several ways besides
-                # ImportError
-                self.installed_version = None
-        else:
-            self.installed_version = installed_version
+        self._installed_version = installed_version
+        self._version_found = (installed_version is not None
+                               and not callable(installed_version))
+
+    @property
+    def installed_version(self):
+        """Installed version of the dependency, or None"""
+        if not self._version_found:
+            version = None
+            if callable(self._installed_version):
+                version = self._installed_version()
+            if version is None:
+                try:
+                    version = programs.get_module_version(self.modname)
+                except:
+                    # NOTE: Don't add any exception type here!
+                    # Modules can fail to import in several ways besides
+                    # ImportError
+                    version = None
+            self._installed_version = version
+            self._version_found = True
+        return self._installed_version
 
     def check(self):
         """Check if dependency is installed"""
@@ -81,7 +97,16 @@ def check(modname):
         if dependency.modname == modname:
             return dependency.check()
     else:
-        raise RuntimeError("Unkwown dependency %s" % modname)
+        raise RuntimeError("Unknown dependency %s" % modname)
+
+
+def get_installed_version(modname):
+    """Return the installed version of a registered dependency"""
+    for dependency in DEPENDENCIES:
+        if dependency.modname == modname:
+            return dependency.installed_version
+    else:
+        raise RuntimeError("Unknown dependency %s" % modname)
 
 
 def status(deps=DEPENDENCIES, linesep=os.linesep):
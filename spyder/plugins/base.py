@@ -77,9 +77,17 @@ class BasePluginWidget(QWidget):
 ##         # or non-Windows platforms (lot of warnings are printed out)
 ##         # (so in those cases, we use the default window flags: Qt.Widget):
 ##         flags = Qt.Widget if is_old_pyqt or os.name != 'nt' else Qt.Window
-        dock = SpyderDockWidget(self.get_plugin_title(), self.main)#, flags)
-
-        dock.setObjectName(self.__class__.__name__+"_dw")
+        name = self.__class__.__name__+"_dw"
+        # Third-party plugins built on first use take over the placeholder
+        # dock created at startup (see spyder.api.plugins.LazyPluginWidget)
+        lazy_dockwidgets = getattr(self.main, 'lazy_dockwidgets', {})
+        dock = lazy_dockwidgets.pop(name, None)
+        if dock is None:
+            dock = SpyderDockWidget(self.get_plugin_title(),
+                                    self.main)#, flags)
+            dock.setObjectName(name)
+        else:
+            dock.setWindowTitle(self.get_plugin_title())
         dock.setAllowedAreas(self.ALLOWED_AREAS)
         dock.setFeatures(self.FEATURES)
         dock.setWidget(self)
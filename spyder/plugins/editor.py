@@ -20,7 +20,7 @@ import time
 # Third party imports
 from qtpy import API
 from qtpy.compat import from_qvariant, getopenfilenames, to_qvariant
-from qtpy.QtCore import QByteArray, Qt, Signal, Slot
+from qtpy.QtCore import QByteArray, Qt, QTimer, Signal, Slot
 from qtpy.QtGui import QKeySequence
 from qtpy.QtPrintSupport import QAbstractPrintDialog, QPrintDialog, QPrinter
 from qtpy.QtWidgets import (QAction, QActionGroup, QApplication, QDialog,
@@ -37,6 +37,7 @@ from spyder.config.utils import (get_edit_filetypes, get_edit_filters,
 from spyder.py3compat import getcwd, PY2, qbytearray_to_str, to_text_string
 from spyder.utils import codeanalysis, encoding, programs, sourcecode
 from spyder.utils import icon_manager as ima
+from spyder.utils.breakpoints import BreakpointStore, get_breakpoints_path
 from spyder.utils.introspection.manager import IntrospectionManager
 from spyder.utils.qthelpers import create_action, add_actions, MENU_SEPARATOR
 from spyder.widgets.findreplace import FindReplace
@@ -52,41 +53,20 @@ from spyder.plugins.runconfig import (ALWAYS_OPEN_FIRST_RUN_OPTION,
                                       RunConfigDialog, RunConfigOneDialog)
 
 
-def _load_all_breakpoints():
-    bp_dict = CONF.get('run', 'breakpoints', {})
-    for filename in list(bp_dict.keys()):
-        if not osp.isfile(filename):
-            bp_dict.pop(filename)
-    return bp_dict
-
-
-def load_breakpoints(filename):
-    breakpoints = _load_all_breakpoints().get(filename, [])
-    if breakpoints and isinstance(breakpoints[0], int):
-        # Old breakpoints format
-        breakpoints = [(lineno, None) for lineno in breakpoints]
-    return breakpoints
-
-
-def save_breakpoints(filename, breakpoints):
-    if not osp.isfile(filename):
-        return
-    bp_dict = _load_all_breakpoints()
-    bp_dict[filename] = breakpoints
-    CONF.set('run', 'breakpoints', bp_dict)
-
-
-def clear_all_breakpoints():
-    CONF.set('run', 'breakpoints', {})
-
-
-def clear_breakpoint(filename, lineno):
-    breakpoints = load_breakpoints(filename)
-    if breakpoints:
-        for breakpoint in breakpoints[:]:
-            if breakpoint[0] == lineno:
-                breakpoints.remove(breakpoint)
-        save_breakpoints(filename, breakpoints)
+def load_breakpoint_store():
+    """
+    Return the store of the breakpoints set without project, moving there
+    the breakpoints saved in Spyder's configuration by previous versions
+    """
+    store = BreakpointStore(get_breakpoints_path())
+    old_breakpoints = CONF.get('run', 'breakpoints', {})
+    if old_breakpoints:
+        for filename, breakpoints in old_breakpoints.items():
+            if osp.isfile(filename):
+                store.set_breakpoints(filename, breakpoints)
+        store.flush()
+        CONF.set('run', 'breakpoints', {})
+    return store
 
 
 WINPDB_PATH = programs.find_program('winpdb')
@@ -355,6 +335,8 @@ class Editor(SpyderPluginWidget):
     TEMPFILE_PATH = get_conf_path('temp.py')
     TEMPLATE_PATH = get_conf_path('template.py')
     DISABLE_ACTIONS_WHEN_HIDDEN = False # SpyderPluginWidget class attribute
+    # Delay before saving changed breakpoints, in ms
+    BREAKPOINTS_SAVE_DELAY = 2000
     
     # Signals
     run_in_current_ipyclient = Signal(str, str, str, bool, bool, bool)
@@ -385,6 +367,13 @@ class Editor(SpyderPluginWidget):
         self.outlineexplorer = None
         self.help = None
 
+        # Breakpoints of all files, saved when they stop changing
+        self.breakpoint_store = load_breakpoint_store()
+        self.breakpoints_timer = QTimer(self)
+        self.breakpoints_timer.setSingleShot(True)
+        self.breakpoints_timer.setInterval(self.BREAKPOINTS_SAVE_DELAY)
+        self.breakpoints_timer.timeout.connect(self.breakpoint_store.flush)
+
         self.editorstacks = None
         self.editorwindows = None
         self.editorwindows_to_be_created = None
@@ -578,6 +567,7 @@ class Editor(SpyderPluginWidget):
         """Perform actions before parent main window is closed"""
         state = self.splitter.saveState()
         self.set_option('splitter_state', qbytearray_to_str(state))
+        self.flush_breakpoints()
         filenames = []
         editorstack = self.editorstacks[0]
 
@@ -1611,7 +1601,42 @@ class Editor(SpyderPluginWidget):
             breakpoints = eval(breakpoints)
         else:
             breakpoints = []
-        save_breakpoints(filename, breakpoints)
+        if not osp.isfile(filename):
+            return
+        revision = self.breakpoint_store.revision
+        self.breakpoint_store.set_breakpoints(filename, breakpoints)
+        if self.breakpoint_store.revision != revision:
+            self.breakpoints_timer.start()
+            self.breakpoints_saved.emit()
+
+    def get_breakpoint_changes(self, revision=0):
+        """
+        Return the current breakpoints revision and the breakpoints of
+        the files changed after *revision*, to be set in a console (see
+        BreakpointStore.get_changes)
+        """
+        if not CONF.get('run', 'breakpoints/enabled', True):
+            return revision, {}
+        return self.breakpoint_store.get_changes(revision)
+
+    def get_breakpoints_file(self):
+        """
+        Return the file storing the breakpoints, to be read by consoles
+        when a debugging session starts, or None if they're disabled
+        """
+        if not CONF.get('run', 'breakpoints/enabled', True):
+            return None
+        return self.breakpoint_store.path
+
+    def flush_breakpoints(self):
+        """Save the changed breakpoints now"""
+        self.breakpoints_timer.stop()
+        self.breakpoint_store.flush()
+
+    def set_breakpoints_project(self, path):
+        """Use the breakpoints of the project in *path* (None: no project)"""
+        self.breakpoints_timer.stop()
+        self.breakpoint_store.load(get_breakpoints_path(path))
         self.breakpoints_saved.emit()
         
     #------ File I/O
@@ -1879,7 +1904,8 @@ class Editor(SpyderPluginWidget):
                 self._clone_file_everywhere(finfo)
                 current_editor = current_es.set_current_filename(filename,
                                                                  focus=focus)
-                current_editor.set_breakpoints(load_breakpoints(filename))
+                current_editor.set_breakpoints(
+                    self.breakpoint_store.get_breakpoints(filename))
                 self.register_widget_shortcuts(current_editor)
                 current_es.analyze_script()
                 self.__add_recent_file(filename)
@@ -2254,7 +2280,8 @@ class Editor(SpyderPluginWidget):
     @Slot()
     def clear_all_breakpoints(self):
         """Clear breakpoints in all files"""
-        clear_all_breakpoints()
+        self.breakpoint_store.clear_all_breakpoints()
+        self.breakpoints_timer.start()
         self.breakpoints_saved.emit()
         editorstack = self.get_current_editorstack()
         if editorstack is not None:
@@ -2264,7 +2291,8 @@ class Editor(SpyderPluginWidget):
                 
     def clear_breakpoint(self, filename, lineno):
         """Remove a single breakpoint"""
-        clear_breakpoint(filename, lineno)
+        self.breakpoint_store.clear_breakpoint(filename, lineno)
+        self.breakpoints_timer.start()
         self.breakpoints_saved.emit()
         editorstack = self.get_current_editorstack()
         if editorstack is not None:
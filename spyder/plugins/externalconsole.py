@@ -478,10 +478,35 @@ class ExternalConsole(SpyderPluginWidget):
         self.activateWindow()
         shellwidget.shell.setFocus()
 
-    def set_spyder_breakpoints(self):
-        """Set all Spyder breakpoints into all shells"""
-        for shellwidget in self.shellwidgets:
-            shellwidget.shell.set_spyder_breakpoints()
+    def set_spyder_breakpoints(self, shellwidget=None):
+        """
+        Set the Editor breakpoints changed since they were last set in the
+        Python process of *shellwidget*, or of all shells
+        """
+        if shellwidget is None:
+            shellwidgets = self.shellwidgets
+        else:
+            shellwidgets = [shellwidget]
+        shellwidgets = [sw for sw in shellwidgets
+                        if isinstance(sw, ExternalPythonShell)]
+        if not shellwidgets:
+            return
+        # Processes read the breakpoints file when a debugging session
+        # starts, so it has to be up to date
+        editor = self.main.editor
+        editor.flush_breakpoints()
+        path = editor.get_breakpoints_file()
+        for shellwidget in shellwidgets:
+            if shellwidget.introspection_socket is None:
+                # Passed to the process when it starts
+                shellwidget.breakpoints_file = path
+                continue
+            revision, changes = editor.get_breakpoint_changes(
+                                            shellwidget.breakpoints_revision)
+            if changes or path != shellwidget.breakpoints_file:
+                shellwidget.shell.set_spyder_breakpoints(path, changes)
+            shellwidget.breakpoints_file = path
+            shellwidget.breakpoints_revision = revision
 
     def start(self, fname, wdir=None, args='', interact=False, debug=False,
               python=True, python_args='', post_mortem=True):
@@ -658,6 +683,10 @@ class ExternalConsole(SpyderPluginWidget):
         
         shellwidget.started.connect(
                      lambda sid=id(shellwidget): self.process_started(sid))
+        if isinstance(shellwidget, ExternalPythonShell):
+            shellwidget.sig_monitor_ready.connect(
+                     lambda sw=shellwidget: self.set_spyder_breakpoints(sw))
+            self.set_spyder_breakpoints(shellwidget)
         shellwidget.sig_finished.connect(
                      lambda sid=id(shellwidget): self.process_finished(sid))
         self.find_widget.set_editor(shellwidget.shell)
@@ -11,6 +11,7 @@ import re
 import os.path as osp
 import socket
 import sys
+import threading
 
 # Third party imports
 from qtpy.QtCore import QThread, QUrl, Signal, Slot
@@ -30,7 +31,8 @@ from spyder.py3compat import get_meth_class_inst, to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils import programs
 from spyder.utils.help.sphinxify import (CSS_PATH, generate_context,
-                                         sphinxify, usage, warning)
+                                         render_docstring, RenderCache,
+                                         rich_text_failed, usage, warning)
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     create_toolbutton)
 from spyder.widgets.browser import FrameWebView
@@ -267,32 +269,92 @@ class SphinxThread(QThread):
     math_option : bool
         Use LaTeX math rendering.
 
+    Only the last documentation asked to be rendered is shown: the results
+    of renders replaced by a newer one are discarded. Rendered documentation
+    is kept in a RenderCache, saved to *cache_dir* if given.
     """
     # Signals
     error_msg = Signal(str)
     html_ready = Signal(str)
 
-    def __init__(self, html_text_no_doc=''):
+    def __init__(self, html_text_no_doc='', cache_dir=None):
         super(SphinxThread, self).__init__()
         self.doc = None
         self.context = None
         self.html_text_no_doc = html_text_no_doc
         self.math_option = False
+        self.img_path = ''
+        self.cache = RenderCache(cache_dir)
+        # Render waiting to be started, whether run() is rendering and
+        # number of the last render asked
+        self._request = None
+        self._running = False
+        self._generation = 0
+        self._lock = threading.Lock()
 
     def render(self, doc, context=None, math_option=False, img_path=''):
-        """Start thread to render a given documentation"""
-        # If the thread is already running wait for it to finish before
-        # starting it again.
-        if self.wait():
-            self.doc = doc
-            self.context = context
-            self.math_option = math_option
-            self.img_path = img_path
-            # This causes run() to be executed in separate thread
-            self.start()
+        """
+        Render a given documentation in the thread
+
+        Cached documentation is shown at once. Otherwise, if a render is
+        running, it's replaced by this one, which starts as soon as the
+        running one finishes.
+        """
+        key = RenderCache.make_key(doc, context, math_option, img_path,
+                                   self.html_text_no_doc)
+        html_text = self.cache.get(key)
+        with self._lock:
+            self._generation += 1
+            if html_text is not None:
+                self._request = None
+            else:
+                self._request = (doc, context, math_option, img_path, key,
+                                 self._generation)
+                if self._running:
+                    return
+                self._running = True
+        if html_text is not None:
+            self.html_ready.emit(html_text)
+            return
+        # Wait for run() to return if it has just finished rendering
+        self.wait()
+        # This causes run() to be executed in separate thread
+        self.start()
+
+    def cancel(self):
+        """Cancel the render waiting to be started, if any"""
+        with self._lock:
+            self._request = None
 
     def run(self):
+        while True:
+            with self._lock:
+                if self._request is None:
+                    self._running = False
+                    return
+                (self.doc, self.context, self.math_option,
+                 self.img_path, key, generation) = self._request
+                self._request = None
+            html_text, error, failed = self._render()
+            # Failures are not cached so they're retried the next time
+            if error is None and not failed:
+                self.cache.put(key, html_text)
+            with self._lock:
+                if generation != self._generation:
+                    # A newer render replaced this one
+                    continue
+            if error is not None:
+                self.error_msg.emit(error)
+            else:
+                self.html_ready.emit(html_text)
+
+    def _render(self):
+        """
+        Return the html text of self.doc, an error message and whether
+        Sphinx failed to process the docstring
+        """
         html_text = self.html_text_no_doc
+        failed = False
         doc = self.doc
         if doc is not None:
             if type(doc) is dict and 'docstring' in doc.keys():
@@ -302,22 +364,24 @@ class SphinxThread(QThread):
                                                note=doc['note'],
                                                math=self.math_option,
                                                img_path=self.img_path)
-                    html_text = sphinxify(doc['docstring'], context)
-                    if doc['docstring'] == '' and \
+                    html_text = render_docstring(doc['docstring'], context)
+                    if html_text is None:
+                        html_text, failed = rich_text_failed(), True
+                    elif doc['docstring'] == '' and \
                       any([doc['name'], doc['argspec'], doc['note']]):
                         msg = _("No further documentation available")
                         html_text += '<div class="hr"></div>'
                         html_text += '<div id="doc-warning">%s</div>' % msg
                 except Exception as error:
-                    self.error_msg.emit(to_text_string(error))
-                    return
+                    return None, to_text_string(error), False
             elif self.context is not None:
                 try:
-                    html_text = sphinxify(doc, self.context)
+                    html_text = render_docstring(doc, self.context)
+                    if html_text is None:
+                        html_text, failed = rich_text_failed(), True
                 except Exception as error:
-                    self.error_msg.emit(to_text_string(error))
-                    return
-        self.html_ready.emit(html_text)
+                    return None, to_text_string(error), False
+        return html_text, None, failed
 
 
 class Help(SpyderPluginWidget):
@@ -458,7 +522,8 @@ class Help(SpyderPluginWidget):
 
         # Add worker thread for handling rich text rendering
         self._sphinx_thread = SphinxThread(
-                                  html_text_no_doc=warning(self.no_doc_string))
+                                  html_text_no_doc=warning(self.no_doc_string),
+                                  cache_dir=get_conf_path('help_cache'))
         self._sphinx_thread.html_ready.connect(
                                              self._on_sphinx_thread_html_ready)
         self._sphinx_thread.error_msg.connect(self._on_sphinx_thread_error_msg)
@@ -505,6 +570,8 @@ class Help(SpyderPluginWidget):
 
     def closing_plugin(self, cancelable=False):
         """Perform actions before parent main window is closed"""
+        self._sphinx_thread.cancel()
+        self._sphinx_thread.wait()
         return True
 
     def refresh_plugin(self):
@@ -913,12 +980,10 @@ class Help(SpyderPluginWidget):
 
     def _on_sphinx_thread_html_ready(self, html_text):
         """Set our sphinx documentation based on thread result"""
-        self._sphinx_thread.wait()
         self.set_rich_text_html(html_text, QUrl.fromLocalFile(CSS_PATH))
 
     def _on_sphinx_thread_error_msg(self, error_msg):
         """ Display error message on Sphinx rich text failure"""
-        self._sphinx_thread.wait()
         self.plain_text_action.setChecked(True)
         sphinx_ver = programs.get_module_version('sphinx')
         QMessageBox.critical(self,
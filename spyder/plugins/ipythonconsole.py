@@ -784,8 +784,28 @@ class IPythonConsole(SpyderPluginWidget):
                                          self.run_script_in_current_client)
         self.main.workingdirectory.set_current_console_wd.connect(
                                      self.set_current_client_working_directory)
+        self.editor.breakpoints_saved.connect(self.set_spyder_breakpoints)
 
     #------ Public API (for clients) ------------------------------------------
+    def set_spyder_breakpoints(self, shellwidget=None):
+        """
+        Set the Editor breakpoints changed since they were last set in the
+        kernel of *shellwidget*, or of all clients
+        """
+        if shellwidget is None:
+            shellwidgets = [client.shellwidget
+                            for client in self.get_clients()]
+        else:
+            shellwidgets = [shellwidget]
+        for shellwidget in shellwidgets:
+            if shellwidget.kernel_client is None:
+                continue
+            revision, changes = self.editor.get_breakpoint_changes(
+                                            shellwidget.breakpoints_revision)
+            if changes:
+                shellwidget.set_breakpoints(changes)
+            shellwidget.breakpoints_revision = revision
+
     def get_clients(self):
         """Return clients list"""
         return [cl for cl in self.clients if isinstance(cl, ClientWidget)]
@@ -1079,6 +1099,11 @@ class IPythonConsole(SpyderPluginWidget):
                               lambda fname, lineno, shellwidget=shellwidget:
                               self.pdb_has_stopped(fname, lineno, shellwidget))
 
+        # Set the Editor breakpoints again when the kernel is restarted
+        shellwidget.sig_breakpoints_reset.connect(
+                              lambda shellwidget=shellwidget:
+                              self.set_spyder_breakpoints(shellwidget))
+
         # Connect text widget to Help
         if self.help is not None:
             control.set_help(self.help)
@@ -1321,6 +1346,10 @@ class IPythonConsole(SpyderPluginWidget):
                                          config=None, autorestart=True)
         kernel_manager._kernel_spec = self.create_kernel_spec()
 
+        # The kernel reads its options from spyder.ini, which may not have
+        # the last changes yet
+        CONF.flush()
+
         # Save stderr in a file to read it later in case of errors
         if not self.testing:
             stderr = codecs.open(stderr_file, 'w', encoding='utf-8')
@@ -1415,6 +1444,7 @@ class IPythonConsole(SpyderPluginWidget):
             self.help.set_shell(client.shellwidget)
         if self.variableexplorer is not None:
             self.variableexplorer.add_shellwidget(client.shellwidget)
+        self.set_spyder_breakpoints(client.shellwidget)
 
     def process_finished(self, client):
         if self.variableexplorer is not None:
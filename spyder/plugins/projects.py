@@ -140,6 +140,8 @@ class Projects(SpyderPluginWidget):
             lambda v: self.workingdirectory.chdir(v))
         self.sig_project_loaded.connect(
             lambda v: self.main.update_window_title())
+        self.sig_project_loaded.connect(
+            lambda v: self.editor.set_breakpoints_project(v))
         self.sig_project_loaded.connect(
             lambda v: self.editor.setup_open_files())
         self.sig_project_loaded.connect(self.update_explorer)
@@ -147,6 +149,8 @@ class Projects(SpyderPluginWidget):
             lambda v: self.workingdirectory.chdir(self.get_last_working_dir()))
         self.sig_project_closed.connect(
             lambda v: self.main.update_window_title())
+        self.sig_project_closed.connect(
+            lambda v: self.editor.set_breakpoints_project(None))
         self.sig_project_closed.connect(
             lambda v: self.editor.setup_open_files())
         self.recent_project_menu.aboutToShow.connect(self.setup_menu_actions)
@@ -35,3 +35,18 @@ def test_sys_argv_clear(ipyconsole_bot):
     shell.execute('import sys; A = sys.argv')
     argv = shell.get_value("A")
     assert argv == ['']
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="It's timing out on Windows")
+def test_profile_code(ipyconsole_bot):
+    qtbot, ipyconsole = ipyconsole_bot
+    shell = ipyconsole.get_current_shellwidget()
+
+    qtbot.waitUntil(lambda: shell._prompt_html is not None, timeout=6000)
+    shell.execute('def f(n):\n    return sum(range(n))')
+    with qtbot.waitSignal(shell.sig_profile_data, timeout=6000) as blocker:
+        shell.profile_code('x = f(1000)')
+    data = blocker.args[0]
+    assert not data['error']
+    assert [function for function in data['stats'] if function[2] == 'f']
+    assert shell.get_value('x') == 499500
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Breakpoints set in the Editor
+
+They are stored by file in a JSON file per project, or in Spyder's
+configuration directory when no project is open, instead of in Spyder's
+configuration, which was rewritten each time one of them changed.
+"""
+
+# Standard library imports
+import io
+import json
+import os
+import os.path as osp
+import tempfile
+
+# Local imports
+from spyder.config.base import get_conf_path
+from spyder.config.user import replace_file
+from spyder.py3compat import to_text_string
+
+
+BREAKPOINTS_FILENAME = 'breakpoints.json'
+
+# Same as spyder.widgets.projects.config.PROJECT_FOLDER, which can't be
+# imported without Qt
+PROJECT_FOLDER = '.spyproject'
+
+
+def get_breakpoints_path(project_path=None):
+    """
+    Return the file storing the breakpoints of the project in
+    *project_path*, or the ones set when there's no project
+    """
+    if project_path:
+        return osp.join(project_path, PROJECT_FOLDER, BREAKPOINTS_FILENAME)
+    return get_conf_path(BREAKPOINTS_FILENAME)
+
+
+def normalize_breakpoints(breakpoints):
+    """
+    Return the (line number, condition) tuples of *breakpoints*, which
+    can also be given as lists or line numbers (old format)
+    """
+    normalized = []
+    for breakpoint in breakpoints:
+        if isinstance(breakpoint, int):
+            normalized.append((breakpoint, None))
+        else:
+            normalized.append((breakpoint[0], breakpoint[1]))
+    return normalized
+
+
+def load_breakpoints_file(path):
+    """Return the breakpoints of each file stored in *path*"""
+    try:
+        with io.open(path, encoding='utf-8') as fdesc:
+            data = json.load(fdesc)
+        return dict((filename, normalize_breakpoints(breakpoints))
+                    for filename, breakpoints in data['files'].items()
+                    if breakpoints)
+    except (IOError, OSError, KeyError, TypeError, ValueError, IndexError):
+        # Missing or corrupted file
+        return {}
+
+
+def save_breakpoints_file(path, breakpoints):
+    """Store the *breakpoints* of each file in *path*"""
+    text = json.dumps({'files': breakpoints}, indent=1, sort_keys=True)
+    dirname = osp.dirname(path)
+    try:
+        if not osp.isdir(dirname):
+            os.makedirs(dirname)
+        fd, tmpname = tempfile.mkstemp(dir=dirname)
+        with io.open(fd, 'w', encoding='utf-8') as fdesc:
+            fdesc.write(to_text_string(text))
+        replace_file(tmpname, path)
+    except (IOError, OSError):
+        pass
+
+
+class BreakpointStore(object):
+    """
+    Breakpoints of each file, stored in the file *path*
+
+    Changing breakpoints only marks the store as modified: it's written by
+    flush, so that several changes are saved at once.
+
+    Each change increases the revision of the store, and the revision of
+    the last change of each file is kept, so that the breakpoints changed
+    since any revision can be sent to consoles (see get_changes).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.breakpoints = load_breakpoints_file(path)
+        self.modified = False
+        self.revision = 0
+        # Revision of the last change of each file, including the files
+        # whose breakpoints were all removed
+        self.revisions = {}
+        self._changed(self.breakpoints)
+
+    def _changed(self, filenames):
+        if filenames:
+            self.revision += 1
+            for filename in filenames:
+                self.revisions[filename] = self.revision
+
+    def load(self, path):
+        """Save the breakpoints, then replace them by the ones of *path*"""
+        self.flush()
+        previous = self.breakpoints
+        self.path = path
+        self.breakpoints = load_breakpoints_file(path)
+        self._changed([filename for filename
+                       in set(previous) | set(self.breakpoints)
+                       if previous.get(filename) !=
+                       self.breakpoints.get(filename)])
+
+    def flush(self):
+        """Save the breakpoints if they were modified"""
+        if self.modified:
+            save_breakpoints_file(self.path, self.breakpoints)
+            self.modified = False
+
+    def get_breakpoints(self, filename):
+        """Return the breakpoints of *filename*"""
+        return list(self.breakpoints.get(filename, []))
+
+    def get_all_breakpoints(self):
+        """Return the breakpoints of each file"""
+        return dict((filename, list(breakpoints))
+                    for filename, breakpoints in self.breakpoints.items())
+
+    def set_breakpoints(self, filename, breakpoints):
+        """Set the *breakpoints* of *filename*, replacing its previous ones"""
+        breakpoints = normalize_breakpoints(breakpoints)
+        if breakpoints == self.breakpoints.get(filename, []):
+            return
+        if breakpoints:
+            self.breakpoints[filename] = breakpoints
+        else:
+            self.breakpoints.pop(filename)
+        self.modified = True
+        self._changed([filename])
+
+    def clear_breakpoint(self, filename, lineno):
+        """Remove the breakpoint of *filename* at line *lineno*"""
+        self.set_breakpoints(filename,
+                             [breakpoint for breakpoint
+                              in self.breakpoints.get(filename, [])
+                              if breakpoint[0] != lineno])
+
+    def clear_all_breakpoints(self):
+        """Remove the breakpoints of all files"""
+        filenames = list(self.breakpoints)
+        if filenames:
+            self.breakpoints = {}
+            self.modified = True
+            self._changed(filenames)
+
+    def get_changes(self, revision=0):
+        """
+        Return the current revision and the breakpoints of the files
+        changed after *revision* (all files for 0), with an empty list for
+        the files without breakpoints anymore
+        """
+        changes = dict((filename, self.get_breakpoints(filename))
+                       for filename, file_revision in self.revisions.items()
+                       if file_revision > revision)
+        if not revision:
+            # Files without breakpoints since the start
+            changes = dict((filename, breakpoints)
+                           for filename, breakpoints in changes.items()
+                           if breakpoints)
+        return self.revision, changes
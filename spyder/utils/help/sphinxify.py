@@ -17,23 +17,30 @@ www.sagemath.org/doc/reference/sagenb/misc/sphinxify.html
 """
 
 # Stdlib imports
+import atexit
+from collections import OrderedDict
 import codecs
+import hashlib
+import io
+import json
 import os
 import os.path as osp
 import shutil
 import sys
 from tempfile import mkdtemp
+import threading
 from xml.sax.saxutils import escape
 
 # 3rd party imports
-from docutils.utils import SystemMessage as SystemMessage
+# Note: Sphinx and docutils are imported when first rendering a docstring
+# because they take a long time to import, which delayed Spyder's startup
 from jinja2 import Environment, FileSystemLoader
-import sphinx
-from sphinx.application import Sphinx
 
 # Local imports
+from spyder import __version__
 from spyder.config.base import (_, get_module_data_path,
                                 get_module_source_path)
+from spyder.config.user import replace_file
 from spyder.utils import encoding
 
 
@@ -117,6 +124,8 @@ def generate_context(name='', argspec='', note='', math=False, collapse=False,
     A dict of strings to be used by Jinja to generate the webpage
     """
 
+    import sphinx
+
     if img_path and os.name == 'nt':
         img_path = img_path.replace('\\', '/')
 
@@ -142,6 +151,218 @@ def generate_context(name='', argspec='', note='', math=False, collapse=False,
     return context
 
 
+class SphinxRenderer(object):
+    """
+    Long-lived Sphinx application rendering docstrings
+
+    Creating a Sphinx application (reading its configuration and loading
+    its extensions and templates) takes most of the time of a render, so
+    the same application is used for all the docstrings, which are given
+    to it through the source-read event instead of being written to files.
+    Only Sphinx's own doctrees and output are written, to a temporary
+    directory created once.
+
+    Renders are serialized because Sphinx applications are not thread safe.
+    """
+    DOCNAME = 'docstring'
+
+    def __init__(self, buildername='html'):
+        self.buildername = buildername
+        self.app = None
+        self.math = None
+        self.tmpdir = None
+        self.docstring = u''
+        self.lock = threading.Lock()
+
+    def _create_app(self, math):
+        from sphinx.application import Sphinx
+
+        self.close()
+        self.tmpdir = encoding.to_unicode_from_fs(mkdtemp())
+        srcdir = osp.join(self.tmpdir, 'src')
+        os.mkdir(srcdir)
+        # Sphinx only builds documents with a source file, but their
+        # contents are replaced by the docstring in _source_read
+        open(osp.join(srcdir, self.DOCNAME + '.rst'), 'w').close()
+        # The configuration is read by Sphinx only once, so the app is
+        # created again if the math option changes
+        self.math = math
+        self.app = Sphinx(srcdir, CONFDIR_PATH,
+                          osp.join(self.tmpdir, 'build'),
+                          osp.join(self.tmpdir, 'doctrees'),
+                          self.buildername, {'html_context': {}},
+                          status=None, warning=None, freshenv=True,
+                          warningiserror=False, tags=None)
+        self.app.connect('source-read', self._source_read)
+        self.app.connect('env-get-outdated', self._get_outdated)
+
+    def _source_read(self, app, docname, source):
+        source[0] = self.docstring
+
+    def _get_outdated(self, app, env, added, changed, removed):
+        # The source file never changes, so the docstring has to be read
+        # again at each build
+        return [self.DOCNAME]
+
+    def render(self, docstring, context):
+        """
+        Render a docstring with the template variables of *context*
+
+        Return None if Sphinx didn't produce any output
+        """
+        with self.lock:
+            math = bool(context.get('math_on'))
+            if self.app is None or math != self.math:
+                self._create_app(math)
+            self.docstring = docstring
+            self.app.config.html_context = context
+            try:
+                self.app.build(False, [osp.join(self.app.srcdir,
+                                                self.DOCNAME + '.rst')])
+            except Exception:
+                # The app can be left in any state
+                self.close()
+                raise
+            if self.buildername == 'html':
+                suffix = '.html'
+            else:
+                suffix = '.txt'
+            output_name = osp.join(self.app.outdir, self.DOCNAME + suffix)
+            if not osp.exists(output_name):
+                return
+            with codecs.open(output_name, 'r', encoding='utf-8') as output:
+                return output.read()
+
+    def close(self):
+        """Remove the app and its temporary directory"""
+        self.app = None
+        if self.tmpdir is not None:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+            self.tmpdir = None
+
+
+# Renderers by builder name
+RENDERERS = {}
+
+
+def get_renderer(buildername='html'):
+    """Return the SphinxRenderer shared by all the renders of *buildername*"""
+    if buildername not in RENDERERS:
+        RENDERERS[buildername] = SphinxRenderer(buildername)
+    return RENDERERS[buildername]
+
+
+@atexit.register
+def close_renderers():
+    """Remove the temporary directories of the renderers"""
+    for renderer in RENDERERS.values():
+        renderer.close()
+
+
+class RenderCache(object):
+    """
+    LRU cache of rendered documentation, optionally saved to *directory* so
+    that it's kept between sessions
+
+    Keys are made with make_key from everything the rendering depends on.
+    """
+    SIZE = 200
+    DISK_SIZE = 2000
+
+    def __init__(self, directory=None, size=SIZE, disk_size=DISK_SIZE):
+        self.directory = directory
+        self.size = size
+        self.disk_size = disk_size
+        self._cache = OrderedDict()
+        # Keys saved to directory, listed when first needed
+        self._saved = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*args):
+        """
+        Return a key for a render depending on *args*, which must be
+        serializable to JSON
+        """
+        import sphinx
+        data = json.dumps([__version__, sphinx.__version__] + list(args),
+                          sort_keys=True, default=repr)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def _filename(self, key):
+        return osp.join(self.directory, key + '.html')
+
+    def _list_saved(self):
+        """Return the saved keys, removing the oldest ones if too many"""
+        if self._saved is None:
+            self._saved = set()
+            try:
+                names = [name for name in os.listdir(self.directory)
+                         if name.endswith('.html')]
+            except OSError:
+                names = []
+            if len(names) > self.disk_size:
+                names.sort(key=lambda name: osp.getmtime(
+                                                osp.join(self.directory, name)))
+                for name in names[:len(names) - self.disk_size]:
+                    try:
+                        os.remove(osp.join(self.directory, name))
+                    except OSError:
+                        pass
+                names = names[len(names) - self.disk_size:]
+            self._saved.update(osp.splitext(name)[0] for name in names)
+        return self._saved
+
+    def _add(self, key, output):
+        self._cache[key] = output
+        if len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+
+    def get(self, key):
+        """Return the output cached for *key*, or None"""
+        with self._lock:
+            try:
+                output = self._cache.pop(key)
+            except KeyError:
+                output = None
+            if output is None and self.directory is not None:
+                if key in self._list_saved():
+                    try:
+                        with io.open(self._filename(key),
+                                     encoding='utf-8') as fdesc:
+                            output = fdesc.read()
+                    except (IOError, OSError):
+                        self._saved.discard(key)
+            if output is not None:
+                self._add(key, output)
+            return output
+
+    def put(self, key, output):
+        """Cache *output* for *key*"""
+        with self._lock:
+            self._add(key, output)
+            if self.directory is None or key in self._list_saved():
+                return
+            self._saved.add(key)
+        try:
+            if not osp.isdir(self.directory):
+                os.makedirs(self.directory)
+            tmpname = self._filename(key) + '.tmp'
+            with io.open(tmpname, 'w', encoding='utf-8') as fdesc:
+                fdesc.write(output)
+            replace_file(tmpname, self._filename(key))
+        except (IOError, OSError):
+            pass
+
+    def clear(self):
+        """Remove all the cached outputs, in memory and on disk"""
+        with self._lock:
+            self._cache.clear()
+            self._saved = None
+            if self.directory is not None:
+                shutil.rmtree(self.directory, ignore_errors=True)
+
+
 def sphinxify(docstring, context, buildername='html'):
     """
     Runs Sphinx on a docstring and outputs the processed documentation.
@@ -161,20 +382,22 @@ def sphinxify(docstring, context, buildername='html'):
     Returns
     -------
     An Sphinx-processed string, in either HTML or plain text format, depending
-    on the value of `buildername`
+    on the value of `buildername`, or a warning page if Sphinx couldn't
+    process the docstring
     """
+    output = render_docstring(docstring, context, buildername)
+    if output is None:
+        return rich_text_failed()
+    return output
 
-    srcdir = mkdtemp()
-    srcdir = encoding.to_unicode_from_fs(srcdir)
 
-    base_name = osp.join(srcdir, 'docstring')
-    rst_name = base_name + '.rst'
+def render_docstring(docstring, context, buildername='html'):
+    """
+    Runs Sphinx on a docstring like sphinxify, but returns None if Sphinx
+    couldn't process it instead of a warning page.
+    """
 
-    if buildername == 'html':
-        suffix = '.html'
-    else:
-        suffix = '.txt'
-    output_name = base_name + suffix
+    from docutils.utils import SystemMessage
 
     # This is needed so users can type \\ on latex eqnarray envs inside raw
     # docstrings
@@ -191,49 +414,22 @@ def sphinxify(docstring, context, buildername='html'):
                          '<span class="argspec-highlight">' + char + '</span>')
     context['argspec'] = argspec
 
-    doc_file = codecs.open(rst_name, 'w', encoding='utf-8')
-    doc_file.write(docstring)
-    doc_file.close()
-    
-    temp_confdir = False
-    if temp_confdir:
-        # TODO: This may be inefficient. Find a faster way to do it.
-        confdir = mkdtemp()
-        confdir = encoding.to_unicode_from_fs(confdir)
-        generate_configuration(confdir)
-    else:
-        confdir = osp.join(get_module_source_path('spyder.utils.help'))
-
-    confoverrides = {'html_context': context}
-
-    doctreedir = osp.join(srcdir, 'doctrees')
-
-    sphinx_app = Sphinx(srcdir, confdir, srcdir, doctreedir, buildername,
-                        confoverrides, status=None, warning=None,
-                        freshenv=True, warningiserror=False, tags=None)
     try:
-        sphinx_app.build(None, [rst_name])
+        output = get_renderer(buildername).render(docstring, context)
     except SystemMessage:
-        output = _("It was not possible to generate rich text help for this "
-                    "object.</br>"
-                    "Please see it in plain text.")
-        return warning(output)
-
-    # TODO: Investigate if this is necessary/important for us
-    if osp.exists(output_name):
-        output = codecs.open(output_name, 'r', encoding='utf-8').read()
-        output = output.replace('<pre>', '<pre class="literal-block">')
-    else:
-        output = _("It was not possible to generate rich text help for this "
-                    "object.</br>"
-                    "Please see it in plain text.")
-        return warning(output)
-
-    if temp_confdir:
-        shutil.rmtree(confdir, ignore_errors=True)
-    shutil.rmtree(srcdir, ignore_errors=True)
+        output = None
 
-    return output
+    if output is None:
+        return None
+
+    return output.replace('<pre>', '<pre class="literal-block">')
+
+
+def rich_text_failed():
+    """Return the warning page shown when a docstring couldn't be rendered"""
+    return warning(_("It was not possible to generate rich text help for "
+                     "this object.</br>"
+                     "Please see it in plain text."))
 
 
 def generate_configuration(directory):
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for sphinxify.py
+"""
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.utils.help.sphinxify import (generate_context, get_renderer,
+                                         render_docstring, RenderCache,
+                                         rich_text_failed, sphinxify)
+
+
+def test_sphinxify_reuses_sphinx_app():
+    html = sphinxify("First *docstring*", generate_context(name='first'))
+    assert '<em>docstring</em>' in html
+    app = get_renderer().app
+    html = sphinxify("Second docstring", generate_context(name='second'))
+    assert 'Second docstring' in html
+    assert 'First' not in html
+    assert get_renderer().app is app
+
+
+def test_sphinxify_failure(monkeypatch):
+    monkeypatch.setattr(get_renderer(), 'render',
+                        lambda docstring, context: None)
+    assert render_docstring("Docstring", generate_context()) is None
+    assert sphinxify("Docstring", generate_context()) == rich_text_failed()
+
+
+def test_render_cache(tmpdir):
+    cache = RenderCache(str(tmpdir), size=1)
+    key = RenderCache.make_key({'name': 'foo', 'docstring': 'Foo'}, None)
+    other_key = RenderCache.make_key({'name': 'bar', 'docstring': 'Bar'}, None)
+    assert cache.get(key) is None
+    cache.put(key, u'<p>Foo</p>')
+    cache.put(other_key, u'<p>Bar</p>')
+    assert list(cache._cache) == [other_key]
+    # Read back from disk, also by a new cache
+    assert cache.get(key) == u'<p>Foo</p>'
+    assert RenderCache(str(tmpdir)).get(other_key) == u'<p>Bar</p>'
+
+
+if __name__ == "__main__":
+    pytest.main()
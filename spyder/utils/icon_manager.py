@@ -14,6 +14,7 @@ from qtpy.QtWidgets import QStyle, QWidget
 # Local imports
 from spyder.config.base import get_image_path
 from spyder.config.main import CONF
+from spyder.utils import timing
 import qtawesome as qta
 
 
@@ -250,6 +251,7 @@ def get_icon(name, default=None, resample=False):
         return icon
 
 
+@timing.timed("Icon creation", accumulate=True)
 def icon(name, resample=False, icon_path=None):
     theme = CONF.get('main', 'icon_theme')
     if theme == 'spyder 3':
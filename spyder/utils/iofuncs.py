@@ -15,7 +15,9 @@ from __future__ import print_function
 
 import sys
 import os
+import io
 import tarfile
+import time
 import os.path as osp
 import shutil
 import warnings
@@ -34,7 +36,7 @@ except:
 
 # Local imports
 from spyder.config.base import _, get_conf_path
-from spyder.py3compat import pickle, to_text_string, getcwd, PY2
+from spyder.py3compat import pickle, to_text_string, PY2
 
 
 class MatlabStruct(dict):
@@ -205,11 +207,79 @@ try:
         except Exception as error:
             return None, str(error)
 
-    def __save_array(data, basename, index):
-        """Save numpy array"""
-        fname = basename + '_%04d.npy' % index
-        np.save(fname, data)
-        return fname
+    class ArrayStream(object):
+        """
+        File-like object giving an array in .npy format, chunk by chunk
+
+        This lets arrays be written to an archive without a temporary file
+        nor a copy of them in memory.
+        """
+        BUFFER_SIZE = 2**24
+
+        def __init__(self, array):
+            header_data = np.lib.format.header_data_from_array_1_0(array)
+            header = io.BytesIO()
+            try:
+                np.lib.format.write_array_header_1_0(header, header_data)
+            except ValueError:
+                header = io.BytesIO()
+                np.lib.format.write_array_header_2_0(header, header_data)
+            header = header.getvalue()
+            self.size = len(header) + array.nbytes
+            self._chunks = self._iter_chunks(header, array,
+                                             header_data['fortran_order'])
+            self._buffer = b''
+
+        def _iter_chunks(self, header, array, fortran_order):
+            yield header
+            buffersize = max(self.BUFFER_SIZE // max(array.itemsize, 1), 1)
+            for chunk in np.nditer(array, flags=['external_loop', 'buffered',
+                                                 'zerosize_ok'],
+                                   buffersize=buffersize,
+                                   order='F' if fortran_order else 'C'):
+                yield chunk.tobytes('C')
+
+        def read(self, size=-1):
+            chunks = [self._buffer]
+            length = len(self._buffer)
+            while size < 0 or length < size:
+                try:
+                    chunk = next(self._chunks)
+                except StopIteration:
+                    break
+                chunks.append(chunk)
+                length += len(chunk)
+            data = b''.join(chunks)
+            if size < 0:
+                size = len(data)
+            self._buffer = data[size:]
+            return data[:size]
+
+    def read_array_member(tar, member, filename, mmap_min_size):
+        """
+        Read array saved in *member* of *tar*, the archive *filename*
+
+        Arrays of at least *mmap_min_size* bytes are memory-mapped from
+        the archive in copy-on-write mode, i.e. they're only read when
+        used and changing them doesn't change the file.
+        """
+        fdesc = tar.extractfile(member)
+        version = np.lib.format.read_magic(fdesc)
+        if version == (1, 0):
+            header = np.lib.format.read_array_header_1_0(fdesc)
+        else:
+            header = np.lib.format.read_array_header_2_0(fdesc)
+        shape, fortran_order, dtype = header
+        nbytes = dtype.itemsize
+        for dim in shape:
+            nbytes *= dim
+        if nbytes >= mmap_min_size and not dtype.hasobject:
+            return np.memmap(filename, dtype=dtype, mode='c', shape=shape,
+                             order='F' if fortran_order else 'C',
+                             offset=member.offset_data + fdesc.tell())
+        fdesc.seek(0)
+        return np.lib.format.read_array(io.BytesIO(fdesc.read()),
+                                        allow_pickle=True)
 except:
     load_array = None
 
@@ -283,96 +353,156 @@ def load_json(filename):
         return None, str(err)
 
 
+# Arrays of at least this size (in bytes) are memory-mapped when loaded from
+# .spydata files
+SPYDATA_MMAP_MIN_SIZE = 2**24
+
+
+def _add_tar_member(tar, name, fileobj, size):
+    """Add *size* bytes read from *fileobj* to *tar* as member *name*"""
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = time.time()
+    tar.addfile(info, fileobj)
+
+
+def _is_mapped_from(value, filename):
+    """Return True if *value* is an array memory-mapped from *filename*"""
+    while value is not None:
+        if getattr(value, 'filename', None) is not None:
+            return osp.normcase(value.filename) == osp.normcase(filename)
+        value = getattr(value, 'base', None)
+    return False
+
+
 def save_dictionary(data, filename):
-    """Save dictionary in a single file .spydata file"""
+    """
+    Save dictionary in a single file .spydata file
+
+    The file is a tar archive with the pickled dictionary and one .npy
+    member per array, which are written to it directly. Array data is
+    aligned in the file, so it can be memory-mapped when loading it.
+    """
     filename = osp.abspath(filename)
-    old_cwd = getcwd()
-    os.chdir(osp.dirname(filename))
+    basename = osp.splitext(osp.basename(filename))[0]
     error_message = None
-    try:
-        saved_arrays = {}
-        if load_array is not None:
-            # Saving numpy arrays with np.save
-            arr_fname = osp.splitext(filename)[0]
-            for name in list(data.keys()):
-                if isinstance(data[name], np.ndarray) and data[name].size > 0:
-                    # Saving arrays at data root
-                    fname = __save_array(data[name], arr_fname,
-                                       len(saved_arrays))
-                    saved_arrays[(name, None)] = osp.basename(fname)
-                    data.pop(name)
-                elif isinstance(data[name], (list, dict)):
-                    # Saving arrays nested in lists or dictionaries
-                    if isinstance(data[name], list):
-                        iterator = enumerate(data[name])
-                    else:
-                        iterator = iter(list(data[name].items()))
-                    to_remove = []
-                    for index, value in iterator:
-                        if isinstance(value, np.ndarray) and value.size > 0:
-                            fname = __save_array(value, arr_fname,
-                                               len(saved_arrays))
-                            saved_arrays[(name, index)] = osp.basename(fname)
-                            to_remove.append(index)
-                    for index in sorted(to_remove, reverse=True):
-                        data[name].pop(index)
-            if saved_arrays:
-                data['__saved_arrays__'] = saved_arrays
-        pickle_filename = osp.splitext(filename)[0]+'.pickle'
-        with open(pickle_filename, 'wb') as fdesc:
-            pickle.dump(data, fdesc, 2)
-        tar = tarfile.open(filename, "w")
-        for fname in [pickle_filename]+[fn for fn in list(saved_arrays.values())]:
-            tar.add(osp.basename(fname))
-            os.remove(fname)
-        tar.close()
+    data = data.copy()
+    saved_arrays = {}
+    arrays = []
+    if load_array is not None:
+        def is_saved_as_array(value):
+            return (isinstance(value, np.ndarray) and value.size > 0
+                    and not value.dtype.hasobject)
+
+        def add_array(array):
+            fname = '%s_%04d.npy' % (basename, len(arrays))
+            arrays.append((fname, array))
+            return fname
+
+        for name in list(data.keys()):
+            value = data[name]
+            if is_saved_as_array(value):
+                # Saving arrays at data root
+                saved_arrays[(name, None)] = add_array(value)
+                data.pop(name)
+            elif isinstance(value, list):
+                # Saving arrays nested in lists
+                for index, item in enumerate(value):
+                    if is_saved_as_array(item):
+                        saved_arrays[(name, index)] = add_array(item)
+                data[name] = [item for item in value
+                              if not is_saved_as_array(item)]
+            elif isinstance(value, dict):
+                # Saving arrays nested in dictionaries
+                for key, item in list(value.items()):
+                    if is_saved_as_array(item):
+                        saved_arrays[(name, key)] = add_array(item)
+                data[name] = dict((key, item)
+                                  for key, item in list(value.items())
+                                  if not is_saved_as_array(item))
         if saved_arrays:
-            data.pop('__saved_arrays__')
-    except (RuntimeError, pickle.PicklingError, TypeError) as error:
+            data['__saved_arrays__'] = saved_arrays
+
+    # Arrays memory-mapped from the file being overwritten must be read
+    # from the old file, which stays available until it's replaced
+    if any(_is_mapped_from(array, filename) for _fname, array in arrays):
+        target = filename + '.%d.tmp' % os.getpid()
+    else:
+        target = filename
+    try:
+        pickled = pickle.dumps(data, 2)
+        with tarfile.open(target, "w", format=tarfile.GNU_FORMAT) as tar:
+            _add_tar_member(tar, basename + '.pickle', io.BytesIO(pickled),
+                            len(pickled))
+            for fname, array in arrays:
+                stream = ArrayStream(array)
+                _add_tar_member(tar, fname, stream, stream.size)
+        if target != filename:
+            try:
+                os.replace(target, filename)
+            except AttributeError:
+                # Python 2
+                os.remove(filename)
+                os.rename(target, filename)
+    except (RuntimeError, pickle.PicklingError, TypeError, IOError,
+            OSError) as error:
         error_message = to_text_string(error)
-    os.chdir(old_cwd)
+        if target != filename and osp.isfile(target):
+            os.remove(target)
     return error_message
 
 
+def _loads_pickle(pickled):
+    """Unpickle data saved by any Spyder version"""
+    try:
+        return pickle.loads(pickled)
+    except (pickle.PickleError, TypeError, UnicodeDecodeError, ValueError,
+            EOFError):
+        # Old format (Spyder 2.0-2.1 for Python 2), written in text mode
+        return pickle.loads(pickled.replace(b'\r\n', b'\n'))
+
+
 def load_dictionary(filename):
-    """Load dictionary from .spydata file"""
+    """
+    Load dictionary from .spydata file
+
+    Members are read directly from the archive, without extracting them,
+    and big arrays are memory-mapped from it.
+    """
     filename = osp.abspath(filename)
-    old_cwd = getcwd()
-    os.chdir(osp.dirname(filename))
     data = None
     error_message = None
     try:
-        tar = tarfile.open(filename, "r")
-        tar.extractall()
-        pickle_filename = osp.splitext(filename)[0]+'.pickle'
-        try:
-            # Old format (Spyder 2.0-2.1 for Python 2)
-            with open(pickle_filename, 'U') as fdesc:
-                data = pickle.loads(fdesc.read())
-        except (pickle.PickleError, TypeError, UnicodeDecodeError):
-            # New format (Spyder >=2.2 for Python 2 and Python 3)
-            with open(pickle_filename, 'rb') as fdesc:
-                data = pickle.loads(fdesc.read())
-        saved_arrays = {}
-        if load_array is not None:
-            # Loading numpy arrays saved with np.save
-            try:
-                saved_arrays = data.pop('__saved_arrays__')
-                for (name, index), fname in list(saved_arrays.items()):
-                    arr = np.load( osp.join(osp.dirname(filename), fname) )
+        with tarfile.open(filename, "r") as tar:
+            pickle_name = osp.splitext(osp.basename(filename))[0] + '.pickle'
+            names = tar.getnames()
+            if pickle_name not in names:
+                # The file was renamed after it was saved
+                pickle_name = [name for name in names
+                               if name.endswith('.pickle')][0]
+            data = _loads_pickle(tar.extractfile(pickle_name).read())
+            if load_array is not None:
+                # Loading numpy arrays saved in .npy members
+                saved_arrays = data.pop('__saved_arrays__', {})
+
+                def insertion_order(item):
+                    (name, index), fname = item
+                    return index if isinstance(data.get(name), list) else -1
+
+                # List items have to be inserted in order
+                for (name, index), fname in sorted(saved_arrays.items(),
+                                                   key=insertion_order):
+                    arr = read_array_member(tar, tar.getmember(fname),
+                                            filename, SPYDATA_MMAP_MIN_SIZE)
                     if index is None:
                         data[name] = arr
                     elif isinstance(data[name], dict):
                         data[name][index] = arr
                     else:
                         data[name].insert(index, arr)
-            except KeyError:
-                pass
-        for fname in [pickle_filename]+[fn for fn in list(saved_arrays.values())]:
-            os.remove(fname)
-    except (EOFError, ValueError) as error:
+    except (EOFError, ValueError, KeyError, IndexError, IOError,
+            tarfile.TarError) as error:
         error_message = to_text_string(error)
-    os.chdir(old_cwd)
     return data, error_message
 
 
@@ -384,8 +514,10 @@ class IOFunctions(object):
         self.save_filters = None
         self.load_funcs = None
         self.save_funcs = None
+        self.load_directory_extensions = None
 
     def setup(self):
+        self.load_directory_extensions = {}
         iofuncs = self.get_internal_funcs()+self.get_3rd_party_funcs()
         load_extensions = {}
         save_extensions = {}
@@ -440,6 +572,11 @@ class IOFunctions(object):
             try:
                 other_funcs.append((mod.FORMAT_EXT, mod.FORMAT_NAME,
                                     mod.FORMAT_LOAD, mod.FORMAT_SAVE))
+                # Formats whose load function also accepts a directory
+                if (mod.FORMAT_LOAD is not None and
+                        getattr(mod, 'FORMAT_LOAD_DIRECTORY', False)):
+                    self.load_directory_extensions[mod.FORMAT_NAME] = \
+                        mod.FORMAT_EXT
             except AttributeError as error:
                 print("%s: %s" % (mod, str(error)), file=STDERR)
         return other_funcs
@@ -10,6 +10,7 @@ Spyder kernel for Jupyter
 
 # Standard library imports
 import os
+import sys
 
 # Third-party imports
 from ipykernel.datapub import publish_data
@@ -27,8 +28,10 @@ if not IS_EXT_INTERPRETER:
     from spyder.utils.dochelpers import isdefined, getdoc, getsource
     from spyder.utils.iofuncs import iofunctions
     from spyder.utils.misc import fix_reference_name
-    from spyder.widgets.variableexplorer.utils import (get_remote_data,
-                                                       make_remote_view)
+    from spyder.widgets.variableexplorer.utils import (
+        get_remote_data, get_value_info, get_value_window, is_lazy_array,
+        make_remote_view, set_value_items, sort_permutation,
+        get_namespace_ids, VarPropertiesCache)
 else:
     # We add "spyder" to sys.path for external interpreters, so this works!
     # See create_kernel_spec of plugins/ipythonconsole
@@ -36,8 +39,10 @@ else:
     from utils.dochelpers import isdefined, getdoc, getsource
     from utils.iofuncs import iofunctions
     from utils.misc import fix_reference_name
-    from widgets.variableexplorer.utils import (get_remote_data,
-                                                make_remote_view)
+    from widgets.variableexplorer.utils import (
+        get_remote_data, get_value_info, get_value_window, is_lazy_array,
+        make_remote_view, set_value_items, sort_permutation,
+        get_namespace_ids, VarPropertiesCache)
 
 
 # XXX --- Disable canning for Numpy arrays for now ---
@@ -62,9 +67,19 @@ class SpyderKernel(IPythonKernel):
         super(SpyderKernel, self).__init__(*args, **kwargs)
 
         self.namespace_view_settings = {}
+        self._value_views = {}
+        self._var_properties = VarPropertiesCache(
+            self._get_var_property_getters())
+        self._namespace_ids = {}
         self._pdb_obj = None
         self._pdb_step = None
 
+        # Only user executions, not the silent ones used to get the
+        # namespace view and variable properties
+        self.shell.events.register('pre_run_cell', self._save_namespace_ids)
+        self.shell.events.register('post_run_cell',
+                                   self._invalidate_var_properties)
+
     @property
     def _pdb_frame(self):
         """Return current Pdb frame if there is any"""
@@ -114,22 +129,7 @@ class SpyderKernel(IPythonKernel):
             ns = self._get_current_namespace()
             data = get_remote_data(ns, settings, mode='editable',
                                    more_excluded_names=EXCLUDED_NAMES)
-
-            properties = {}
-            for name, value in list(data.items()):
-                properties[name] = {
-                    'is_list':  isinstance(value, (tuple, list)),
-                    'is_dict':  isinstance(value, dict),
-                    'len': self._get_len(value),
-                    'is_array': self._is_array(value),
-                    'is_image': self._is_image(value),
-                    'is_data_frame': self._is_data_frame(value),
-                    'is_series': self._is_series(value),
-                    'array_shape': self._get_array_shape(value),
-                    'array_ndim': self._get_array_ndim(value)
-                }
-
-            return properties
+            return self._var_properties.get_namespace_properties(data)
         else:
             return {}
 
@@ -146,16 +146,66 @@ class SpyderKernel(IPythonKernel):
         if isinstance(value, CannedObject):
             value = value.get_object()
         ns[name] = value
+        self._var_properties.forget(name)
 
     def remove_value(self, name):
         """Remove a variable"""
         ns = self._get_reference_namespace(name)
         ns.pop(name)
+        self._var_properties.forget(name)
 
     def copy_value(self, orig_name, new_name):
         """Copy a variable"""
         ns = self._get_reference_namespace(orig_name)
         ns[new_name] = ns[orig_name]
+        self._var_properties.forget(new_name)
+
+    # --- For editing arrays and DataFrames by windows
+    def get_value_info(self, name):
+        """Get the information needed to edit a variable by windows"""
+        ns = self._get_current_namespace()
+        publish_data({'__spy_data__': get_value_info(ns[name])})
+
+    def get_value_window(self, name, rows, cols):
+        """Get a window of rows and columns of a variable"""
+        ns = self._get_current_namespace()
+        value = ns[name]
+        permutation = self._value_views.get(name)
+        if permutation is not None and len(permutation) != len(value):
+            # The variable was changed since it was sorted
+            self._value_views.pop(name)
+            permutation = None
+        window = get_value_window(value, rows, cols, permutation=permutation)
+        publish_data({'__spy_data__': window})
+
+    def sort_value_view(self, name, column, ascending):
+        """
+        Sort the rows seen through windows of a variable, without
+        modifying it. Return an error message if that's not possible, an
+        empty string otherwise.
+        """
+        ns = self._get_current_namespace()
+        value = ns[name]
+        if self._is_array(value):
+            return "Arrays can't be sorted"
+        try:
+            self._value_views[name] = sort_permutation(
+                value, column, ascending=ascending,
+                permutation=self._value_views.get(name))
+        except TypeError as error:
+            return str(error)
+        return ''
+
+    def set_value_items(self, name, items):
+        """Set items of a variable given in window coordinates"""
+        ns = self._get_reference_namespace(name)
+        items = deserialize_object(items)[0]
+        set_value_items(ns[name], items,
+                        permutation=self._value_views.get(name))
+
+    def close_value_view(self, name):
+        """Free the data used to edit a variable by windows"""
+        self._value_views.pop(name, None)
 
     def load_data(self, filename, ext):
         """Load data from filename"""
@@ -192,6 +242,22 @@ class SpyderKernel(IPythonKernel):
         """Return info about pdb current frame"""
         return self._pdb_step
 
+    def set_breakpoints(self, changes):
+        """
+        Set the breakpoints of the files of *changes*, a dict of their
+        (line number, condition) lists, set in Spyder's Editor
+
+        They're used by the current Pdb session, if any, and by the next
+        ones.
+        """
+        import pdb
+        if not hasattr(pdb.Pdb, 'update_spyder_breakpoints'):
+            # Spyder's sitecustomize wasn't loaded
+            return
+        pdb.Pdb.update_spyder_breakpoints(changes)
+        if self._pdb_obj is not None:
+            self._pdb_obj.set_spyder_breakpoints(list(changes.keys()))
+
     # --- For the Help plugin
     def is_defined(self, obj, force_import=False):
         """Return True if object is defined in current namespace"""
@@ -214,6 +280,31 @@ class SpyderKernel(IPythonKernel):
         """Set current working directory."""
         return os.chdir(dirname)
 
+    # --- For the Profiler
+    def profile_code(self, code, filename='<profiled code>'):
+        """
+        Run code in the current namespace with cProfile and publish the
+        collected stats, in the format saved by pstats
+
+        The code can use IPython syntax (e.g. magics). If it raises an
+        exception, its traceback is shown in the console and the stats
+        collected until then are published anyway.
+        """
+        import cProfile
+        import pstats
+
+        code = self.shell.input_transformer_manager.transform_cell(code)
+        glbs = self._mglobals()
+        profiler = cProfile.Profile()
+        error = False
+        try:
+            profiler.runctx(compile(code, filename, 'exec'), glbs, glbs)
+        except BaseException:
+            self.shell.showtraceback()
+            error = True
+        stats = pstats.Stats(profiler).stats
+        publish_data({'__spy_profile__': {'stats': stats, 'error': error}})
+
     # -- Private API ---------------------------------------------------
     # --- For the Variable Explorer
     def _get_current_namespace(self, with_magics=False):
@@ -265,6 +356,31 @@ class SpyderKernel(IPythonKernel):
         else:
             return self.shell.user_ns
 
+    def _get_var_property_getters(self):
+        """Return the functions computing each property of a variable"""
+        return {
+            'is_list': lambda value: isinstance(value, (tuple, list)),
+            'is_dict': lambda value: isinstance(value, dict),
+            'len': self._get_len,
+            'is_array': self._is_array,
+            'is_image': self._is_image,
+            'is_data_frame': self._is_data_frame,
+            'is_series': self._is_series,
+            'array_shape': self._get_array_shape,
+            'array_ndim': self._get_array_ndim
+        }
+
+    def _save_namespace_ids(self, *args):
+        """Save the variables bound before an execution"""
+        self._namespace_ids = get_namespace_ids(
+            self._get_current_namespace())
+
+    def _invalidate_var_properties(self, *args):
+        """Forget the properties of variables rebound by an execution"""
+        self._var_properties.invalidate(self._get_current_namespace(),
+                                        self._namespace_ids)
+        self._namespace_ids = {}
+
     def _get_len(self, var):
         """Return sequence length"""
         try:
@@ -273,7 +389,11 @@ class SpyderKernel(IPythonKernel):
             return None
 
     def _is_array(self, var):
-        """Return True if variable is a NumPy array"""
+        """Return True if variable is a NumPy array or a lazy array"""
+        if is_lazy_array(var):
+            return True
+        if 'numpy' not in sys.modules:
+            return False
         try:
             import numpy
             return isinstance(var, numpy.ndarray)
@@ -282,6 +402,9 @@ class SpyderKernel(IPythonKernel):
 
     def _is_image(self, var):
         """Return True if variable is a PIL.Image image"""
+        # No variable can be an image if PIL.Image wasn't imported yet
+        if 'PIL.Image' not in sys.modules:
+            return False
         try:
             from PIL import Image
             return isinstance(var, Image.Image)
@@ -290,6 +413,8 @@ class SpyderKernel(IPythonKernel):
 
     def _is_data_frame(self, var):
         """Return True if variable is a DataFrame"""
+        if 'pandas' not in sys.modules:
+            return False
         try:
             from pandas import DataFrame
             return isinstance(var, DataFrame)
@@ -298,6 +423,8 @@ class SpyderKernel(IPythonKernel):
 
     def _is_series(self, var):
         """Return True if variable is a Series"""
+        if 'pandas' not in sys.modules:
+            return False
         try:
             from pandas import Series
             return isinstance(var, Series)
@@ -512,27 +512,62 @@ except (ImportError, AttributeError):
 #==============================================================================
 class SpyderPdb(pdb.Pdb):
     send_initial_notification = True
+    # Breakpoints set in Spyder's Editor, by file, sent by Spyder through
+    # update_spyder_breakpoints
+    spyder_breakpoints = {}
+    # File storing them, read when a session starts in external consoles
+    spyder_breakpoints_file = os.environ.get('SPYDER_BREAKPOINTS_FILE')
+
+    @classmethod
+    def load_spyder_breakpoints(cls):
+        """Read the Spyder breakpoints from the file storing them"""
+        from spyder.utils.breakpoints import load_breakpoints_file
+        if cls.spyder_breakpoints_file:
+            cls.spyder_breakpoints = load_breakpoints_file(
+                                                cls.spyder_breakpoints_file)
+        else:
+            cls.spyder_breakpoints = {}
+
+    @classmethod
+    def update_spyder_breakpoints(cls, changes):
+        """
+        Update the Spyder breakpoints of the files of *changes*, a dict of
+        their (line number, condition) lists
+        """
+        for fname, data in changes.items():
+            if data:
+                cls.spyder_breakpoints[fname] = data
+            else:
+                cls.spyder_breakpoints.pop(fname, None)
 
-    def set_spyder_breakpoints(self):
-        self.clear_all_breaks()
-        #------Really deleting all breakpoints:
-        for bp in bdb.Breakpoint.bpbynumber:
-            if bp:
-                bp.deleteMe()
-        bdb.Breakpoint.next = 1
-        bdb.Breakpoint.bplist = {}
-        bdb.Breakpoint.bpbynumber = [None]
-        #------
-        from spyder.config.main import CONF
-        CONF.load_from_ini()
-        if CONF.get('run', 'breakpoints/enabled', True):
-            breakpoints = CONF.get('run', 'breakpoints', {})
-            i = 0
-            for fname, data in list(breakpoints.items()):
-                for linenumber, condition in data:
-                    i += 1
-                    self.set_break(self.canonic(fname), linenumber,
-                                   cond=condition)
+    def set_spyder_breakpoints(self, fnames=None):
+        """
+        Set the Spyder breakpoints of files *fnames*, replacing their
+        breakpoints, or of all files (replacing all breakpoints)
+        """
+        if fnames is None:
+            self.clear_all_breaks()
+            #------Really deleting all breakpoints:
+            for bp in bdb.Breakpoint.bpbynumber:
+                if bp:
+                    bp.deleteMe()
+            bdb.Breakpoint.next = 1
+            bdb.Breakpoint.bplist = {}
+            bdb.Breakpoint.bpbynumber = [None]
+            #------
+            if not IS_IPYKERNEL:
+                # The breakpoints sent through the monitor may not have
+                # arrived yet when the session starts
+                self.load_spyder_breakpoints()
+            fnames = list(self.spyder_breakpoints.keys())
+        else:
+            for fname in fnames:
+                self.clear_all_file_breaks(self.canonic(fname))
+        for fname in fnames:
+            for linenumber, condition in self.spyder_breakpoints.get(fname,
+                                                                     []):
+                self.set_break(self.canonic(fname), linenumber,
+                               cond=condition)
 
     def notify_spyder(self, frame):
         if not frame:
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for breakpoints.py"""
+
+import os.path as osp
+
+from spyder.utils.breakpoints import (BreakpointStore, get_breakpoints_path,
+                                      load_breakpoints_file,
+                                      normalize_breakpoints)
+
+
+def test_normalize_breakpoints():
+    assert normalize_breakpoints([3, [5, 'x > 1']]) == [(3, None),
+                                                        (5, 'x > 1')]
+
+
+def test_get_breakpoints_path(tmpdir):
+    path = get_breakpoints_path(tmpdir.strpath)
+    assert path == osp.join(tmpdir.strpath, '.spyproject', 'breakpoints.json')
+
+
+def test_store_flush(tmpdir):
+    path = tmpdir.join('breakpoints.json').strpath
+    store = BreakpointStore(path)
+    store.set_breakpoints('a.py', [(1, None), (4, 'i == 2')])
+    assert not osp.isfile(path)
+    store.flush()
+    assert load_breakpoints_file(path) == {'a.py': [(1, None), (4, 'i == 2')]}
+    store = BreakpointStore(path)
+    assert store.get_breakpoints('a.py') == [(1, None), (4, 'i == 2')]
+    assert not store.modified
+
+
+def test_store_get_changes(tmpdir):
+    store = BreakpointStore(tmpdir.join('breakpoints.json').strpath)
+    store.set_breakpoints('a.py', [(1, None)])
+    store.set_breakpoints('b.py', [(2, None)])
+    revision, changes = store.get_changes()
+    assert changes == {'a.py': [(1, None)], 'b.py': [(2, None)]}
+
+    # Setting the same breakpoints again is not a change
+    store.set_breakpoints('a.py', [(1, None)])
+    assert store.get_changes(revision) == (revision, {})
+
+    store.clear_breakpoint('a.py', 1)
+    store.set_breakpoints('b.py', [(2, None), (3, None)])
+    revision, changes = store.get_changes(revision)
+    assert changes == {'a.py': [], 'b.py': [(2, None), (3, None)]}
+
+    # Files without breakpoints are only listed after they changed
+    assert store.get_changes()[1] == {'b.py': [(2, None), (3, None)]}
+
+    store.clear_all_breakpoints()
+    assert store.get_changes(revision)[1] == {'b.py': []}
+
+
+def test_store_load(tmpdir):
+    store = BreakpointStore(tmpdir.join('first.json').strpath)
+    store.set_breakpoints('a.py', [(1, None)])
+    store.set_breakpoints('b.py', [(2, None)])
+    revision = store.revision
+    other = BreakpointStore(tmpdir.join('second.json').strpath)
+    other.set_breakpoints('b.py', [(2, None)])
+    other.set_breakpoints('c.py', [(3, None)])
+    other.flush()
+
+    store.load(other.path)
+    assert osp.isfile(tmpdir.join('first.json').strpath)
+    assert store.get_changes(revision)[1] == {'a.py': [], 'c.py': [(3, None)]}
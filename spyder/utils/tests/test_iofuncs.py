@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Tests for iofuncs.py"""
+
+import os
+import tarfile
+
+import numpy as np
+import pytest
+
+from spyder.py3compat import pickle
+from spyder.utils import iofuncs
+from spyder.utils.iofuncs import load_dictionary, save_dictionary
+
+
+@pytest.fixture
+def spydata(tmpdir):
+    return str(tmpdir.join('data.spydata'))
+
+
+def test_spydata_roundtrip(spydata):
+    arr = np.arange(12.).reshape(3, 4)
+    farr = np.asfortranarray(arr)
+    data = {'a': 1, 'arr': arr, 'farr': farr, 'empty': np.array([]),
+            'objs': np.array([None, 1], dtype=object),
+            'lst': [arr, 'x', arr + 1], 'dct': {'k': arr, 'v': 2}}
+    cwd = os.getcwd()
+    assert save_dictionary(data, spydata) is None
+    assert os.getcwd() == cwd
+    # The saved data is left untouched
+    assert len(data['lst']) == 3 and 'k' in data['dct']
+    loaded, error = load_dictionary(spydata)
+    assert error is None
+    assert os.getcwd() == cwd
+    assert os.listdir(os.path.dirname(spydata)) == ['data.spydata']
+    assert loaded['a'] == 1
+    assert np.array_equal(loaded['arr'], arr)
+    assert np.array_equal(loaded['farr'], arr)
+    assert loaded['empty'].size == 0
+    assert loaded['objs'].tolist() == [None, 1]
+    assert loaded['lst'][1] == 'x'
+    assert np.array_equal(loaded['lst'][0], arr)
+    assert np.array_equal(loaded['lst'][2], arr + 1)
+    assert np.array_equal(loaded['dct']['k'], arr)
+    assert loaded['dct']['v'] == 2
+
+
+def test_spydata_big_arrays_are_mapped(spydata, monkeypatch):
+    monkeypatch.setattr(iofuncs, 'SPYDATA_MMAP_MIN_SIZE', 1000)
+    arr = np.random.rand(200, 30)
+    save_dictionary({'arr': arr, 'small': np.ones(3)}, spydata)
+    loaded, error = load_dictionary(spydata)
+    assert isinstance(loaded['arr'], np.memmap)
+    assert not isinstance(loaded['small'], np.memmap)
+    assert loaded['arr'].offset % 64 == 0
+    assert np.array_equal(loaded['arr'], arr)
+
+    # Changing the array doesn't change the file
+    loaded['arr'][0, 0] = -1
+    assert load_dictionary(spydata)[0]['arr'][0, 0] == arr[0, 0]
+
+    # Saving mapped arrays to the file they come from
+    loaded['b'] = 2
+    assert save_dictionary(loaded, spydata) is None
+    reloaded, error = load_dictionary(spydata)
+    assert reloaded['b'] == 2
+    assert reloaded['arr'][0, 0] == -1
+    assert np.array_equal(reloaded['arr'][1:], arr[1:])
+
+
+def test_spydata_old_format(tmpdir):
+    """Files saved by previous versions, through temporary files"""
+    arr = np.arange(5)
+    data = {'b': [1, 2], '__saved_arrays__': {('a', None): 'old_0000.npy',
+                                              ('b', 0): 'old_0001.npy',
+                                              ('b', 2): 'old_0002.npy'}}
+    with open(str(tmpdir.join('old.pickle')), 'wb') as fdesc:
+        pickle.dump(data, fdesc, 2)
+    np.save(str(tmpdir.join('old_0000.npy')), arr)
+    np.save(str(tmpdir.join('old_0001.npy')), arr + 1)
+    np.save(str(tmpdir.join('old_0002.npy')), arr + 2)
+    # The file was renamed after being saved
+    filename = str(tmpdir.join('renamed.spydata'))
+    with tarfile.open(filename, 'w') as tar:
+        for name in ['old.pickle', 'old_0000.npy', 'old_0001.npy',
+                     'old_0002.npy']:
+            tar.add(str(tmpdir.join(name)), arcname=name)
+    loaded, error = load_dictionary(filename)
+    assert error is None
+    assert np.array_equal(loaded['a'], arr)
+    assert np.array_equal(loaded['b'][0], arr + 1)
+    assert loaded['b'][1] == 1
+    assert np.array_equal(loaded['b'][2], arr + 2)
+    assert loaded['b'][3] == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for timing.py"""
+
+import io
+import json
+import sys
+
+import pytest
+
+from spyder.py3compat import builtins
+from spyder.utils import timing
+
+
+@pytest.fixture
+def stopped_timing(monkeypatch):
+    """Make sure the startup isn't being timed"""
+    monkeypatch.setattr(timing, 'STARTUP_TIMER', None)
+    monkeypatch.setattr(timing, 'TRACE_FILENAME', None)
+    monkeypatch.setattr(timing, 'PRINT_REPORT', False)
+
+
+def test_timer_section_and_accumulate():
+    timer = timing.StartupTimer()
+    with timer.section("setup"):
+        pass
+    for i in range(3):
+        with timer.accumulate("icons"):
+            pass
+    timer.mark("window shown")
+    assert [name for name, _start, _elapsed in timer.sections] == ["setup"]
+    assert timer.totals["icons"][0] == 3
+    assert [name for name, _time in timer.marks] == ["window shown"]
+    report = timer.report()
+    assert "setup" in report
+    assert "icons (3 calls)" in report
+
+
+def test_timer_section_error():
+    timer = timing.StartupTimer()
+    with pytest.raises(ValueError):
+        with timer.section("failing"):
+            raise ValueError
+    assert timer.sections[0][0] == "failing"
+
+
+def test_timer_imports(tmpdir, monkeypatch):
+    tmpdir.join('timing_test_module.py').write('import json\nVALUE = 1\n')
+    monkeypatch.syspath_prepend(tmpdir.strpath)
+    monkeypatch.delitem(sys.modules, 'timing_test_module', raising=False)
+    original_import = builtins.__import__
+    timer = timing.StartupTimer()
+    timer.install()
+    try:
+        import timing_test_module  # analysis:ignore
+    finally:
+        timer.uninstall()
+    assert builtins.__import__ is original_import
+    # Only imports loading new modules are recorded
+    assert [name for name, _self, _total in timer.imports] == [
+        'timing_test_module']
+    name, self_time, total = timer.imports[0]
+    assert 0 <= self_time <= total
+
+
+def test_get_trace():
+    timer = timing.StartupTimer()
+    with timer.section("setup"):
+        pass
+    trace = timer.get_trace()
+    assert trace['version'] == timing.TRACE_VERSION
+    assert [section['name'] for section in trace['sections']] == ["setup"]
+    assert trace['imports'] == []
+
+
+def test_start_stop(tmpdir, capsys, stopped_timing):
+    filename = tmpdir.join('trace.json').strpath
+    timer = timing.start(report=True, trace_filename=filename)
+    assert timing.start() is timer
+    with timing.section("setup"):
+        timing.mark("setup started")
+
+    @timing.timed("decorated")
+    def decorated(value):
+        return value + 1
+
+    assert decorated(1) == 2
+    assert timing.stop() is timer
+    assert timing.STARTUP_TIMER is None
+    assert "Startup time" in capsys.readouterr().out
+    with io.open(filename, encoding='utf-8') as fdesc:
+        trace = json.load(fdesc)
+    assert ([section['name'] for section in trace['sections']] ==
+            ["setup", "decorated"])
+    assert [mark['name'] for mark in trace['marks']] == ["setup started"]
+
+
+def test_not_started(stopped_timing):
+    @timing.timed("icons", accumulate=True)
+    def decorated():
+        return 1
+
+    with timing.section("setup"):
+        timing.mark("setup started")
+    assert decorated() == 1
+    assert timing.stop() is None
+
+
+if __name__ == "__main__":
+    pytest.main()
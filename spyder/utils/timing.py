@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Startup timing: time spent importing modules, loading the configuration,
+creating icons and setting up the main window and its plugins
+
+Started with the --startup-timing and --startup-trace command line options.
+All the functions of this module do nothing if the startup isn't timed.
+"""
+
+from __future__ import print_function
+
+# Standard library imports
+from contextlib import contextmanager
+import functools
+import io
+import json
+import sys
+import time
+
+# Local imports
+from spyder.py3compat import builtins, to_text_string
+
+
+# Version of the trace files format
+TRACE_VERSION = 1
+
+
+class StartupTimer(object):
+    """
+    Record the time spent importing each module, through a wrapper around
+    __import__, in named sections of code, in code run many times (e.g.
+    icon creation) and the moments where phases of the startup begin
+    """
+
+    def __init__(self):
+        self.start_time = time.time()
+        self.imports = []
+        self.sections = []
+        self.totals = {}
+        self.marks = []
+        self._import = None
+        self._children = []
+
+    def install(self):
+        """Start recording imports"""
+        if self._import is None:
+            self._import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        """Stop recording imports"""
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(),
+                      level=0):
+        if level == 0 and name in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+        modules = len(sys.modules)
+        self._children.append(0.)
+        start = time.time()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.time() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            # Only imports loading new modules are worth reporting
+            if len(sys.modules) > modules:
+                if level > 0 and globals is not None:
+                    package = globals.get('__package__') or ''
+                    name = '.'.join([package, name]).rstrip('.')
+                self.imports.append((name, elapsed - children, elapsed))
+
+    @contextmanager
+    def section(self, name):
+        """Record the time spent in a with block"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.sections.append((name, start - self.start_time,
+                                  time.time() - start))
+
+    @contextmanager
+    def accumulate(self, name):
+        """Add the time spent in a with block to the total of *name*"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            count, elapsed = self.totals.get(name, (0, 0.))
+            self.totals[name] = (count + 1, elapsed + time.time() - start)
+
+    def mark(self, name):
+        """Record the moment a startup phase begins"""
+        self.marks.append((name, time.time() - self.start_time))
+
+    def get_trace(self):
+        """Return the recorded times as a dictionary, with times in s"""
+        return {
+            'version': TRACE_VERSION,
+            'python': sys.version.split()[0],
+            'total': time.time() - self.start_time,
+            'imports': [{'name': name, 'self': self_time, 'cumulative': total}
+                        for name, self_time, total in self.imports],
+            'sections': [{'name': name, 'start': start, 'duration': elapsed}
+                         for name, start, elapsed in self.sections],
+            'totals': [{'name': name, 'count': count, 'duration': elapsed}
+                       for name, (count, elapsed)
+                       in sorted(self.totals.items())],
+            'marks': [{'name': name, 'time': moment}
+                      for name, moment in self.marks],
+        }
+
+    def save_trace(self, filename):
+        """Save the recorded times to *filename* in JSON format"""
+        text = to_text_string(json.dumps(self.get_trace(), indent=1))
+        with io.open(filename, 'w', encoding='utf-8') as fdesc:
+            fdesc.write(text)
+
+    def report(self, count=25):
+        """Return a text report of the slowest imports and the sections"""
+        lines = ["Startup time: %.3f s" % (time.time() - self.start_time),
+                 "", "Slowest imports (self / cumulative, in ms):"]
+        imports = sorted(self.imports, key=lambda item: item[1],
+                         reverse=True)
+        for name, self_time, total in imports[:count]:
+            lines.append("  %8.1f %8.1f  %s" % (1000 * self_time,
+                                                1000 * total, name))
+        lines.append("  %d modules imported in %.3f s" % (
+            len(self.imports), sum(item[1] for item in self.imports)))
+        lines += ["", "Sections (in ms):"]
+        for name, _start, elapsed in self.sections:
+            lines.append("  %8.1f  %s" % (1000 * elapsed, name))
+        if self.totals:
+            lines += ["", "Totals (in ms):"]
+            for name, (calls, elapsed) in sorted(self.totals.items()):
+                lines.append("  %8.1f  %s (%d calls)" % (1000 * elapsed,
+                                                         name, calls))
+        return '\n'.join(lines)
+
+
+STARTUP_TIMER = None
+TRACE_FILENAME = None
+PRINT_REPORT = False
+
+
+def start(report=True, trace_filename=None):
+    """
+    Start timing Spyder's startup
+
+    When stopped, a report is printed if *report* is True and the trace
+    is saved to *trace_filename* if given.
+    """
+    global STARTUP_TIMER, TRACE_FILENAME, PRINT_REPORT
+    if STARTUP_TIMER is None:
+        STARTUP_TIMER = StartupTimer()
+        STARTUP_TIMER.install()
+    PRINT_REPORT = PRINT_REPORT or report
+    TRACE_FILENAME = trace_filename or TRACE_FILENAME
+    return STARTUP_TIMER
+
+
+def stop(stream=None):
+    """Stop timing Spyder's startup, print the report and save the trace"""
+    global STARTUP_TIMER
+    if STARTUP_TIMER is None:
+        return
+    timer, STARTUP_TIMER = STARTUP_TIMER, None
+    timer.uninstall()
+    if PRINT_REPORT:
+        print(timer.report(), file=stream or sys.stdout)
+    if TRACE_FILENAME:
+        timer.save_trace(TRACE_FILENAME)
+    return timer
+
+
+@contextmanager
+def section(name):
+    """Time a section of the startup"""
+    if STARTUP_TIMER is None:
+        yield
+    else:
+        with STARTUP_TIMER.section(name):
+            yield
+
+
+def mark(name):
+    """Record the moment a phase of the startup begins"""
+    if STARTUP_TIMER is not None:
+        STARTUP_TIMER.mark(name)
+
+
+def timed(name, accumulate=False):
+    """
+    Decorator timing calls of a function during the startup
+
+    With *accumulate*, calls only add to the total time of *name*, which
+    is meant for functions called many times.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if STARTUP_TIMER is None:
+                return func(*args, **kwargs)
+            if accumulate:
+                context = STARTUP_TIMER.accumulate(name)
+            else:
+                context = STARTUP_TIMER.section(name)
+            with context:
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -20,6 +20,7 @@ from spyder.config.base import get_conf_path, DEBUG
 from spyder.utils.debug import log_last_error
 from spyder.utils.bsdsocket import read_packet, write_packet
 from spyder.utils.misc import select_port
+from spyder.widgets.variableexplorer.utils import unpack_remote_view
 
 
 LOG_FILENAME = get_conf_path('introspection.log')
@@ -148,11 +149,23 @@ class NotificationThread(QThread):
     def __init__(self):
         QThread.__init__(self)
         self.notify_socket = None
+        self.remote_view = {}
         
     def set_notify_socket(self, notify_socket):
         """Set the notification socket"""
         self.notify_socket = notify_socket
         
+    def update_remote_view(self, data):
+        """Update remote view with packed *data* and return a copy of it"""
+        view, removed, full = unpack_remote_view(data)
+        if full:
+            self.remote_view = view
+        else:
+            for name in removed:
+                self.remote_view.pop(name, None)
+            self.remote_view.update(view)
+        return self.remote_view.copy()
+
     def run(self):
         """Start notification thread"""
         while True:
@@ -185,7 +198,8 @@ class NotificationThread(QThread):
                 elif command == 'refresh':
                     self.refresh_namespace_browser.emit()
                 elif command == 'remote_view':
-                    self.sig_process_remote_view.emit(data)
+                    self.sig_process_remote_view.emit(
+                                            self.update_remote_view(data))
                 elif command == 'open_file':
                     fname, lineno = data
                     self.open_file.emit(fname, lineno)
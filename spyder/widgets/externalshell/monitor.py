@@ -26,11 +26,17 @@ from spyder.utils.dochelpers import (getargtxt, getdoc, getsource,
 from spyder.utils.bsdsocket import (communicate, read_packet, write_packet,
                                     PACKET_NOT_RECEIVED, PICKLE_HIGHEST_PROTOCOL)
 from spyder.utils.introspection.module_completion import module_completion
-from spyder.widgets.variableexplorer.utils import (get_remote_data,
-                                                   make_remote_view)
+from spyder.widgets.variableexplorer.utils import (diff_remote_view,
+                                                   get_remote_data,
+                                                   make_remote_view,
+                                                   pack_remote_view)
 
 
 LOG_FILENAME = get_conf_path('monitor.log')
+
+# The refresh timeout is doubled each time the remote view didn't change,
+# up to this factor
+MAX_TIMEOUT_FACTOR = 32
 DEBUG_MONITOR = DEBUG >= 2
 if DEBUG_MONITOR:
     import logging
@@ -80,10 +86,12 @@ class Monitor(threading.Thread):
         self.pdb_obj = None
         
         self.timeout = None
+        self.timeout_factor = 1
         self.set_timeout(timeout)
         self.auto_refresh = auto_refresh
         self.refresh_after_eval = False
         self.remote_view_settings = None
+        self.remote_view = None
         
         self.inputhook_flag = False
         self.first_inputhook_call = True
@@ -217,6 +225,7 @@ class Monitor(threading.Thread):
     def set_timeout(self, timeout):
         """Set monitor timeout (in milliseconds!)"""
         self.timeout = float(timeout)/1000.
+        self.timeout_factor = 1
         
     def set_auto_refresh(self, state):
         """Enable/disable namespace browser auto refresh feature"""
@@ -249,10 +258,21 @@ class Monitor(threading.Thread):
                     dict(command="pdb_step", data=(fname, lineno)))
 
     def set_spyder_breakpoints(self):
-        """Set all Spyder breakpoints in active pdb session"""
+        """
+        Set the file storing the Spyder breakpoints, read by the next pdb
+        sessions, and the breakpoints of the files sent in the active one
+        """
+        import pdb
+        path = read_packet(self.i_request)
+        changes = read_packet(self.i_request)
+        if not hasattr(pdb.Pdb, 'update_spyder_breakpoints'):
+            # Spyder's sitecustomize wasn't loaded
+            return
+        pdb.Pdb.spyder_breakpoints_file = path
+        pdb.Pdb.update_spyder_breakpoints(changes)
         if not self.pdb_obj:
             return
-        self.pdb_obj.set_spyder_breakpoints()    
+        self.pdb_obj.set_spyder_breakpoints(list(changes.keys()))
     
     def notify_open_file(self, fname, lineno=1):
         """Open file in Spyder's editor"""
@@ -367,18 +387,37 @@ class Monitor(threading.Thread):
         (see the namespace browser widget)
         """
         self.remote_view_settings = read_packet(self.i_request)
+        self.remote_view = None
         self.enable_refresh_after_eval()
         
-    def update_remote_view(self):
+    def update_remote_view(self, only_changes=False):
         """
-        Return remote view of globals()
+        Send remote view of globals()
+
+        Only the variables changed since the last update are sent. If
+        *only_changes* is True, nothing is sent when nothing changed.
+
+        Return True if the remote view changed.
         """
         settings = self.remote_view_settings
         if settings:
             ns = self.get_current_namespace()
             remote_view = make_remote_view(ns, settings)
+            if self.remote_view is None:
+                data = pack_remote_view(remote_view)
+                changed = True
+            else:
+                view, removed = diff_remote_view(self.remote_view,
+                                                 remote_view)
+                changed = bool(view or removed)
+                if only_changes and not changed:
+                    return False
+                data = pack_remote_view(view, removed, full=False)
+            self.remote_view = remote_view
             communicate(self.n_request,
-                        dict(command="remote_view", data=remote_view))
+                        dict(command="remote_view", data=data))
+            return changed
+        return False
         
     def saveglobals(self):
         """Save globals() into filename"""
@@ -449,7 +488,10 @@ class Monitor(threading.Thread):
                     logging.debug("****** Introspection request /Begin ******")
                 command = PACKET_NOT_RECEIVED
                 try:
-                    timeout = self.timeout if self.auto_refresh else None
+                    if self.auto_refresh:
+                        timeout = self.timeout * self.timeout_factor
+                    else:
+                        timeout = None
                     command = read_packet(self.i_request, timeout=timeout)
                     if command is None:
                         continue
@@ -464,10 +506,16 @@ class Monitor(threading.Thread):
                 if timed_out:
                     if DEBUG_MONITOR:
                         logging.debug("connection timed out -> updating remote view")
-                    self.update_remote_view()
+                    # Poll less and less often while nothing changes
+                    if self.update_remote_view(only_changes=True):
+                        self.timeout_factor = 1
+                    else:
+                        self.timeout_factor = min(2 * self.timeout_factor,
+                                                  MAX_TIMEOUT_FACTOR)
                     if DEBUG_MONITOR:
                         logging.debug("****** Introspection request /End ******")
                     continue
+                self.timeout_factor = 1
                 if DEBUG_MONITOR:
                     logging.debug("command: %r" % command)
                 lcls = self.mlocals()
@@ -151,9 +151,13 @@ class ExtPythonShellWidget(PythonShellWidget):
         """Return sys.path[:]"""
         return self.ask_monitor("getsyspath()")
 
-    def set_spyder_breakpoints(self):
-        """Set Spyder breakpoints into debugging session"""
-        return self.ask_monitor("set_spyder_breakpoints()")
+    def set_spyder_breakpoints(self, path, changes):
+        """
+        Set the file *path* storing the Spyder breakpoints and the ones of
+        the files of *changes* into the debugging session, if any
+        """
+        return self.ask_monitor("set_spyder_breakpoints()",
+                                settings=[path, changes])
 
     def is_running(self):
         """Check if parent is running"""
@@ -167,6 +171,7 @@ class ExternalPythonShell(ExternalShellBase):
     open_file = Signal(str, int)
     started = Signal()
     sig_finished = Signal()
+    sig_monitor_ready = Signal()
 
     def __init__(self, parent=None, fname=None, wdir=None,
                  interact=False, debug=False, post_mortem=False,
@@ -240,6 +245,11 @@ class ExternalPythonShell(ExternalShellBase):
         
         self.introspection_socket = None
         self.is_interpreter = fname is None
+
+        # File storing the Editor breakpoints and revision of the ones
+        # set in the process
+        self.breakpoints_file = None
+        self.breakpoints_revision = 0
         
         if self.is_interpreter:
             self.terminate_button.hide()
@@ -256,6 +266,7 @@ class ExternalPythonShell(ExternalShellBase):
             settings = self.namespacebrowser.get_view_settings()
             communicate(introspection_socket,
                         'set_remote_view_settings()', settings=[settings])
+        self.sig_monitor_ready.emit()
         
     def set_autorefresh_timeout(self, interval):
         if self.introspection_socket is not None:
@@ -429,6 +440,8 @@ class ExternalPythonShell(ExternalShellBase):
         # See http://stackoverflow.com/q/26312400/438386, specifically
         # the comments of Martijn Pieters
         env.append('PYTHONIOENCODING=UTF-8')
+        if self.breakpoints_file:
+            env.append('SPYDER_BREAKPOINTS_FILE=%s' % self.breakpoints_file)
 
         # Monitor
         if self.monitor_enabled:
@@ -541,6 +554,7 @@ class ExternalPythonShell(ExternalShellBase):
         """Reimplement ExternalShellBase method"""
         ExternalShellBase.finished(self, exit_code, exit_status)
         self.introspection_socket = None
+        self.breakpoints_revision = 0
 
     
 #==============================================================================
@@ -30,6 +30,7 @@ from qtpy.QtWidgets import (QHBoxLayout, QMenu, QMessageBox, QToolButton,
 from spyder.config.base import (_, get_conf_path, get_image_path,
                                 get_module_source_path)
 from spyder.config.gui import get_font, get_shortcut
+from spyder.config.main import CONF
 from spyder.utils import icon_manager as ima
 from spyder.utils import sourcecode
 from spyder.utils.programs import TEMPDIR
@@ -333,6 +334,8 @@ class ClientWidget(QWidget, SaveHistoryMixin):
                 if self.infowidget.isVisible():
                     self.infowidget.hide()
                     sw.show()
+                # The new kernel reads its options from spyder.ini
+                CONF.flush()
                 try:
                     sw.kernel_manager.restart_kernel()
                 except RuntimeError as e:
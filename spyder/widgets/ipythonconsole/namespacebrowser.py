@@ -12,7 +12,7 @@ the Variable Explorer
 from qtpy.QtCore import QEventLoop
 
 from ipykernel.pickleutil import CannedObject
-from ipykernel.serialize import deserialize_object
+from ipykernel.serialize import deserialize_object, serialize_object
 from qtconsole.rich_jupyter_widget import RichJupyterWidget
 
 from spyder.config.base import _
@@ -68,30 +68,55 @@ class NamepaceBrowserWidget(RichJupyterWidget):
 
     def get_value(self, name):
         """Ask kernel for a value"""
-        # Don't ask for values while reading (ipdb) is active
-        if self._reading:
-            raise ValueError(_("Inspecting and setting values while debugging "
-                               "in IPython consoles is not supported yet by "
-                               "Spyder."))
-
-        # Wait until the kernel returns the value
+        return self._get_kernel_value(
+            "get_ipython().kernel.get_value('%s')" % name)
+
+    def get_value_info(self, name):
+        """Ask kernel for the information needed to edit a value by windows"""
+        return self._get_kernel_value(
+            "get_ipython().kernel.get_value_info('%s')" % name)
+
+    def get_value_window(self, name, rows, cols):
+        """Ask kernel for a window of rows and columns of a value"""
+        value = self._get_kernel_value(
+            "get_ipython().kernel.get_value_window('%s', %r, %r)" %
+            (name, tuple(rows), tuple(cols)))
+        # Don't keep a reference to the window to save memory
+        self._kernel_value = None
+        return value
+
+    def sort_value_view(self, name, column, ascending):
+        """
+        Sort the rows of a value seen by windows. Return an error message
+        if that's not possible.
+        """
         wait_loop = QEventLoop()
         self.sig_got_reply.connect(wait_loop.quit)
-        self.silent_execute("get_ipython().kernel.get_value('%s')" % name)
+        self.silent_exec_method(
+            "get_ipython().kernel.sort_value_view('%s', %d, %r)" %
+            (name, column, bool(ascending)))
         wait_loop.exec_()
 
         # Remove loop connection and loop
         self.sig_got_reply.disconnect(wait_loop.quit)
         wait_loop = None
 
-        # Handle exceptions
-        if self._kernel_value is None:
-            if self._kernel_reply:
-                msg = self._kernel_reply[:]
-                self._kernel_reply = None
-                raise ValueError(msg)
+        # The kernel method returns an empty string when the rows are sorted
+        # and there's no reply if it raised an exception
+        if self._kernel_reply is None:
+            return _("The kernel could not sort the rows of this variable")
+        return self._kernel_reply
 
-        return self._kernel_value
+    def set_value_items(self, name, items):
+        """Set items of a value given in window coordinates"""
+        items = to_text_string(serialize_object(items))
+        self.silent_execute(
+            "get_ipython().kernel.set_value_items('%s', %s)" % (name, items))
+
+    def close_value_view(self, name):
+        """Free the data used by the kernel to edit a value by windows"""
+        self.silent_execute(
+            "get_ipython().kernel.close_value_view('%s')" % name)
 
     def set_value(self, name, value):
         """Set value for a variable"""
@@ -137,6 +162,34 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         return self._kernel_reply
 
     # ---- Private API (defined by us) ------------------------------
+    def _get_kernel_value(self, code):
+        """Execute code publishing a value in the kernel and return it"""
+        # Don't ask for values while reading (ipdb) is active
+        if self._reading:
+            raise ValueError(_("Inspecting and setting values while debugging "
+                               "in IPython consoles is not supported yet by "
+                               "Spyder."))
+
+        # Wait until the kernel returns the value
+        self._kernel_value = None
+        wait_loop = QEventLoop()
+        self.sig_got_reply.connect(wait_loop.quit)
+        self.silent_execute(code)
+        wait_loop.exec_()
+
+        # Remove loop connection and loop
+        self.sig_got_reply.disconnect(wait_loop.quit)
+        wait_loop = None
+
+        # Handle exceptions
+        if self._kernel_value is None:
+            if self._kernel_reply:
+                msg = self._kernel_reply[:]
+                self._kernel_reply = None
+                raise ValueError(msg)
+
+        return self._kernel_value
+
     def _handle_data_message(self, msg):
         """
         Handle raw (serialized) data sent by the kernel
@@ -153,6 +206,12 @@ class NamepaceBrowserWidget(RichJupyterWidget):
             self.sig_got_reply.emit()
             return
 
+        # Stats of code profiled in the kernel
+        profile = data.get('__spy_profile__', None)
+        if profile is not None:
+            self.sig_profile_data.emit(profile)
+            return
+
         # We only handle data asked by Spyder
         value = data.get('__spy_data__', None)
         if value is not None:
@@ -185,6 +244,16 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         if info and info.kind == 'silent_exec_method' and not self._hidden:
             self.handle_exec_method(msg)
             self._request_info['execute'].pop(msg_id)
+        elif info and info.kind == 'profile_code':
+            # Profiled code errors are caught and sent by the kernel, so
+            # this is only an error of the kernel method itself
+            self._request_info['execute'].pop(msg_id)
+            content = msg['content']
+            if content['status'] == 'error':
+                self.sig_profile_error.emit(
+                    u"%s: %s" % (content['ename'], content['evalue']))
+            elif content['status'] != 'ok':
+                self.sig_profile_error.emit(content['status'])
         else:
             super(NamepaceBrowserWidget, self)._handle_execute_reply(msg)
 
@@ -41,6 +41,13 @@ class ShellWidget(NamepaceBrowserWidget, HelpWidget, DebuggingWidget):
     sig_pdb_step = Signal(str, int)
     sig_prompt_ready = Signal()
 
+    # For the Profiler
+    sig_profile_data = Signal(object)
+    sig_profile_error = Signal(str)
+
+    # For the Editor breakpoints
+    sig_breakpoints_reset = Signal()
+
     # For ShellWidget
     focus_changed = Signal()
     new_client = Signal()
@@ -67,6 +74,9 @@ class ShellWidget(NamepaceBrowserWidget, HelpWidget, DebuggingWidget):
         # To save kernel replies in silent execution
         self._kernel_reply = None
 
+        # Revision of the Editor breakpoints set in the kernel
+        self.breakpoints_revision = 0
+
     #---- Public API ----------------------------------------------------------
     def set_exit_callback(self):
         """Set exit callback for this shell."""
@@ -189,6 +199,30 @@ the sympy module (e.g. plot)
         """Execute code in the kernel without increasing the prompt"""
         self.kernel_client.execute(to_text_string(code), silent=True)
 
+    def profile_code(self, code, filename='<profiled code>'):
+        """
+        Profile code in the kernel, without blocking
+
+        The stats are sent by sig_profile_data, as a dictionary with the
+        stats saved by pstats under 'stats' and whether the code raised an
+        exception under 'error'. If the kernel can't profile code (e.g.
+        an external kernel without profile_code), sig_profile_error is
+        emitted with the error instead.
+        """
+        code = u"get_ipython().kernel.profile_code(%s, %s)" % (
+            repr(to_text_string(code)), repr(to_text_string(filename)))
+        msg_id = self.kernel_client.execute(code, silent=True)
+        self._request_info['execute'][msg_id] = self._ExecutionRequest(
+            msg_id, 'profile_code')
+
+    def set_breakpoints(self, changes):
+        """
+        Set the Editor breakpoints of the files of *changes*, a dict of
+        their (line number, condition) lists, in the kernel
+        """
+        self.silent_execute(u"get_ipython().kernel.set_breakpoints(%s)" %
+                            repr(changes))
+
     def silent_exec_method(self, code):
         """Silently execute a kernel method and save its reply
 
@@ -281,6 +315,15 @@ the sympy module (e.g. plot)
         else:
             return self.short_banner()
 
+    def reset(self, clear=False):
+        """
+        Reimplemented to set the Editor breakpoints again in the kernel,
+        which is reset when it restarts
+        """
+        super(ShellWidget, self).reset(clear=clear)
+        self.breakpoints_revision = 0
+        self.sig_breakpoints_reset.emit()
+
     def _kernel_restarted_message(self, died=True):
         msg = _("Kernel died, restarting") if died else _("Kernel restarting")
         self.sig_kernel_restarted.emit(msg)
@@ -33,11 +33,13 @@ import numpy as np
 from spyder.config.base import _
 from spyder.config.fonts import DEFAULT_SMALL_DELTA
 from spyder.config.gui import get_font, config_shortcut
-from spyder.py3compat import (io, is_binary_string, is_string,
-                              is_text_string, PY3, to_binary_string,
-                              to_text_string)
+from spyder.py3compat import (is_binary_string, is_string, is_text_string,
+                              to_binary_string, to_text_string)
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import add_actions, create_action, keybinding
+from spyder.widgets.variableexplorer.textexport import TextExporter
+from spyder.widgets.variableexplorer.utils import (iter_array_text,
+                                                   RemoteValue)
 
 
 # Note: string and unicode data types will be formatted with '%s' (see below)
@@ -145,14 +147,22 @@ class ArrayModel(QAbstractTableModel):
 
         self._data = data
         self._format = format
+
+        # Hues are computed per blocks of ROWS_TO_LOAD x COLS_TO_LOAD
+        # cells and cached here until the data or the color range change
+        self._hue_cache = {}
         
         self.total_rows = self._data.shape[0]
         self.total_cols = self._data.shape[1]
         size = self.total_rows * self.total_cols
         
         try:
-            self.vmin = np.nanmin(self.color_func(data))
-            self.vmax = np.nanmax(self.color_func(data))
+            if isinstance(data, RemoteValue):
+                # Computed by the kernel
+                self.vmin, self.vmax = data.min_max
+            else:
+                self.vmin = np.nanmin(self.color_func(data))
+                self.vmax = np.nanmax(self.color_func(data))
             if self.vmax == self.vmin:
                 self.vmin -= 1
             self.hue0 = huerange[0]
@@ -246,6 +256,41 @@ class ArrayModel(QAbstractTableModel):
         j = index.column()
         return self.changes.get((i, j), self._data[i, j])
 
+    def get_hue_block(self, i, j):
+        """
+        Return the hues of the block of cells containing cell (i, j).
+
+        Hues are computed for ROWS_TO_LOAD x COLS_TO_LOAD cells at a time
+        in a single vectorized pass and cached until the data or the color
+        range change.
+        """
+        key = (i // self.ROWS_TO_LOAD, j // self.COLS_TO_LOAD)
+        try:
+            return self._hue_cache[key]
+        except KeyError:
+            pass
+        row0 = key[0] * self.ROWS_TO_LOAD
+        col0 = key[1] * self.COLS_TO_LOAD
+        block = self._data[row0:row0 + self.ROWS_TO_LOAD,
+                           col0:col0 + self.COLS_TO_LOAD]
+        values = np.asarray(self.color_func(block), dtype=float)
+        vmax, vmin = float(self.vmax), float(self.vmin)
+        with np.errstate(invalid='ignore'):
+            hue = np.abs(self.hue0 + self.dhue*(vmax - values)/(vmax - vmin))
+        self._hue_cache[key] = hue
+        return hue
+
+    def get_hue(self, i, j):
+        """Return the hue of cell (i, j)"""
+        if (i, j) in self.changes:
+            # Edited cells are few, so compute them one by one
+            value = float(self.color_func(self.changes[(i, j)]))
+            hue = self.hue0 + \
+                  self.dhue*(self.vmax - value)/(self.vmax - self.vmin)
+            return float(np.abs(hue))
+        hues = self.get_hue_block(i, j)
+        return float(hues[i % self.ROWS_TO_LOAD, j % self.COLS_TO_LOAD])
+
     def data(self, index, role=Qt.DisplayRole):
         """Cell content"""
         if not index.isValid():
@@ -265,10 +310,7 @@ class ArrayModel(QAbstractTableModel):
             return to_qvariant(int(Qt.AlignCenter|Qt.AlignVCenter))
         elif role == Qt.BackgroundColorRole and self.bgcolor_enabled \
           and value is not np.ma.masked:
-            hue = self.hue0+\
-                  self.dhue*(self.vmax-self.color_func(value)) \
-                  /(self.vmax-self.vmin)
-            hue = float(np.abs(hue))
+            hue = self.get_hue(index.row(), index.column())
             color = QColor.fromHsvF(hue, self.sat, self.val, self.alp)
             return to_qvariant(color)
         elif role == Qt.FontRole:
@@ -317,8 +359,10 @@ class ArrayModel(QAbstractTableModel):
         if not is_string(val):
             if val > self.vmax:
                 self.vmax = val
+                self._hue_cache = {}
             if val < self.vmin:
                 self.vmin = val
+                self._hue_cache = {}
         return True
 
     def flags(self, index):
@@ -339,6 +383,7 @@ class ArrayModel(QAbstractTableModel):
             return to_qvariant(labels[section])
 
     def reset(self):
+        self._hue_cache = {}
         self.beginResetModel()
         self.endResetModel()
 
@@ -398,6 +443,7 @@ class ArrayView(QTableView):
             total_width += self.columnWidth(k)
         self.viewport().resize(min(total_width, 1024), self.height())
         self.shape = shape
+        self.exporter = TextExporter(self)
         self.menu = self.setup_menu()
         config_shortcut(self.copy, context='variable_explorer', name='copy',
                         parent=self)
@@ -456,8 +502,11 @@ class ArrayView(QTableView):
                                          icon=ima.icon('editcopy'),
                                          triggered=self.copy,
                                          context=Qt.WidgetShortcut)
+        self.export_action = create_action(self, _('Export to file...'),
+                                           icon=ima.icon('filesaveas'),
+                                           triggered=self.export)
         menu = QMenu(self)
-        add_actions(menu, [self.copy_action, ])
+        add_actions(menu, [self.copy_action, self.export_action])
         return menu
 
     def contextMenuEvent(self, event):
@@ -472,10 +521,8 @@ class ArrayView(QTableView):
         else:
             QTableView.keyPressEvent(self, event)
 
-    def _sel_to_text(self, cell_range):
-        """Copy an array portion to a unicode string"""
-        if not cell_range:
-            return
+    def _sel_to_range(self, cell_range):
+        """Return the (rows, cols) of an array portion"""
         row_min, row_max, col_min, col_max = get_idx_rect(cell_range)
         if col_min == 0 and col_max == (self.model().cols_loaded-1):
             # we've selected a whole column. It isn't possible to
@@ -484,30 +531,62 @@ class ArrayView(QTableView):
             col_max = self.model().total_cols-1
         if row_min == 0 and row_max == (self.model().rows_loaded-1):
             row_max = self.model().total_rows-1
-        
-        _data = self.model().get_data()
-        if PY3:
-            output = io.BytesIO()
-        else:
-            output = io.StringIO()
+        return (row_min, row_max+1), (col_min, col_max+1)
+
+    def _sel_to_chunks(self, cell_range):
+        """
+        Return the text chunks of an array portion, its number of rows and
+        its number of cells
+        """
+        rows, cols = self._sel_to_range(cell_range)
+        chunks = iter_array_text(self.model().get_data(), rows, cols)
+        nrows = rows[1] - rows[0]
+        return chunks, nrows, nrows * (cols[1] - cols[0])
+
+    def _sel_to_text(self, cell_range):
+        """Copy an array portion to a unicode string"""
+        if not cell_range:
+            return
+        chunks, _nrows, _ncells = self._sel_to_chunks(cell_range)
         try:
-            np.savetxt(output, _data[row_min:row_max+1, col_min:col_max+1],
-                       delimiter='\t')
+            return u''.join(text for text, _done in chunks)
         except:
             QMessageBox.warning(self, _("Warning"),
                                 _("It was not possible to copy values for "
                                   "this array"))
             return
-        contents = output.getvalue().decode('utf-8')
-        output.close()
-        return contents
+
+    def _is_local(self):
+        """Return True if the array is not living in a kernel"""
+        return not isinstance(self.model().get_data(), RemoteValue)
 
     @Slot()
     def copy(self):
         """Copy text to clipboard"""
-        cliptxt = self._sel_to_text( self.selectedIndexes() )
-        clipboard = QApplication.clipboard()
-        clipboard.setText(cliptxt)
+        if not self.selectedIndexes():
+            return
+        chunks, nrows, ncells = self._sel_to_chunks(self.selectedIndexes())
+        try:
+            self.exporter.copy(chunks, nrows, ncells,
+                               threaded=self._is_local())
+        except:
+            # Small selections are copied at once, without the exporter
+            # error message
+            QMessageBox.warning(self, _("Warning"),
+                                _("It was not possible to copy values for "
+                                  "this array"))
+
+    @Slot()
+    def export(self):
+        """Export the selection, or the whole array, to a text file"""
+        cell_range = self.selectedIndexes()
+        if cell_range:
+            chunks, nrows, _ncells = self._sel_to_chunks(cell_range)
+        else:
+            nrows = self.model().total_rows
+            chunks = iter_array_text(self.model().get_data(), (0, nrows),
+                                     (0, self.model().total_cols))
+        self.exporter.export(chunks, nrows, threaded=self._is_local())
 
 
 class ArrayEditorWidget(QWidget):
@@ -601,9 +680,13 @@ class ArrayEditor(QDialog):
         """
         Setup ArrayEditor:
         return False if data is not supported, True otherwise
+
+        data can also be a RemoteValue for a 1D or 2D array living in
+        a kernel.
         """
         self.data = data
-        self.data.flags.writeable = True
+        if not isinstance(data, RemoteValue):
+            self.data.flags.writeable = True
         is_record_array = data.dtype.names is not None
         is_masked_array = isinstance(data, np.ma.MaskedArray)
 
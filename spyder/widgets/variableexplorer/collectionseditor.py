@@ -21,6 +21,7 @@ from __future__ import print_function
 import datetime
 import gc
 import sys
+import threading
 
 # Third party imports
 import ipykernel.pickleutil
@@ -47,11 +48,11 @@ from spyder.utils.qthelpers import (add_actions, create_action,
 from spyder.widgets.variableexplorer.importwizard import ImportWizard
 from spyder.widgets.variableexplorer.texteditor import TextEditor
 from spyder.widgets.variableexplorer.utils import (
-    array, DataFrame, DatetimeIndex, display_to_value, FakeObject,
+    argsort, array, DataFrame, DatetimeIndex, display_to_value, FakeObject,
     get_color_name, get_human_readable_type, get_size, Image, is_editable_type,
-    is_known_type, MaskedArray, ndarray, np_savetxt, Series, sort_against,
-    try_to_eval, unsorted_unique, value_to_display, get_object_attrs,
-    get_type_string)
+    is_known_type, is_lazy_array, MaskedArray, ndarray, np_savetxt, RemoteValue, Series,
+    try_to_eval, unsorted_unique, value_to_display,
+    get_object_attrs, get_type_string)
 
 if ndarray is not FakeObject:
     from spyder.widgets.variableexplorer.arrayeditor import ArrayEditor
@@ -72,21 +73,65 @@ ipykernel.pickleutil.can_map.pop('numpy.ndarray')
 
 LARGE_NROWS = 100
 
+# Arrays and DataFrames living in a kernel with more elements than this are
+# edited through windows of data instead of being transferred at once
+REMOTE_VALUE_MIN_SIZE = 5e5
+
+
+class UnresolvedAttribute(object):
+    """Value of an attribute still being computed, or whose getter failed"""
+
+    def __init__(self, error=None):
+        self.error = error
+
+    def __str__(self):
+        if self.error is None:
+            return _("Computing...")
+        return _("Error: %s") % to_text_string(self.error)
+
 
 class ProxyObject(object):
-    """Dictionary proxy to an unknown object."""
+    """
+    Dictionary proxy to an unknown object.
 
-    def __init__(self, obj):
+    Attribute values are got only when asked for and then cached. Getting
+    one is done in a thread and waited for *timeout* seconds at most: if
+    it takes longer, an UnresolvedAttribute is returned in the meantime and
+    *callback* is called with the attribute name once it's available.
+    """
+    ATTR_TIMEOUT = 0.1
+
+    def __init__(self, obj, names=None, callback=None):
         """Constructor."""
         self.__obj__ = obj
+        if names is None:
+            names = get_object_attrs(obj)
+        self.names = names
+        self.callback = callback
+        self._values = {}
+        self._pending = set()
+        self._lock = threading.Lock()
 
     def __len__(self):
         """Get len according to detected attributes."""
-        return len(get_object_attrs(self.__obj__))
+        return len(self.names)
 
     def __getitem__(self, key):
         """Get attribute corresponding to key."""
-        return getattr(self.__obj__, key)
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            if key in self._pending:
+                return UnresolvedAttribute()
+        thread = threading.Thread(target=self._resolve, args=(key,))
+        thread.daemon = True
+        thread.start()
+        thread.join(self.ATTR_TIMEOUT)
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+            self._pending.add(key)
+        return UnresolvedAttribute()
 
     def __setitem__(self, key, value):
         """Set attribute corresponding to key with value."""
@@ -94,12 +139,31 @@ class ProxyObject(object):
             setattr(self.__obj__, key, value)
         except TypeError:
             pass
+        else:
+            with self._lock:
+                self._values[key] = value
+
+    def _resolve(self, key):
+        """Get and cache attribute *key*"""
+        try:
+            value = getattr(self.__obj__, key)
+        except Exception as error:
+            value = UnresolvedAttribute(error)
+        with self._lock:
+            self._values[key] = value
+            notify = key in self._pending
+            self._pending.discard(key)
+        if notify and self.callback is not None:
+            self.callback(key)
 
 
 class ReadOnlyCollectionsModel(QAbstractTableModel):
     """CollectionsEditor Read-Only Table Model"""
     ROWS_TO_LOAD = 50
 
+    # Emitted (from another thread) when a slow attribute has been got
+    sig_attribute_resolved = Signal(object)
+
     def __init__(self, parent, data, title="", names=False,
                  minmax=False, dataframe_format=None, remote=False):
         QAbstractTableModel.__init__(self, parent)
@@ -119,6 +183,7 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
             self.title = self.title + ' - '
         self.sizes = []
         self.types = []
+        self.sig_attribute_resolved.connect(self.attribute_resolved)
         self.set_data(data)
         
     def get_data(self):
@@ -151,7 +216,8 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
                 self.header0 = _("Key")
         else:
             self.keys = get_object_attrs(data)
-            self._data = data = self.showndata = ProxyObject(data)
+            self._data = data = self.showndata = ProxyObject(
+                data, self.keys, callback=self._notify_attribute_resolved)
             if not self.names:
                 self.header0 = _("Attribute")
 
@@ -167,76 +233,86 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
         else:
             self.rows_loaded = self.total_rows
 
+        self.sizes = []
+        self.types = []
         self.set_size_and_type()
         self.reset()
 
     def set_size_and_type(self, start=None, stop=None):
+        """
+        Compute the sizes and types of rows start:stop (the loaded rows by
+        default) which haven't been computed yet
+
+        Sizes and types are kept in lists parallel to the keys, holding
+        None for the rows not computed yet, so that big collections don't
+        have to be walked through before being shown.
+        """
         data = self._data
-        
         if start is None and stop is None:
             start = 0
             stop = self.rows_loaded
-            fetch_more = False
-        else:
-            fetch_more = True
-        
-        if self.remote:
-            sizes = [ data[self.keys[index]]['size'] 
-                      for index in range(start, stop) ]
-            types = [ data[self.keys[index]]['type']
-                      for index in range(start, stop) ]
-        else:
-            sizes = [ get_size(data[self.keys[index]])
-                      for index in range(start, stop) ]
-            types = [ get_human_readable_type(data[self.keys[index]])
-                      for index in range(start, stop) ]
-
-        if fetch_more:
-            self.sizes = self.sizes + sizes
-            self.types = self.types + types
-        else:
-            self.sizes = sizes
-            self.types = types
+        if len(self.sizes) != self.total_rows:
+            self.sizes = [None] * self.total_rows
+            self.types = [None] * self.total_rows
+        sizes = self.sizes
+        types = self.types
+        for row in range(start, stop):
+            if sizes[row] is not None:
+                continue
+            value = data[self.keys[row]]
+            if isinstance(value, UnresolvedAttribute):
+                if value.error is None:
+                    # Computed once attribute_resolved is called
+                    continue
+                sizes[row] = 1
+                types[row] = type(value.error).__name__
+            elif self.remote:
+                sizes[row] = value['size']
+                types[row] = value['type']
+            else:
+                sizes[row] = get_size(value)
+                types[row] = get_human_readable_type(value)
 
     def sort(self, column, order=Qt.AscendingOrder):
         """Overriding sort method"""
         reverse = (order==Qt.DescendingOrder)
         if column == 0:
-            self.sizes = sort_against(self.sizes, self.keys, reverse)
-            self.types = sort_against(self.types, self.keys, reverse)
-            try:
-                self.keys.sort(reverse=reverse)
-            except:
-                pass
-        elif column == 1:
-            self.keys = sort_against(self.keys, self.types, reverse)
-            self.sizes = sort_against(self.sizes, self.types, reverse)
-            try:
-                self.types.sort(reverse=reverse)
-            except:
-                pass
-        elif column == 2:
-            self.keys = sort_against(self.keys, self.sizes, reverse)
-            self.types = sort_against(self.types, self.sizes, reverse)
-            try:
-                self.sizes.sort(reverse=reverse)
-            except:
-                pass
-        elif column == 3:
-            self.keys = sort_against(self.keys, self.sizes, reverse)
-            self.types = sort_against(self.types, self.sizes, reverse)
-            try:
-                self.sizes.sort(reverse=reverse)
-            except:
-                pass
-        elif column == 4:
-            values = [self._data[key] for key in self.keys]
-            self.keys = sort_against(self.keys, values, reverse)
-            self.sizes = sort_against(self.sizes, values, reverse)
-            self.types = sort_against(self.types, values, reverse)
+            permutation = argsort(self.keys, reverse)
+        else:
+            # Types and sizes are needed for all rows to sort by them
+            self.set_size_and_type(0, self.total_rows)
+            if column == 1:
+                permutation = argsort(self.types, reverse)
+            else:
+                permutation = argsort(self.sizes, reverse)
+        if permutation is not None:
+            self.keys = [self.keys[row] for row in permutation]
+            self.sizes = [self.sizes[row] for row in permutation]
+            self.types = [self.types[row] for row in permutation]
+            self.set_size_and_type()
         self.beginResetModel()
         self.endResetModel()
 
+    def _notify_attribute_resolved(self, name):
+        try:
+            self.sig_attribute_resolved.emit(name)
+        except RuntimeError:
+            # The model was deleted before the attribute was got
+            pass
+
+    @Slot(object)
+    def attribute_resolved(self, name):
+        """Show the value, type and size of a slow attribute"""
+        try:
+            row = self.keys.index(name)
+        except ValueError:
+            return
+        if row >= self.rows_loaded:
+            return
+        self.set_size_and_type(row, row + 1)
+        self.dataChanged.emit(self.createIndex(row, 1),
+                              self.createIndex(row, 3))
+
     def columnCount(self, qindex=QModelIndex()):
         """Array column number"""
         return 4
@@ -305,8 +381,13 @@ class ReadOnlyCollectionsModel(QAbstractTableModel):
         value = self.get_value(index)
         if index.column() == 3 and self.remote:
             value = value['view']
-        if index.column() == 3:
+        if isinstance(value, UnresolvedAttribute):
+            display = to_text_string(value)
+        elif index.column() == 3:
             display = value_to_display(value, minmax=self.minmax)
+        elif value is None and index.column() in (1, 2):
+            # Type and size of an attribute still being computed
+            display = ''
         else:
              display = to_text_string(value)
         if role == Qt.DisplayRole:
@@ -438,7 +519,7 @@ class CollectionsDelegate(QItemDelegate):
                 return None
         try:
             value = self.get_value(index)
-            if value is None:
+            if value is None or isinstance(value, UnresolvedAttribute):
                 return None
         except Exception as msg:
             QMessageBox.critical(self.parent(), _("Error"),
@@ -468,6 +549,15 @@ class CollectionsDelegate(QItemDelegate):
             self.create_dialog(editor, dict(model=index.model(), editor=editor,
                                             key=key, readonly=readonly))
             return None
+        #---editor = ArrayEditor, showing the data read from a lazy array
+        elif is_lazy_array(value) and ndarray is not FakeObject:
+            editor = ArrayEditor(parent)
+            if not editor.setup_and_check(array(value), title=key,
+                                          readonly=True):
+                return
+            self.create_dialog(editor, dict(model=index.model(), editor=editor,
+                                            key=key, readonly=True))
+            return None
         #---showing image
         elif isinstance(value, Image) and ndarray is not FakeObject \
           and Image is not FakeObject:
@@ -1369,6 +1459,60 @@ class RemoteCollectionsDelegate(CollectionsDelegate):
             name = index.model().keys[index.row()]
             self.parent().new_value(name, value)
 
+    def createEditor(self, parent, option, index):
+        """
+        Overriding method createEditor
+
+        Large arrays and DataFrames are edited through a RemoteValue
+        instead of transferring them from the kernel.
+        """
+        if index.column() == 3:
+            name = index.model().keys[index.row()]
+            try:
+                value = self.parent().get_remote_value(name)
+            except Exception:
+                value = None
+            if value is not None:
+                return self.create_remote_editor(parent, index, value)
+        return CollectionsDelegate.createEditor(self, parent, option, index)
+
+    def create_remote_editor(self, parent, index, value):
+        """Create an editor for a RemoteValue"""
+        key = index.model().get_key(index)
+        readonly = self.parent().readonly or value.readonly
+        if value.kind == 'array':
+            editor = ArrayEditor(parent)
+            if not editor.setup_and_check(value, title=key, readonly=readonly):
+                return
+        else:
+            editor = DataFrameEditor()
+            if not editor.setup_and_check(value, title=key):
+                return
+            editor.dataModel.set_format(index.model().dataframe_format)
+            editor.sig_option_changed.connect(self.change_option)
+        self.create_dialog(editor, dict(model=index.model(), editor=editor,
+                                        key=key, readonly=readonly,
+                                        remote_value=value))
+
+    def editor_accepted(self, editor_id):
+        data = self._editors[editor_id]
+        value = data.get('remote_value')
+        if value is None:
+            CollectionsDelegate.editor_accepted(self, editor_id)
+            return
+        if not data['readonly']:
+            value.commit()
+        value.close()
+        self._editors.pop(editor_id)
+        self.parent().shellwidget.refresh_namespacebrowser()
+        self.free_memory()
+
+    def editor_rejected(self, editor_id):
+        value = self._editors[editor_id].get('remote_value')
+        if value is not None:
+            value.close()
+        CollectionsDelegate.editor_rejected(self, editor_id)
+
 
 class RemoteCollectionsEditorTableView(BaseTableView):
     """DictEditor table view"""
@@ -1404,6 +1548,35 @@ class RemoteCollectionsEditorTableView(BaseTableView):
         self.shellwidget._kernel_value = None
         return value
 
+    def get_remote_value(self, name):
+        """
+        Return a RemoteValue to edit a large array or DataFrame by
+        windows, or None if the variable must be transferred at once
+        """
+        properties = self.var_properties[name]
+        is_frame = properties['is_data_frame'] or properties['is_series']
+        is_array = properties['is_array'] and properties['array_ndim'] <= 2
+        if not ((is_frame and DataFrame is not FakeObject) or
+                (is_array and ndarray is not FakeObject)):
+            return
+        # Don't ask the kernel for the information of small values (which
+        # computes the bounds of the whole value), given their shape
+        shape = self.model.get_data()[name]['size']
+        if isinstance(shape, tuple):
+            size = 1
+            for length in shape:
+                size *= length
+            if size < REMOTE_VALUE_MIN_SIZE:
+                return
+        info = self.shellwidget.get_value_info(name)
+        self.shellwidget._kernel_value = None
+        if not info['supported']:
+            return
+        nrows, ncols = info['shape']
+        if nrows * ncols < REMOTE_VALUE_MIN_SIZE:
+            return
+        return RemoteValue(self.shellwidget, name, info)
+
     def new_value(self, name, value):
         """Create new value in data"""
         value = serialize_object(value)
@@ -17,29 +17,31 @@ Pandas DataFrame Editor Dialog
 from pandas import DataFrame, DatetimeIndex, Series
 from qtpy import API
 from qtpy.compat import from_qvariant, to_qvariant
-from qtpy.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal, Slot
+from qtpy.QtCore import (QAbstractTableModel, QModelIndex, Qt, QThread,
+                         Signal, Slot)
 from qtpy.QtGui import QColor, QCursor
 from qtpy.QtWidgets import (QApplication, QCheckBox, QDialogButtonBox, QDialog,
                             QGridLayout, QHBoxLayout, QInputDialog, QLineEdit,
-                            QMenu, QMessageBox, QPushButton, QTableView,
-                            QHeaderView)
+                            QMenu, QMessageBox, QProgressDialog, QPushButton,
+                            QTableView, QHeaderView)
 import numpy as np
 
 # Local imports
 from spyder.config.base import _
 from spyder.config.fonts import DEFAULT_SMALL_DELTA
 from spyder.config.gui import get_font, config_shortcut
-from spyder.py3compat import (io, is_text_string, PY2, to_text_string,
+from spyder.py3compat import (is_text_string, PY2, to_text_string,
                               TEXT_TYPES)
 from spyder.utils import encoding
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     keybinding, qapplication)
 from spyder.widgets.variableexplorer.arrayeditor import get_idx_rect
+from spyder.widgets.variableexplorer.textexport import TextExporter
+from spyder.widgets.variableexplorer.utils import (
+    COMPLEX_NUMBER_TYPES, get_columns_min_max, iter_dataframe_text,
+    REAL_NUMBER_TYPES, RemoteValue, sort_permutation)
 
-# Supported Numbers and complex numbers
-REAL_NUMBER_TYPES = (float, int, np.int64, np.int32)
-COMPLEX_NUMBER_TYPES = (complex, np.complex64, np.complex128)
 # Used to convert bool intrance to false since bool('False') will return True
 _bool_false = ['false', '0']
 
@@ -77,35 +79,78 @@ def global_max(col_vals, index):
     return max(max_col), min(min_col)
 
 
+class SortThread(QThread):
+    """Thread computing the sort permutation of a large DataFrame"""
+    sig_progress = Signal(int)
+    sig_finished = Signal(object)
+    sig_error = Signal(str)
+
+    def __init__(self, parent):
+        QThread.__init__(self, parent)
+        self.df = None
+        self.column = None
+        self.ascending = None
+        self.permutation = None
+
+    def initialize(self, df, column, ascending, permutation):
+        self.df = df
+        self.column = column
+        self.ascending = ascending
+        self.permutation = permutation
+
+    def run(self):
+        try:
+            order = sort_permutation(self.df, self.column,
+                                     ascending=self.ascending,
+                                     permutation=self.permutation,
+                                     progress=self.sig_progress.emit)
+        except Exception as e:
+            # Exceptions are not propagated to the main thread
+            self.sig_error.emit(str(e))
+            return
+        self.sig_finished.emit(order)
+
+
 class DataFrameModel(QAbstractTableModel):
     """ DataFrame Table Model"""
     
     ROWS_TO_LOAD = 500
     COLS_TO_LOAD = 40
     
-    def __init__(self, dataFrame, format="%.3g", parent=None):
+    def __init__(self, dataFrame, format="%.3g", parent=None,
+                 sort_inplace=False):
         QAbstractTableModel.__init__(self)
         self.dialog = parent
         self.df = dataFrame
-        self.df_index = dataFrame.index.tolist()
+        self.df_index = None
+        self.update_df_index()
         self.df_header = dataFrame.columns.tolist()
         self._format = format
         self.complex_intran = None
+
+        # If sort_inplace is False, sorting doesn't touch the DataFrame:
+        # view rows are mapped to DataFrame rows through this permutation
+        self.sort_inplace = sort_inplace
+        self.sort_permutation = None
+        self.sort_thread = None
+        self.sort_progress = None
         
         self.total_rows = self.df.shape[0]
         self.total_cols = self.df.shape[1]
         size = self.total_rows * self.total_cols
 
+        # Hues are computed per blocks of ROWS_TO_LOAD rows and cached
+        # here, keyed by (block, column), until the data or the color
+        # settings change
+        self._hue_cache = {}
+
+        # Column max/min are computed with vectorized reductions, so it's
+        # cheap enough to do it also for large DataFrames
         self.max_min_col = None
-        if size < LARGE_SIZE:
-            self.max_min_col_update()
-            self.colum_avg_enabled = True
-            self.bgcolor_enabled = True
-            self.colum_avg(1)
-        else:
-            self.colum_avg_enabled = False
-            self.bgcolor_enabled = False
-            self.colum_avg(0)
+        self.max_min_col_update()
+        self.colum_avg_enabled = True
+        self.bgcolor_enabled = True
+        self.colum_avg(1)
 
         # Use paging when the total size, number of rows or number of
         # columns is too large
@@ -125,34 +170,25 @@ class DataFrameModel(QAbstractTableModel):
     def max_min_col_update(self):
         """
         Determines the maximum and minimum number in each column.
-        
-        The result is a list whose k-th entry is [vmax, vmin], where vmax and
-        vmin denote the maximum and minimum of the k-th column (ignoring NaN). 
-        This list is stored in self.max_min_col.
-        
-        If the k-th column has a non-numerical dtype, then the k-th entry
-        is set to None. If the dtype is complex, then compute the maximum and
-        minimum of the absolute values. If vmax equals vmin, then vmin is 
-        decreased by one.
+
+        The result is stored in self.max_min_col. See get_columns_min_max
+        for its format.
         """
+        self._hue_cache = {}
         if self.df.shape[0] == 0: # If no rows to compute max/min then return
             return
-        self.max_min_col = []
-        for dummy, col in self.df.iteritems():
-            if col.dtype in REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES:
-                if col.dtype in REAL_NUMBER_TYPES:
-                    vmax = col.max(skipna=True)
-                    vmin = col.min(skipna=True)
-                else:
-                    vmax = col.abs().max(skipna=True)
-                    vmin = col.abs().min(skipna=True)
-                if vmax != vmin:
-                    max_min = [vmax, vmin]
-                else:
-                    max_min = [vmax, vmin - 1]
-            else:
-                max_min = None
-            self.max_min_col.append(max_min)
+        self.max_min_col = get_columns_min_max(self.df)
+
+    def update_column_min_max(self, column, value):
+        """
+        Update the maximum and minimum of `column` only, after one of its
+        values was set to `value`
+        """
+        self._hue_cache = {}
+        if self.max_min_col is None:
+            return
+        self.max_min_col[column] = get_columns_min_max(
+            self.df.iloc[:, column:column + 1])[0]
 
     def get_format(self):
         """Return current format"""
@@ -217,6 +253,35 @@ class DataFrameModel(QAbstractTableModel):
         else:
             return to_qvariant()
 
+    def get_hue_block(self, row, column):
+        """
+        Return the hues of the block of rows containing `row` in `column`.
+
+        Hues are computed for ROWS_TO_LOAD rows at a time in a single
+        vectorized pass and cached until the data or the color settings
+        change. NaN values get a NaN hue.
+        """
+        block = row // self.ROWS_TO_LOAD
+        try:
+            return self._hue_cache[(block, column)]
+        except KeyError:
+            pass
+        start = block * self.ROWS_TO_LOAD
+        values = self.get_df_block(start, start + self.ROWS_TO_LOAD,
+                                   column, column + 1).iloc[:, 0].values
+        if np.iscomplexobj(values):
+            values = np.abs(values)
+        else:
+            values = values.astype(float)
+        vmax, vmin = self.return_max(self.max_min_col, column)
+        vmax, vmin = float(vmax), float(vmin)
+        with np.errstate(invalid='ignore'):
+            hue = (BACKGROUND_NUMBER_MINHUE + BACKGROUND_NUMBER_HUERANGE *
+                   (vmax - values) / (vmax - vmin))
+            hue = np.minimum(np.abs(hue), 1)
+        self._hue_cache[(block, column)] = hue
+        return hue
+
     def get_bgcolor(self, index):
         """Background color depending on value"""
         column = index.column()
@@ -226,30 +291,50 @@ class DataFrameModel(QAbstractTableModel):
             return color
         if not self.bgcolor_enabled:
             return
-        value = self.get_value(index.row(), column-1)
         if self.max_min_col[column - 1] is None:
+            value = self.get_value(index.row(), column-1)
             color = QColor(BACKGROUND_NONNUMBER_COLOR)
             if is_text_string(value):
                 color.setAlphaF(BACKGROUND_STRING_ALPHA)
             else:
                 color.setAlphaF(BACKGROUND_MISC_ALPHA)
         else:
-            if isinstance(value, COMPLEX_NUMBER_TYPES):
-                color_func = abs
+            row = index.row()
+            hue = self.get_hue_block(row, column-1)[row % self.ROWS_TO_LOAD]
+            if np.isnan(hue):
+                color = QColor(BACKGROUND_NONNUMBER_COLOR)
+                color.setAlphaF(BACKGROUND_MISC_ALPHA)
             else:
-                color_func = float
-            vmax, vmin = self.return_max(self.max_min_col, column-1)
-            hue = (BACKGROUND_NUMBER_MINHUE + BACKGROUND_NUMBER_HUERANGE *
-                   (vmax - color_func(value)) / (vmax - vmin))
-            hue = float(abs(hue))
-            if hue > 1:
-                hue = 1
-            color = QColor.fromHsvF(hue, BACKGROUND_NUMBER_SATURATION,
-                                    BACKGROUND_NUMBER_VALUE, BACKGROUND_NUMBER_ALPHA)
+                color = QColor.fromHsvF(float(hue),
+                                        BACKGROUND_NUMBER_SATURATION,
+                                        BACKGROUND_NUMBER_VALUE,
+                                        BACKGROUND_NUMBER_ALPHA)
         return color
 
+    def get_df_row(self, row):
+        """Return the DataFrame position of a view row"""
+        if self.sort_permutation is None:
+            return row
+        return self.sort_permutation[row]
+
+    def get_df_rows(self, start, stop):
+        """Return the DataFrame positions of view rows start to stop-1"""
+        if self.sort_permutation is None:
+            return slice(start, stop)
+        return self.sort_permutation[start:stop]
+
+    def get_df_block(self, row_start, row_stop, col_start, col_stop):
+        """Return the DataFrame shown in a block of view rows and columns"""
+        return self.df.iloc[self.get_df_rows(row_start, row_stop),
+                            col_start:col_stop]
+
+    def get_index_label(self, row):
+        """Return the index label of a view row"""
+        return self.df_index[self.get_df_row(row)]
+
     def get_value(self, row, column):
         """Returns the value of the DataFrame"""
+        row = self.get_df_row(row)
         # To increase the performance iat is used but that requires error
         # handling, so fallback uses iloc
         try:
@@ -258,6 +343,10 @@ class DataFrameModel(QAbstractTableModel):
             value = self.df.iloc[row, column]
         return value
 
+    def set_value(self, row, column, value):
+        """Set the value of the DataFrame at row and column positions"""
+        self.df.iloc[row, column] = value
+
     def update_df_index(self):
         """"Update the DataFrame index"""
         self.df_index = self.df.index.tolist()
@@ -270,7 +359,7 @@ class DataFrameModel(QAbstractTableModel):
             column = index.column()
             row = index.row()
             if column == 0:
-                return to_qvariant(to_text_string(self.df_index[row]))
+                return to_qvariant(to_text_string(self.get_index_label(row)))
             else:
                 value = self.get_value(row, column-1)
                 if isinstance(value, float):
@@ -294,8 +383,10 @@ class DataFrameModel(QAbstractTableModel):
                                      "TypeError error: no ordering "
                                      "relation is defined for complex numbers")
                 return False
+        ascending = order == Qt.AscendingOrder
+        if not self.sort_inplace:
+            return self.sort_by_permutation(column, ascending)
         try:
-            ascending = order == Qt.AscendingOrder
             if column > 0:
                 try:
                     self.df.sort_values(by=self.df.columns[column-1],
@@ -318,6 +409,57 @@ class DataFrameModel(QAbstractTableModel):
         self.reset()
         return True
 
+    def sort_by_permutation(self, column, ascending):
+        """
+        Sort the view without modifying the DataFrame.
+
+        For large DataFrames the permutation is computed in a thread and
+        applied when it's ready.
+        """
+        if self.sort_thread is not None and self.sort_thread.isRunning():
+            return False
+        if self.total_rows <= LARGE_NROWS:
+            try:
+                order = sort_permutation(self.df, column, ascending=ascending,
+                                         permutation=self.sort_permutation)
+            except TypeError as e:
+                self.sort_error(str(e))
+                return False
+            self.set_sort_permutation(order)
+            return True
+
+        self.sort_progress = QProgressDialog(_("Sorting..."), _("Cancel"),
+                                             0, 100, self.dialog)
+        self.sort_progress.setWindowModality(Qt.WindowModal)
+        self.sort_progress.setMinimumDuration(500)
+        self.sort_thread = SortThread(self)
+        self.sort_thread.initialize(self.df, column, ascending,
+                                    self.sort_permutation)
+        self.sort_thread.sig_progress.connect(self.sort_progress.setValue)
+        self.sort_thread.sig_finished.connect(self.sort_finished)
+        self.sort_thread.sig_error.connect(self.sort_error)
+        self.sort_thread.start()
+        return True
+
+    def sort_finished(self, order):
+        """Apply the permutation computed by the sort thread"""
+        canceled = self.sort_progress.wasCanceled()
+        self.sort_progress.close()
+        if not canceled:
+            self.set_sort_permutation(order)
+
+    def sort_error(self, message):
+        """Show a sorting error"""
+        if self.sort_progress is not None:
+            self.sort_progress.close()
+        QMessageBox.critical(self.dialog, "Error",
+                             _("Unable to sort the rows: %s") % message)
+
+    def set_sort_permutation(self, order):
+        """Set the permutation mapping view rows to DataFrame rows"""
+        self.sort_permutation = order
+        self.reset()
+
     def flags(self, index):
         """Set flags"""
         if index.column() == 0:
@@ -328,7 +470,7 @@ class DataFrameModel(QAbstractTableModel):
     def setData(self, index, value, role=Qt.EditRole, change_type=None):
         """Cell content change"""
         column = index.column()
-        row = index.row()
+        row = self.get_df_row(index.row())
 
         if change_type is not None:
             try:
@@ -336,19 +478,22 @@ class DataFrameModel(QAbstractTableModel):
                 val = from_qvariant(value, str)
                 if change_type is bool:
                     val = bool_false_check(val)
-                self.df.iloc[row, column - 1] = change_type(val)
+                value = change_type(val)
+                self.set_value(row, column - 1, value)
             except ValueError:
-                self.df.iloc[row, column - 1] = change_type('0')
+                value = change_type('0')
+                self.set_value(row, column - 1, value)
         else:
             val = from_qvariant(value, str)
-            current_value = self.get_value(row, column-1)
+            current_value = self.get_value(index.row(), column-1)
             if isinstance(current_value, bool):
                 val = bool_false_check(val)
             supported_types = (bool,) + REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES
             if (isinstance(current_value, supported_types) or 
                     is_text_string(current_value)):
                 try:
-                    self.df.iloc[row, column-1] = current_value.__class__(val)
+                    value = current_value.__class__(val)
+                    self.set_value(row, column - 1, value)
                 except ValueError as e:
                     QMessageBox.critical(self.dialog, "Error",
                                          "Value error: %s" % str(e))
@@ -358,7 +503,7 @@ class DataFrameModel(QAbstractTableModel):
                                      "The type of the cell is not a supported "
                                      "type")
                 return False
-        self.max_min_col_update()
+        self.update_column_min_max(column - 1, value)
         return True
 
     def get_data(self):
@@ -411,10 +556,76 @@ class DataFrameModel(QAbstractTableModel):
             return self.cols_loaded + 1
 
     def reset(self):
+        self._hue_cache = {}
         self.beginResetModel()
         self.endResetModel()
 
 
+class RemoteDataFrameModel(DataFrameModel):
+    """
+    DataFrame Table Model for a DataFrame or Series living in a kernel.
+
+    Data is accessed through a RemoteValue, so only visible blocks are
+    transferred, sorting is done by the kernel and edits are sent to it
+    when the editor is accepted.
+    """
+
+    def get_df_block(self, row_start, row_stop, col_start, col_stop):
+        """Return the DataFrame shown in a block of view rows and columns"""
+        return self.df[row_start:row_stop, col_start:col_stop]
+
+    def get_index_label(self, row):
+        """Return the index label of a view row"""
+        return self.df.get_index_label(row)
+
+    def get_value(self, row, column):
+        """Returns the value of the DataFrame"""
+        return self.df.get_cell(row, column)
+
+    def set_value(self, row, column, value):
+        """Set the value of the DataFrame at row and column positions"""
+        self.df[row, column] = value
+
+    def update_df_index(self):
+        """Index labels are fetched with the data blocks"""
+        pass
+
+    def max_min_col_update(self):
+        """Use the column max/min computed by the kernel"""
+        self._hue_cache = {}
+        self.max_min_col = self.df.max_min_col
+
+    def update_column_min_max(self, column, value):
+        """
+        Widen the maximum and minimum of `column` computed by the kernel to
+        include `value`, the rest of the column not being available here
+        """
+        self._hue_cache = {}
+        if self.max_min_col is None or self.max_min_col[column] is None:
+            return
+        if isinstance(value, COMPLEX_NUMBER_TYPES):
+            value = abs(value)
+        elif not isinstance(value, REAL_NUMBER_TYPES):
+            return
+        if np.isnan(value):
+            return
+        vmax, vmin = self.max_min_col[column]
+        # Don't modify the bounds of the RemoteValue
+        self.max_min_col = list(self.max_min_col)
+        self.max_min_col[column] = [max(vmax, value), min(vmin, value)]
+
+    def sort_by_permutation(self, column, ascending):
+        """Sort the DataFrame view in the kernel"""
+        QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
+        error = self.df.sort(column, ascending=ascending)
+        QApplication.restoreOverrideCursor()
+        if error:
+            self.sort_error(error)
+            return False
+        self.reset()
+        return True
+
+
 class FrozenTableView(QTableView):
     """This class implements a table with its first column frozen
     For more information please see:
@@ -476,6 +687,7 @@ class DataFrameView(QTableView):
         self.sort_old = [None]
         self.header_class = self.horizontalHeader()
         self.header_class.sectionClicked.connect(self.sortByColumn)
+        self.exporter = TextExporter(self)
         self.menu = self.setup_menu()
         config_shortcut(self.copy, context='variable_explorer', name='copy',
                         parent=self)
@@ -574,7 +786,10 @@ class DataFrameView(QTableView):
         functions = ((_("To bool"), bool), (_("To complex"), complex),
                      (_("To int"), int), (_("To float"), float),
                      (_("To str"), to_text_string))
-        types_in_menu = [copy_action]
+        export_action = create_action(self, _('Export to file...'),
+                                      icon=ima.icon('filesaveas'),
+                                      triggered=self.export)
+        types_in_menu = [copy_action, export_action]
         for name, func in functions:
             # QAction.triggered works differently for PySide and PyQt
             if not API == 'pyside':
@@ -594,34 +809,55 @@ class DataFrameView(QTableView):
         index_list = self.selectedIndexes()
         [model.setData(i, '', change_type=func) for i in index_list]
 
-    @Slot()
-    def copy(self):
-        """Copy text to clipboard"""
-        if not self.selectedIndexes():
-            return
+    def _sel_to_chunks(self, cell_range):
+        """
+        Return the text chunks of a DataFrame portion, its number of rows
+        and its number of cells
+        """
         (row_min, row_max,
-         col_min, col_max) = get_idx_rect(self.selectedIndexes())
+         col_min, col_max) = get_idx_rect(cell_range)
         index = header = False
         if col_min == 0:
             col_min = 1
             index = True
-        df = self.model().df
+        model = self.model()
         if col_max == 0:  # To copy indices
-            contents = '\n'.join(map(str, df.index.tolist()[slice(row_min,
-                                                            row_max+1)]))
+            cols = (0, 0)
         else:  # To copy DataFrame
-            if (col_min == 0 or col_min == 1) and (df.shape[1] == col_max):
+            if (col_min == 0 or col_min == 1) and (model.total_cols == col_max):
                 header = True
-            obj = df.iloc[slice(row_min, row_max+1), slice(col_min-1, col_max)]
-            output = io.StringIO()
-            obj.to_csv(output, sep='\t', index=index, header=header)
-            if not PY2:
-                contents = output.getvalue()
-            else:
-                contents = output.getvalue().decode('utf-8')
-            output.close()
-        clipboard = QApplication.clipboard()
-        clipboard.setText(contents)
+            cols = (col_min-1, col_max)
+        rows = (row_min, row_max+1)
+        chunks = iter_dataframe_text(model.get_df_block, rows, cols,
+                                     index=index, header=header)
+        nrows = rows[1] - rows[0]
+        return chunks, nrows, nrows * max(cols[1] - cols[0], 1)
+
+    def _is_local(self):
+        """Return True if the DataFrame is not living in a kernel"""
+        return not isinstance(self.model().df, RemoteValue)
+
+    @Slot()
+    def copy(self):
+        """Copy text to clipboard"""
+        if not self.selectedIndexes():
+            return
+        chunks, nrows, ncells = self._sel_to_chunks(self.selectedIndexes())
+        self.exporter.copy(chunks, nrows, ncells, threaded=self._is_local())
+
+    @Slot()
+    def export(self):
+        """Export the selection, or the whole DataFrame, to a text file"""
+        model = self.model()
+        cell_range = self.selectedIndexes()
+        if cell_range:
+            chunks, nrows, _ncells = self._sel_to_chunks(cell_range)
+        else:
+            nrows = model.total_rows
+            chunks = iter_dataframe_text(model.get_df_block, (0, nrows),
+                                         (0, model.total_cols), index=True,
+                                         header=True)
+        self.exporter.export(chunks, nrows, threaded=self._is_local())
 
 
 class DataFrameEditor(QDialog):
@@ -649,16 +885,23 @@ class DataFrameEditor(QDialog):
         """
         Setup DataFrameEditor:
         return False if data is not supported, True otherwise.
-        Supported types for data are DataFrame, Series and DatetimeIndex.
+        Supported types for data are DataFrame, Series and DatetimeIndex,
+        or a RemoteValue for DataFrames and Series living in a kernel.
         """
         self.layout = QGridLayout()
         self.setLayout(self.layout)
         self.setWindowIcon(ima.icon('arredit'))
+        if isinstance(data, RemoteValue):
+            type_name = data.type_name
+        else:
+            type_name = data.__class__.__name__
         if title:
-            title = to_text_string(title) + " - %s" % data.__class__.__name__
+            title = to_text_string(title) + " - %s" % type_name
         else:
-            title = _("%s editor") % data.__class__.__name__
-        if isinstance(data, Series):
+            title = _("%s editor") % type_name
+        if isinstance(data, RemoteValue):
+            self.is_series = data.kind == 'series'
+        elif isinstance(data, Series):
             self.is_series = True
             data = data.to_frame()
         elif isinstance(data, DatetimeIndex):
@@ -667,7 +910,10 @@ class DataFrameEditor(QDialog):
         self.setWindowTitle(title)
         self.resize(600, 500)
 
-        self.dataModel = DataFrameModel(data, parent=self)
+        if isinstance(data, RemoteValue):
+            self.dataModel = RemoteDataFrameModel(data, parent=self)
+        else:
+            self.dataModel = DataFrameModel(data, parent=self)
         self.dataTable = DataFrameView(self, self.dataModel)
 
         self.layout.addWidget(self.dataTable)
@@ -746,7 +992,7 @@ class DataFrameEditor(QDialog):
         # It is import to avoid accessing Qt C++ object as it has probably
         # already been destroyed, due to the Qt.WA_DeleteOnClose attribute
         df = self.dataModel.get_data()
-        if self.is_series:
+        if self.is_series and not isinstance(df, RemoteValue):
             return df.iloc[:, 0]
         else:
             return df
@@ -11,13 +11,15 @@ Text data Importing Wizard based on Qt
 # Standard library imports
 from __future__ import print_function
 from functools import partial as ft_partial
+from itertools import islice
 
 # Third party imports
 from qtpy.compat import to_qvariant
-from qtpy.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal, Slot
+from qtpy.QtCore import (QAbstractTableModel, QModelIndex, Qt, QThread,
+                          Signal, Slot)
 from qtpy.QtGui import QColor, QIntValidator
 from qtpy.QtWidgets import (QCheckBox, QDialog, QFrame, QGridLayout, QGroupBox,
-                            QHBoxLayout, QLabel, QLineEdit,
+                            QHBoxLayout, QLabel, QLineEdit, QProgressDialog,
                             QPushButton, QMenu, QMessageBox, QRadioButton,
                             QSizePolicy, QSpacerItem, QTableView, QTabWidget,
                             QTextEdit, QVBoxLayout, QWidget)
@@ -36,6 +38,17 @@ from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import add_actions, create_action
 
 
+# Number of rows parsed to preview data. Bigger texts are converted in a
+# background thread when the wizard is done
+PREVIEW_ROWS = 500
+
+# Number of rows converted at once in the background
+CHUNK_ROWS = 20000
+
+# Texts bigger than this (in characters) are truncated in the raw text view
+MAX_TEXT_DISPLAY = 2**20
+
+
 def try_to_parse(value):
     _types = ('int', 'float')
     for _t in _types:
@@ -78,6 +91,200 @@ except ImportError:
 def datestr_to_datetime(value, dayfirst=True):
     return dateparse(value, dayfirst=dayfirst)
 
+#----Text parsing
+def iter_rows(text, rowsep=u"\n", skiprows=0, comments='#'):
+    """
+    Iterate over the rows of *text* which are not empty nor comments,
+    after skipping the first *skiprows* rows
+
+    Rows are found one after another, so the text isn't split at once.
+    """
+    start = 0
+    index = 0
+    while start <= len(text):
+        end = text.find(rowsep, start)
+        if end == -1:
+            end = len(text)
+        row = text[start:end]
+        start = end + len(rowsep)
+        index += 1
+        if index <= skiprows:
+            continue
+        stripped = row.strip()
+        if len(stripped) == 0 or (comments and stripped.startswith(comments)):
+            continue
+        yield row
+
+
+def shape_rows(rows, colsep=u"\t", transpose=False, report=None):
+    """
+    Parse *rows* into a rectangular list of lists
+
+    *report* is called with the number of parsed rows every CHUNK_ROWS
+    rows, and the parsing is stopped (None is returned) if it returns True.
+    """
+    out = []
+    for row in rows:
+        line = to_text_string(row).split(colsep)
+        line = [try_to_parse(to_text_string(x)) for x in line]
+        out.append(line)
+        if (report is not None and len(out) % CHUNK_ROWS == 0
+                and report(len(out))):
+            return
+    if not out:
+        return out
+    # Replace missing elements with np.nan's or None's
+    if programs.is_module_installed('numpy'):
+        from numpy import nan
+        out = list(zip_longest(*out, fillvalue=nan))
+    else:
+        out = list(zip_longest(*out, fillvalue=None))
+    # Tranpose the last result to get the expected one
+    out = [[r[col] for r in out] for col in range(len(out[0]))]
+    if transpose:
+        return [[r[col] for r in out] for col in range(len(out[0]))]
+    return out
+
+
+def infer_column_types(data):
+    """
+    Return the type of each column of *data*, a sample of parsed rows:
+    int, float if any value is a float, or None for other values
+    """
+    types = []
+    for col in range(len(data[0]) if data else 0):
+        values = [row[col] for row in data]
+        if all(isinstance(val, INT_TYPES) for val in values):
+            types.append(int)
+        elif all(isinstance(val, (float,) + INT_TYPES) for val in values):
+            types.append(float)
+        else:
+            types.append(None)
+    return types
+
+
+def simplify_shape(data):
+    """
+    Reduce the dimension of *data*, a list of rows or a 2D array: a
+    single row is returned as its values and rows of a single value as
+    these values (a single value is returned alone)
+    """
+    if isinstance(data, ndarray):
+        if data.ndim != 2:
+            return data
+        if len(data) == 1:
+            data = data[0]
+            return data[0] if len(data) == 1 else data
+        return data[:, 0] if data.shape[1] == 1 else data
+    if len(data) == 1:
+        row = data[-1]
+        return row[-1] if len(row) == 1 else row
+    return [row[-1] if len(row) == 1 else row for row in data]
+
+
+def parse_text(text, colsep=u"\t", rowsep=u"\n", transpose=False,
+               skiprows=0, comments='#', kind='list', progress=None,
+               is_canceled=None):
+    """
+    Convert *text* to a list of lists, an array or a DataFrame (given by
+    *kind*), chunk by chunk. Lists and arrays are reduced as by
+    simplify_shape.
+
+    *progress* is called with the percentage of converted rows and the
+    conversion is stopped (None is returned) if *is_canceled* returns
+    True.
+    """
+    total = max(text.count(rowsep), 1)
+
+    def report(done):
+        if progress is not None:
+            progress(min(int(100 * done / total), 100))
+        return is_canceled is not None and is_canceled()
+
+    comment = comments or None
+    if kind == 'dataframe':
+        chunks = []
+        reader = pd.read_csv(io.StringIO(text), sep=colsep,
+                             lineterminator=rowsep, skiprows=skiprows,
+                             comment=comment, chunksize=CHUNK_ROWS)
+        for chunk in reader:
+            chunks.append(chunk)
+            if report(CHUNK_ROWS * len(chunks)):
+                return
+        return pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+
+    sample = shape_rows(islice(iter_rows(text, rowsep, skiprows, comments),
+                               PREVIEW_ROWS), colsep)
+    types = infer_column_types(sample)
+    if (kind == 'array' and pd and len(colsep) == 1 and len(rowsep) == 1
+            and types and all(types)):
+        # Numeric data: parse it with pandas C parser
+        chunks = []
+        try:
+            reader = pd.read_csv(io.StringIO(text), sep=colsep, header=None,
+                                 lineterminator=rowsep, skiprows=skiprows,
+                                 comment=comment, chunksize=CHUNK_ROWS,
+                                 skip_blank_lines=True,
+                                 dtype=dict(enumerate(types)))
+            for chunk in reader:
+                chunks.append(chunk.values)
+                if report(CHUNK_ROWS * len(chunks)):
+                    return
+        except (ValueError, TypeError):
+            # Ragged or not numeric after all: parse it row by row
+            pass
+        else:
+            import numpy as np
+            data = np.concatenate(chunks) if chunks else np.array([])
+            return np.asarray(simplify_shape(data.T if transpose else data))
+
+    rows = iter_rows(text, rowsep, skiprows, comments)
+    data = shape_rows(rows, colsep, transpose, report=report)
+    if data is None:
+        return
+    data = simplify_shape(data)
+    if kind == 'array':
+        return array(data)
+    return data
+
+
+class ImportThread(QThread):
+    """Thread converting text to data in the background"""
+    sig_progress = Signal(int)
+    sig_finished = Signal(object)
+    sig_canceled = Signal()
+    sig_error = Signal(str)
+
+    def __init__(self, parent):
+        QThread.__init__(self, parent)
+        self.text = None
+        self.options = None
+        self.canceled = False
+
+    def initialize(self, text, **options):
+        self.text = text
+        self.options = options
+        self.canceled = False
+
+    def cancel(self):
+        self.canceled = True
+
+    def run(self):
+        """Convert the text, then emit one of the finished, canceled and
+        error signals"""
+        try:
+            data = parse_text(self.text, progress=self.sig_progress.emit,
+                              is_canceled=lambda: self.canceled,
+                              **self.options)
+        except Exception as e:
+            # Exceptions are not propagated to the main thread
+            self.sig_error.emit(str(e))
+        else:
+            if self.canceled:
+                self.sig_canceled.emit()
+            else:
+                self.sig_finished.emit(data)
+
 #----Background colors for supported types
 COLORS = {
           bool: Qt.magenta,
@@ -107,7 +314,11 @@ class ContentsWidget(QWidget):
     def __init__(self, parent, text):
         QWidget.__init__(self, parent)
 
+        self.text = text
         self.text_editor = QTextEdit(self)
+        if len(text) > MAX_TEXT_DISPLAY:
+            # Showing huge texts would freeze the interface
+            text = text[:MAX_TEXT_DISPLAY].rsplit(u"\n", 1)[0] + u"\n..."
         self.text_editor.setText(text)
         self.text_editor.setReadOnly(True)
 
@@ -180,7 +391,7 @@ class ContentsWidget(QWidget):
         other_layout.addWidget(skiprows_label, 0, 0)
         self.skiprows_edt = QLineEdit('0')
         self.skiprows_edt.setMaximumWidth(30)
-        intvalid = QIntValidator(0, len(to_text_string(text).splitlines()),
+        intvalid = QIntValidator(0, to_text_string(self.text).count(u"\n") + 1,
                                  self.skiprows_edt)
         self.skiprows_edt.setValidator(intvalid)
         other_layout.addWidget(self.skiprows_edt, 0, 1)
@@ -334,6 +545,7 @@ class PreviewTable(QTableView):
     def __init__(self, parent):
         QTableView.__init__(self, parent)
         self._model = None
+        self.is_complete = True
 
         # Setting up actions
         self.date_dayfirst_action = create_action(self, "dayfirst",
@@ -366,28 +578,20 @@ class PreviewTable(QTableView):
                                      self.float_action))
 
     def _shape_text(self, text, colsep=u"\t", rowsep=u"\n",
-                    transpose=False, skiprows=0, comments='#'):
-        """Decode the shape of the given text"""
+                    transpose=False, skiprows=0, comments='#',
+                    max_rows=None):
+        """Decode the shape of the given text (only its first *max_rows*)"""
         assert colsep != rowsep
-        out = []
-        text_rows = text.split(rowsep)[skiprows:]
-        for row in text_rows:
-            stripped = to_text_string(row).strip()
-            if len(stripped) == 0 or stripped.startswith(comments):
-                continue
-            line = to_text_string(row).split(colsep)
-            line = [try_to_parse(to_text_string(x)) for x in line]
-            out.append(line)
-        # Replace missing elements with np.nan's or None's
-        if programs.is_module_installed('numpy'):
-            from numpy import nan
-            out = list(zip_longest(*out, fillvalue=nan))
+        rows = iter_rows(text, rowsep, skiprows, comments)
+        if max_rows is not None:
+            rows = list(islice(rows, max_rows + 1))
+            self.is_complete = len(rows) <= max_rows
+            rows = rows[:max_rows]
         else:
-            out = list(zip_longest(*out, fillvalue=None))
-        # Tranpose the last result to get the expected one
-        out = [[r[col] for r in out] for col in range(len(out[0]))]
-        if transpose:
-            return [[r[col] for r in out] for col in range(len(out[0]))]
+            self.is_complete = True
+        out = shape_rows(rows, colsep, transpose)
+        if not out:
+            raise AssertionError(_("There is no data to import"))
         return out
 
     def get_data(self):
@@ -400,7 +604,7 @@ class PreviewTable(QTableView):
                      transpose=False, skiprows=0, comments='#'):
         """Put data into table model"""
         data = self._shape_text(text, colsep, rowsep, transpose, skiprows,
-                                comments)
+                                comments, max_rows=PREVIEW_ROWS)
         self._model = PreviewTableModel(data)
         self.setModel(self._model)
 
@@ -463,9 +667,25 @@ class PreviewWidget(QWidget):
             self.pd_text = text
             self.pd_info = dict(sep=colsep, lineterminator=rowsep,
                 skiprows=skiprows,comment=comments)
+        self.text = text
+        self.parse_info = dict(colsep=colsep, rowsep=rowsep,
+                               transpose=transpose, skiprows=skiprows,
+                               comments=comments)
         self._table_view.process_data(text, colsep, rowsep, transpose,
                                       skiprows, comments)
 
+    def is_complete(self):
+        """Return True if the preview shows all data"""
+        return self._table_view.is_complete
+
+    def get_kind(self):
+        """Return the kind of data to import"""
+        if self.array_btn.isChecked():
+            return 'array'
+        elif pd and self.df_btn.isChecked():
+            return 'dataframe'
+        return 'list'
+
     def get_data(self):
         """Return table data"""
         return self._table_view.get_data()
@@ -495,6 +715,8 @@ class ImportWizard(QDialog):
             varname = _("variable_name")
 
         self.var_name, self.clip_data = None, None
+        self.import_thread = None
+        self.import_progress = None
 
         # Setting GUI
         self.tab_widget = QTabWidget(self)
@@ -585,20 +807,9 @@ class ImportWizard(QDialog):
         # already been destroyed, due to the Qt.WA_DeleteOnClose attribute
         return self.var_name, self.clip_data
 
-    def _simplify_shape(self, alist, rec=0):
-        """Reduce the alist dimension if needed"""
-        if rec != 0:
-            if len(alist) == 1:
-                return alist[-1]
-            return alist
-        if len(alist) == 1:
-            return self._simplify_shape(alist[-1], 1)
-        return [self._simplify_shape(al, 1) for al in alist]
-
     def _get_table_data(self):
         """Return clipboard processed as data"""
-        data = self._simplify_shape(
-                self.table_widget.get_data())
+        data = simplify_shape(self.table_widget.get_data())
         if self.table_widget.array_btn.isChecked():
             return array(data)
         elif pd and self.table_widget.df_btn.isChecked():
@@ -609,7 +820,49 @@ class ImportWizard(QDialog):
 
     def _get_plain_text(self):
         """Return clipboard as text"""
-        return self.text_widget.text_editor.toPlainText()
+        return self.text_widget.text
+
+    def _start_import_thread(self):
+        """Convert data not entirely shown in the preview in a thread"""
+        self.import_progress = QProgressDialog(_("Importing data..."),
+                                               _("Cancel"), 0, 100, self)
+        self.import_progress.setWindowModality(Qt.WindowModal)
+        self.import_progress.setMinimumDuration(500)
+        self.import_thread = ImportThread(self)
+        self.import_thread.initialize(self.table_widget.text,
+                                      kind=self.table_widget.get_kind(),
+                                      **self.table_widget.parse_info)
+        self.import_thread.sig_progress.connect(self.import_progress.setValue)
+        self.import_thread.sig_finished.connect(self.import_finished)
+        self.import_thread.sig_canceled.connect(self._end_import)
+        self.import_thread.sig_error.connect(self.import_error)
+        self.import_progress.canceled.connect(self.import_thread.cancel)
+        self.done_btn.setEnabled(False)
+        self.import_thread.start()
+
+    def _end_import(self):
+        """Wait for the end of the import thread and restore the dialog"""
+        try:
+            # The thread may still be returning from run()
+            self.import_thread.wait()
+            self.import_progress.close()
+        finally:
+            self.import_thread = None
+            self.import_progress = None
+            self.done_btn.setEnabled(True)
+
+    def import_finished(self, data):
+        """Accept data converted by the import thread"""
+        self._end_import()
+        self.clip_data = data
+        self.accept()
+
+    def import_error(self, message):
+        """Show an error of the import thread"""
+        self._end_import()
+        QMessageBox.critical(self, _("Import wizard"),
+                             _("<b>Unable to import data</b>"
+                               "<br><br>Error message:<br>%s") % message)
 
     @Slot()
     def process(self):
@@ -620,6 +873,9 @@ class ImportWizard(QDialog):
         except UnicodeEncodeError:
             self.var_name = to_text_string(var_name)
         if self.text_widget.get_as_data():
+            if not self.table_widget.is_complete():
+                self._start_import_thread()
+                return
             self.clip_data = self._get_table_data()
         elif self.text_widget.get_as_code():
             self.clip_data = try_to_eval(
@@ -14,7 +14,8 @@ This is the main widget used in the Variable Explorer plugin
 import os.path as osp
 
 # Third library imports (qtpy)
-from qtpy.compat import getsavefilename, getopenfilenames
+from qtpy.compat import (getexistingdirectory, getopenfilenames,
+                         getsavefilename)
 from qtpy.QtCore import Qt, Signal, Slot
 from qtpy.QtGui import QCursor
 from qtpy.QtWidgets import (QApplication, QHBoxLayout, QInputDialog, QMenu,
@@ -158,6 +159,16 @@ class NamespaceBrowser(QWidget):
         load_button = create_toolbutton(self, text=_('Import data'),
                                         icon=ima.icon('fileimport'),
                                         triggered=lambda: self.import_data())
+        if iofunctions.load_directory_extensions:
+            # Some formats, e.g. DICOM series, are loaded from directories
+            import_directory_action = create_action(self,
+                    _("Import data from a directory..."),
+                    icon=ima.icon('fileimport'),
+                    triggered=self.import_directory)
+            load_menu = QMenu(self)
+            add_actions(load_menu, [import_directory_action])
+            load_button.setMenu(load_menu)
+            load_button.setPopupMode(QToolButton.MenuButtonPopup)
         self.save_button = create_toolbutton(self, text=_("Save data"),
                             icon=ima.icon('filesave'),
                             triggered=lambda: self.save_data(self.filename))
@@ -268,7 +279,25 @@ class NamespaceBrowser(QWidget):
             self.filename = to_text_string(filename)
             ext = osp.splitext(self.filename)[1].lower()
 
-            if ext not in iofunctions.load_funcs:
+            if osp.isdir(self.filename):
+                formats = sorted(iofunctions.load_directory_extensions)
+                if not formats:
+                    QMessageBox.critical(self, title,
+                                         _("<b>Unable to load '%s'</b><br><br>"
+                                           "No format can be loaded from a "
+                                           "directory") % self.filename)
+                    return
+                if len(formats) > 1:
+                    item, ok = QInputDialog.getItem(self, title,
+                                                    _('Open directory as:'),
+                                                    formats, 0, False)
+                    if not ok:
+                        return
+                else:
+                    item = formats[0]
+                ext = iofunctions.load_directory_extensions[
+                    to_text_string(item)]
+            elif ext not in iofunctions.load_funcs:
                 buttons = QMessageBox.Yes | QMessageBox.Cancel
                 answer = QMessageBox.question(self, title,
                             _("<b>Unsupported file extension '%s'</b><br><br>"
@@ -317,6 +346,18 @@ class NamespaceBrowser(QWidget):
                                        ) % (self.filename, error_message))
             self.refresh_table()
             
+    @Slot()
+    def import_directory(self):
+        """Import data from a directory, e.g. a DICOM series"""
+        if self.filename is None:
+            basedir = getcwd()
+        else:
+            basedir = osp.dirname(self.filename)
+        directory = getexistingdirectory(self, _("Import data from a "
+                                                 "directory"), basedir)
+        if directory:
+            self.import_data(directory)
+
     @Slot()
     def save_data(self, filename=None):
         """Save data"""
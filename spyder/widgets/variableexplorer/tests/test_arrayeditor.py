@@ -14,7 +14,8 @@ import pytest
 
 # Local imports
 from spyder.utils.qthelpers import qapplication
-from spyder.widgets.variableexplorer.arrayeditor import ArrayEditor
+from spyder.widgets.variableexplorer import arrayeditor, textexport
+from spyder.widgets.variableexplorer.arrayeditor import ArrayEditor, ArrayModel
 
 
 def launch_arrayeditor(data, title="", xlabels=None, ylabels=None):
@@ -84,6 +85,43 @@ def test_arrayeditor_with_3d_array(qtbot):
     assert_array_equal(arr, launch_arrayeditor(arr, "3D array"))
 
 
+def test_arraymodel_hue_is_computed_by_blocks():
+    arr = np.arange(1200 * 50, dtype=float).reshape(1200, 50)
+    model = ArrayModel(arr)
+    vmax, vmin = arr.max(), arr.min()
+    for i, j in [(0, 0), (600, 45), (1100, 49)]:
+        hue = model.hue0 + model.dhue * (vmax - arr[i, j]) / (vmax - vmin)
+        assert abs(model.get_hue(i, j) - hue) < 1e-12
+    assert len(model._hue_cache) == 3
+
+
+def test_arrayview_copy_in_background(qtbot, monkeypatch):
+    monkeypatch.setattr(textexport, 'COPY_SYNC_MAX_CELLS', 0)
+    arr = np.arange(6).reshape(3, 2)
+    dlg = ArrayEditor()
+    assert dlg.setup_and_check(arr)
+    view = dlg.arraywidget.view
+    view.selectAll()
+    with qtbot.waitSignal(view.exporter.sig_finished, timeout=5000):
+        view.copy()
+    app = qapplication()
+    assert app.clipboard().text() == u'0\t1\n2\t3\n4\t5\n'
+
+
+def test_arrayview_copy_error(qtbot, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(arrayeditor.QMessageBox, 'warning',
+                        lambda *args: warnings.append(args))
+    arr = np.array([['a', 'b'], ['c', 'd']])
+    dlg = ArrayEditor()
+    assert dlg.setup_and_check(arr)
+    view = dlg.arraywidget.view
+    view.selectAll()
+    view.copy()
+    assert len(warnings) == 1
+    assert not view.exporter.is_running()
+
+
 if __name__ == "__main__":
     pytest.main()
 
@@ -8,18 +8,23 @@ Tests for collectionseditor.py
 """
 
 # Standard library imports
+import time
 try:
     from unittest.mock import Mock
 except ImportError:
     from mock import Mock # Python 2
 
 # Third party imports
+import numpy
 import pandas
 import pytest
+from qtpy.QtCore import Qt
 
 # Local imports
 from spyder.widgets.variableexplorer.collectionseditor import (
-    CollectionsEditorTableView, CollectionsModel)
+    CollectionsEditorTableView, CollectionsModel,
+    RemoteCollectionsEditorTableView)
+from spyder.widgets.variableexplorer.utils import get_value_info
 
 # Helper functions
 def data(cm, i, j):
@@ -94,6 +99,63 @@ def test_shows_dataframeeditor_when_editing_datetimeindex(qtbot, monkeypatch):
     editor.delegate.createEditor(None, None, editor.model.createIndex(0, 3))
     mockDataFrameEditor_instance.show.assert_called_once_with()
 
+def test_collectionsmodel_sizes_are_lazy_and_sorted_with_keys():
+    coll = dict(('k%03d' % i, list(range(i % 7))) for i in range(300))
+    cm = CollectionsModel(None, coll)
+    assert cm.rowCount() == cm.ROWS_TO_LOAD
+    assert cm.sizes[cm.ROWS_TO_LOAD] is None
+    cm.sort(0, Qt.DescendingOrder)
+    assert cm.keys == sorted(coll, reverse=True)
+    assert data(cm, 0, 0) == 'k299'
+    assert data(cm, 0, 2) == str(299 % 7)
+    cm.sort(2)
+    assert cm.sizes == sorted(len(value) for value in coll.values())
+    assert [len(coll[key]) for key in cm.keys] == cm.sizes
+    # Keys with equal sizes keep their previous (descending) order
+    assert cm.keys[:2] == ['k294', 'k287']
+
+def test_collectionsmodel_resolves_slow_attributes_later(qtbot):
+    class Slow(object):
+        fast = 1
+        @property
+        def slow(self):
+            time.sleep(0.5)
+            return 'done'
+        @property
+        def broken(self):
+            raise ValueError('boom')
+    cm = CollectionsModel(None, Slow())
+    row = cm.keys.index('slow')
+    assert data(cm, row, 3) == 'Computing...'
+    assert data(cm, row, 1) == ''
+    assert data(cm, cm.keys.index('fast'), 3) == '1'
+    broken = cm.keys.index('broken')
+    assert data(cm, broken, 1) == 'ValueError'
+    assert data(cm, broken, 3) == 'Error: boom'
+    with qtbot.waitSignal(cm.sig_attribute_resolved, timeout=5000):
+        pass
+    assert data(cm, row, 1) == 'str'
+    assert data(cm, row, 3) == 'done'
+
+def test_remote_value_info_only_asked_for_large_values(qtbot):
+    shellwidget = Mock()
+    shellwidget.get_value_info.return_value = get_value_info(
+        numpy.zeros((1000, 1000)))
+    view_data = dict((name, {'type': 'ndarray', 'size': shape,
+                             'color': '#0000ff', 'view': 'Min: 0'})
+                     for name, shape in (('small', (10, 10)),
+                                         ('large', (1000, 1000))))
+    editor = RemoteCollectionsEditorTableView(None, view_data,
+                                              shellwidget=shellwidget)
+    qtbot.addWidget(editor)
+    properties = {'is_data_frame': False, 'is_series': False,
+                  'is_array': True, 'array_ndim': 2}
+    editor.var_properties = {'small': properties, 'large': properties}
+    assert editor.get_remote_value('small') is None
+    assert not shellwidget.get_value_info.called
+    assert editor.get_remote_value('large').shape == (1000, 1000)
+    shellwidget.get_value_info.assert_called_once_with('large')
+
 
 if __name__ == "__main__":
     pytest.main()
@@ -26,7 +26,10 @@ import pytest
 from spyder.utils.programs import is_module_installed
 from spyder.widgets.variableexplorer import dataframeeditor
 from spyder.widgets.variableexplorer.dataframeeditor import (
-    DataFrameEditor, DataFrameModel)
+    DataFrameEditor, DataFrameModel, RemoteDataFrameModel)
+from spyder.widgets.variableexplorer.utils import (
+    get_value_info, get_value_window, RemoteValue, set_value_items,
+    sort_permutation)
 from spyder.py3compat import PY2
 
 FILES_PATH = os.path.dirname(os.path.realpath(__file__))
@@ -45,6 +48,32 @@ def data(dfm, i, j):
 def bgcolor(dfm, i, j):
     return dfm.get_bgcolor(dfm.createIndex(i, j))
 
+class LocalBackend(object):
+    """Backend doing what a kernel does for RemoteValue's, locally"""
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.views = {}
+
+    def get_value_window(self, name, rows, cols):
+        return get_value_window(self.namespace[name], rows, cols,
+                                permutation=self.views.get(name))
+
+    def sort_value_view(self, name, column, ascending):
+        self.views[name] = sort_permutation(self.namespace[name], column,
+                                            ascending=ascending,
+                                            permutation=self.views.get(name))
+
+    def set_value_items(self, name, items):
+        set_value_items(self.namespace[name], items,
+                        permutation=self.views.get(name))
+
+    def close_value_view(self, name):
+        self.views.pop(name, None)
+
+def remote_value(value):
+    return RemoteValue(LocalBackend({'x': value}), 'x', get_value_info(value))
+
 # --- Tests
 # -----------------------------------------------------------------------------
 
@@ -82,6 +111,89 @@ def test_dataframemodel_sort_is_stable():   # cf. issue 3010
     assert col2 == [str(x) for x in [1, 3, 4, 6, 11, 12, 15, 17,
                                      2, 5, 7, 8, 9, 10, 13, 14, 16]]
 
+def test_dataframemodel_sort_keeps_dataframe():
+    df = DataFrame({'colA': [1, 3], 'colB': ['c', 'a']})
+    dfm = DataFrameModel(df)
+    dfm.sort(2)
+    assert df['colB'].tolist() == ['c', 'a']
+    assert dfm.get_data() is df
+    dfm.sort(0, Qt.DescendingOrder)
+    assert [data(dfm, i, 0) for i in range(2)] == ['1', '0']
+
+def test_dataframemodel_sort_inplace():
+    df = DataFrame({'colA': [1, 3], 'colB': ['c', 'a']})
+    dfm = DataFrameModel(df, sort_inplace=True)
+    dfm.sort(2)
+    assert df['colB'].tolist() == ['a', 'c']
+    assert dfm.sort_permutation is None
+
+def test_dataframemodel_sort_puts_nan_last():
+    df = DataFrame({'colA': [2.0, float('nan'), 1.0, 2.0]})
+    dfm = DataFrameModel(df)
+    dfm.sort(1, Qt.DescendingOrder)
+    assert [data(dfm, i, 0) for i in range(4)] == ['0', '3', '2', '1']
+
+def test_dataframemodel_sort_large_dataframe_in_thread(qtbot):
+    nrows = int(dataframeeditor.LARGE_NROWS) + 1
+    df = DataFrame({'colA': range(nrows, 0, -1)})
+    dfm = DataFrameModel(df)
+    assert dfm.sort(1)
+    qtbot.waitUntil(lambda: dfm.sort_permutation is not None, timeout=10000)
+    assert data(dfm, 0, 1) == '1'
+    assert data(dfm, 0, 0) == str(nrows - 1)
+    assert df['colA'].iloc[0] == nrows
+
+def test_dataframemodel_sort_thread_reports_errors(qtbot, monkeypatch):
+    def sort_permutation(*args, **kwargs):
+        raise MemoryError('no memory left')
+    monkeypatch.setattr(dataframeeditor, 'sort_permutation', sort_permutation)
+    critical = Mock()
+    monkeypatch.setattr(dataframeeditor.QMessageBox, 'critical', critical)
+    nrows = int(dataframeeditor.LARGE_NROWS) + 1
+    dfm = DataFrameModel(DataFrame({'colA': range(nrows)}))
+    assert dfm.sort(1)
+    qtbot.waitUntil(lambda: critical.called, timeout=10000)
+    assert 'no memory left' in critical.call_args[0][2]
+    assert dfm.sort_permutation is None
+
+def test_remote_dataframemodel():
+    df = DataFrame({'colA': [1, 3], 'colB': ['c', 'a']})
+    dfm = RemoteDataFrameModel(remote_value(df))
+    assert dfm.rowCount() == 2
+    assert dfm.columnCount() == 3
+    assert dfm.max_min_col == [[3, 1], None]
+    assert dfm.headerData(2, Qt.Horizontal) == 'colB'
+    dfm.sort(2)
+    assert [data(dfm, i, 0) for i in range(2)] == ['1', '0']
+    assert data(dfm, 0, 2) == 'a'
+    assert dfm.setData(dfm.createIndex(0, 1), '7')
+    assert data(dfm, 0, 1) == '7'
+    assert dfm.max_min_col == [[7, 1], None]
+    assert dfm.get_data().max_min_col == [[3, 1], None]
+    assert df['colA'].tolist() == [1, 3]
+    dfm.get_data().commit()
+    assert df['colA'].tolist() == [1, 7]
+
+def test_dataframeeditor_with_remote_series():
+    editor = DataFrameEditor(None)
+    value = remote_value(dataframeeditor.Series([3, 1, 2], name='s'))
+    assert editor.setup_and_check(value, title='s')
+    assert editor.is_series
+    assert editor.windowTitle() == 's - Series'
+    assert editor.get_value() is value
+    assert data(editor.dataModel, 2, 1) == '2'
+
+def test_dataframemodel_setdata_updates_edited_column():
+    df = DataFrame({'colA': [1, 3, 2], 'colB': [4.0, 5.0, 6.0]})
+    dfm = DataFrameModel(df)
+    def max_min_col_update():
+        raise AssertionError("all the columns were updated")
+    dfm.max_min_col_update = max_min_col_update
+    assert dfm.setData(dfm.createIndex(1, 1), '0')
+    assert dfm.max_min_col == [[2, 0], [6.0, 4.0]]
+    assert dfm.setData(dfm.createIndex(0, 2), '10')
+    assert dfm.max_min_col == [[2, 0], [10.0, 5.0]]
+
 def test_dataframemodel_max_min_col_update():
     df = DataFrame([[1, 2.0], [2, 2.5], [3, 9.0]])
     dfm = DataFrameModel(df)
@@ -135,6 +247,30 @@ def test_dataframemodel_get_bgcolor_with_numbers_using_global_max():
     assert colorclose(bgcolor(dfm, 1, 2), (h0 + 20 / 40 * dh, s, v, a))
     assert colorclose(bgcolor(dfm, 2, 2), (h0,                s, v, a))
 
+def test_dataframemodel_get_bgcolor_with_large_dataframe():
+    nrows = int(dataframeeditor.LARGE_SIZE) + 1
+    df = DataFrame({'colA': range(nrows)})
+    dfm = DataFrameModel(df)
+    assert dfm.bgcolor_enabled
+    assert dfm.max_min_col == [[nrows - 1, 0]]
+    h0 = dataframeeditor.BACKGROUND_NUMBER_MINHUE
+    dh = dataframeeditor.BACKGROUND_NUMBER_HUERANGE
+    s = dataframeeditor.BACKGROUND_NUMBER_SATURATION
+    v = dataframeeditor.BACKGROUND_NUMBER_VALUE
+    a = dataframeeditor.BACKGROUND_NUMBER_ALPHA
+    assert colorclose(bgcolor(dfm, 0, 1), (h0 + dh, s, v, a))
+    assert colorclose(bgcolor(dfm, nrows - 1, 1), (h0, s, v, a))
+    row = dfm.ROWS_TO_LOAD + 1
+    hue = h0 + dh * (nrows - 1 - row) / (nrows - 1)
+    assert colorclose(bgcolor(dfm, row, 1), (hue, s, v, a))
+
+def test_dataframemodel_get_bgcolor_with_nan():
+    df = DataFrame([[0.0], [float('nan')], [2.0]])
+    dfm = DataFrameModel(df)
+    h, s, v, dummy = QColor(dataframeeditor.BACKGROUND_NONNUMBER_COLOR).getHsvF()
+    a = dataframeeditor.BACKGROUND_MISC_ALPHA
+    assert colorclose(bgcolor(dfm, 1, 1), (h, s, v, a))
+
 def test_dataframemodel_get_bgcolor_for_index():
     df = DataFrame([[0]])
     dfm = DataFrameModel(df)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for importwizard.py
+"""
+
+# Standard library imports
+import time
+
+# Third party imports
+import numpy as np
+from pandas import DataFrame
+import pytest
+
+# Local imports
+from spyder.widgets.variableexplorer import importwizard
+from spyder.widgets.variableexplorer.importwizard import (ImportWizard,
+                                                         iter_rows,
+                                                         parse_text,
+                                                         simplify_shape)
+
+
+# --- Tests
+# -----------------------------------------------------------------------------
+def test_iter_rows():
+    text = u"# header\n1,2\n\n3,4\n  # comment\n5,6"
+    assert list(iter_rows(text)) == [u"1,2", u"3,4", u"5,6"]
+    assert list(iter_rows(text, skiprows=2)) == [u"3,4", u"5,6"]
+    assert list(iter_rows(u"1;2|3;4", rowsep=u"|")) == [u"1;2", u"3;4"]
+
+def test_parse_text_numeric_array():
+    text = u"\n".join(u"%d,%d" % (i, 2 * i) for i in range(50000))
+    progress = []
+    data = parse_text(text, colsep=u",", kind='array',
+                      progress=progress.append)
+    assert data.shape == (50000, 2)
+    assert data.dtype == np.int64
+    assert data[-1].tolist() == [49999, 99998]
+    assert progress[-1] == 100
+    data = parse_text(u"1,2\n3,4", colsep=u",", kind='array', transpose=True)
+    assert data.tolist() == [[1, 3], [2, 4]]
+
+def test_parse_text_ragged_and_mixed():
+    data = parse_text(u"1,a\n2", colsep=u",", kind='list')
+    assert data[0] == [1, u'a']
+    assert data[1][0] == 2 and np.isnan(data[1][1])
+    data = parse_text(u"1,2\n3", colsep=u",", kind='array')
+    assert data.shape == (2, 2) and np.isnan(data[1, 1])
+
+def test_parse_text_dataframe():
+    data = parse_text(u"a,b\n1,2\n3,4", colsep=u",", kind='dataframe')
+    assert isinstance(data, DataFrame)
+    assert data['b'].tolist() == [2, 4]
+
+def test_parse_text_cancel():
+    text = u"\n".join(u"%d" % i for i in range(50000))
+    assert parse_text(text, kind='list', is_canceled=lambda: True) is None
+
+def test_import_wizard_big_text(qtbot, monkeypatch):
+    monkeypatch.setattr(importwizard, 'PREVIEW_ROWS', 10)
+    text = u"\n".join(u"%d\t%d" % (i, i) for i in range(100))
+    wizard = ImportWizard(None, text)
+    wizard.text_widget.tab_btn.setChecked(True)
+    wizard._set_step(1)
+    assert len(wizard.table_widget.get_data()) == 10
+    assert not wizard.table_widget.is_complete()
+    with qtbot.waitSignal(wizard.accepted, timeout=10000):
+        wizard.process()
+    assert wizard.get_data()[1].shape == (100, 2)
+
+def test_parse_text_row_by_row_is_cancelable(monkeypatch):
+    monkeypatch.setattr(importwizard, 'CHUNK_ROWS', 10)
+    text = u"\n".join(u"%d\ta" % i for i in range(100))
+    progress = []
+    data = parse_text(text, kind='list', progress=progress.append)
+    assert len(data) == 100
+    assert progress[:2] == [10, 20]
+    assert parse_text(text, kind='list', is_canceled=lambda: True) is None
+
+def test_import_wizard_cancel(qtbot, monkeypatch):
+    def parse_text(text, progress=None, is_canceled=None, **options):
+        while not is_canceled():
+            time.sleep(0.01)
+    monkeypatch.setattr(importwizard, 'PREVIEW_ROWS', 10)
+    monkeypatch.setattr(importwizard, 'parse_text', parse_text)
+    text = u"\n".join(u"%d\t%d" % (i, i) for i in range(100))
+    wizard = ImportWizard(None, text)
+    wizard.text_widget.tab_btn.setChecked(True)
+    wizard._set_step(1)
+    wizard.process()
+    assert not wizard.done_btn.isEnabled()
+    wizard.import_thread.cancel()
+    qtbot.waitUntil(lambda: wizard.import_thread is None, timeout=5000)
+    assert wizard.done_btn.isEnabled()
+    assert wizard.import_progress is None
+
+def test_import_wizard_small_text(qtbot):
+    wizard = ImportWizard(None, u"1\t2\n3\t4")
+    wizard.text_widget.tab_btn.setChecked(True)
+    wizard._set_step(1)
+    assert wizard.table_widget.is_complete()
+    wizard.process()
+    assert wizard.get_data()[1].tolist() == [[1, 2], [3, 4]]
+
+
+def test_simplify_shape():
+    assert simplify_shape([[1], [2]]) == [1, 2]
+    assert simplify_shape([[1, 2]]) == [1, 2]
+    assert simplify_shape([[1]]) == 1
+    assert simplify_shape(np.array([[1], [2]])).tolist() == [1, 2]
+    assert simplify_shape(np.array([[1, 2]])).tolist() == [1, 2]
+    assert simplify_shape(np.array([[1]])) == 1
+
+@pytest.mark.parametrize('text', [u"\n".join(u"%d" % i for i in range(20)),
+                                  u"\t".join(u"%d" % i for i in range(20)),
+                                  u"1", u"1\ta\n2\tb\n3"])
+@pytest.mark.parametrize('kind', ['array', 'list'])
+def test_import_wizard_same_data_in_thread(qtbot, text, kind):
+    """Data converted in the background has the shape of the preview's"""
+    def import_data(in_thread):
+        wizard = ImportWizard(None, text)
+        wizard.text_widget.tab_btn.setChecked(True)
+        wizard._set_step(1)
+        wizard.table_widget.array_btn.setChecked(kind == 'array')
+        if in_thread:
+            # As if the preview didn't show all the data
+            wizard.table_widget.is_complete = lambda: False
+        with qtbot.waitSignal(wizard.accepted, timeout=10000):
+            wizard.process()
+        return wizard.get_data()[1]
+    data = import_data(False)
+    thread_data = import_data(True)
+    if kind == 'array':
+        assert thread_data.shape == data.shape
+        data, thread_data = data.tolist(), thread_data.tolist()
+    assert repr(thread_data) == repr(data)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -17,6 +17,7 @@ except ImportError:
 import pytest
 
 # Local imports
+from spyder.utils.iofuncs import iofunctions
 from spyder.widgets.variableexplorer.namespacebrowser import NamespaceBrowser
 
 def test_setup_sets_dataframe_format(qtbot):
@@ -28,5 +29,21 @@ def test_setup_sets_dataframe_format(qtbot):
     assert browser.editor.model.dataframe_format == '%10.5f'
 
 
+def test_import_data_directory(qtbot, tmpdir, monkeypatch):
+    """Directories are loaded with the formats that accept them"""
+    monkeypatch.setattr(iofunctions, 'load_directory_extensions',
+                        {'DICOM images': '.dcm'})
+    monkeypatch.setitem(iofunctions.load_funcs, '.dcm', Mock())
+    browser = NamespaceBrowser(None)
+    shellwidget = Mock()
+    shellwidget.load_data.return_value = None
+    browser.set_shellwidget(shellwidget)
+    browser.setup(exclude_private=True, exclude_uppercase=True,
+                  exclude_capitalized=True, exclude_unsupported=True,
+                  minmax=False)
+    browser.import_data(tmpdir.strpath)
+    shellwidget.load_data.assert_called_once_with(tmpdir.strpath, '.dcm')
+
+
 if __name__ == "__main__":
     pytest.main()
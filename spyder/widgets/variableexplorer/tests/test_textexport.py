@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""
+Tests for textexport.py
+"""
+
+# Standard library imports
+import threading
+
+# Third party imports
+import pytest
+from qtpy.QtWidgets import QWidget
+
+# Local imports
+from spyder.widgets.variableexplorer.textexport import (COPY_SYNC_MAX_CELLS,
+                                                        consume_chunks,
+                                                        export_chunks,
+                                                        TextExporter)
+
+
+def test_consume_chunks():
+    progress = []
+    chunks = [(u'a\n', 1), (u'b\n', 2), (u'c\n', 4)]
+    assert consume_chunks(chunks, 4, progress=progress.append) == u'a\nb\nc\n'
+    assert progress == [25, 50, 100]
+    assert consume_chunks(chunks, 4, is_canceled=lambda: True) is None
+
+
+def test_export_chunks(tmpdir):
+    target = tmpdir.join('export.txt')
+    chunks = [(u'a\n', 1), (u'b\n', 2)]
+    assert export_chunks(iter(chunks), 2, target.strpath) == u''
+    assert target.read() == u'a\nb\n'
+    # Canceled exports don't touch the existing file
+    assert export_chunks(iter(chunks), 2, target.strpath,
+                         is_canceled=lambda: True) is None
+    assert target.read() == u'a\nb\n'
+    assert tmpdir.listdir() == [target]
+
+
+def test_export_chunks_error(tmpdir):
+    target = tmpdir.join('export.txt')
+
+    def chunks():
+        yield u'a\n', 1
+        raise MemoryError
+
+    with pytest.raises(MemoryError):
+        export_chunks(chunks(), 2, target.strpath)
+    assert not tmpdir.listdir()
+
+
+def test_text_exporter_cancel(qtbot):
+    widget = QWidget()
+    exporter = TextExporter(widget)
+    resume = threading.Event()
+
+    def chunks():
+        yield u'a\n', 1
+        resume.wait(5)
+        yield u'b\n', 2
+
+    with qtbot.waitSignal(exporter.sig_finished, timeout=5000):
+        exporter.copy(chunks(), 2, COPY_SYNC_MAX_CELLS + 1)
+        exporter.thread.cancel()
+        resume.set()
+    assert not exporter.is_running()
+
+    # Copies are possible again after a canceled one
+    with qtbot.waitSignal(exporter.sig_finished, timeout=5000):
+        exporter.copy(iter([(u'c\n', 1)]), 1, COPY_SYNC_MAX_CELLS + 1)
+    assert not exporter.is_running()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -8,10 +8,68 @@ Tests for utils.py
 """
 
 # Third party imports
+import numpy as np
+from pandas import DataFrame
 import pytest
 
 # Local imports
-from spyder.widgets.variableexplorer.utils import sort_against
+from spyder.widgets.variableexplorer.utils import (
+    argsort, ARRAY_COLOR, diff_remote_view, get_color_name, get_namespace_ids,
+    get_remote_data, get_size, get_value_info, get_value_window,
+    get_var_fingerprint, is_supported, iter_array_text, iter_dataframe_text,
+    pack_remote_view, RemoteValue, set_value_items, sort_against,
+    sort_permutation, unpack_remote_view, VarPropertiesCache)
+
+
+# --- Helpers
+# -----------------------------------------------------------------------------
+class LocalBackend(object):
+    """Backend doing what a kernel does for RemoteValue's, locally"""
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.views = {}
+        self.windows = []
+
+    def get_value_info(self, name):
+        return get_value_info(self.namespace[name])
+
+    def get_value_window(self, name, rows, cols):
+        self.windows.append((rows, cols))
+        return get_value_window(self.namespace[name], rows, cols,
+                                permutation=self.views.get(name))
+
+    def sort_value_view(self, name, column, ascending):
+        self.views[name] = sort_permutation(self.namespace[name], column,
+                                            ascending=ascending,
+                                            permutation=self.views.get(name))
+
+    def set_value_items(self, name, items):
+        set_value_items(self.namespace[name], items,
+                        permutation=self.views.get(name))
+
+    def close_value_view(self, name):
+        self.views.pop(name, None)
+
+
+class LazyArray(object):
+    """Array reading its data only when it's sliced"""
+    lazy_array = True
+
+    def __init__(self, data):
+        self.data = data
+        self.shape, self.ndim, self.dtype = data.shape, data.ndim, data.dtype
+        self.size = data.size
+        self.reads = []
+
+    def __getitem__(self, key):
+        self.reads.append(key)
+        return self.data[key]
+
+
+def remote_value(value):
+    backend = LocalBackend({'x': value})
+    return RemoteValue(backend, 'x', backend.get_value_info('x'))
 
 
 # --- Tests
@@ -27,7 +85,216 @@ def test_sort_against_is_stable():
     listb = [1, 1, 1]
     res = sort_against(lista, listb)
     assert res == lista
-    
+
+def test_argsort():
+    assert argsort([3, 1, 2]) == [1, 2, 0]
+    assert argsort([1, 0, 1, 0], reverse=True) == [0, 2, 1, 3]
+    assert argsort([1, 'a', None]) is None
+
+
+def test_remote_value_with_1d_array():
+    arr = np.arange(1200.)
+    value = remote_value(arr)
+    assert value.shape == (1200, 1)
+    assert value.min_max == (0., 1199.)
+    assert value[0, 0] == 0.
+    assert value[1100, 0] == 1100.
+    assert value[499, 0] == 499.
+    # Cells of the same block are fetched only once
+    assert len(value.backend.windows) == 2
+    np.testing.assert_array_equal(value[10:20, :], arr[10:20, None])
+
+def test_remote_value_cache_is_bounded():
+    value = remote_value(np.arange(100000.))
+    for row in range(0, 100000, value.BLOCK_ROWS):
+        value[row, 0]
+    assert len(value._cache) == value.CACHE_SIZE
+
+def test_remote_value_buffers_changes():
+    arr = np.zeros((3, 3))
+    value = remote_value(arr)
+    value[1, 2] = 5.
+    assert value[1, 2] == 5.
+    assert arr[1, 2] == 0.
+    value.commit()
+    assert arr[1, 2] == 5.
+
+def test_remote_value_windows_inside_a_block_are_cached():
+    arr = np.arange(1000.).reshape(50, 20)
+    value = remote_value(arr)
+    np.testing.assert_array_equal(value[:, 3:4], arr[:, 3:4])
+    np.testing.assert_array_equal(value[10:30, 5:9], arr[10:30, 5:9])
+    assert value[7, 2] == arr[7, 2]
+    assert len(value.backend.windows) == 1
+    # Windows overlapping several blocks are fetched directly
+    value = remote_value(np.arange(1200.))
+    np.testing.assert_array_equal(value[490:510, :],
+                                  np.arange(490., 510.)[:, None])
+    assert value.backend.windows == [((490, 510), (0, 1))]
+
+def test_remote_value_windows_show_changes():
+    df = DataFrame({'a': [1., 2., 3.], 'b': [4., 5., 6.]})
+    value = remote_value(df)
+    value[1, 1] = 10.
+    assert value[:, 1:2].iloc[:, 0].tolist() == [4., 10., 6.]
+    assert value[0:1, :].iloc[0].tolist() == [1., 4.]
+    # The cached block is left untouched
+    assert value.get_block(0, 0).iat[1, 1] == 5.
+    arr = np.zeros((600, 2))
+    value = remote_value(arr)
+    value[550, 1] = 7.
+    assert value[540:560, 1:2][10, 0] == 7.
+    assert value[490:560, 1:2][60, 0] == 7.
+
+def test_remote_value_sort_and_edit_dataframe():
+    df = DataFrame({'a': [3, 1, 2]}, index=['x', 'y', 'z'])
+    value = remote_value(df)
+    assert value.kind == 'dataframe'
+    assert value.max_min_col == [[3, 1]]
+    value.sort(1)
+    assert [value[i, 0] for i in range(3)] == [1, 2, 3]
+    assert [value.get_index_label(i) for i in range(3)] == ['y', 'z', 'x']
+    value[0, 0] = 10
+    value.commit()
+    assert df['a'].tolist() == [3, 10, 2]
+    value.close()
+    assert not value.backend.views
+
+def test_remote_value_info_for_unsupported_arrays():
+    assert not get_value_info(np.zeros((2, 2, 2)))['supported']
+    assert not get_value_info(np.ma.array([1, 2]))['supported']
+
+def test_lazy_array_remote_value():
+    lazy = LazyArray(np.arange(12.).reshape(6, 2))
+    assert is_supported(lazy, filters=(dict,))
+    assert get_color_name(lazy) == ARRAY_COLOR
+    assert get_size(lazy) == (6, 2)
+    value = remote_value(lazy)
+    assert value.readonly and value.min_max is None
+    assert value.shape == (6, 2)
+    assert not lazy.reads
+    assert value[1, 1] == 3.
+    assert lazy.reads == [(slice(0, 500), slice(0, 40))]
+    # 1D lazy arrays are seen as a column
+    value = remote_value(LazyArray(np.arange(5)))
+    assert value.shape == (5, 1)
+    assert value[3, 0] == 3
+    assert not remote_value(np.arange(5)).readonly
+
+def test_var_properties_cache():
+    calls = []
+    def get_len(value):
+        calls.append(value)
+        return len(value)
+    cache = VarPropertiesCache({'len': get_len, 'is_list': lambda value:
+                                isinstance(value, list)})
+    lista, arr = [1, 2], np.zeros(3)
+    ns = {'a': lista, 'b': arr}
+    props = cache.get_namespace_properties(ns)
+    assert props == {'a': {'len': 2, 'is_list': True},
+                     'b': {'len': 3, 'is_list': False}}
+    cache.get_namespace_properties(ns)
+    assert len(calls) == 2
+    # An unrelated execution doesn't recompute unchanged variables
+    ids = get_namespace_ids(ns)
+    ns['c'] = [0]
+    cache.invalidate(ns, ids)
+    assert cache.get_namespace_properties(ns)['c']['len'] == 1
+    assert len(calls) == 3
+    # Rebound variables are forgotten after an execution
+    ids = get_namespace_ids(ns)
+    ns['b'] = np.zeros(4)
+    cache.invalidate(ns, ids)
+    assert 'b' not in cache and 'a' in cache
+    assert cache.get_namespace_properties(ns)['b']['len'] == 4
+    assert len(calls) == 4
+    # Mutations changing the fingerprint are detected
+    lista.append(3)
+    arr = ns['b']
+    arr.resize(5, refcheck=False)
+    props = cache.get_namespace_properties(ns)
+    assert (props['a']['len'], props['b']['len']) == (3, 5)
+    assert len(calls) == 6
+    # Deleted names are forgotten
+    del ns['a']
+    assert 'a' not in cache.get_namespace_properties(ns)
+    assert 'a' not in cache and len(cache) == 2
+    cache.forget('b')
+    assert 'b' not in cache
+
+def test_lazy_var_properties():
+    """Properties are only computed when they're accessed"""
+    calls = []
+    def get_len(value):
+        calls.append(value)
+        return len(value)
+    cache = VarPropertiesCache({'len': get_len, 'is_list': lambda value:
+                                isinstance(value, list)})
+    props = cache.get_properties('a', [1, 2])
+    assert props['is_list'] and not calls
+    assert props.get_all() == {'len': 2, 'is_list': True}
+    assert len(calls) == 1 and props.value is None
+
+def test_var_fingerprint():
+    arr = np.zeros(3)
+    fingerprint = get_var_fingerprint(arr)
+    arr[0] = 1
+    assert get_var_fingerprint(arr) == fingerprint
+    assert get_var_fingerprint(arr.astype(int)) != fingerprint
+    assert get_var_fingerprint(arr.reshape(3, 1)) != fingerprint
+    assert get_var_fingerprint([1]) != get_var_fingerprint([1, 2])
+
+def test_get_remote_data_keeps_settings():
+    settings = {'check_all': False, 'exclude_private': True,
+                'exclude_uppercase': True, 'exclude_capitalized': False,
+                'exclude_unsupported': False, 'excluded_names': ['z']}
+    data = get_remote_data({'a': 1, 'z': 2, 'In': 3}, settings, 'editable',
+                           more_excluded_names=['In'])
+    assert data == {'a': 1}
+    assert settings['excluded_names'] == ['z']
+
+def test_pack_remote_view():
+    view = {'a': {'type': 'int', 'size': 1, 'color': '#0000ff', 'view': '1'},
+            u'é': {'type': 'ndarray', 'size': (2, 3), 'color': '#0000ff',
+                   'view': u'Min: é'}}
+    assert unpack_remote_view(pack_remote_view(view)) == (view, [], True)
+
+def test_pack_remote_view_changes():
+    old = {'a': {'type': 'int', 'size': 1, 'color': '#0000ff', 'view': '1'},
+           'b': {'type': 'int', 'size': 1, 'color': '#0000ff', 'view': '2'}}
+    new = {'a': {'type': 'int', 'size': 1, 'color': '#0000ff', 'view': '1'},
+           'c': {'type': 'list', 'size': 2, 'color': '#ff00ff',
+                 'view': '[1, 2]'}}
+    changed, removed = diff_remote_view(old, new)
+    assert changed == {'c': new['c']}
+    assert removed == ['b']
+    data = pack_remote_view(changed, removed, full=False)
+    assert unpack_remote_view(data) == (changed, ['b'], False)
+
+def test_unpack_remote_view_checks_version():
+    data = bytearray(pack_remote_view({}))
+    data[4] = 99
+    with pytest.raises(ValueError):
+        unpack_remote_view(bytes(data))
+
+
+def test_iter_array_text():
+    arr = np.arange(12).reshape(4, 3)
+    chunks = list(iter_array_text(arr, (1, 4), (0, 2), chunk_rows=2))
+    assert [done for _text, done in chunks] == [2, 3]
+    assert u''.join(text for text, _done in chunks) == u'3\t4\n6\t7\n9\t10\n'
+
+
+def test_iter_dataframe_text():
+    df = DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]}, index=['x', 'y', 'z'])
+    get_block = lambda r0, r1, c0, c1: df.iloc[r0:r1, c0:c1]
+    chunks = iter_dataframe_text(get_block, (0, 3), (0, 2), index=True,
+                                 header=True, chunk_rows=2)
+    text = u''.join(text for text, _done in chunks)
+    assert text.splitlines() == ['\ta\tb', 'x\t1\t4', 'y\t2\t5', 'z\t3\t6']
+    chunks = iter_dataframe_text(get_block, (1, 3), (0, 0), chunk_rows=1)
+    assert list(chunks) == [(u'y\n', 1), (u'z\n', 2)]
+
 
 if __name__ == "__main__":
     pytest.main()
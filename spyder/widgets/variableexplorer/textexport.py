@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Copy and export to file of array and DataFrame selections as text,
+in the background for big selections
+"""
+
+# Standard library imports
+import io
+import os
+
+# Third party imports
+from qtpy.compat import getsavefilename
+from qtpy.QtCore import QObject, Qt, QThread, Signal
+from qtpy.QtWidgets import QApplication, QMessageBox, QProgressDialog
+
+# Local imports
+from spyder.config.base import _
+from spyder.config.user import replace_file
+from spyder.py3compat import getcwd
+
+
+# Selections with fewer cells than this are copied at once
+COPY_SYNC_MAX_CELLS = 100000
+
+# Selections with more cells than this are too big for the clipboard, so
+# they're exported to a file instead
+CLIPBOARD_MAX_CELLS = 10**7
+
+
+def consume_chunks(chunks, total, fdesc=None, progress=None,
+                   is_canceled=None):
+    """
+    Join or write to *fdesc* the text of (text, rows done) *chunks*
+
+    *progress* is called with the percentage of the *total* rows done and
+    None is returned if *is_canceled* returns True.
+    """
+    texts = []
+    for text, done in chunks:
+        if fdesc is not None:
+            fdesc.write(text)
+        else:
+            texts.append(text)
+        if progress is not None:
+            progress(int(100 * done / max(total, 1)))
+        if is_canceled is not None and is_canceled():
+            return
+    return u''.join(texts)
+
+
+def export_chunks(chunks, total, filename, progress=None, is_canceled=None):
+    """
+    Write the text of *chunks* to *filename*, with the same arguments as
+    consume_chunks
+
+    The text is written to a temporary file which replaces *filename* only
+    once it's complete, so a canceled or failed export leaves no partial
+    file and doesn't overwrite an existing one.
+    """
+    tmpname = filename + '.%d.tmp' % os.getpid()
+    try:
+        with io.open(tmpname, 'w', encoding='utf-8') as fdesc:
+            text = consume_chunks(chunks, total, fdesc, progress=progress,
+                                  is_canceled=is_canceled)
+        if is_canceled is None or not is_canceled():
+            replace_file(tmpname, filename)
+    finally:
+        if os.path.isfile(tmpname):
+            os.remove(tmpname)
+    return text
+
+
+class ExportThread(QThread):
+    """Thread formatting text chunks for the clipboard or a file"""
+    sig_progress = Signal(int)
+    sig_finished = Signal(object)
+    sig_canceled = Signal()
+    sig_error = Signal(str)
+
+    def __init__(self, parent):
+        QThread.__init__(self, parent)
+        self.chunks = None
+        self.total = None
+        self.filename = None
+        self.canceled = False
+
+    def initialize(self, chunks, total, filename=None):
+        self.chunks = chunks
+        self.total = total
+        self.filename = filename
+        self.canceled = False
+
+    def cancel(self):
+        self.canceled = True
+
+    def run(self):
+        """Format the chunks, then emit one of the finished, canceled and
+        error signals"""
+        try:
+            if self.filename is None:
+                text = consume_chunks(self.chunks, self.total,
+                                      progress=self.sig_progress.emit,
+                                      is_canceled=lambda: self.canceled)
+            else:
+                text = export_chunks(self.chunks, self.total, self.filename,
+                                     progress=self.sig_progress.emit,
+                                     is_canceled=lambda: self.canceled)
+        except Exception as e:
+            # Exceptions are not propagated to the main thread
+            self.sig_error.emit(str(e))
+        else:
+            if self.canceled:
+                self.sig_canceled.emit()
+            else:
+                self.sig_finished.emit(text)
+
+
+class TextExporter(QObject):
+    """
+    Copy to the clipboard or export to a file the text of a selection
+
+    The text is given by an iterator over (text, rows done) chunks. It's
+    formatted in an ExportThread if *threaded* is True, or else in the
+    main thread, processing events between chunks (e.g. for data living
+    in a kernel, which can only be fetched from the main thread).
+    """
+    sig_finished = Signal()
+
+    def __init__(self, parent):
+        QObject.__init__(self, parent)
+        self.widget = parent
+        self.thread = None
+        self.progress = None
+        self.filename = None
+        self.export_dir = None
+
+    def is_running(self):
+        """Return True if a copy or an export is running"""
+        return self.progress is not None
+
+    def copy(self, chunks, total, ncells, threaded=True):
+        """Copy the text given by *chunks* to the clipboard"""
+        if self.is_running():
+            return
+        if ncells <= COPY_SYNC_MAX_CELLS:
+            QApplication.clipboard().setText(consume_chunks(chunks, total))
+            return
+        if ncells > CLIPBOARD_MAX_CELLS:
+            answer = QMessageBox.question(
+                self.widget, _("Copy"),
+                _("The selection is too large to be copied to the "
+                  "clipboard.<br><br>Do you want to export it to a file "
+                  "instead?"), QMessageBox.Yes | QMessageBox.No)
+            if answer == QMessageBox.Yes:
+                self.export(chunks, total, threaded=threaded)
+            return
+        self._start(chunks, total, None, threaded, _("Copying..."))
+
+    def export(self, chunks, total, threaded=True):
+        """Export the text given by *chunks* to a file chosen by the user"""
+        if self.is_running():
+            return
+        if self.export_dir is None:
+            self.export_dir = getcwd()
+        filename, _selfilter = getsavefilename(
+            self.widget, _("Export to file"), self.export_dir,
+            _("Text files") + " (*.txt *.tsv *.csv)")
+        if not filename:
+            return
+        self.export_dir = filename
+        self._start(chunks, total, filename, threaded, _("Exporting..."))
+
+    def _start(self, chunks, total, filename, threaded, label):
+        self.filename = filename
+        self.progress = QProgressDialog(label, _("Cancel"), 0, 100,
+                                        self.widget)
+        self.progress.setWindowModality(Qt.WindowModal)
+        self.progress.setMinimumDuration(500)
+        if threaded:
+            self.thread = ExportThread(self)
+            self.thread.initialize(chunks, total, filename)
+            self.thread.sig_progress.connect(self.progress.setValue)
+            self.thread.sig_finished.connect(self.finished)
+            self.thread.sig_canceled.connect(self._close_progress)
+            self.thread.sig_error.connect(self.error)
+            self.progress.canceled.connect(self.thread.cancel)
+            self.thread.start()
+            return
+
+        def progress(value):
+            self.progress.setValue(value)
+            QApplication.processEvents()
+
+        try:
+            if filename is None:
+                text = consume_chunks(chunks, total, progress=progress,
+                                      is_canceled=self.progress.wasCanceled)
+            else:
+                text = export_chunks(chunks, total, filename,
+                                     progress=progress,
+                                     is_canceled=self.progress.wasCanceled)
+        except Exception as e:
+            self.error(str(e))
+            return
+        if self.progress.wasCanceled():
+            self._close_progress()
+        else:
+            self.finished(text)
+
+    def _close_progress(self):
+        try:
+            if self.thread is not None:
+                # The thread may still be returning from run()
+                self.thread.wait()
+            self.progress.close()
+        finally:
+            self.thread = None
+            self.progress = None
+            self.sig_finished.emit()
+
+    def finished(self, text):
+        """Put the text in the clipboard if it wasn't exported"""
+        self._close_progress()
+        if self.filename is None and text is not None:
+            QApplication.clipboard().setText(text)
+
+    def error(self, message):
+        """Show an error of the copy or export"""
+        self._close_progress()
+        QMessageBox.warning(self.widget, _("Warning"),
+                            _("It was not possible to copy or export "
+                              "these values.<br><br>Error message:<br>%s")
+                            % message)
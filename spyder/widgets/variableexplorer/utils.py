@@ -10,11 +10,14 @@ Utilities for the Collections editor widget and dialog
 
 from __future__ import print_function
 
+import ast
+from collections import OrderedDict
 import re
+import struct
 
 # Local imports
 from spyder.config.base import get_supported_types
-from spyder.py3compat import (NUMERIC_TYPES, TEXT_TYPES, to_text_string,
+from spyder.py3compat import (io, NUMERIC_TYPES, TEXT_TYPES, to_text_string,
                               is_text_string, is_binary_string, reprlib,
                               PY2, to_binary_string)
 from spyder.utils import programs
@@ -58,6 +61,11 @@ except ImportError:
     np_set_printoptions = int64 = int32 = float64 = float32 = \
     complex64 = complex128 = FakeObject
 
+# Supported Numbers and complex numbers
+REAL_NUMBER_TYPES = (float, int, int64, int32)
+COMPLEX_NUMBER_TYPES = (complex, complex64, complex128)
+
+
 def get_numpy_dtype(obj):
     """Return NumPy data type associated to obj
     Return None if NumPy is not available
@@ -78,6 +86,17 @@ def get_numpy_dtype(obj):
                 return
 
 
+def is_lazy_array(obj):
+    """
+    Return True if obj is an array whose data is read only when it's
+    sliced or converted to an array (e.g. a dataset of an HDF5 file).
+
+    Their classes declare it by a lazy_array attribute and give them
+    the shape, ndim, dtype and size attributes of arrays.
+    """
+    return getattr(type(obj), 'lazy_array', False) is True
+
+
 #==============================================================================
 # Pandas support
 #==============================================================================
@@ -128,7 +147,7 @@ def get_size(item):
     """Return size of an item of arbitrary type"""
     if isinstance(item, (list, tuple, dict)):
         return len(item)
-    elif isinstance(item, (ndarray, MaskedArray)):
+    elif isinstance(item, (ndarray, MaskedArray)) or is_lazy_array(item):
         return item.shape
     elif isinstance(item, Image):
         return item.size
@@ -211,6 +230,8 @@ UNSUPPORTED_COLOR = "#ffffff"
 
 def get_color_name(value):
     """Return color name depending on value type"""
+    if is_lazy_array(value):
+        return ARRAY_COLOR
     if not is_known_type(value):
         return CUSTOM_TYPE_COLOR
     for typ, name in list(COLORS.items()):
@@ -232,6 +253,65 @@ def is_editable_type(value):
     return get_color_name(value) not in (UNSUPPORTED_COLOR, CUSTOM_TYPE_COLOR)
 
 
+#==============================================================================
+# Export of arrays and DataFrames as text
+#==============================================================================
+EXPORT_CHUNK_ROWS = 50000
+
+
+def format_array_block(block):
+    """Format a 2D array as tab separated text"""
+    if DataFrame is not FakeObject and block.dtype.kind in 'biuf':
+        # pandas writes numbers much faster than savetxt
+        output = io.StringIO()
+        DataFrame(block).to_csv(output, sep='\t', header=False, index=False,
+                                float_format='%.18e')
+        text = output.getvalue()
+        return text.decode('utf-8') if PY2 else text
+    output = io.StringIO() if PY2 else io.BytesIO()
+    np_savetxt(output, block, delimiter='\t')
+    return output.getvalue().decode('utf-8')
+
+
+def iter_array_text(data, rows, cols, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Iterate over the rows[0]:rows[1] x cols[0]:cols[1] region of 2D array
+    *data* as chunks of tab separated text
+
+    Yield (text, number of rows formatted so far) tuples.
+    """
+    for start in range(rows[0], rows[1], chunk_rows):
+        stop = min(start + chunk_rows, rows[1])
+        block = data[start:stop, cols[0]:cols[1]]
+        yield format_array_block(block), stop - rows[0]
+
+
+def iter_dataframe_text(get_block, rows, cols, index=False, header=False,
+                        chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Iterate over the rows[0]:rows[1] x cols[0]:cols[1] region of a
+    DataFrame, given by ``get_block(row_start, row_stop, col_start,
+    col_stop)``, as chunks of tab separated text
+
+    Only the index is given if the region has no columns. Yield (text,
+    number of rows formatted so far) tuples.
+    """
+    for start in range(rows[0], rows[1], chunk_rows):
+        stop = min(start + chunk_rows, rows[1])
+        block = get_block(start, stop, cols[0], cols[1])
+        if cols[0] == cols[1]:
+            text = u'\n'.join(map(to_text_string, block.index.tolist()))
+            text += u'\n'
+        else:
+            output = io.StringIO()
+            block.to_csv(output, sep='\t', index=index,
+                         header=header and start == rows[0])
+            text = output.getvalue()
+            if PY2:
+                text = text.decode('utf-8')
+        yield text, stop - rows[0]
+
+
 #==============================================================================
 # Sorting
 #==============================================================================
@@ -249,11 +329,81 @@ def sort_against(list1, list2, reverse=False):
         return list1
 
 
+def argsort(values, reverse=False):
+    """
+    Return the indices that would sort the *values* sequence, keeping the
+    order of equal values, or None if they can't be compared
+    """
+    try:
+        return sorted(range(len(values)), key=values.__getitem__,
+                      reverse=reverse)
+    except Exception:
+        return None
+
+
 def unsorted_unique(lista):
     """Removes duplicates from lista neglecting its initial ordering"""
     return list(set(lista))
 
 
+def argsort_stable(values, null_mask, ascending=True):
+    """
+    Return the indices that would sort `values` in a stable way.
+
+    Null entries, given by the boolean array `null_mask`, are put at the
+    end whatever the sort order, as done by DataFrame.sort_values.
+    """
+    import numpy as np
+    valid = np.flatnonzero(~null_mask)
+    keys = values[valid]
+    if ascending:
+        order = np.argsort(keys, kind='mergesort')
+    else:
+        # Sort the reversed keys and reverse the result back, so that
+        # equal keys keep their relative order
+        order = (len(keys) - 1 - np.argsort(keys[::-1], kind='mergesort'))
+        order = order[::-1]
+    return np.concatenate([valid[order], np.flatnonzero(null_mask)])
+
+
+def sort_permutation(df, column, ascending=True, permutation=None,
+                     progress=None):
+    """
+    Return the row permutation sorting `df` by `column`.
+
+    Column 0 stands for the index and column k for the (k-1)-th column.
+    `df` can also be a Series, seen as a one column DataFrame.
+    If `permutation` is given, the rows are sorted from that order, so
+    sorting is stable with respect to the previous sort. `df` is not
+    modified. `progress` is an optional callback receiving a percentage.
+    """
+    from pandas import isnull
+    if progress is None:
+        progress = lambda value: None
+    if column == 0:
+        keys = df.index.values
+        null_mask = isnull(keys)
+    else:
+        col = df if isinstance(df, Series) else df.iloc[:, column-1]
+        if col.dtype.name == 'category':
+            keys = col.cat.codes.values
+            null_mask = keys == -1
+        else:
+            keys = col.values
+            null_mask = isnull(keys)
+    progress(25)
+    if permutation is not None:
+        keys = keys[permutation]
+        null_mask = null_mask[permutation]
+    progress(50)
+    order = argsort_stable(keys, null_mask, ascending=ascending)
+    progress(75)
+    if permutation is not None:
+        order = permutation[order]
+    progress(100)
+    return order
+
+
 #==============================================================================
 # Display <--> Value
 #==============================================================================
@@ -275,6 +425,9 @@ def value_to_display(value, minmax=False):
                     display = repr(value)
             else:
                 display = repr(value)
+        elif is_lazy_array(value):
+            # Its data isn't read
+            display = repr(value)
         elif isinstance(value, (list, tuple, dict, set)):
             display = CollectionsRepr.repr(value)
         elif isinstance(value, Image):
@@ -402,7 +555,7 @@ def is_known_type(item):
 
 def get_human_readable_type(item):
     """Return human-readable type string of an item"""
-    if isinstance(item, (ndarray, MaskedArray)):
+    if isinstance(item, (ndarray, MaskedArray)) or is_lazy_array(item):
         return item.dtype.name
     elif isinstance(item, Image):
         return "Image"
@@ -423,7 +576,7 @@ def is_supported(value, check_all=False, filters=None, iterate=True):
     assert filters is not None
     if not is_editable_type(value):
         return False
-    elif not isinstance(value, filters):
+    elif not isinstance(value, filters) and not is_lazy_array(value):
         return False
     elif iterate:
         if isinstance(value, (list, tuple, set)):
@@ -481,7 +634,7 @@ def get_remote_data(data, settings, mode, more_excluded_names=None):
     """
     supported_types = get_supported_types()
     assert mode in list(supported_types.keys())
-    excluded_names = settings['excluded_names']
+    excluded_names = list(settings['excluded_names'])
     if more_excluded_names is not None:
         excluded_names += more_excluded_names
     return globalsfilter(data, check_all=settings['check_all'],
@@ -508,3 +661,513 @@ def make_remote_view(data, settings, more_excluded_names=None):
                        'color': get_color_name(value),
                        'view':  view}
     return remote
+
+
+#==============================================================================
+# Compact transport of remote views
+#==============================================================================
+# Remote views are sent as a header, a table of interned strings and
+# one column of string indexes per view field, all packed with struct.
+# Full views replace the previous one and deltas only carry the changed
+# and removed variables.
+REMOTE_VIEW_MAGIC = b'SPRV'
+REMOTE_VIEW_VERSION = 1
+REMOTE_VIEW_FIELDS = ('type', 'size', 'color', 'view')
+_REMOTE_VIEW_HEADER = struct.Struct('!4sBBIII')
+
+
+def _encode_text(text):
+    """Return *text* as utf-8 bytes"""
+    if is_binary_string(text):
+        return text
+    return to_text_string(text).encode('utf-8')
+
+
+def diff_remote_view(old, new):
+    """
+    Return the variables changed and removed from remote view *old*
+    to *new*, as a (dict, list) tuple
+    """
+    changed = dict((name, props) for name, props in list(new.items())
+                   if old.get(name) != props)
+    removed = [name for name in old if name not in new]
+    return changed, removed
+
+
+def pack_remote_view(view, removed=(), full=True):
+    """
+    Pack remote view *view* (or the variables changed since the last
+    packed view if *full* is False) and the names in *removed*
+    """
+    strings, indexes = [], {}
+
+    def add_string(text):
+        index = indexes.get(text)
+        if index is None:
+            index = indexes[text] = len(strings)
+            strings.append(_encode_text(text))
+        return index
+
+    names = sorted(view.keys())
+    columns = [[add_string(name) for name in names]]
+    for field in REMOTE_VIEW_FIELDS:
+        if field == 'size':
+            column = [add_string(repr(view[name][field])) for name in names]
+        else:
+            column = [add_string(view[name][field]) for name in names]
+        columns.append(column)
+    removed = [add_string(name) for name in removed]
+
+    chunks = [_REMOTE_VIEW_HEADER.pack(REMOTE_VIEW_MAGIC, REMOTE_VIEW_VERSION,
+                                       int(full), len(strings), len(names),
+                                       len(removed))]
+    chunks.append(struct.pack('!%dI' % len(strings),
+                              *[len(text) for text in strings]))
+    chunks.extend(strings)
+    for column in columns + [removed]:
+        chunks.append(struct.pack('!%dI' % len(column), *column))
+    return b''.join(chunks)
+
+
+def unpack_remote_view(data):
+    """
+    Unpack *data* created by pack_remote_view
+
+    Return a (view, removed names, full) tuple
+    """
+    (magic, version, full, nstrings, nnames,
+     nremoved) = _REMOTE_VIEW_HEADER.unpack_from(data)
+    if magic != REMOTE_VIEW_MAGIC or version != REMOTE_VIEW_VERSION:
+        raise ValueError("Unsupported remote view format")
+    offset = _REMOTE_VIEW_HEADER.size
+    lengths = struct.unpack_from('!%dI' % nstrings, data, offset)
+    offset += 4 * nstrings
+    strings = []
+    for length in lengths:
+        strings.append(to_text_string(data[offset:offset + length], 'utf-8'))
+        offset += length
+
+    columns = []
+    for count in [nnames] * (len(REMOTE_VIEW_FIELDS) + 1) + [nremoved]:
+        columns.append(struct.unpack_from('!%dI' % count, data, offset))
+        offset += 4 * count
+
+    sizes = {}
+    view = {}
+    for row, name_index in enumerate(columns[0]):
+        props = {}
+        for field, column in zip(REMOTE_VIEW_FIELDS, columns[1:]):
+            index = column[row]
+            if field == 'size':
+                if index not in sizes:
+                    sizes[index] = ast.literal_eval(strings[index])
+                props[field] = sizes[index]
+            else:
+                props[field] = strings[index]
+        view[strings[name_index]] = props
+    removed = [strings[index] for index in columns[-1]]
+    return view, removed, bool(full)
+
+
+#==============================================================================
+# Cache of variable properties
+#==============================================================================
+def get_var_fingerprint(value):
+    """
+    Return a cheap fingerprint of *value*, which changes when it's
+    mutated in a way that can change its properties, without looking
+    at its items
+    """
+    fingerprint = [type(value)]
+    try:
+        fingerprint.append(len(value))
+    except Exception:
+        fingerprint.append(None)
+    for attr in ('shape', 'nbytes', 'dtype'):
+        try:
+            part = getattr(value, attr)
+            hash(part)
+        except Exception:
+            part = None
+        fingerprint.append(part)
+    # Arrays whose data was reallocated in place (e.g. by resize)
+    try:
+        fingerprint.append(value.__array_interface__['data'][0])
+    except Exception:
+        fingerprint.append(None)
+    return tuple(fingerprint)
+
+
+def get_namespace_ids(namespace):
+    """Return the ids of the values bound to the names of *namespace*"""
+    return dict((name, id(value)) for name, value in list(namespace.items()))
+
+
+class LazyVarProperties(dict):
+    """
+    Properties of a variable, each one computed by its getter the first
+    time it's accessed
+    """
+
+    def __init__(self, value, getters):
+        dict.__init__(self)
+        self.value = value
+        self.getters = getters
+
+    def __missing__(self, name):
+        prop = self.getters[name](self.value)
+        self[name] = prop
+        return prop
+
+    def get_all(self):
+        """Return a dictionary with all the properties"""
+        if self.value is not None or len(self) < len(self.getters):
+            for name in self.getters:
+                self[name]
+            # Don't keep the variable alive once everything is known
+            self.value = None
+        return dict(self)
+
+
+class VarPropertiesCache(object):
+    """
+    Cache of the properties of the variables of a namespace
+
+    Properties are computed by *getters*, a dictionary of functions
+    taking the value of a variable, the first time they're asked for. They
+    are reused until the variable is rebound to another object or its
+    fingerprint changes.
+    """
+
+    def __init__(self, getters):
+        self.getters = getters
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def get_properties(self, name, value):
+        """
+        Return the properties of variable *name*, whose value is *value*,
+        as a LazyVarProperties
+        """
+        key = (id(value), get_var_fingerprint(value))
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, LazyVarProperties(value, self.getters))
+            self._entries[name] = entry
+        return entry[1]
+
+    def get_namespace_properties(self, data):
+        """
+        Return the properties of all variables in *data* and forget
+        the ones that are not there anymore
+        """
+        for name in set(self._entries) - set(data):
+            del self._entries[name]
+        return dict((name, self.get_properties(name, value).get_all())
+                    for name, value in list(data.items()))
+
+    def invalidate(self, namespace, previous_ids):
+        """
+        Forget the variables of *namespace* rebound or deleted since
+        *previous_ids* were taken by get_namespace_ids (e.g. before an
+        execution)
+        """
+        for name, value_id in previous_ids.items():
+            if name in self._entries and (
+                    name not in namespace or id(namespace[name]) != value_id):
+                del self._entries[name]
+
+    def forget(self, name):
+        """Forget variable *name*"""
+        self._entries.pop(name, None)
+
+    def clear(self):
+        """Forget all variables"""
+        self._entries.clear()
+
+
+#==============================================================================
+# Windows of arrays and DataFrames living in a kernel
+#==============================================================================
+def get_columns_min_max(df):
+    """
+    Return the maximum and minimum number in each column of a DataFrame.
+
+    The result is a list whose k-th entry is [vmax, vmin], where vmax and
+    vmin denote the maximum and minimum of the k-th column (ignoring NaN).
+
+    If the k-th column has a non-numerical dtype, then the k-th entry
+    is set to None. If the dtype is complex, then compute the maximum and
+    minimum of the absolute values. If vmax equals vmin, then vmin is
+    decreased by one.
+    """
+    import warnings
+    import numpy as np
+    max_min_col = []
+    for dummy, col in df.iteritems():
+        if col.dtype in REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES:
+            values = col.values
+            if col.dtype in COMPLEX_NUMBER_TYPES:
+                values = np.abs(values)
+            with warnings.catch_warnings():
+                # All-NaN columns give NaN without warning, as
+                # in Series.max/min
+                warnings.simplefilter('ignore', RuntimeWarning)
+                vmax = np.nanmax(values)
+                vmin = np.nanmin(values)
+            if vmax != vmin:
+                max_min = [vmax, vmin]
+            else:
+                max_min = [vmax, vmin - 1]
+        else:
+            max_min = None
+        max_min_col.append(max_min)
+    return max_min_col
+
+
+def as_2d(value):
+    """
+    Return a 2D version of an array, Series or DataFrame.
+
+    For arrays this is a view, so it can be used to modify `value`.
+    """
+    if isinstance(value, Series):
+        return value.to_frame()
+    elif isinstance(value, ndarray) and value.ndim < 2:
+        return value.reshape((-1, 1))
+    return value
+
+
+def get_value_info(value):
+    """
+    Return the information needed to edit `value` through windows.
+
+    This is used by kernels for RemoteValue objects. 'supported' is False
+    for values that can't be edited that way (i.e. record, masked and
+    n-dimensional arrays). 'min_max' is (vmin, vmax) for arrays and
+    'max_min_col' is given by get_columns_min_max for DataFrames. Lazy
+    arrays are 'readonly' and their bounds aren't computed, to only read
+    the windows that are shown.
+    """
+    import numpy as np
+    if is_lazy_array(value):
+        supported = 0 < value.ndim <= 2 and value.dtype.names is None
+        return {'kind': 'array', 'type_name': value.__class__.__name__,
+                'supported': supported, 'readonly': True,
+                'shape': ((tuple(value.shape) + (1,))[:2] if supported
+                          else None),
+                'dtype': value.dtype if supported else None,
+                'columns': None, 'min_max': None, 'max_min_col': None}
+    if isinstance(value, (DataFrame, Series)):
+        # Get column names and dtypes without copying any data
+        header = as_2d(value.iloc[0:0])
+        return {'kind': 'series' if isinstance(value, Series) else 'dataframe',
+                'type_name': value.__class__.__name__,
+                'supported': True, 'readonly': False,
+                'shape': (value.shape[0], header.shape[1]),
+                'dtype': None,
+                'columns': header.columns,
+                'min_max': None,
+                'max_min_col': (get_columns_min_max(as_2d(value))
+                                if len(value) else None)}
+    supported = (isinstance(value, ndarray) and value.ndim <= 2 and
+                 value.dtype.names is None and
+                 not isinstance(value, MaskedArray))
+    info = {'kind': 'array', 'type_name': value.__class__.__name__,
+            'supported': supported, 'readonly': False, 'shape': None,
+            'dtype': None, 'columns': None, 'min_max': None,
+            'max_min_col': None}
+    if supported:
+        info['shape'] = as_2d(value).shape
+        info['dtype'] = value.dtype
+        color_func = np.abs if np.iscomplexobj(value) else np.real
+        try:
+            info['min_max'] = (np.nanmin(color_func(value)),
+                               np.nanmax(color_func(value)))
+        except (TypeError, ValueError):
+            pass
+    return info
+
+
+def get_value_window(value, rows, cols, permutation=None):
+    """
+    Return the rows[0]:rows[1] x cols[0]:cols[1] window of `value`.
+
+    `value` is an array, Series or DataFrame, which is seen in 2D and
+    with its rows reordered by `permutation` if given.
+    """
+    row_index = slice(*rows)
+    if permutation is not None:
+        row_index = permutation[row_index]
+    if isinstance(value, Series):
+        # Slice before converting to avoid copying the whole Series
+        return value.iloc[row_index].to_frame().iloc[:, slice(*cols)]
+    elif isinstance(value, DataFrame):
+        return value.iloc[row_index, slice(*cols)]
+    elif is_lazy_array(value):
+        # Read only the rows of the window
+        if value.ndim == 1:
+            return array(value[row_index]).reshape((-1, 1))[:, slice(*cols)]
+        return array(value[row_index, slice(*cols)])
+    return as_2d(value)[row_index, slice(*cols)]
+
+
+def set_value_items(value, items, permutation=None):
+    """
+    Set the (row, column) items of `value` given in window coordinates.
+    """
+    if isinstance(value, Series):
+        for (row, col), item in items:
+            if permutation is not None:
+                row = permutation[row]
+            value.iloc[row] = item
+        return
+    data = as_2d(value)
+    for (row, col), item in items:
+        if permutation is not None:
+            row = permutation[row]
+        if isinstance(data, DataFrame):
+            data.iloc[row, col] = item
+        else:
+            data[row, col] = item
+
+
+class RemoteValue(object):
+    """
+    Client-side handle on an array or DataFrame living in a kernel.
+
+    It fetches from the kernel only the windows of data asked by the
+    editors and keeps the last CACHE_SIZE blocks in a small cache, so
+    viewing a huge variable costs memory proportional to the viewport.
+    Sorting is done by the kernel and edits are buffered until `commit`,
+    unless the value is `readonly`.
+
+    `backend` is the shell widget connected to the kernel and `info` the
+    dictionary returned by get_value_info in the kernel.
+    """
+    BLOCK_ROWS = 500
+    BLOCK_COLS = 40
+    CACHE_SIZE = 16
+
+    def __init__(self, backend, name, info):
+        self.backend = backend
+        self.name = name
+        self.kind = info['kind']
+        self.type_name = info['type_name']
+        self.shape = tuple(info['shape'])
+        self.ndim = 2
+        self.dtype = info['dtype']
+        self.columns = info['columns']
+        self.min_max = info['min_max']
+        self.max_min_col = info['max_min_col']
+        self.readonly = info.get('readonly', False)
+        self.changes = {}
+        self._cache = OrderedDict()
+
+    def get_window(self, rows, cols):
+        """
+        Return a window of data, with buffered changes applied.
+
+        Windows lying inside a single block are sliced from the cache,
+        the others are fetched from the kernel.
+        """
+        (row0, row1), (col0, col1) = rows, cols
+        last_row, last_col = max(row1 - 1, row0), max(col1 - 1, col0)
+        if (row0 // self.BLOCK_ROWS == last_row // self.BLOCK_ROWS and
+                col0 // self.BLOCK_COLS == last_col // self.BLOCK_COLS):
+            block = self.get_block(row0, col0)
+            i, j = row0 % self.BLOCK_ROWS, col0 % self.BLOCK_COLS
+            if self.kind == 'array':
+                window = block[i:i + row1 - row0, j:j + col1 - col0]
+            else:
+                window = block.iloc[i:i + row1 - row0, j:j + col1 - col0]
+        else:
+            window = self.backend.get_value_window(self.name, rows, cols)
+        changes = [((row, col), value)
+                   for (row, col), value in self.changes.items()
+                   if row0 <= row < row1 and col0 <= col < col1]
+        if changes:
+            # Don't modify the cached block
+            window = window.copy()
+            for (row, col), value in changes:
+                if self.kind == 'array':
+                    window[row - row0, col - col0] = value
+                else:
+                    window.iat[row - row0, col - col0] = value
+        return window
+
+    def get_block(self, row, col):
+        """Return the cached block of data containing cell (row, col)"""
+        key = (row // self.BLOCK_ROWS, col // self.BLOCK_COLS)
+        try:
+            block = self._cache.pop(key)
+        except KeyError:
+            row0 = key[0] * self.BLOCK_ROWS
+            col0 = key[1] * self.BLOCK_COLS
+            block = self.backend.get_value_window(
+                self.name, (row0, row0 + self.BLOCK_ROWS),
+                (col0, col0 + self.BLOCK_COLS))
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        self._cache[key] = block
+        return block
+
+    def get_cell(self, row, col):
+        """Return the value of cell (row, col)"""
+        if (row, col) in self.changes:
+            return self.changes[(row, col)]
+        block = self.get_block(row, col)
+        i, j = row % self.BLOCK_ROWS, col % self.BLOCK_COLS
+        if self.kind == 'array':
+            return block[i, j]
+        return block.iat[i, j]
+
+    def get_index_label(self, row):
+        """Return the index label of a row of a DataFrame or Series"""
+        block = self.get_block(row, 0)
+        return block.index[row % self.BLOCK_ROWS]
+
+    def __getitem__(self, key):
+        """Return a cell for (row, col) keys or a window for slices"""
+        rows, cols = key
+        if isinstance(rows, slice) or isinstance(cols, slice):
+            if not isinstance(rows, slice):
+                rows = slice(rows, rows + 1)
+            if not isinstance(cols, slice):
+                cols = slice(cols, cols + 1)
+            rows = rows.indices(self.shape[0])[:2]
+            cols = cols.indices(self.shape[1])[:2]
+            return self.get_window(rows, cols)
+        return self.get_cell(rows, cols)
+
+    def __setitem__(self, key, value):
+        """Buffer the change of a cell until `commit` is called"""
+        self.changes[key] = value
+
+    def commit(self):
+        """Send buffered changes to the kernel"""
+        if self.changes:
+            self.backend.set_value_items(self.name,
+                                         list(self.changes.items()))
+            self.changes = {}
+            self._cache.clear()
+
+    def sort(self, column, ascending=True):
+        """
+        Sort rows in the kernel, with the same conventions as
+        sort_permutation. Return an error message if it fails.
+        """
+        self.commit()
+        error = self.backend.sort_value_view(self.name, column, ascending)
+        self._cache.clear()
+        return error
+
+    def close(self):
+        """Free the data kept for this value in the kernel"""
+        self._cache.clear()
+        self.backend.close_value_view(self.name)
@@ -1,6 +1,20 @@
 # -*- coding: utf-8 -*-
 
 #==============================================================================
-# The following statement is required to register this 3rd party plugin:
+# The following statements are required to register this 3rd party plugin.
+# The plugin module is only imported when the Breakpoints pane is first shown
+# or its action is used (see spyder.api.plugins.LazyPluginWidget)
 #==============================================================================
-from .breakpoints import Breakpoints as PLUGIN_CLASS
+from spyder.config.base import get_translation
+
+_ = get_translation("breakpoints", "spyder_breakpoints")
+
+PLUGIN_CLASS_PATH = 'spyder_breakpoints.breakpoints.Breakpoints'
+PLUGIN_CONF_SECTION = 'breakpoints'
+PLUGIN_TITLE = _("Breakpoints")
+PLUGIN_ICON = 'profiler'
+PLUGIN_ACTIONS = [
+    {'text': _("List breakpoints"), 'method': 'show',
+     'menu': 'debug_menu_actions', 'before': 'list_breakpoints',
+     'python_only': True},
+]
@@ -44,7 +44,6 @@ class Breakpoints(SpyderPluginWidget):
 
         # Initialize plugin
         self.initialize_plugin()
-        self.breakpoints.set_data()
     
     #------ SpyderPluginWidget API --------------------------------------------
     def get_plugin_title(self):
@@ -79,7 +78,8 @@ class Breakpoints(SpyderPluginWidget):
                                         self.main.editor.clear_all_breakpoints)
         self.breakpoints.clear_breakpoint.connect(
             self.main.editor.clear_breakpoint)
-        self.main.editor.breakpoints_saved.connect(self.breakpoints.set_data)
+        self.main.editor.breakpoints_saved.connect(self.update_breakpoints)
+        self.update_breakpoints()
         self.breakpoints.set_or_edit_conditional_breakpoint.connect(
                            self.main.editor.set_or_edit_conditional_breakpoint)
         
@@ -95,6 +95,12 @@ class Breakpoints(SpyderPluginWidget):
     def refresh_plugin(self):
         """Refresh widget"""
         pass
+
+    def update_breakpoints(self):
+        """Show the breakpoints changed in the Editor"""
+        store = self.main.editor.breakpoint_store
+        self.breakpoints.set_data(
+            *store.get_changes(self.breakpoints.revision))
         
     def closing_plugin(self, cancelable=False):
         """Perform actions before parent main window is closed"""
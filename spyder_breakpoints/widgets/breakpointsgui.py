@@ -26,7 +26,6 @@ from qtpy.QtWidgets import (QItemDelegate, QMenu, QTableView, QVBoxLayout,
 
 # Local imports
 from spyder.config.base import get_translation
-from spyder.config.main import CONF
 from spyder.utils.qthelpers import add_actions, create_action
 
 # This is needed for testing this module as a stand alone script
@@ -225,8 +224,10 @@ class BreakpointWidget(QWidget):
         QWidget.__init__(self, parent)
         
         self.setWindowTitle("Breakpoints")        
-        self.dictwidget = BreakpointTableView(self, 
-                               self._load_all_breakpoints())
+        # Breakpoints of each file, as of revision of the breakpoint store
+        self.bp_dict = {}
+        self.revision = 0
+        self.dictwidget = BreakpointTableView(self, self.bp_dict)
         layout = QVBoxLayout()
         layout.addWidget(self.dictwidget)
         self.setLayout(layout)
@@ -239,19 +240,21 @@ class BreakpointWidget(QWidget):
         self.dictwidget.set_or_edit_conditional_breakpoint.connect(
                         lambda: self.set_or_edit_conditional_breakpoint.emit())
                      
-    def _load_all_breakpoints(self):
-        bp_dict = CONF.get('run', 'breakpoints', {})
-        for filename in list(bp_dict.keys()):
-            if not osp.isfile(filename):
-                bp_dict.pop(filename)
-        return bp_dict    
-    
     def get_data(self):
         pass
         
-    def set_data(self):
-        bp_dict = self._load_all_breakpoints()
-        self.dictwidget.model.set_data(bp_dict)
+    def set_data(self, revision, changes):
+        """
+        Update the breakpoints of the files of *changes*, the ones changed
+        in the breakpoint store up to *revision*
+        """
+        for filename, breakpoints in changes.items():
+            if breakpoints and osp.isfile(filename):
+                self.bp_dict[filename] = breakpoints
+            else:
+                self.bp_dict.pop(filename, None)
+        self.revision = revision
+        self.dictwidget.model.set_data(self.bp_dict)
         self.dictwidget.adjust_columns()
         self.dictwidget.sortByColumn(0, Qt.DescendingOrder)
 
@@ -262,8 +265,10 @@ class BreakpointWidget(QWidget):
 def test():
     """Run breakpoint widget test"""
     from spyder.utils.qthelpers import qapplication
+    from spyder.utils.breakpoints import BreakpointStore, get_breakpoints_path
     app = qapplication()
     widget = BreakpointWidget(None)
+    widget.set_data(*BreakpointStore(get_breakpoints_path()).get_changes())
     widget.show()
     sys.exit(app.exec_())
 
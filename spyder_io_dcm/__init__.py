@@ -6,4 +6,6 @@ from .dcm import load_dicom
 FORMAT_NAME = "DICOM images"
 FORMAT_EXT  = ".dcm"
 FORMAT_LOAD = load_dicom
-FORMAT_SAVE = None
\ No newline at end of file
+FORMAT_SAVE = None
+# load_dicom also loads all the slices of a directory as a 3D volume
+FORMAT_LOAD_DIRECTORY = True
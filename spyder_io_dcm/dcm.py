@@ -1,8 +1,14 @@
 # -*- coding:utf-8 -*-
 """Example of I/O plugin for loading DICOM files"""
 
+import glob
+import multiprocessing
+import os
 import os.path as osp
 
+# Series with fewer slices than this are decoded in the current process
+PARALLEL_MIN_SLICES = 16
+
 try:
     try:
         # pydicom 0.9
@@ -10,17 +16,146 @@ try:
     except ImportError:
         # pydicom 1.0
         from pydicom import dicomio
+    import numpy as np
+
+    def read_dicom(filename, stop_before_pixels=False):
+        """Read a DICOM file"""
+        try:
+            return dicomio.read_file(filename, force=True,
+                                     stop_before_pixels=stop_before_pixels)
+        except TypeError:
+            return dicomio.read_file(filename,
+                                     stop_before_pixels=stop_before_pixels)
+
     def load_dicom(filename):
+        if osp.isdir(filename) or glob.has_magic(filename):
+            return load_dicom_series(filename)
         try:
             name = osp.splitext(osp.basename(filename))[0]
-            try:
-                data = dicomio.read_file(filename, force=True)
-            except TypeError:
-                data = dicomio.read_file(filename)                
+            data = read_dicom(filename)
             arr = data.pixel_array
             return {name: arr}, None
         except Exception as error:
             return None, str(error)
+
+    def get_series_files(path):
+        """Return the files of the series given by a directory or a glob"""
+        if osp.isdir(path):
+            filenames = [osp.join(path, fname) for fname in os.listdir(path)]
+        else:
+            filenames = glob.glob(path)
+        return sorted(fname for fname in filenames if osp.isfile(fname))
+
+    def get_slice_position(header):
+        """
+        Return the position of a slice along the series axis, or None
+        if its header doesn't have the needed information
+        """
+        try:
+            position = np.array(header.ImagePositionPatient, dtype=float)
+            orientation = np.array(header.ImageOrientationPatient,
+                                   dtype=float)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        normal = np.cross(orientation[:3], orientation[3:])
+        return float(np.dot(position, normal))
+
+    def sort_series(filenames):
+        """
+        Read the headers of *filenames* and return the ones of DICOM
+        images sorted by their position in the series
+        """
+        slices = []
+        for fname in filenames:
+            try:
+                header = read_dicom(fname, stop_before_pixels=True)
+            except Exception:
+                # Not a DICOM file
+                continue
+            if 'PixelData' not in header and 'Rows' not in header:
+                continue
+            position = get_slice_position(header)
+            number = getattr(header, 'InstanceNumber', None)
+            slices.append((position is None, position or 0.,
+                           number is None, number or 0, fname))
+        return [fname for _p, _pos, _n, _number, fname in sorted(slices)]
+
+    def decode_slices(args):
+        """
+        Decode the pixel data of (index, filename) *items*
+
+        If *scratch* is given, slices are written in the volume mapped
+        from it and nothing is returned. Otherwise a list of
+        (index, array) is returned.
+        """
+        items, scratch, dtype, shape = args
+        volume = None
+        if scratch is not None:
+            volume = np.memmap(scratch, dtype=dtype, mode='r+', shape=shape)
+        result = []
+        for index, fname in items:
+            arr = read_dicom(fname).pixel_array
+            if volume is not None:
+                volume[index] = arr
+            else:
+                result.append((index, arr))
+        if volume is not None:
+            volume.flush()
+        return result
+
+    def load_dicom_series(path, processes=None, scratch=None):
+        """
+        Load the DICOM series given by *path*, a directory or a glob
+        pattern, as a 3D volume
+
+        Slices are sorted by their position in the series (read from
+        their headers only) and decoded in *processes* processes (all
+        cores by default). If *scratch* is the name of a file, the volume
+        is memory-mapped to it instead of kept in memory.
+        """
+        try:
+            if osp.isdir(path):
+                name = osp.basename(osp.normpath(path))
+            else:
+                name = osp.basename(osp.dirname(osp.abspath(path)))
+            filenames = sort_series(get_series_files(path))
+            if not filenames:
+                return None, "No DICOM images found in %s" % path
+            first = read_dicom(filenames[0]).pixel_array
+            shape = (len(filenames),) + first.shape
+            if scratch is not None:
+                volume = np.memmap(scratch, dtype=first.dtype, mode='w+',
+                                   shape=shape)
+            else:
+                volume = np.empty(shape, dtype=first.dtype)
+            volume[0] = first
+
+            items = list(enumerate(filenames))[1:]
+            if processes is None:
+                processes = multiprocessing.cpu_count()
+            processes = min(processes, len(items))
+            if processes > 1 and len(items) >= PARALLEL_MIN_SLICES:
+                # A few chunks per process to balance the load
+                size = max(len(items) // (4 * processes), 1)
+                tasks = [(items[i:i + size], scratch, first.dtype, shape)
+                         for i in range(0, len(items), size)]
+                if scratch is not None:
+                    volume.flush()
+                pool = multiprocessing.Pool(processes)
+                try:
+                    results = pool.imap_unordered(decode_slices, tasks)
+                    for result in results:
+                        for index, arr in result:
+                            volume[index] = arr
+                finally:
+                    pool.close()
+                    pool.join()
+            else:
+                for index, fname in items:
+                    volume[index] = read_dicom(fname).pixel_array
+            return {name: volume}, None
+        except Exception as error:
+            return None, str(error)
 except ImportError:
     load_dicom = None
-
+    load_dicom_series = None
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for dcm.py
+"""
+
+# Third party imports
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+# Local imports
+from spyder_io_dcm import dcm
+
+
+pytestmark = pytest.mark.skipif(dcm.load_dicom is None,
+                                reason="pydicom is not installed")
+
+
+def write_dicom(filename, pixels, position=None, number=None):
+    """Write a minimal DICOM image with *pixels*, a 2D uint16 array"""
+    from pydicom.dataset import Dataset, FileDataset
+    from pydicom.uid import ImplicitVRLittleEndian
+    meta = Dataset()
+    meta.MediaStorageSOPClassUID = '1.2.840.10008.5.1.4.1.1.2'
+    meta.MediaStorageSOPInstanceUID = '1.2.3.4'
+    meta.TransferSyntaxUID = ImplicitVRLittleEndian
+    data = FileDataset(filename, {}, file_meta=meta, preamble=b'\0' * 128)
+    data.is_little_endian = True
+    data.is_implicit_VR = True
+    data.Rows, data.Columns = pixels.shape
+    data.SamplesPerPixel = 1
+    data.PhotometricInterpretation = 'MONOCHROME2'
+    data.BitsAllocated = 16
+    data.BitsStored = 16
+    data.HighBit = 15
+    data.PixelRepresentation = 0
+    if position is not None:
+        data.ImagePositionPatient = [0., 0., position]
+        data.ImageOrientationPatient = [1., 0., 0., 0., 1., 0.]
+    if number is not None:
+        data.InstanceNumber = number
+    data.PixelData = pixels.astype('<u2').tobytes()
+    data.save_as(filename)
+
+
+def make_slice(value):
+    return np.full((4, 5), value, dtype=np.uint16)
+
+
+@pytest.fixture
+def series(tmpdir):
+    """Write a series of 6 slices whose file names aren't in the slice
+    order, and a file which isn't a DICOM one"""
+    directory = tmpdir.mkdir('series')
+    # File name -> position along the series axis
+    positions = {'a.dcm': 3., 'b.dcm': -1., 'c.dcm': 10., 'd.dcm': 0.,
+                 'e.dcm': 2.5, 'f.dcm': 7.}
+    for fname, position in positions.items():
+        write_dicom(directory.join(fname).strpath,
+                    make_slice(int(10 * position) + 100), position=position)
+    directory.join('notes.txt').write('not a DICOM file')
+    return directory.strpath
+
+
+def expected_volume():
+    positions = [-1., 0., 2.5, 3., 7., 10.]
+    return np.array([make_slice(int(10 * position) + 100)
+                     for position in positions])
+
+
+def test_load_dicom(tmpdir):
+    filename = tmpdir.join('image.dcm').strpath
+    write_dicom(filename, make_slice(7))
+    data, error = dcm.load_dicom(filename)
+    assert error is None
+    assert_array_equal(data['image'], make_slice(7))
+
+
+def test_load_dicom_error(tmpdir):
+    filename = tmpdir.join('image.dcm').strpath
+    tmpdir.join('image.dcm').write('not a DICOM file')
+    data, error = dcm.load_dicom(filename)
+    assert data is None
+    assert error
+
+
+def test_get_slice_position(tmpdir):
+    filename = tmpdir.join('image.dcm').strpath
+    write_dicom(filename, make_slice(0), position=2.5)
+    header = dcm.read_dicom(filename, stop_before_pixels=True)
+    assert dcm.get_slice_position(header) == 2.5
+    write_dicom(filename, make_slice(0))
+    header = dcm.read_dicom(filename, stop_before_pixels=True)
+    assert dcm.get_slice_position(header) is None
+
+
+def test_sort_series(tmpdir, series):
+    filenames = dcm.get_series_files(series)
+    assert len(filenames) == 7
+    names = [fname[-5:] for fname in dcm.sort_series(filenames)]
+    assert names == ['b.dcm', 'd.dcm', 'e.dcm', 'a.dcm', 'f.dcm', 'c.dcm']
+
+    # Slices without a position go last, in the order of their number
+    for fname, number in [('x.dcm', 2), ('y.dcm', 1)]:
+        write_dicom(tmpdir.join(fname).strpath, make_slice(0), number=number)
+    filenames = [tmpdir.join(fname).strpath for fname in ['x.dcm', 'y.dcm']]
+    filenames.append(tmpdir.join('series', 'c.dcm').strpath)
+    names = [fname[-5:] for fname in dcm.sort_series(filenames)]
+    assert names == ['c.dcm', 'y.dcm', 'x.dcm']
+
+
+def test_load_dicom_series(series):
+    """Slices are decoded in the current process"""
+    data, error = dcm.load_dicom_series(series, processes=1)
+    assert error is None
+    volume = data['series']
+    assert type(volume) is np.ndarray
+    assert_array_equal(volume, expected_volume())
+
+    # Directories and glob patterns select the series with load_dicom
+    data, error = dcm.load_dicom(series)
+    assert_array_equal(data['series'], expected_volume())
+    data, error = dcm.load_dicom(series + '/[a-c].dcm')
+    assert_array_equal(data['series'], expected_volume()[[0, 3, 5]])
+
+
+def test_load_dicom_series_parallel(series, monkeypatch):
+    """Slices are decoded in worker processes"""
+    monkeypatch.setattr(dcm, 'PARALLEL_MIN_SLICES', 2)
+    data, error = dcm.load_dicom_series(series, processes=2)
+    assert error is None
+    assert_array_equal(data['series'], expected_volume())
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_load_dicom_series_memmap(tmpdir, series, monkeypatch, processes):
+    """The volume is memory-mapped to the scratch file"""
+    monkeypatch.setattr(dcm, 'PARALLEL_MIN_SLICES', 2)
+    scratch = tmpdir.join('scratch.dat').strpath
+    data, error = dcm.load_dicom_series(series, processes=processes,
+                                        scratch=scratch)
+    assert error is None
+    volume = data['series']
+    assert isinstance(volume, np.memmap)
+    assert volume.filename == scratch
+    assert_array_equal(volume, expected_volume())
+    # Slices decoded by the workers are written in the scratch file
+    stored = np.memmap(scratch, dtype=np.uint16, mode='r',
+                       shape=volume.shape)
+    assert_array_equal(stored, expected_volume())
+
+
+def test_load_dicom_series_empty(tmpdir):
+    data, error = dcm.load_dicom_series(tmpdir.strpath)
+    assert data is None
+    assert 'No DICOM images' in error
@@ -6,23 +6,26 @@
 
 """I/O plugin for loading/saving HDF5 files
 
-Note that this is a fairly dumb implementation which reads the whole HDF5 file into
-Spyder's variable explorer.  Since HDF5 files are designed for storing very large
-data-sets, it may be much better to work directly with the HDF5 objects, thus keeping
-the data on disk.  Nonetheless, this plugin gives quick and dirty but convenient 
-access to HDF5 files.
+Since HDF5 files are designed for storing very large data-sets, big
+datasets are not read into memory when loading a file. Contiguous ones are
+memory-mapped, so they can be used as any other array while only the parts
+that are accessed are read from disk. Chunked or compressed ones are given
+as HDF5Dataset objects, whose shape, dtype and chunks are available at once
+and whose slices are read when they're accessed (e.g. the rows shown by the
+Array Editor, which views them read-only). Other datasets are loaded as
+arrays, unless lazy loading is asked for.
 
-There is no support for creating files with compression, chunking etc, although
-these can be read without problem.
+When saving data, arrays are written as contiguous datasets, which can be
+memory-mapped, unless a compression is asked for: big enough arrays are
+then written as chunked and compressed datasets.
 
 All datatypes to be saved must be convertible to a numpy array, otherwise an exception
 will be raised.
 
 Data attributes are currently ignored.
 
-When reading an HDF5 file with sub-groups, groups in the HDF5 file will
-correspond to dictionaries with the same layout.  However, when saving
-data, dictionaries are not turned into HDF5 groups.
+Groups in the HDF5 file correspond to dictionaries with the same layout,
+both when reading and saving data.
 
 TODO: Look for the pytables library if h5py is not found??
 TODO: Check issues with valid python names vs valid h5f5 names
@@ -30,20 +33,124 @@ TODO: Check issues with valid python names vs valid h5f5 names
 
 from __future__ import print_function
 
+# Datasets of at least this size (in bytes) are loaded lazily by default
+LAZY_MIN_SIZE = 2**24
+
+# Arrays of at least this number of elements are saved as chunked datasets
+# when they're compressed
+CHUNKED_MIN_SIZE = 1024
+
 try:
     # Do not import h5py here because it will try to import IPython,
     # and this is freezing the Spyder GUI
     import imp
     imp.find_module('h5py')
     import numpy as np
-    
-    def load_hdf5(filename):
+
+    class HDF5Dataset(object):
+        """
+        Proxy of a dataset in an HDF5 file, which reads its data only
+        when it's sliced or converted to an array
+        """
+        # Shown and edited by windows in the Variable Explorer
+        lazy_array = True
+
+        def __init__(self, filename, name, dataset):
+            self.filename = filename
+            self.name = name
+            self.shape = dataset.shape
+            self.dtype = dataset.dtype
+            self.chunks = dataset.chunks
+            self.compression = dataset.compression
+            self._dataset = None
+
+        def __getstate__(self):
+            state = self.__dict__.copy()
+            state['_dataset'] = None
+            return state
+
+        @property
+        def ndim(self):
+            return len(self.shape)
+
+        @property
+        def size(self):
+            return int(np.prod(self.shape))
+
+        @property
+        def nbytes(self):
+            return self.size * self.dtype.itemsize
+
+        def __len__(self):
+            if not self.shape:
+                raise TypeError("len() of unsized object")
+            return self.shape[0]
+
+        def __repr__(self):
+            return "<HDF5 dataset %s: shape %s, type %s>" % (
+                       self.name, self.shape, self.dtype.str)
+
+        @property
+        def dataset(self):
+            """Open h5py dataset"""
+            if self._dataset is None:
+                import h5py
+                self._dataset = h5py.File(self.filename, 'r')[self.name]
+            return self._dataset
+
+        def __getitem__(self, key):
+            return self.dataset[key]
+
+        def __array__(self, dtype=None):
+            return np.asarray(self.read(), dtype=dtype)
+
+        def read(self):
+            """Read the whole dataset"""
+            return self.dataset[()]
+
+        def close(self):
+            """Close the HDF5 file, which is reopened if needed"""
+            if self._dataset is not None:
+                self._dataset.file.close()
+                self._dataset = None
+
+    def load_dataset(filename, dataset, lazy):
+        """
+        Load *dataset* into memory, or lazily if *lazy* is True, i.e.
+        memory-mapped if it's contiguous and as an HDF5Dataset otherwise
+
+        If *lazy* is None, only datasets of at least LAZY_MIN_SIZE bytes
+        are loaded lazily.
+        """
+        if lazy is None:
+            big = dataset.size * dataset.dtype.itemsize >= LAZY_MIN_SIZE
+        else:
+            big = lazy
+        if not big or not dataset.shape or dataset.dtype.hasobject:
+            return np.array(dataset)
+        offset = dataset.id.get_offset()
+        if offset is not None and dataset.chunks is None:
+            # Contiguous and uncompressed: map it in copy-on-write mode
+            # so changes don't end up in the file
+            return np.memmap(filename, dtype=dataset.dtype, mode='c',
+                             offset=offset, shape=dataset.shape)
+        return HDF5Dataset(filename, dataset.name, dataset)
+
+    def load_hdf5(filename, lazy=None):
+        """
+        Load HDF5 file
+
+        If *lazy* is True, datasets are loaded lazily, i.e. memory-mapped
+        or as HDF5Dataset objects, and if it's None (as when importing
+        files in the Variable Explorer), only big datasets are. Otherwise
+        they're loaded as arrays.
+        """
         import h5py
         def get_group(group):
             contents = {}
             for name, obj in list(group.items()):
                 if isinstance(obj, h5py.Dataset):
-                    contents[name] = np.array(obj)
+                    contents[name] = load_dataset(filename, obj, lazy)
                 elif isinstance(obj, h5py.Group):
                     # it is a group, so call self recursively
                     contents[name] = get_group(obj)
@@ -57,14 +164,36 @@ try:
             return contents, None
         except Exception as error:
             return None, str(error)
-            
-    def save_hdf5(data, filename):
+
+    def save_hdf5(data, filename, compression=None):
+        """
+        Save HDF5 file, mapping dictionaries to groups
+
+        Arrays are saved as contiguous datasets, unless a *compression*
+        is given (e.g. 'gzip'): big enough arrays are then saved as chunked
+        datasets compressed with it.
+        """
         import h5py
+        def set_group(group, contents):
+            for key, value in list(contents.items()):
+                if isinstance(value, dict):
+                    set_group(group.create_group(key), value)
+                    continue
+                value = np.asarray(value)
+                if (compression is not None and value.ndim > 0 and
+                        value.size >= CHUNKED_MIN_SIZE):
+                    group.create_dataset(key, data=value, chunks=True,
+                                         compression=compression,
+                                         shuffle=True)
+                else:
+                    group[key] = value
+
         try:
             f = h5py.File(filename, 'w')
-            for key, value in list(data.items()):
-                f[key] = np.array(value)
-            f.close()
+            try:
+                set_group(f, data)
+            finally:
+                f.close()
         except Exception as error:
             return str(error)            
 except ImportError:
@@ -73,6 +202,6 @@ except ImportError:
 
 
 if __name__ == "__main__":
-    data = {'a' : [1, 2, 3, 4], 'b' : 4.5}
-    print(save_hdf5(data, "test.h5"))
-    print(load_hdf5("test.h5"))
+    data = {'a' : [1, 2, 3, 4], 'b' : 4.5, 'c': {'d': np.arange(10000.)}}
+    print(save_hdf5(data, "test.h5", compression='gzip'))
+    print(load_hdf5("test.h5", lazy=True))
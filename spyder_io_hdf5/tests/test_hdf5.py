@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for hdf5.py
+"""
+
+# Third party imports
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+# Local imports
+from spyder_io_hdf5 import hdf5
+
+
+pytestmark = pytest.mark.skipif(hdf5.load_hdf5 is None,
+                                reason="h5py is not installed")
+
+
+@pytest.fixture
+def filename(tmpdir):
+    data = {'a': [1, 2, 3], 'b': 4.5,
+            'c': {'d': np.arange(10000.).reshape(100, 100)}}
+    path = tmpdir.join('test.h5').strpath
+    assert hdf5.save_hdf5(data, path, compression='gzip') is None
+    return path
+
+
+def test_save_load_hdf5(filename):
+    data, error = hdf5.load_hdf5(filename)
+    assert error is None
+    assert_array_equal(data['a'], [1, 2, 3])
+    assert data['b'] == 4.5
+    # Saved chunked and compressed, but loaded as an array
+    d = data['c']['d']
+    assert type(d) is np.ndarray
+    assert_array_equal(d + 1, np.arange(1., 10001.).reshape(100, 100))
+    assert d.mean() == 4999.5
+
+
+def test_load_hdf5_big(tmpdir, monkeypatch):
+    """Big datasets are loaded lazily by default"""
+    monkeypatch.setattr(hdf5, 'LAZY_MIN_SIZE', 500)
+    path = tmpdir.join('test.h5').strpath
+    hdf5.save_hdf5({'a': np.arange(10.), 'b': np.arange(2000.)}, path)
+    data, _error = hdf5.load_hdf5(path)
+    assert type(data['a']) is np.ndarray
+    # Saved contiguous by default, so it's memory-mapped
+    assert isinstance(data['b'], np.memmap)
+    assert_array_equal(data['b'], np.arange(2000.))
+
+    hdf5.save_hdf5({'b': np.arange(2000.)}, path, compression='gzip')
+    data, _error = hdf5.load_hdf5(path)
+    assert isinstance(data['b'], hdf5.HDF5Dataset)
+    assert data['b'].compression == 'gzip'
+    assert_array_equal(data['b'][10:12], [10., 11.])
+    data['b'].close()
+
+
+def test_load_hdf5_lazy(filename):
+    data, error = hdf5.load_hdf5(filename, lazy=True)
+    assert error is None
+    d = data['c']['d']
+    assert isinstance(d, hdf5.HDF5Dataset)
+    assert d.shape == (100, 100)
+    assert d.dtype == np.float64
+    assert d.chunks is not None
+    assert len(d) == 100
+    assert_array_equal(d[1, :3], [100., 101., 102.])
+    assert_array_equal(np.asarray(d), np.arange(10000.).reshape(100, 100))
+    d.close()
+    assert isinstance(data['a'], np.memmap)
+    assert_array_equal(data['a'], [1, 2, 3])
+    # Scalars are always read
+    assert data['b'] == 4.5
+
+
+def test_load_hdf5_not_lazy(filename):
+    data, _error = hdf5.load_hdf5(filename, lazy=False)
+    assert type(data['a']) is np.ndarray
+    assert type(data['c']['d']) is np.ndarray
+
+
+def test_dataset_in_variable_explorer(filename):
+    """Datasets are shown as arrays and read by windows"""
+    from spyder.widgets.variableexplorer.utils import (
+        get_size, get_value_info, get_value_window, is_lazy_array,
+        is_supported, value_to_display)
+    data, _error = hdf5.load_hdf5(filename, lazy=True)
+    d = data['c']['d']
+    assert is_lazy_array(d) and not is_lazy_array(data['a'])
+    assert is_supported(d, filters=(dict,))
+    assert get_size(d) == (100, 100)
+    assert value_to_display(d) == repr(d)
+    info = get_value_info(d)
+    assert info['supported'] and info['readonly']
+    assert info['shape'] == (100, 100) and info['min_max'] is None
+    assert_array_equal(get_value_window(d, (1, 3), (0, 2)),
+                       [[100., 101.], [200., 201.]])
+    d.close()
+
+    hdf5.save_hdf5({'e': np.arange(2000.)}, filename, compression='gzip')
+    e = hdf5.load_hdf5(filename, lazy=True)[0]['e']
+    assert get_value_info(e)['shape'] == (2000, 1)
+    assert_array_equal(get_value_window(e, (5, 7), (0, 1)), [[5.], [6.]])
+    e.close()
+
+
+if __name__ == "__main__":
+    pytest.main()
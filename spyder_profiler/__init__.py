@@ -1,6 +1,27 @@
 # -*- coding: utf-8 -*-
 
 #==============================================================================
-# The following statement is required to register this 3rd party plugin:
+# The following statements are required to register this 3rd party plugin.
+# The plugin module is only imported when the Profiler pane is first shown
+# or one of its actions is used (see spyder.api.plugins.LazyPluginWidget)
 #==============================================================================
-from .profiler import Profiler as PLUGIN_CLASS
+from spyder.config.base import get_translation
+
+_ = get_translation("profiler", "spyder_profiler")
+
+PLUGIN_CLASS_PATH = 'spyder_profiler.profiler.Profiler'
+PLUGIN_CONF_SECTION = 'profiler'
+PLUGIN_TITLE = _("Profiler")
+PLUGIN_ICON = 'profiler'
+PLUGIN_ACTIONS = [
+    {'text': _("Profile"), 'method': 'run_profiler',
+     'menu': 'run_menu_actions', 'shortcut': ("Profiler", "Run profiler"),
+     'icon': True, 'python_only': True},
+    {'text': _("Profile cell in console"), 'method': 'profile_cell',
+     'menu': 'run_menu_actions', 'icon': True, 'python_only': True},
+    {'text': _("Profile selection in console"),
+     'method': 'profile_selection', 'menu': 'run_menu_actions',
+     'icon': True, 'python_only': True},
+    {'text': _("Profile call in console..."), 'method': 'profile_call',
+     'menu': 'run_menu_actions', 'icon': True},
+]
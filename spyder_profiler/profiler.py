@@ -13,15 +13,18 @@ import os.path as osp
 
 # Third party imports
 from qtpy.QtCore import Qt
-from qtpy.QtWidgets import QGroupBox, QLabel, QVBoxLayout
+from qtpy.QtWidgets import (QGroupBox, QInputDialog, QLabel, QLineEdit,
+                            QMessageBox, QVBoxLayout)
 
 # Local imports
 from spyder.config.base import get_translation
 from spyder.api.plugins import SpyderPluginWidget
 from spyder.api.preferences import PluginConfigPage
 from spyder.plugins.runconfig import get_run_configuration
+from spyder.py3compat import to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import create_action
+from .widgets.linetimingpanel import LineTimingPanel
 from .widgets.profilergui import (ProfilerWidget, is_profiler_installed)
 
 
@@ -66,6 +69,8 @@ class Profiler(SpyderPluginWidget):
 
         max_entries = self.get_option('max_entries', 50)
         self.profiler = ProfilerWidget(self, max_entries)
+        # {filename: {line: (hits, time)}} of the last line timing results
+        self.line_timings = {}
 
         layout = QVBoxLayout()
         layout.addWidget(self.profiler)
@@ -102,7 +107,10 @@ class Profiler(SpyderPluginWidget):
 
     def register_plugin(self):
         """Register plugin in Spyder's main window"""
-        self.profiler.datatree.sig_edit_goto.connect(self.main.editor.load)
+        for widget in (self.profiler.datatree, self.profiler.flamegraph,
+                       self.profiler.linetree):
+            widget.sig_edit_goto.connect(self.edit_goto)
+        self.profiler.sig_line_timings.connect(self.show_line_timings)
         self.profiler.redirect_stdio.connect(
             self.main.redirect_internalshell_stdio)
         self.main.add_dockwidget(self)
@@ -114,8 +122,24 @@ class Profiler(SpyderPluginWidget):
         self.register_shortcut(profiler_act, context="Profiler",
                                name="Run profiler")
         
-        self.main.run_menu_actions += [profiler_act]
-        self.main.editor.pythonfile_dependent_actions += [profiler_act]
+        profile_cell_act = create_action(
+            self, _("Profile cell in console"), icon=self.get_plugin_icon(),
+            triggered=self.profile_cell)
+        profile_selection_act = create_action(
+            self, _("Profile selection in console"),
+            icon=self.get_plugin_icon(), triggered=self.profile_selection)
+        profile_call_act = create_action(
+            self, _("Profile call in console..."),
+            icon=self.get_plugin_icon(), triggered=self.profile_call)
+        for action in (profile_cell_act, profile_selection_act,
+                       profile_call_act):
+            action.setEnabled(is_profiler_installed())
+        
+        self.main.run_menu_actions += [profiler_act, profile_cell_act,
+                                       profile_selection_act,
+                                       profile_call_act]
+        self.main.editor.pythonfile_dependent_actions += [
+            profiler_act, profile_cell_act, profile_selection_act]
 
     def refresh_plugin(self):
         """Refresh profiler widget"""
@@ -153,3 +177,87 @@ class Profiler(SpyderPluginWidget):
                 args = runconf.args
         self.profiler.analyze(filename, wdir=wdir, args=args,
                               pythonpath=pythonpath)
+
+    def profile_cell(self):
+        """Profile the current cell in the current console"""
+        editor = self.main.editor.get_current_editor()
+        if editor is not None:
+            self.profile_in_console(editor.get_cell_as_executable_code())
+
+    def profile_selection(self):
+        """Profile the selected text, or current line, in the console"""
+        editor = self.main.editor.get_current_editor()
+        if editor is not None:
+            text = editor.get_selection_as_executable_code()
+            if not text:
+                text = editor.get_current_line().strip()
+            self.profile_in_console(text)
+
+    def profile_call(self):
+        """Ask for an expression, e.g. a function call, and profile it"""
+        text, valid = QInputDialog.getText(
+            self, _("Profile call in console"),
+            _("Expression to profile (e.g. a function call):"),
+            QLineEdit.Normal, self.get_option('last_call', ''))
+        if valid and text:
+            self.set_option('last_call', to_text_string(text))
+            self.profile_in_console(text)
+
+    def profile_in_console(self, code):
+        """
+        Profile code in the kernel of the current IPython console, with the
+        variables already defined in it, and show the results
+        """
+        if not code:
+            return
+        shellwidget = None
+        if self.main.ipyconsole is not None:
+            shellwidget = self.main.ipyconsole.get_current_shellwidget()
+        if shellwidget is None:
+            QMessageBox.warning(self, _("Profiler"),
+                                _("There is no IPython console to profile "
+                                  "code in."))
+            return
+        if shellwidget._reading:
+            QMessageBox.warning(self, _("Profiler"),
+                                _("Code can't be profiled in a console "
+                                  "while debugging."))
+            return
+        try:
+            shellwidget.sig_profile_data.disconnect(
+                self.profiler.show_console_data)
+            shellwidget.sig_profile_error.disconnect(
+                self.profiler.show_console_error)
+        except TypeError:
+            pass
+        shellwidget.sig_profile_data.connect(self.profiler.show_console_data)
+        shellwidget.sig_profile_error.connect(
+            self.profiler.show_console_error)
+        if self.dockwidget and not self.ismaximized:
+            self.dockwidget.setVisible(True)
+            self.dockwidget.raise_()
+        self.profiler.set_console_profiling()
+        shellwidget.profile_code(code)
+
+    def edit_goto(self, filename, line, word):
+        """Open *filename* in the editor, with its line timings if any"""
+        if not osp.isfile(filename):
+            # Code profiled in a console
+            return
+        self.main.editor.load(filename, line, word)
+        self.show_line_timings(self.line_timings)
+
+    def show_line_timings(self, timings):
+        """Show the line *timings* in the margin of the opened files"""
+        self.line_timings = timings
+        for editorstack in self.main.editor.editorstacks:
+            for finfo in editorstack.data:
+                editor = finfo.editor
+                try:
+                    panel = editor.panels.get(LineTimingPanel)
+                except KeyError:
+                    if osp.normcase(finfo.filename) not in timings:
+                        continue
+                    panel = editor.panels.register(LineTimingPanel())
+                panel.set_timings(timings.get(osp.normcase(finfo.filename),
+                                              {}))
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Flame graph of the stacks recorded by the sampling profiler
+"""
+
+# Standard library imports
+import os.path as osp
+import zlib
+
+# Third party imports
+from qtpy.QtCore import QRectF, Qt, Signal
+from qtpy.QtGui import QColor, QPainter
+from qtpy.QtWidgets import QToolTip, QWidget
+
+# Local imports
+from spyder.config.base import get_translation
+
+from .sampling import build_stack_tree, compare_stack_trees
+
+try:
+    _ = get_translation("profiler", "spyder_profiler")
+except KeyError as error:
+    import gettext
+    _ = gettext.gettext
+
+
+class FlameGraphWidget(QWidget):
+    """
+    Icicle-style flame graph: the root of the stacks is at the top and the
+    width of each function is proportional to the number of samples taken
+    while it was running
+
+    Clicking a function zooms into it (clicking the first row zooms out)
+    and double-clicking it goes to its definition. With compared data,
+    functions with more samples than in it are shown in red and the ones
+    with fewer in green.
+    """
+    sig_edit_goto = Signal(str, int, str)
+
+    MIN_WIDTH = 2
+
+    def __init__(self, parent=None):
+        QWidget.__init__(self, parent)
+        self.setMouseTracking(True)
+        self.tree = None
+        self.zoomed = None
+        self.compared = False
+        # (rect, node) of the shown nodes, computed when needed
+        self._rects = None
+
+    def set_data(self, data, compare_data=None):
+        """Show the stacks of sampling profiler *data*"""
+        self.tree = build_stack_tree(data['stacks'])
+        self.compared = compare_data is not None
+        if self.compared:
+            compare_stack_trees(self.tree,
+                                build_stack_tree(compare_data['stacks']))
+        self.zoom(self.tree)
+
+    def clear(self):
+        """Remove the graph"""
+        self.tree = self.zoomed = None
+        self._rects = None
+        self.setMinimumHeight(0)
+        self.update()
+
+    def zoom(self, node):
+        """Show *node* over the whole width"""
+        self.zoomed = node
+        depth = node.get_depth()
+        ancestor = node.parent
+        while ancestor is not None:
+            depth += 1
+            ancestor = ancestor.parent
+        self.setMinimumHeight(depth * self.row_height())
+        self._rects = None
+        self.update()
+
+    def row_height(self):
+        return self.fontMetrics().height() + 4
+
+    def node_text(self, node):
+        """Return the label of *node*"""
+        if node.frame is None:
+            return _("All")
+        filename, _line, name = node.frame
+        if name == '<module>':
+            return '<%s>' % osp.basename(filename)
+        return name
+
+    def node_color(self, node):
+        """Return the color of *node*"""
+        if self.compared and node.other_count is not None:
+            total = float(self.tree.count)
+            other_total = float(max(self.tree.other_count, 1))
+            change = node.count / total - node.other_count / other_total
+            change = max(-1., min(1., 4 * change))
+            if change > 0:
+                return QColor.fromHsvF(0., change, 1.)
+            return QColor.fromHsvF(1 / 3., -change, 1.)
+        # Warm colors, stable for each function
+        hue = zlib.crc32(self.node_text(node).encode('utf-8')) % 60
+        return QColor.fromHsv(hue, 150, 240)
+
+    def get_rects(self):
+        """Return the (rect, node) of the shown nodes"""
+        if self._rects is not None:
+            return self._rects
+        self._rects = rects = []
+        if self.zoomed is None or not self.zoomed.count:
+            return rects
+        height = self.row_height()
+
+        # Ancestors of the zoomed node, over the whole width
+        ancestors = []
+        node = self.zoomed.parent
+        while node is not None:
+            ancestors.insert(0, node)
+            node = node.parent
+        for depth, node in enumerate(ancestors):
+            rects.append((QRectF(0, depth * height, self.width(), height),
+                          node))
+
+        # The zoomed node and its callees
+        scale = float(self.width()) / self.zoomed.count
+        stack = [(self.zoomed, 0., len(ancestors))]
+        while stack:
+            node, left, depth = stack.pop()
+            width = node.count * scale
+            if width < self.MIN_WIDTH:
+                continue
+            rects.append((QRectF(left, depth * height, width, height), node))
+            children = sorted(node.children.values(),
+                              key=lambda child: self.node_text(child))
+            for child in children:
+                stack.append((child, left, depth + 1))
+                left += child.count * scale
+        return rects
+
+    def resizeEvent(self, event):
+        """Override Qt method"""
+        self._rects = None
+        QWidget.resizeEvent(self, event)
+
+    def paintEvent(self, event):
+        """Override Qt method"""
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.palette().base())
+        exposed = QRectF(event.rect())
+        for rect, node in self.get_rects():
+            if rect.intersects(exposed):
+                self._paint_node(painter, node, rect)
+
+    def _paint_node(self, painter, node, rect):
+        painter.fillRect(rect.adjusted(0, 0, -1, -1), self.node_color(node))
+        painter.setPen(Qt.black)
+        text = painter.fontMetrics().elidedText(self.node_text(node),
+                                                Qt.ElideRight,
+                                                int(rect.width()) - 4)
+        painter.drawText(rect.adjusted(2, 0, -2, 0),
+                         Qt.AlignLeft | Qt.AlignVCenter, text)
+
+    def node_at(self, pos):
+        """Return the node at *pos*, or None"""
+        for rect, node in self.get_rects():
+            if rect.contains(pos.x(), pos.y()):
+                return node
+
+    def mouseMoveEvent(self, event):
+        """Override Qt method: show information about the hovered node"""
+        node = self.node_at(event.pos())
+        if node is None:
+            QToolTip.hideText()
+            return
+        lines = ["<b>%s</b>" % self.node_text(node)]
+        if node.frame is not None:
+            lines.append("%s : %d" % node.frame[:2])
+        percent = 100. * node.count / max(self.tree.count, 1)
+        lines.append(_("%d samples (%.1f%%)") % (node.count, percent))
+        if self.compared and node.other_count is not None:
+            lines.append(_("%d samples in compared data") % node.other_count)
+        QToolTip.showText(event.globalPos(), '<br>'.join(lines), self)
+
+    def mousePressEvent(self, event):
+        """Override Qt method: zoom into the clicked node"""
+        node = self.node_at(event.pos())
+        if event.button() != Qt.LeftButton or node is None:
+            return
+        if node is self.zoomed and node.parent is not None:
+            self.zoom(node.parent)
+        else:
+            self.zoom(node)
+
+    def mouseDoubleClickEvent(self, event):
+        """Override Qt method: go to the definition of the clicked node"""
+        node = self.node_at(event.pos())
+        if node is not None and node.frame is not None:
+            filename, line, _name = node.frame
+            if osp.isfile(filename):
+                self.sig_edit_goto.emit(filename, line, '')
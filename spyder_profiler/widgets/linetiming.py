@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Line timing profiler
+
+Run as a script, it runs a Python script and records the number of times
+each of its lines is run and the time spent running it, including the time
+spent in the functions it calls (but only once for lines running in nested
+frames, e.g. in recursive calls or comprehensions):
+
+    python linetiming.py [-f FILE]... -o OUTPUT script [args]
+
+Only the lines of the script and of the files given with -f are timed,
+through a trace function (see sys.settrace). The timings are saved in a
+JSON file.
+
+This module only uses the standard library, because it's run by the
+interpreter of the profiled script.
+"""
+
+from __future__ import print_function
+
+# Standard library imports
+import argparse
+import io
+import json
+import os.path as osp
+import runpy
+import sys
+import time
+
+
+# Version of the results format
+FORMAT_VERSION = 1
+
+timer = getattr(time, 'perf_counter', time.time)
+
+
+class LineTimer(object):
+    """Record the hits and times of the lines of *filenames*"""
+
+    def __init__(self, filenames):
+        self.filenames = set(filenames)
+        # (filename, line) -> [hits, time]
+        self.timings = {}
+        # (filename, line) -> number of frames running it
+        self.running = {}
+        self.start_time = None
+        self.total_time = 0.
+
+    def start(self):
+        """Start timing lines"""
+        self.start_time = timer()
+        sys.settrace(self._trace_calls)
+
+    def stop(self):
+        """Stop timing lines"""
+        sys.settrace(None)
+        self.total_time += timer() - self.start_time
+
+    def _trace_calls(self, frame, event, arg):
+        if frame.f_code.co_filename not in self.filenames:
+            return None
+        timings = self.timings
+        running = self.running
+        # Line being run in this frame, time it started and whether its
+        # time is counted: it's not if the line is already running in an
+        # outer frame, whose time includes it
+        current = [None, 0., False]
+
+        def trace_lines(frame, event, arg):
+            if event not in ('line', 'return'):
+                return trace_lines
+            now = timer()
+            line = current[0]
+            if line is not None:
+                if current[2]:
+                    timings[line][1] += now - current[1]
+                running[line] -= 1
+            if event == 'line':
+                line = (frame.f_code.co_filename, frame.f_lineno)
+                if line not in timings:
+                    timings[line] = [0, 0.]
+                timings[line][0] += 1
+                current[0] = line
+                current[2] = not running.get(line)
+                running[line] = running.get(line, 0) + 1
+            else:
+                current[0] = None
+            current[1] = timer()
+            return trace_lines
+
+        return trace_lines
+
+    def get_data(self):
+        """Return the timings as a dictionary serializable to JSON"""
+        return {'version': FORMAT_VERSION,
+                'total': self.total_time,
+                'timings': [[filename, line, hits, elapsed]
+                            for (filename, line), (hits, elapsed)
+                            in self.timings.items()]}
+
+    def save(self, filename):
+        """Save the timings to *filename*"""
+        text = json.dumps(self.get_data())
+        if not isinstance(text, type(u'')):
+            text = text.decode('utf-8')
+        with io.open(filename, 'w', encoding='utf-8') as fdesc:
+            fdesc.write(text)
+
+
+def load_line_timings(filename):
+    """
+    Load the timings saved by a LineTimer
+
+    Return a dictionary with the total time, under 'total', and the
+    (hits, time) of each (filename, line), under 'timings'
+    """
+    with io.open(filename, encoding='utf-8') as fdesc:
+        data = json.load(fdesc)
+    data['timings'] = dict(((filename, line), (hits, elapsed))
+                           for filename, line, hits, elapsed
+                           in data['timings'])
+    return data
+
+
+def main():
+    """Run a script with the line timing profiler"""
+    parser = argparse.ArgumentParser(description="Line timing profiler")
+    parser.add_argument('-o', '--output', required=True,
+                        help="File where the timings are saved")
+    parser.add_argument('-f', '--file', action='append', default=[],
+                        help="Also time the lines of this file")
+    parser.add_argument('script')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    options = parser.parse_args()
+
+    script = osp.abspath(options.script)
+    sys.argv = [script] + options.args
+    # Replace the directory of this module
+    sys.path[0] = osp.dirname(script)
+    line_timer = LineTimer([script] + [osp.abspath(filename)
+                                       for filename in options.file])
+    line_timer.start()
+    try:
+        runpy.run_path(script, run_name='__main__')
+    finally:
+        line_timer.stop()
+        line_timer.save(options.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Editor panel showing the time spent running each line, as measured by the
+line timing profiler
+"""
+
+# Third party imports
+from qtpy.QtCore import QRect, QSize, Qt
+from qtpy.QtGui import QColor, QPainter
+from qtpy.QtWidgets import QToolTip
+
+# Local imports
+from spyder.api.panel import Panel
+from spyder.config.base import get_translation
+
+from .profilergui import format_measure
+
+try:
+    _ = get_translation("profiler", "spyder_profiler")
+except KeyError as error:
+    import gettext
+    _ = gettext.gettext
+
+
+class LineTimingPanel(Panel):
+    """
+    Left margin of an editor with the time spent running each of its lines:
+    a bar proportional to the slowest line and the time
+    """
+    BAR_COLOR = QColor(255, 140, 0, 110)
+
+    def __init__(self):
+        Panel.__init__(self)
+        self.scrollable = True
+        self.setMouseTracking(True)
+        # line -> (hits, time)
+        self.timings = {}
+        self.max_time = 0.
+
+    def set_timings(self, timings):
+        """Show the (hits, time) of each line of *timings*"""
+        self.timings = timings
+        self.max_time = max([elapsed for _hits, elapsed
+                             in timings.values()] or [0.])
+        self.setVisible(bool(timings))
+        self.update()
+
+    def sizeHint(self):
+        """Override Qt method"""
+        if not self.timings:
+            return QSize(0, 0)
+        return QSize(self.editor.fontMetrics().width('999.99 ms') + 6, 0)
+
+    def paintEvent(self, event):
+        """Override Qt method"""
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.editor.sideareas_color)
+        if not self.max_time:
+            return
+        font_height = self.editor.fontMetrics().height()
+        width = self.width() - 2
+        painter.setFont(self.editor.font())
+        painter.setPen(self.editor.normal_color)
+        for top, line_number, _block in self.editor.visible_blocks:
+            timing = self.timings.get(line_number)
+            if timing is None:
+                continue
+            elapsed = timing[1]
+            bar_width = int(width * elapsed / self.max_time)
+            painter.fillRect(QRect(0, top + 1, bar_width, font_height - 2),
+                             self.BAR_COLOR)
+            painter.drawText(0, top, width, font_height,
+                             Qt.AlignRight | Qt.AlignBottom,
+                             format_measure(elapsed))
+
+    def line_at(self, y):
+        """Return the line number at vertical position *y*, or None"""
+        font_height = self.editor.fontMetrics().height()
+        for top, line_number, _block in self.editor.visible_blocks:
+            if top <= y < top + font_height:
+                return line_number
+
+    def mouseMoveEvent(self, event):
+        """Override Qt method: show the timing of the hovered line"""
+        timing = self.timings.get(self.line_at(event.pos().y()))
+        if timing is None:
+            QToolTip.hideText()
+            return
+        hits, elapsed = timing
+        text = _("%s in %d hits (%s per hit)") % (
+            format_measure(elapsed), hits,
+            format_measure(elapsed / max(hits, 1)))
+        QToolTip.showText(event.globalPos(), text, self)
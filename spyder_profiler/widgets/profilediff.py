@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Comparison of profiler results
+
+Compare the results saved by cProfile for one or several base runs with
+the ones of one or several new runs, and report the functions that got
+significantly slower or faster:
+
+    python profilediff.py --base a1.Result a2.Result --new b1.Result b2.Result
+
+The exit code is 1 if there are regressions, which allows using it to
+check performance changes in scripts.
+
+Functions are matched across runs by file, name and position among the
+functions of the same name in the file, so that functions whose line
+numbers changed are still compared. With several runs per side, changes
+smaller than the noise measured between the runs of each side are ignored.
+
+This module only uses the standard library, so that it can be run
+without Spyder.
+"""
+
+from __future__ import print_function
+
+# Standard library imports
+import argparse
+import io
+import json
+import math
+import pstats
+import sys
+
+
+# Measures, with their position in the values of pstats functions
+MEASURES = {'calls': 1, 'local': 2, 'cumulative': 3}
+
+# Status of a compared function
+UNCHANGED, REGRESSION, IMPROVEMENT, ADDED, REMOVED = (
+    'unchanged', 'regression', 'improvement', 'added', 'removed')
+
+# Key of the whole run in the comparison
+TOTAL = ('', 0, '<total>')
+
+
+def load_stats(filenames):
+    """Return the stats dictionaries of the pstats files *filenames*"""
+    return [pstats.Stats(filename).stats for filename in filenames]
+
+
+def function_ids(stats):
+    """
+    Return an identifier of each function of *stats* that doesn't depend
+    on its line number: its file, name and position among the functions of
+    the same name in the file
+    """
+    functions = sorted(stats, key=lambda function: (function[0],
+                                                    function[2],
+                                                    function[1]))
+    ids = {}
+    ordinal = 0
+    previous = None
+    for function in functions:
+        filename, _line, name = function
+        ordinal = ordinal + 1 if (filename, name) == previous else 0
+        previous = (filename, name)
+        ids[function] = (filename, name, ordinal)
+    return ids
+
+
+def align_stats(stats, other):
+    """
+    Return the values of the *other* stats under the keys of the same
+    functions in *stats*, matching functions whose line number changed
+    """
+    other_ids = dict((function_id, function) for function, function_id
+                     in function_ids(other).items())
+    aligned = {}
+    for function, function_id in function_ids(stats).items():
+        other_function = other_ids.get(function_id)
+        if other_function is not None:
+            aligned[function] = other[other_function]
+    return aligned
+
+
+def mean(values):
+    return sum(values) / float(len(values))
+
+
+def variance(values):
+    """Return the sample variance of *values*, 0 for a single value"""
+    if len(values) < 2:
+        return 0.
+    average = mean(values)
+    return (sum((value - average) ** 2 for value in values) /
+            (len(values) - 1))
+
+
+class RunSet(object):
+    """Values of a measure of every function in several runs"""
+
+    def __init__(self, runs, measure='cumulative'):
+        self.runs = len(runs)
+        position = MEASURES[measure]
+        # Function id -> value in each run
+        self.values = {}
+        # Function id -> (filename, line, name), from the last run
+        self.functions = {}
+        self.totals = []
+        for index, stats in enumerate(runs):
+            for function, function_id in function_ids(stats).items():
+                values = self.values.get(function_id)
+                if values is None:
+                    # Functions not called in a run count as 0
+                    values = self.values[function_id] = [0] * self.runs
+                values[index] = stats[function][position]
+                self.functions[function_id] = function
+            self.totals.append(self.get_total(stats, measure))
+
+    @staticmethod
+    def get_total(stats, measure):
+        """Return the total of *measure* in a run"""
+        if measure == 'calls':
+            return sum(values[1] for values in stats.values())
+        # Time of the whole run
+        return sum(values[2] for values in stats.values())
+
+
+class FunctionDiff(object):
+    """Comparison of a measure of a function in the base and new runs"""
+    __slots__ = ('function', 'base', 'new', 'status')
+
+    def __init__(self, function, base, new, status=UNCHANGED):
+        self.function = function
+        self.base = base
+        self.new = new
+        self.status = status
+
+    @property
+    def difference(self):
+        return mean(self.new) - mean(self.base)
+
+    @property
+    def relative(self):
+        """Return the relative difference, None if it was 0 before"""
+        base = mean(self.base)
+        if not base:
+            return None
+        return self.difference / base
+
+    @property
+    def noise(self):
+        """Return the standard error of the difference between the means"""
+        return math.sqrt(variance(self.base) / len(self.base) +
+                         variance(self.new) / len(self.new))
+
+    def classify(self, threshold, min_difference, noise_factor):
+        """
+        Set the status of a function present in the base and new runs: a
+        regression or an improvement if its measure changed more than
+        *threshold* (relative), *min_difference* (absolute) and
+        *noise_factor* times the noise
+        """
+        base, new = mean(self.base), mean(self.new)
+        difference = new - base
+        if (abs(difference) <= min_difference or
+                abs(difference) <= threshold * base or
+                abs(difference) <= noise_factor * self.noise):
+            self.status = UNCHANGED
+        elif difference > 0:
+            self.status = REGRESSION
+        else:
+            self.status = IMPROVEMENT
+        return self.status
+
+    def to_dict(self):
+        filename, line, name = self.function
+        return {'filename': filename, 'line': line, 'name': name,
+                'status': self.status, 'base': mean(self.base),
+                'new': mean(self.new), 'difference': self.difference,
+                'relative': self.relative, 'noise': self.noise}
+
+
+class ProfileDiff(object):
+    """
+    Comparison of the *base_runs* and *new_runs* stats dictionaries for a
+    measure ('cumulative', 'local' or 'calls')
+
+    The measures of each function are averaged over the runs of each side.
+    A change is significant if it's larger than *threshold* times the base
+    value, than *min_difference* and than *noise_factor* times the noise
+    estimated from the differences between the runs of each side (which
+    needs several runs on both sides).
+    """
+
+    def __init__(self, base_runs, new_runs, measure='cumulative',
+                 threshold=0.1, min_difference=0.001, noise_factor=3.):
+        self.measure = measure
+        base = RunSet(base_runs, measure)
+        new = RunSet(new_runs, measure)
+        self.base_runs, self.new_runs = base.runs, new.runs
+        self.total = FunctionDiff(TOTAL, base.totals, new.totals)
+        self.total.classify(threshold, min_difference, noise_factor)
+        self.functions = []
+        for function_id in set(base.values) | set(new.values):
+            function = (new.functions.get(function_id) or
+                        base.functions[function_id])
+            diff = FunctionDiff(function,
+                                base.values.get(function_id,
+                                                [0] * base.runs),
+                                new.values.get(function_id, [0] * new.runs))
+            # Functions are added or removed if they were called in no run
+            # of one side, whatever their measured values
+            if function_id not in base.values:
+                diff.status = ADDED
+            elif function_id not in new.values:
+                diff.status = REMOVED
+            else:
+                diff.classify(threshold, min_difference, noise_factor)
+            self.functions.append(diff)
+        self.functions.sort(key=lambda diff: abs(diff.difference),
+                            reverse=True)
+
+    def get_functions(self, *statuses):
+        """Return the functions with one of *statuses*"""
+        return [diff for diff in self.functions if diff.status in statuses]
+
+    def has_regressions(self):
+        return (self.total.status == REGRESSION or
+                bool(self.get_functions(REGRESSION)))
+
+    def to_dict(self):
+        """Return the comparison as a dictionary serializable to JSON"""
+        return {'measure': self.measure, 'base_runs': self.base_runs,
+                'new_runs': self.new_runs, 'total': self.total.to_dict(),
+                'functions': [diff.to_dict() for diff in self.functions
+                              if diff.status != UNCHANGED]}
+
+    def report(self, count=20):
+        """Return a text report of the significant changes"""
+        def format_value(value):
+            if self.measure == 'calls':
+                return '%d' % value
+            return '%.3f ms' % (1000 * value)
+
+        def format_diff(diff):
+            relative = diff.relative
+            relative = '' if relative is None else ' (%+.1f%%)' % (
+                100 * relative)
+            filename, line, name = diff.function
+            location = '%s:%d' % (filename, line) if filename else ''
+            return '  %12s -> %12s  %s%s  %s %s' % (
+                format_value(mean(diff.base)), format_value(mean(diff.new)),
+                diff.status, relative, name, location)
+
+        lines = ["Measure: %s, %d base run(s), %d new run(s)" % (
+                     self.measure, self.base_runs, self.new_runs),
+                 "Total:" + format_diff(self.total)]
+        for title, statuses in (("Regressions", (REGRESSION,)),
+                                ("Improvements", (IMPROVEMENT,)),
+                                ("Added and removed functions",
+                                 (ADDED, REMOVED))):
+            functions = self.get_functions(*statuses)
+            if functions:
+                lines += ["", "%s (%d):" % (title, len(functions))]
+                lines += [format_diff(diff) for diff in functions[:count]]
+        return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Compare profiler results from the command line"""
+    parser = argparse.ArgumentParser(
+        description="Compare cProfile results and report regressions")
+    parser.add_argument('--base', nargs='+', required=True,
+                        help="Results of the base runs")
+    parser.add_argument('--new', nargs='+', required=True,
+                        help="Results of the new runs")
+    parser.add_argument('-m', '--measure', choices=sorted(MEASURES),
+                        default='cumulative',
+                        help="Measure compared (default: cumulative)")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="Minimum relative change (default: 0.1)")
+    parser.add_argument('--min-difference', type=float, default=0.001,
+                        help="Minimum absolute change, in seconds or calls "
+                             "(default: 0.001)")
+    parser.add_argument('--noise', type=float, default=3.,
+                        help="Minimum change, in standard errors of the "
+                             "difference between runs (default: 3)")
+    parser.add_argument('-n', '--count', type=int, default=20,
+                        help="Functions shown per category (default: 20)")
+    parser.add_argument('--json', default=None,
+                        help="Also save the comparison to this JSON file")
+    options = parser.parse_args(argv)
+
+    try:
+        diff = ProfileDiff(load_stats(options.base), load_stats(options.new),
+                           options.measure, options.threshold,
+                           options.min_difference, options.noise)
+    except (EOFError, IOError, OSError, TypeError, ValueError) as error:
+        print("Error loading results: %s" % error, file=sys.stderr)
+        return 2
+    print(diff.report(options.count))
+    if options.json:
+        text = json.dumps(diff.to_dict(), indent=1)
+        if not isinstance(text, type(u'')):
+            text = text.decode('utf-8')
+        with io.open(options.json, 'w', encoding='utf-8') as fdesc:
+            fdesc.write(text)
+    return 1 if diff.has_regressions() else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,30 +15,40 @@ http://docs.python.org/library/profile.html
 
 # Standard library imports
 from __future__ import with_statement
+from array import array
+import linecache
+import marshal
 import os
 import os.path as osp
+import shutil
 import sys
 import time
 
 # Third party imports
-from qtpy.compat import getopenfilename, getsavefilename
-from qtpy.QtCore import (QByteArray, QProcess, QProcessEnvironment, QTextCodec,
-                         Qt, Signal)
+from qtpy.compat import getopenfilename, getsavefilename, to_qvariant
+from qtpy.QtCore import (QAbstractItemModel, QByteArray, QModelIndex,
+                         QProcess, QProcessEnvironment, QTextCodec, Qt,
+                         Signal)
 from qtpy.QtGui import QColor
-from qtpy.QtWidgets import (QApplication, QHBoxLayout, QLabel, QMessageBox,
-                            QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget)
+from qtpy.QtWidgets import (QApplication, QComboBox, QHBoxLayout, QLabel,
+                            QMessageBox, QScrollArea, QStackedWidget,
+                            QTreeView, QTreeWidget, QTreeWidgetItem,
+                            QVBoxLayout, QWidget)
 
 # Local imports
 from spyder.config.base import get_conf_path, get_translation
 from spyder.py3compat import getcwd, to_text_string
 from spyder.utils import icon_manager as ima
-from spyder.utils.qthelpers import (create_toolbutton, get_item_user_text,
-                                    set_item_user_text)
+from spyder.utils.qthelpers import create_toolbutton
 from spyder.utils.programs import shell_split
 from spyder.widgets.comboboxes import PythonModulesComboBox
 from spyder.utils.misc import add_pathlist_to_PYTHONPATH
 from spyder.widgets.variableexplorer.texteditor import TextEditor
 
+from . import linetiming, sampling
+from .flamegraph import FlameGraphWidget
+from .profilediff import align_stats
+
 # This is needed for testing this module as a stand alone script
 try:
     _ = get_translation("profiler", "spyder_profiler")
@@ -55,13 +65,22 @@ def is_profiler_installed():
     return is_module_installed('cProfile') and is_module_installed('pstats')
 
 
+def get_runner_path(module):
+    """Return the path of the script of a profiler runner *module*"""
+    return osp.splitext(module.__file__)[0] + '.py'
+
+
 class ProfilerWidget(QWidget):
     """
     Profiler widget
     """
     DATAPATH = get_conf_path('profiler.results')
+    SAMPLES_PATH = get_conf_path('profiler.samples')
+    LINES_PATH = get_conf_path('profiler.lines')
     VERSION = '0.0.1'
+    CPROFILE, SAMPLING, LINE_TIMING = range(3)
     redirect_stdio = Signal(bool)
+    sig_line_timings = Signal(object)
     
     def __init__(self, parent, max_entries=100):
         QWidget.__init__(self, parent)
@@ -74,8 +93,23 @@ class ProfilerWidget(QWidget):
         self._last_wdir = None
         self._last_args = None
         self._last_pythonpath = None
+        self.running_mode = None
+        # Files of the data compared with the results of each mode, except
+        # cProfile's, which is kept by the data tree
+        self.compare_files = {}
         
         self.filecombo = PythonModulesComboBox(self)
+
+        self.mode_combo = QComboBox(self)
+        self.mode_combo.addItems([_("Function calls"), _("Sampling"),
+                                  _("Line timing")])
+        self.mode_combo.setToolTip(_("Function calls: time and number of "
+                                     "calls of every function (cProfile)\n"
+                                     "Sampling: flame graph of the stacks "
+                                     "sampled every few milliseconds, with "
+                                     "a low overhead\n"
+                                     "Line timing: time spent in each line "
+                                     "of the script"))
         
         self.start_button = create_toolbutton(self, icon=ima.icon('run'),
                                     text=_("Profile"),
@@ -105,6 +139,15 @@ class ProfilerWidget(QWidget):
                                             triggered=self.show_log)
 
         self.datatree = ProfilerDataTree(self)
+        self.flamegraph = FlameGraphWidget(self)
+        self.linetree = LineTimingTree(self)
+        flamegraph_area = QScrollArea(self)
+        flamegraph_area.setWidgetResizable(True)
+        flamegraph_area.setWidget(self.flamegraph)
+        self.stack = QStackedWidget(self)
+        for widget in (self.datatree, flamegraph_area, self.linetree):
+            self.stack.addWidget(widget)
+        self.mode_combo.currentIndexChanged.connect(self.set_mode)
 
         self.collapse_button = create_toolbutton(self,
                                                  icon=ima.icon('collapse'),
@@ -135,6 +178,7 @@ class ProfilerWidget(QWidget):
         hlayout1 = QHBoxLayout()
         hlayout1.addWidget(self.filecombo)
         hlayout1.addWidget(browse_button)
+        hlayout1.addWidget(self.mode_combo)
         hlayout1.addWidget(self.start_button)
         hlayout1.addWidget(self.stop_button)
 
@@ -152,7 +196,7 @@ class ProfilerWidget(QWidget):
         layout = QVBoxLayout()
         layout.addLayout(hlayout1)
         layout.addLayout(hlayout2)
-        layout.addWidget(self.datatree)
+        layout.addWidget(self.stack)
         self.setLayout(layout)
         
         self.process = None
@@ -173,27 +217,69 @@ class ProfilerWidget(QWidget):
             self.datelabel.setText(text)
         else:
             pass # self.show_data()
-            
+
+    def get_mode(self):
+        """Return the selected profiling mode"""
+        return self.mode_combo.currentIndex()
+
+    def set_mode(self, mode):
+        """Show the results of profiling *mode*"""
+        self.stack.setCurrentIndex(mode)
+        for button in (self.collapse_button, self.expand_button):
+            button.setEnabled(mode == self.CPROFILE)
+        if mode == self.CPROFILE:
+            compared = self.datatree.compare_file is not None
+        else:
+            compared = self.compare_files.get(mode) is not None
+        self.clear_button.setEnabled(compared)
+
+    def get_results_path(self, mode):
+        """Return the file where the results of *mode* are saved"""
+        return {self.CPROFILE: self.DATAPATH,
+                self.SAMPLING: self.SAMPLES_PATH,
+                self.LINE_TIMING: self.LINES_PATH}[mode]
+
+    def get_results_filter(self, mode):
+        """Return the file dialog filter of the results of *mode*"""
+        if mode == self.SAMPLING:
+            return _("Sampling profiler result") + " (*.samples)"
+        elif mode == self.LINE_TIMING:
+            return _("Line timing result") + " (*.lines)"
+        return _("Profiler result") + " (*.Result)"
+
     def save_data(self):
         """Save data"""
+        mode = self.get_mode()
         title = _( "Save profiler result")
         filename, _selfilter = getsavefilename(self, title,
                                                getcwd(),
-                                               _("Profiler result")+" (*.Result)")
+                                               self.get_results_filter(mode))
         if filename:
-            self.datatree.save_data(filename)
+            if mode == self.CPROFILE:
+                self.datatree.save_data(filename)
+            elif osp.isfile(self.get_results_path(mode)):
+                shutil.copyfile(self.get_results_path(mode), filename)
             
     def compare(self):
+        mode = self.get_mode()
         filename, _selfilter = getopenfilename(self, _("Select script to compare"),
-                                               getcwd(), _("Profiler result")+" (*.Result)")
+                                               getcwd(),
+                                               self.get_results_filter(mode))
         if filename:
-            self.datatree.compare(filename)
+            if mode == self.CPROFILE:
+                self.datatree.compare(filename)
+            else:
+                self.compare_files[mode] = filename
             self.show_data()
             self.clear_button.setEnabled(True)
 
     def clear(self):
-        self.datatree.compare(None)
-        self.datatree.hide_diff_cols(True)
+        mode = self.get_mode()
+        if mode == self.CPROFILE:
+            self.datatree.compare(None)
+            self.datatree.hide_diff_cols(True)
+        else:
+            self.compare_files[mode] = None
         self.show_data()
         self.clear_button.setEnabled(False)
 
@@ -273,7 +359,13 @@ class ProfilerWidget(QWidget):
         self.output = ''
         self.error_output = ''
         
-        p_args = ['-m', 'cProfile', '-o', self.DATAPATH]
+        self.running_mode = mode = self.get_mode()
+        if mode == self.SAMPLING:
+            p_args = [get_runner_path(sampling), '-o', self.SAMPLES_PATH]
+        elif mode == self.LINE_TIMING:
+            p_args = [get_runner_path(linetiming), '-o', self.LINES_PATH]
+        else:
+            p_args = ['-m', 'cProfile', '-o', self.DATAPATH]
         if os.name == 'nt':
             # On Windows, one has to replace backslashes by slashes to avoid 
             # confusion with escape characters (otherwise, for example, '\t' 
@@ -298,6 +390,7 @@ class ProfilerWidget(QWidget):
     def set_running_state(self, state=True):
         self.start_button.setEnabled(not state)
         self.stop_button.setEnabled(state)
+        self.mode_combo.setEnabled(not state)
         
     def read_output(self, error=False):
         if error:
@@ -320,10 +413,35 @@ class ProfilerWidget(QWidget):
         self.set_running_state(False)
         self.show_errorlog()  # If errors occurred, show them.
         self.output = self.error_output + self.output
+        if self.running_mode is not None:
+            self.mode_combo.setCurrentIndex(self.running_mode)
         # FIXME: figure out if show_data should be called here or
         #        as a signal from the combobox
         self.show_data(justanalyzed=True)
                 
+    def set_console_profiling(self):
+        """Show that code is being profiled in a console"""
+        self.datelabel.setText(_('Profiling in the console, please wait...'))
+
+    def show_console_data(self, data):
+        """
+        Show the stats of code profiled in a console, sent by its kernel
+        in the format saved by pstats
+        """
+        with open(self.DATAPATH, 'wb') as fdesc:
+            marshal.dump(data['stats'], fdesc)
+        self.output = None
+        if self.mode_combo.currentIndex() != self.CPROFILE:
+            self.mode_combo.setCurrentIndex(self.CPROFILE)
+        self.show_data()
+
+    def show_console_error(self, message):
+        """Show that code couldn't be profiled in a console"""
+        self.datelabel.setText('')
+        QMessageBox.critical(self, _("Error"),
+                             _("The code could not be profiled in the "
+                               "console:<br><br>%s") % message)
+
     def kill_if_running(self):
         if self.process is not None:
             if self.process.state() == QProcess.Running:
@@ -336,15 +454,30 @@ class ProfilerWidget(QWidget):
         self.log_button.setEnabled(self.output is not None \
                                    and len(self.output) > 0)
         self.kill_if_running()
-        filename = to_text_string(self.filecombo.currentText())
-        if not filename:
+        mode = self.get_mode()
+        if not osp.isfile(self.get_results_path(mode)):
             return
 
         self.datelabel.setText(_('Sorting data, please wait...'))
         QApplication.processEvents()
         
-        self.datatree.load_data(self.DATAPATH)
-        self.datatree.show_tree()
+        if mode == self.SAMPLING:
+            compare_data = None
+            if self.compare_files.get(mode) is not None:
+                compare_data = sampling.load_samples(self.compare_files[mode])
+            self.flamegraph.set_data(
+                sampling.load_samples(self.SAMPLES_PATH), compare_data)
+        elif mode == self.LINE_TIMING:
+            compare_data = None
+            if self.compare_files.get(mode) is not None:
+                compare_data = linetiming.load_line_timings(
+                    self.compare_files[mode])
+            self.linetree.set_data(
+                linetiming.load_line_timings(self.LINES_PATH), compare_data)
+            self.sig_line_timings.emit(self.linetree.get_file_timings())
+        else:
+            self.datatree.load_data(self.DATAPATH)
+            self.datatree.show_tree()
             
         text_style = "<span style=\'color: #444444\'><b>%s </b></span>"
         date_text = text_style % time.strftime("%d %b %Y %H:%M",
@@ -352,22 +485,51 @@ class ProfilerWidget(QWidget):
         self.datelabel.setText(date_text)
 
 
-class TreeWidgetItem( QTreeWidgetItem ):
-    def __init__(self, parent=None):
-        QTreeWidgetItem.__init__(self, parent)
-    
-    def __lt__(self, otherItem):
-        column = self.treeWidget().sortColumn()
-        try:
-            return float( self.text(column) ) > float( otherItem.text(column) )
-        except ValueError:
-            return self.text(column) > otherItem.text(column)
+def format_measure(measure):
+    """Get format and units for data coming from profiler task."""
+    # For number of calls
+    if isinstance(measure, int):
+        return to_text_string(measure)
+
+    # For time measurements
+    if 1.e-9 < measure <= 1.e-6:
+        measure = u"{0:.2f} ns".format(measure / 1.e-9)
+    elif 1.e-6 < measure <= 1.e-3:
+        measure = u"{0:.2f} us".format(measure / 1.e-6)
+    elif 1.e-3 < measure <= 1:
+        measure = u"{0:.2f} ms".format(measure / 1.e-3)
+    elif 1 < measure <= 60:
+        measure = u"{0:.2f} sec".format(measure)
+    elif 60 < measure <= 3600:
+        m, s = divmod(measure, 3600)
+        if s > 60:
+            m, s = divmod(measure, 60)
+            s = to_text_string(s).split(".")[-1]
+        measure = u"{0:.0f}.{1:.2s} min".format(m, s)
+    else:
+        h, m = divmod(measure, 3600)
+        if m > 60:
+            m /= 60
+        measure = u"{0:.0f}h:{1:.0f}min".format(h, m)
+    return measure
+
 
+def format_difference(difference):
+    """Return the text and color of a difference between two measures"""
+    if not difference:
+        return "", "black"
+    elif difference < 0:
+        return '-' + format_measure(-difference), "green"
+    return '+' + format_measure(difference), "red"
 
-class ProfilerDataTree(QTreeWidget):
+
+class CallGraph(object):
     """
-    Convenience tree widget (with built-in model) 
-    to store and view profiler data.
+    Call graph of profiler data, indexed by integers
+
+    Functions are numbered in the iteration order of the stats dictionary
+    of a pstats.Stats object, their measures are kept in arrays and the callees
+    of function i are callees[callee_offsets[i]:callee_offsets[i + 1]].
 
     The quantities calculated by the profiler are as follows 
     (from profile.Profile):
@@ -382,49 +544,340 @@ class ProfilerDataTree(QTreeWidget):
     [4] = A dictionary indicating for each function name, the number of times
           it was called by us.
     """
+    def __init__(self, stats):
+        items = list(stats.items())
+        self.functions = [item[0] for item in items]
+        self.index = dict(zip(self.functions, range(len(items))))
+        values = [item[1] for item in items]
+        self.total_calls = array('l', [value[1] for value in values])
+        self.local_time = array('d', [value[2] for value in values])
+        self.cum_time = array('d', [value[3] for value in values])
 
-    sig_edit_goto = Signal(str, int, str)
+        # Callees, from the callers of each function
+        count = len(self.functions)
+        offsets = array('l', [0]) * (count + 1)
+        edges = []
+        for callee, value in enumerate(values):
+            for caller in value[4]:
+                caller = self.index.get(caller)
+                if caller is not None:
+                    offsets[caller + 1] += 1
+                    edges.append((caller, callee))
+        for i in range(count):
+            offsets[i + 1] += offsets[i]
+        position = array('l', offsets)
+        callees = array('l', [0]) * len(edges)
+        for caller, callee in edges:
+            callees[position[caller]] = callee
+            position[caller] += 1
+        self.callee_offsets = offsets
+        self.callees = callees
+
+    def get_callees(self, function):
+        """Return the indexes of the functions called by *function*"""
+        return self.callees[self.callee_offsets[function]:
+                            self.callee_offsets[function + 1]]
+
+    def count_callees(self, function):
+        """Return the number of functions called by *function*"""
+        return (self.callee_offsets[function + 1] -
+                self.callee_offsets[function])
 
-    SEP = r"<[=]>"  # separator between filename and linenumber
-    # (must be improbable as a filename to avoid splitting the filename itself)
+    def find_root(self):
+        """Find a function without a caller"""
+        root = None
+        for i, func in enumerate(self.functions):
+            # This skips the profiler function at the top of the list
+            # it does only occur in Python 3
+            if ('~', 0) == func[0:2] or func[2].startswith(
+                    '<built-in method exec>'):
+                continue
+            if root is None or self.cum_time[i] > self.cum_time[root]:
+                root = i
+        return root
+
+
+class ProfilerNode(object):
+    """
+    Node of the profiler tree: a call of *function* by the function of
+    *parent*
+
+    *callees* (the sorted indexes of the functions called) and *children*
+    (their nodes, None until they're shown) are only filled when needed.
+    """
+    __slots__ = ('parent', 'function', 'row', 'recursive', 'callees',
+                 'children')
+
+    def __init__(self, parent, function, row):
+        self.parent = parent
+        self.function = function
+        self.row = row
+        self.callees = None
+        self.children = None
+        # A function called by itself, directly or not, isn't expanded
+        self.recursive = False
+        ancestor = parent
+        while ancestor is not None and ancestor.parent is not None:
+            if ancestor.function == function:
+                self.recursive = True
+                break
+            ancestor = ancestor.parent
+
+
+class ProfilerTreeModel(QAbstractItemModel):
+    """
+    Model of the profiler tree, whose nodes are created only when they're
+    shown, the number of callees of each function being known from the call
+    graph
+    """
+    (NAME, CUM_TIME, CUM_TIME_DIFF, LOCAL_TIME, LOCAL_TIME_DIFF, CALLS,
+     CALLS_DIFF, FILE_LINE) = range(8)
 
     def __init__(self, parent=None):
-        QTreeWidget.__init__(self, parent)
+        QAbstractItemModel.__init__(self, parent)
         self.header_list = [_('Function/Module'), _('Total Time'), _('Diff'),
                             _('Local Time'), _('Diff'), _('Calls'), _('Diff'),
                             _('File:line')]
+        self.tooltips = {
+            self.NAME: _('Function or module name'),
+            self.CUM_TIME: _('Time in function (including sub-functions)'),
+            self.LOCAL_TIME: _('Local time in function (not in '
+                               'sub-functions)'),
+            self.CALLS: _('Total number of calls (including recursion)'),
+            self.FILE_LINE: _('File:line where function is defined')}
         self.icon_list = {'module': ima.icon('python'),
-                         'function': ima.icon('function'),
-                         'builtin': ima.icon('python_t'),
-                         'constructor': ima.icon('class')}
+                          'function': ima.icon('function'),
+                          'builtin': ima.icon('python_t'),
+                          'constructor': ima.icon('class')}
+        self.graph = None
+        self.compare_stats = None
+        self.root = None
+        self.sort_column = self.CUM_TIME
+        self.sort_order = Qt.DescendingOrder
+        self._info = {}
+
+    def set_data(self, graph, compare_stats=None):
+        """Show the callees of the root of *graph*"""
+        self.beginResetModel()
+        self.graph = graph
+        self.compare_stats = compare_stats
+        self._info = {}
+        self.root = None
+        if graph is not None:
+            root = graph.find_root()
+            if root is not None:
+                self.root = ProfilerNode(None, root, 0)
+        self.endResetModel()
+
+    def get_node(self, index):
+        """Return the node of *index*"""
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def function_info(self, function):
+        """Returns processed information about the function's name and file."""
+        try:
+            return self._info[function]
+        except KeyError:
+            pass
+        node_type = 'function'
+        filename, line_number, function_name = self.graph.functions[function]
+        if function_name == '<module>':
+            modulePath, moduleName = osp.split(filename)
+            node_type = 'module'
+            if moduleName == '__init__.py':
+                modulePath, moduleName = osp.split(modulePath)
+            function_name = '<' + moduleName + '>'
+        if not filename or filename == '~':
+            file_and_line = '(built-in)'
+            node_type = 'builtin'
+        else:
+            if function_name == '__init__':
+                node_type = 'constructor'                
+            file_and_line = '%s : %d' % (filename, line_number)
+        info = (filename, line_number, function_name, file_and_line, node_type)
+        self._info[function] = info
+        return info
+
+    def get_measure(self, function, column):
+        """Return the measure of *function* shown in *column*"""
+        if column in (self.CUM_TIME, self.CUM_TIME_DIFF):
+            return self.graph.cum_time[function]
+        elif column in (self.LOCAL_TIME, self.LOCAL_TIME_DIFF):
+            return self.graph.local_time[function]
+        return self.graph.total_calls[function]
+
+    def get_difference(self, function, column):
+        """Return the difference of a measure with the compared data"""
+        if self.compare_stats is None:
+            return None
+        value = self.compare_stats.get(self.graph.functions[function],
+                                       (0, 0, 0, 0, 0))
+        position = {self.CUM_TIME_DIFF: 3, self.LOCAL_TIME_DIFF: 2,
+                    self.CALLS_DIFF: 1}[column]
+        return self.get_measure(function, column) - value[position]
+
+    def sort_key(self, column):
+        """Return the key used to sort functions by *column*"""
+        if column == self.NAME:
+            return lambda function: self.function_info(function)[2]
+        elif column == self.FILE_LINE:
+            return lambda function: self.graph.functions[function][:2]
+        elif column in (self.CUM_TIME_DIFF, self.LOCAL_TIME_DIFF,
+                        self.CALLS_DIFF) and self.compare_stats is not None:
+            return lambda function: self.get_difference(function, column)
+        return lambda function: self.get_measure(function, column)
+
+    def sort_callees(self, node):
+        """Sort the callees of *node*, forgetting their nodes"""
+        callees = self.graph.get_callees(node.function)
+        node.callees = sorted(callees, key=self.sort_key(self.sort_column),
+                              reverse=self.sort_order == Qt.DescendingOrder)
+        node.children = [None] * len(node.callees)
+
+    def get_child(self, node, row):
+        """Return the node of the callee of *node* at *row*, creating it"""
+        if node.callees is None:
+            self.sort_callees(node)
+        child = node.children[row]
+        if child is None:
+            child = ProfilerNode(node, node.callees[row], row)
+            node.children[row] = child
+        return child
+
+    #---- Qt methods
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        node = self.get_node(parent)
+        return self.createIndex(row, column, self.get_child(node, row))
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer().parent
+        if node is None or node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        node = self.get_node(parent)
+        if node is None or node.recursive:
+            return 0
+        return self.graph.count_callees(node.function)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.header_list)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.internalPointer().recursive:
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return to_qvariant(self.header_list[section])
+        return to_qvariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return to_qvariant()
+        node = index.internalPointer()
+        column = index.column()
+        info = self.function_info(node.function)
+        if role == Qt.DisplayRole:
+            if column == self.NAME:
+                return to_qvariant(info[2])
+            elif column == self.FILE_LINE:
+                if node.recursive:
+                    return to_qvariant('(%s)' % _('recursion'))
+                return to_qvariant(info[3])
+            elif column in (self.CUM_TIME, self.LOCAL_TIME, self.CALLS):
+                return to_qvariant(format_measure(
+                    self.get_measure(node.function, column)))
+            else:
+                difference = self.get_difference(node.function, column)
+                return to_qvariant(format_difference(difference)[0])
+        elif role == Qt.DecorationRole and column == self.NAME:
+            return to_qvariant(self.icon_list[info[4]])
+        elif role == Qt.ToolTipRole and column in self.tooltips:
+            return to_qvariant(self.tooltips[column])
+        elif role == Qt.ForegroundRole and column in (
+                self.CUM_TIME_DIFF, self.LOCAL_TIME_DIFF, self.CALLS_DIFF):
+            difference = self.get_difference(node.function, column)
+            return to_qvariant(QColor(format_difference(difference)[1]))
+        elif role == Qt.TextAlignmentRole:
+            if column in (self.CUM_TIME, self.LOCAL_TIME, self.CALLS):
+                return to_qvariant(int(Qt.AlignRight | Qt.AlignVCenter))
+            return to_qvariant(int(Qt.AlignLeft | Qt.AlignVCenter))
+        return to_qvariant()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort the callees of all the nodes created so far"""
+        self.sort_column = column
+        self.sort_order = order
+        if self.root is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        self._sort_node(self.root)
+        # Nodes are kept, only their rows change
+        new_indexes = [self.createIndex(index.internalPointer().row,
+                                        index.column(),
+                                        index.internalPointer())
+                       for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _sort_node(self, node):
+        if node.callees is None:
+            return
+        # Keep the nodes (and so their children) created so far
+        nodes = dict((child.function, child) for child in node.children
+                     if child is not None)
+        self.sort_callees(node)
+        for row, function in enumerate(node.callees):
+            child = nodes.get(function)
+            if child is not None:
+                child.row = row
+                node.children[row] = child
+                self._sort_node(child)
+
+
+class ProfilerDataTree(QTreeView):
+    """
+    Convenience tree view to store and view profiler data.
+
+    The profiler data is indexed once in a CallGraph and shown through a
+    ProfilerTreeModel, which creates the items of a function only when
+    they're shown.
+    """
+
+    sig_edit_goto = Signal(str, int, str)
+
+    def __init__(self, parent=None):
+        QTreeView.__init__(self, parent)
         self.profdata = None   # To be filled by self.load_data()
         self.stats = None      # To be filled by self.load_data()
-        self.item_depth = None
-        self.item_list = None
-        self.items_to_be_shown = None
-        self.current_view_depth = None
+        self.stats1 = None     # To be filled by self.load_data()
+        self.graph = None      # To be filled by self.load_data()
+        self.current_view_depth = 0
         self.compare_file = None
-        self.setColumnCount(len(self.header_list))
-        self.setHeaderLabels(self.header_list)
-        self.initialize_view()
-        self.itemActivated.connect(self.item_activated)
-        self.itemExpanded.connect(self.item_expanded)
-
-    def set_item_data(self, item, filename, line_number):
-        """Set tree item user data: filename (string) and line_number (int)"""
-        set_item_user_text(item, '%s%s%d' % (filename, self.SEP, line_number))
-    
-    def get_item_data(self, item):
-        """Get tree item user data: (filename, line_number)"""
-        filename, line_number_str = get_item_user_text(item).split(self.SEP)
-        return filename, int(line_number_str)
+        self.setModel(ProfilerTreeModel(self))
+        self.header().setSortIndicator(ProfilerTreeModel.CUM_TIME,
+                                       Qt.DescendingOrder)
+        self.setSortingEnabled(True)
+        self.setUniformRowHeights(True)
+        self.activated.connect(self.item_activated)
 
     def initialize_view(self):
         """Clean the tree and view parameters"""
-        self.clear()
-        self.item_depth = 0   # To be use for collapsing/expanding one level
-        self.item_list = []  # To be use for collapsing/expanding one level
-        self.items_to_be_shown = {}
+        self.model().set_data(None)
         self.current_view_depth = 0
 
     def load_data(self, profdatafile):
@@ -435,10 +888,9 @@ class ProfilerDataTree(QTreeWidget):
         
         if self.compare_file is not None:
             stats_indi.append(pstats.Stats(self.compare_file))
-        map(lambda x: x.calc_callees(), stats_indi)
-        self.profdata.calc_callees()
         self.stats1 = stats_indi
         self.stats = stats_indi[0].stats
+        self.graph = CallGraph(self.stats)
         
     def compare(self,filename):
         self.hide_diff_cols(False)
@@ -452,211 +904,34 @@ class ProfilerDataTree(QTreeWidget):
         """"""
         self.stats1[0].dump_stats(filename)
 
-    def find_root(self):
-        """Find a function without a caller"""
-        self.profdata.sort_stats("cumulative")
-        for func in self.profdata.fcn_list:
-            if ('~', 0) != func[0:2] and not func[2].startswith(
-                    '<built-in method exec>'):
-                # This skips the profiler function at the top of the list
-                # it does only occur in Python 3
-                return func
-    
-    def find_callees(self, parent):
-        """Find all functions called by (parent) function."""
-        # FIXME: This implementation is very inneficient, because it
-        #        traverses all the data to find children nodes (callees)
-        return self.profdata.all_callees[parent]
-
     def show_tree(self):
         """Populate the tree with profiler data and display it."""
         self.initialize_view() # Clear before re-populating
-        self.setItemsExpandable(True)
-        self.setSortingEnabled(False)
-        rootkey = self.find_root()  # This root contains profiler overhead
-        if rootkey:
-            self.populate_tree(self, self.find_callees(rootkey))
-            self.resizeColumnToContents(0)
-            self.setSortingEnabled(True)
-            self.sortItems(1, Qt.AscendingOrder) # FIXME: hardcoded index
+        compare_stats = None
+        if len(self.stats1) > 1:
+            # Match the functions whose line number changed
+            compare_stats = align_stats(self.stats, self.stats1[1].stats)
+        self.model().set_data(self.graph, compare_stats)
+        if self.model().root is not None:
             self.change_view(1)
+            self.resizeColumnToContents(0)
 
-    def function_info(self, functionKey):
-        """Returns processed information about the function's name and file."""
-        node_type = 'function'
-        filename, line_number, function_name = functionKey
-        if function_name == '<module>':
-            modulePath, moduleName = osp.split(filename)
-            node_type = 'module'
-            if moduleName == '__init__.py':
-                modulePath, moduleName = osp.split(modulePath)
-            function_name = '<' + moduleName + '>'
-        if not filename or filename == '~':
-            file_and_line = '(built-in)'
-            node_type = 'builtin'
-        else:
-            if function_name == '__init__':
-                node_type = 'constructor'                
-            file_and_line = '%s : %d' % (filename, line_number)
-        return filename, line_number, function_name, file_and_line, node_type
-
-    def format_measure(self, measure):
-        """Get format and units for data coming from profiler task."""
-        # For number of calls
-        if isinstance(measure, int):
-            return to_text_string(measure)
-
-        # For time measurements
-        if 1.e-9 < measure <= 1.e-6:
-            measure = u"{0:.2f} ns".format(measure / 1.e-9)
-        elif 1.e-6 < measure <= 1.e-3:
-            measure = u"{0:.2f} us".format(measure / 1.e-6)
-        elif 1.e-3 < measure <= 1:
-            measure = u"{0:.2f} ms".format(measure / 1.e-3)
-        elif 1 < measure <= 60:
-            measure = u"{0:.2f} sec".format(measure)
-        elif 60 < measure <= 3600:
-            m, s = divmod(measure, 3600)
-            if s > 60:
-                m, s = divmod(measure, 60)
-                s = to_text_string(s).split(".")[-1]
-            measure = u"{0:.0f}.{1:.2s} min".format(m, s)
-        else:
-            h, m = divmod(measure, 3600)
-            if m > 60:
-                m /= 60
-            measure = u"{0:.0f}h:{1:.0f}min".format(h, m)
-        return measure
-
-    def color_string(self, args):
-        x, fmt = args
-        diff_str = ""
-        color = "black"
-
-        if len(x) == 2 and self.compare_file is not None:
-            difference = x[0] - x[1]
-            if difference < 0:
-                diff_str = "".join(['', fmt[1] % self.format_measure(difference)])
-                color = "green"
-            elif difference > 0:
-                diff_str = "".join(['+', fmt[1] % self.format_measure(difference)])
-                color = "red"
-        return [fmt[0] % self.format_measure(x[0]), [diff_str, color]]
-
-    def format_output(self, child_key):
-        """ Formats the data"""
-        if True:
-            data = [x.stats.get(child_key, [0,0,0,0,0]) for x in self.stats1]
-            format_data = zip(list(zip(*data))[1:4],
-                              [["%s"]*2, ["%s", "%s"], ["%s", "%s"]])
-            return (map(self.color_string, format_data))
-            
-    def populate_tree(self, parentItem, children_list):
-        """Recursive method to create each item (and associated data) in the tree."""
-        for child_key in children_list:
-            self.item_depth += 1
-            (filename, line_number, function_name, file_and_line, node_type
-             ) = self.function_info(child_key)
-
-            ((total_calls, total_calls_dif), (loc_time, loc_time_dif), (cum_time,
-             cum_time_dif)) = self.format_output(child_key)
-
-            child_item = TreeWidgetItem(parentItem)
-            self.item_list.append(child_item)
-            self.set_item_data(child_item, filename, line_number)
-
-            # FIXME: indexes to data should be defined by a dictionary on init
-            child_item.setToolTip(0, _('Function or module name'))
-            child_item.setData(0, Qt.DisplayRole, function_name)
-            child_item.setIcon(0, self.icon_list[node_type])
-
-            child_item.setToolTip(1, _('Time in function '\
-                                       '(including sub-functions)'))
-            child_item.setData(1, Qt.DisplayRole, cum_time)
-            child_item.setTextAlignment(1, Qt.AlignRight)
-            
-            child_item.setData(2, Qt.DisplayRole, cum_time_dif[0])
-            child_item.setForeground(2, QColor(cum_time_dif[1]))
-            child_item.setTextAlignment(2, Qt.AlignLeft)
-
-            child_item.setToolTip(3, _('Local time in function '\
-                                      '(not in sub-functions)'))
-
-            child_item.setData(3, Qt.DisplayRole, loc_time)
-            child_item.setTextAlignment(3, Qt.AlignRight)
-            
-            child_item.setData(4, Qt.DisplayRole, loc_time_dif[0])
-            child_item.setForeground(4, QColor(loc_time_dif[1]))
-            child_item.setTextAlignment(4, Qt.AlignLeft)
-
-            child_item.setToolTip(5, _('Total number of calls '\
-                                       '(including recursion)'))
-
-            child_item.setData(5, Qt.DisplayRole, total_calls)
-            child_item.setTextAlignment(5, Qt.AlignRight)
-            
-            child_item.setData(6, Qt.DisplayRole, total_calls_dif[0])
-            child_item.setForeground(6, QColor(total_calls_dif[1]))
-            child_item.setTextAlignment(6, Qt.AlignLeft)
-
-            child_item.setToolTip(7, _('File:line '\
-                                       'where function is defined'))
-            child_item.setData(7, Qt.DisplayRole, file_and_line)
-            #child_item.setExpanded(True)
-            if self.is_recursive(child_item):
-                child_item.setData(7, Qt.DisplayRole, '(%s)' % _('recursion'))
-                child_item.setDisabled(True)
-            else:
-                callees = self.find_callees(child_key)
-                if self.item_depth < 3:
-                    self.populate_tree(child_item, callees)
-                elif callees:
-                    child_item.setChildIndicatorPolicy(child_item.ShowIndicator)
-                    self.items_to_be_shown[id(child_item)] = callees
-            self.item_depth -= 1
-        
-    def item_activated(self, item):
-        filename, line_number = self.get_item_data(item)
+    def item_activated(self, index):
+        node = self.model().get_node(index)
+        if node is None or node.recursive:
+            return
+        filename, line_number = self.model().function_info(node.function)[:2]
         self.sig_edit_goto.emit(filename, line_number, '')
-            
-    def item_expanded(self, item):
-        if item.childCount() == 0 and id(item) in self.items_to_be_shown:
-            callees = self.items_to_be_shown[id(item)]
-            self.populate_tree(item, callees)
-    
-    def is_recursive(self, child_item):
-        """Returns True is a function is a descendant of itself."""
-        ancestor = child_item.parent()
-        # FIXME: indexes to data should be defined by a dictionary on init
-        while ancestor:
-            if (child_item.data(0, Qt.DisplayRole
-                                ) == ancestor.data(0, Qt.DisplayRole) and
-                child_item.data(4, Qt.DisplayRole
-                                ) == ancestor.data(4, Qt.DisplayRole)):
-                return True
-            else:
-                ancestor = ancestor.parent()
-        return False
-    
-    def get_top_level_items(self):
-        """Iterate over top level items"""
-        return [self.topLevelItem(_i) for _i in range(self.topLevelItemCount())]
-    
-    def get_items(self, maxlevel):
-        """Return all items with a level <= `maxlevel`"""
-        itemlist = []
-        def add_to_itemlist(item, maxlevel, level=1):
-            level += 1
-            for index in range(item.childCount()):
-                citem = item.child(index)
-                itemlist.append(citem)
-                if level <= maxlevel:
-                    add_to_itemlist(citem, maxlevel, level)
-        for tlitem in self.get_top_level_items():
-            itemlist.append(tlitem)
-            if maxlevel > 0:
-                add_to_itemlist(tlitem, maxlevel=maxlevel)
-        return itemlist
+
+    def expand_rows(self, parent, depth):
+        """Expand the rows under *parent* down to *depth* levels"""
+        model = self.model()
+        for row in range(model.rowCount(parent)):
+            index = model.index(row, 0, parent)
+            if model.hasChildren(index):
+                self.setExpanded(index, True)
+                if depth > 0:
+                    self.expand_rows(index, depth - 1)
             
     def change_view(self, change_in_depth):
         """Change the view depth by expand or collapsing all same-level nodes"""
@@ -665,10 +940,66 @@ class ProfilerDataTree(QTreeWidget):
             self.current_view_depth = 0
         self.collapseAll()
         if self.current_view_depth > 0:
-            for item in self.get_items(maxlevel=self.current_view_depth-1):
-                item.setExpanded(True)
+            self.expand_rows(QModelIndex(), self.current_view_depth - 1)
     
 
+class LineTimingTree(QTreeWidget):
+    """List of the lines timed by the line timing profiler, slowest first"""
+    sig_edit_goto = Signal(str, int, str)
+    (LINE, CODE, TIME, HITS, PER_HIT, PERCENT, DIFF) = range(7)
+
+    def __init__(self, parent=None):
+        QTreeWidget.__init__(self, parent)
+        self.setHeaderLabels([_('File:line'), _('Code'), _('Time'),
+                              _('Hits'), _('Per hit'), '%', _('Diff')])
+        self.setRootIsDecorated(False)
+        self.setUniformRowHeights(True)
+        self.timings = {}
+        self.itemActivated.connect(self.item_activated)
+
+    def set_data(self, data, compare_data=None):
+        """Show the timings loaded by load_line_timings"""
+        self.clear()
+        self.timings = data['timings']
+        other = compare_data['timings'] if compare_data is not None else None
+        total = data['total'] or 1.
+        linecache.checkcache()
+        timings = sorted(self.timings.items(), key=lambda item: item[1][1],
+                         reverse=True)
+        for (filename, line), (hits, elapsed) in timings:
+            item = QTreeWidgetItem(self, [
+                '%s:%d' % (osp.basename(filename), line),
+                linecache.getline(filename, line).strip(),
+                format_measure(elapsed), to_text_string(hits),
+                format_measure(elapsed / max(hits, 1)),
+                '%.1f' % (100 * elapsed / total)])
+            item.setToolTip(self.LINE, filename)
+            item.setData(self.LINE, Qt.UserRole, filename)
+            item.setData(self.LINE, Qt.UserRole + 1, line)
+            for column in (self.TIME, self.HITS, self.PER_HIT, self.PERCENT):
+                item.setTextAlignment(column, Qt.AlignRight | Qt.AlignVCenter)
+            if other is not None:
+                other_time = other.get((filename, line), (0, 0.))[1]
+                text, color = format_difference(elapsed - other_time)
+                item.setText(self.DIFF, text)
+                item.setForeground(self.DIFF, QColor(color))
+        self.setColumnHidden(self.DIFF, other is None)
+        for column in range(self.columnCount()):
+            self.resizeColumnToContents(column)
+
+    def get_file_timings(self):
+        """Return the {line: (hits, time)} timings of each file"""
+        file_timings = {}
+        for (filename, line), timing in self.timings.items():
+            file_timings.setdefault(osp.normcase(filename), {})[line] = timing
+        return file_timings
+
+    def item_activated(self, item):
+        filename = to_text_string(item.data(self.LINE, Qt.UserRole))
+        line = int(item.data(self.LINE, Qt.UserRole + 1))
+        self.sig_edit_goto.emit(filename, line, '')
+
+
 #==============================================================================
 # Tests
 #==============================================================================
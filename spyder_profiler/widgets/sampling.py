@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Sampling profiler
+
+Run as a script, it runs a Python script while another thread records the
+stack of its main thread every few milliseconds:
+
+    python sampling.py [-i INTERVAL] -o OUTPUT script [args]
+
+Unlike cProfile, its overhead doesn't depend on the number of calls. The
+stacks are saved aggregated, with the number of times each was sampled, in
+a JSON file.
+
+This module only uses the standard library, because it's run by the
+interpreter of the profiled script.
+"""
+
+from __future__ import print_function
+
+# Standard library imports
+import argparse
+import io
+import json
+import os.path as osp
+import runpy
+import sys
+import threading
+
+try:
+    from threading import get_ident
+except ImportError:
+    # Python 2
+    from thread import get_ident
+
+
+# Seconds between samples
+INTERVAL = 0.005
+
+# Version of the results format
+FORMAT_VERSION = 1
+
+
+class Sampler(object):
+    """
+    Record the stacks of a thread every *interval* seconds
+
+    Only the frames from the first one of *root_filename*, if given, are
+    recorded, which leaves out the ones of the code running the script.
+    """
+
+    def __init__(self, interval=INTERVAL, thread_id=None, root_filename=None):
+        self.interval = interval
+        self.thread_id = get_ident() if thread_id is None else thread_id
+        self.root_filename = root_filename
+        self.stacks = {}
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a daemon thread"""
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        """Record the current stack of the thread"""
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno,
+                          code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        if self.root_filename is not None:
+            for index, (filename, _line, _name) in enumerate(stack):
+                if filename == self.root_filename:
+                    stack = stack[index:]
+                    break
+            else:
+                # The script isn't running yet or anymore
+                return
+        if stack:
+            stack = tuple(stack)
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            self.samples += 1
+
+    def get_data(self):
+        """Return the recorded stacks as a dictionary serializable to JSON"""
+        return {'version': FORMAT_VERSION,
+                'interval': self.interval,
+                'samples': self.samples,
+                'stacks': [[[list(frame) for frame in stack], count]
+                           for stack, count in self.stacks.items()]}
+
+    def save(self, filename):
+        """Save the recorded stacks to *filename*"""
+        text = json.dumps(self.get_data())
+        if not isinstance(text, type(u'')):
+            text = text.decode('utf-8')
+        with io.open(filename, 'w', encoding='utf-8') as fdesc:
+            fdesc.write(text)
+
+
+def load_samples(filename):
+    """Load the stacks saved by a Sampler"""
+    with io.open(filename, encoding='utf-8') as fdesc:
+        data = json.load(fdesc)
+    data['stacks'] = [(tuple(tuple(frame) for frame in stack), count)
+                      for stack, count in data['stacks']]
+    return data
+
+
+class StackNode(object):
+    """
+    Node of a tree of aggregated stacks: *count* samples were taken while
+    running the function of *frame* (filename, line, name) called from the
+    functions of the parent nodes
+    """
+    __slots__ = ('frame', 'parent', 'count', 'children', 'other_count')
+
+    def __init__(self, frame=None, parent=None):
+        self.frame = frame
+        self.parent = parent
+        self.count = 0
+        self.children = {}
+        # Samples of the same node in compared data
+        self.other_count = None
+
+    def get_depth(self):
+        """Return the depth of the subtree of this node"""
+        # Not recursive, since stacks can be deeper than the recursion limit
+        depth = 0
+        nodes = [(self, 1)]
+        while nodes:
+            node, node_depth = nodes.pop()
+            depth = max(depth, node_depth)
+            nodes.extend((child, node_depth + 1)
+                         for child in node.children.values())
+        return depth
+
+    def get_child(self, frame):
+        """Return the child node for *frame*, creating it if needed"""
+        child = self.children.get(frame)
+        if child is None:
+            child = self.children[frame] = StackNode(frame, self)
+        return child
+
+
+def build_stack_tree(stacks):
+    """Return the root StackNode of (stack, count) *stacks*"""
+    root = StackNode()
+    for stack, count in stacks:
+        node = root
+        node.count += count
+        for frame in stack:
+            node = node.get_child(frame)
+            node.count += count
+    return root
+
+
+def compare_stack_trees(tree, other):
+    """Set the other_count of the nodes of *tree* from the *other* tree"""
+    nodes = [(tree, other)]
+    while nodes:
+        node, other_node = nodes.pop()
+        if other_node is None:
+            node.other_count = 0
+            nodes.extend((child, None) for child in node.children.values())
+        else:
+            node.other_count = other_node.count
+            nodes.extend((child, other_node.children.get(frame))
+                         for frame, child in node.children.items())
+
+
+def main():
+    """Run a script with the sampling profiler"""
+    parser = argparse.ArgumentParser(description="Sampling profiler")
+    parser.add_argument('-o', '--output', required=True,
+                        help="File where the sampled stacks are saved")
+    parser.add_argument('-i', '--interval', type=float, default=INTERVAL,
+                        help="Seconds between samples")
+    parser.add_argument('script')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    options = parser.parse_args()
+
+    script = osp.abspath(options.script)
+    sys.argv = [script] + options.args
+    # Replace the directory of this module
+    sys.path[0] = osp.dirname(script)
+    sampler = Sampler(options.interval, root_filename=script)
+    sampler.start()
+    try:
+        runpy.run_path(script, run_name='__main__')
+    finally:
+        sampler.stop()
+        sampler.save(options.output)
+
+
+if __name__ == '__main__':
+    main()
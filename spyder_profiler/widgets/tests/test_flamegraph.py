@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for flamegraph.py
+"""
+
+# Third party imports
+import pytest
+from qtpy.QtCore import QPoint
+
+# Local imports are done in the tests: importing the plugin package while
+# collecting them breaks the editor tests run before (through runconfig)
+
+
+A = ('a.py', 1, 'a')
+B = ('a.py', 5, 'b')
+C = ('c.py', 1, 'c')
+
+
+@pytest.fixture
+def flamegraph(qtbot):
+    # The plugin package can't be imported before spyder.plugins
+    import spyder.plugins  # analysis:ignore
+    from spyder_profiler.widgets.flamegraph import FlameGraphWidget
+    widget = FlameGraphWidget()
+    qtbot.addWidget(widget)
+    widget.set_data({'stacks': [((A, B), 3), ((A, C), 1)]},
+                    {'stacks': [((A, B), 1)]})
+    widget.resize(400, 200)
+    widget.show()
+    qtbot.waitForWindowShown(widget)
+    return widget
+
+
+def test_flamegraph_node_at(flamegraph):
+    height = flamegraph.row_height()
+    assert flamegraph.node_at(QPoint(10, height // 2)) is flamegraph.tree
+    a = flamegraph.tree.children[A]
+    assert flamegraph.node_at(QPoint(390, height + 2)) is a
+    # b is sorted before c and takes 3/4 of the width
+    assert flamegraph.node_at(QPoint(10, 2 * height + 2)) is a.children[B]
+    assert flamegraph.node_at(QPoint(390, 2 * height + 2)) is a.children[C]
+    assert flamegraph.node_at(QPoint(10, 3 * height + 2)) is None
+
+
+def test_flamegraph_partial_repaint(flamegraph):
+    """Nodes outside of a repainted area can still be clicked"""
+    flamegraph.repaint(0, 0, 10, 10)
+    a = flamegraph.tree.children[A]
+    assert flamegraph.node_at(QPoint(390, 2 * flamegraph.row_height() + 2)) \
+        is a.children[C]
+
+
+def test_flamegraph_zoom(flamegraph):
+    a = flamegraph.tree.children[A]
+    flamegraph.zoom(a.children[C])
+    height = flamegraph.row_height()
+    # Ancestors and zoomed node over the whole width
+    assert flamegraph.node_at(QPoint(390, height + 2)) is a
+    assert flamegraph.node_at(QPoint(390, 2 * height + 2)) is a.children[C]
+    flamegraph.clear()
+    assert flamegraph.node_at(QPoint(10, 2)) is None
+
+
+if __name__ == "__main__":
+    pytest.main()
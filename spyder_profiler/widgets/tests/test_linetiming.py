@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for linetiming.py
+"""
+
+# Standard library imports
+import runpy
+
+# Third party imports
+import pytest
+
+# Local imports are done in the tests: importing the plugin package while
+# collecting them breaks the editor tests run before (through runconfig)
+
+
+SCRIPT = u'''def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+def squares(n):
+    return [fib(i % 10) for i in range(n)]
+
+fib(15)
+squares(200)
+'''
+
+
+@pytest.fixture
+def line_timer(tmpdir):
+    script = tmpdir.join('script.py')
+    script.write(SCRIPT)
+    # The plugin package can't be imported before spyder.plugins
+    import spyder.plugins  # analysis:ignore
+    from spyder_profiler.widgets.linetiming import LineTimer
+    line_timer = LineTimer([script.strpath])
+    line_timer.start()
+    try:
+        runpy.run_path(script.strpath)
+    finally:
+        line_timer.stop()
+    line_timer.script = script.strpath
+    return line_timer
+
+
+def test_line_timer_hits(line_timer):
+    timings = line_timer.timings
+    # Calls of fib(15) and of fib(0) to fib(9), 20 times each
+    assert timings[(line_timer.script, 2)][0] == 1973 + 20 * 276
+    assert timings[(line_timer.script, 7)][0] == 1
+
+
+def test_line_timer_nested_frames(line_timer):
+    """Lines running in nested frames are only timed once"""
+    total = line_timer.total_time
+    for line in (2, 5, 7, 8):
+        assert line_timer.timings[(line_timer.script, line)][1] <= total
+    # The module lines include everything else
+    module_time = sum(line_timer.timings[(line_timer.script, line)][1]
+                      for line in (1, 4, 7, 8))
+    assert module_time <= total
+
+
+def test_line_timings_save_load(line_timer, tmpdir):
+    from spyder_profiler.widgets.linetiming import load_line_timings
+    filename = tmpdir.join('timings.json').strpath
+    line_timer.save(filename)
+    data = load_line_timings(filename)
+    assert data['total'] == line_timer.total_time
+    assert data['timings'][(line_timer.script, 7)] == tuple(
+        line_timer.timings[(line_timer.script, 7)])
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for profilediff.py
+"""
+
+# Standard library imports
+import json
+import marshal
+
+# Third party imports
+import pytest
+
+# Local imports are done in the tests: importing the plugin package while
+# collecting them breaks the editor tests run before (through runconfig)
+
+
+@pytest.fixture
+def profilediff():
+    # The plugin package can't be imported before spyder.plugins
+    import spyder.plugins  # analysis:ignore
+    from spyder_profiler.widgets import profilediff
+    return profilediff
+
+
+def make_stats(functions):
+    """Return a stats dictionary from {function: (calls, local, cumulative)}"""
+    return dict((function, (calls, calls, local, cumulative, {}))
+                for function, (calls, local, cumulative)
+                in functions.items())
+
+
+def save_stats(tmpdir, name, functions):
+    filename = tmpdir.join(name).strpath
+    with open(filename, 'wb') as fdesc:
+        marshal.dump(make_stats(functions), fdesc)
+    return filename
+
+
+def test_function_ids(profilediff):
+    ids = profilediff.function_ids(make_stats({
+        ('a.py', 10, 'f'): (1, 1., 1.), ('a.py', 30, 'f'): (1, 1., 1.),
+        ('a.py', 20, 'g'): (1, 1., 1.)}))
+    assert ids[('a.py', 10, 'f')] == ('a.py', 'f', 0)
+    assert ids[('a.py', 30, 'f')] == ('a.py', 'f', 1)
+    assert ids[('a.py', 20, 'g')] == ('a.py', 'g', 0)
+
+
+def test_align_stats(profilediff):
+    """Functions whose line changed are matched"""
+    stats = make_stats({('a.py', 10, 'f'): (1, 1., 1.),
+                        ('a.py', 20, 'g'): (1, 1., 1.)})
+    other = make_stats({('a.py', 12, 'f'): (2, 2., 2.)})
+    assert profilediff.align_stats(stats, other) == {
+        ('a.py', 10, 'f'): other[('a.py', 12, 'f')]}
+
+
+def test_profile_diff_status(profilediff):
+    base = make_stats({('a.py', 1, 'same'): (1, 1., 1.),
+                       ('a.py', 5, 'slower'): (1, 1., 1.),
+                       ('a.py', 9, 'faster'): (1, 1., 1.),
+                       ('a.py', 13, 'removed'): (1, 1., 1.),
+                       ('a.py', 17, 'fast'): (1, 0., 0.)})
+    new = make_stats({('a.py', 1, 'same'): (1, 1., 1.),
+                      ('a.py', 6, 'slower'): (1, 2., 2.),
+                      ('a.py', 10, 'faster'): (1, .5, .5),
+                      ('a.py', 14, 'added'): (1, 1., 1.),
+                      ('a.py', 18, 'fast'): (1, 1., 1.)})
+    diff = profilediff.ProfileDiff([base], [new])
+    statuses = dict((function.function[2], function.status)
+                    for function in diff.functions)
+    assert statuses == {'same': profilediff.UNCHANGED,
+                        'slower': profilediff.REGRESSION,
+                        'faster': profilediff.IMPROVEMENT,
+                        'removed': profilediff.REMOVED,
+                        'added': profilediff.ADDED,
+                        # Called in both runs, even if it took no time before
+                        'fast': profilediff.REGRESSION}
+    # Matched functions are reported with their new position
+    assert ('a.py', 6, 'slower') in [
+        function.function for function in diff.functions]
+    assert diff.has_regressions()
+
+
+def test_profile_diff_threshold(profilediff):
+    base = make_stats({('a.py', 1, 'f'): (1, 1., 1.)})
+    new = make_stats({('a.py', 1, 'f'): (1, 1.05, 1.05)})
+    diff = profilediff.ProfileDiff([base], [new])
+    assert diff.functions[0].status == profilediff.UNCHANGED
+    assert diff.total.status == profilediff.UNCHANGED
+    assert not diff.has_regressions()
+
+    diff = profilediff.ProfileDiff([base], [new], threshold=0.01)
+    assert diff.functions[0].status == profilediff.REGRESSION
+    assert diff.has_regressions()
+
+    diff = profilediff.ProfileDiff([base], [new], threshold=0.01,
+                                   min_difference=0.1)
+    assert diff.functions[0].status == profilediff.UNCHANGED
+
+
+def test_profile_diff_noise(profilediff):
+    """Changes within the noise between runs are ignored"""
+    base = [make_stats({('a.py', 1, 'f'): (1, value, value)})
+            for value in (1., 2., 1.5)]
+    new = [make_stats({('a.py', 1, 'f'): (1, value, value)})
+           for value in (1.5, 2.5, 2.)]
+    diff = profilediff.ProfileDiff(base, new)
+    assert diff.functions[0].status == profilediff.UNCHANGED
+    diff = profilediff.ProfileDiff(base, new, noise_factor=0.)
+    assert diff.functions[0].status == profilediff.REGRESSION
+
+
+def test_main(profilediff, tmpdir, capsys):
+    base = save_stats(tmpdir, 'base.Result', {('a.py', 1, 'f'): (1, 1., 1.)})
+    same = save_stats(tmpdir, 'same.Result', {('a.py', 1, 'f'): (1, 1., 1.)})
+    slower = save_stats(tmpdir, 'slower.Result',
+                        {('a.py', 1, 'f'): (1, 2., 2.)})
+    assert profilediff.main(['--base', base, '--new', same]) == 0
+
+    output = tmpdir.join('diff.json').strpath
+    assert profilediff.main(['--base', base, '--new', slower,
+                             '--json', output]) == 1
+    assert 'Regressions (1):' in capsys.readouterr()[0]
+    with open(output) as fdesc:
+        data = json.load(fdesc)
+    assert data['total']['status'] == profilediff.REGRESSION
+    assert [function['name'] for function in data['functions']] == ['f']
+
+    missing = tmpdir.join('missing.Result').strpath
+    assert profilediff.main(['--base', base, '--new', missing]) == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
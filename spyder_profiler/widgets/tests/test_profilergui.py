@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for profilergui.py
+"""
+
+# Third party imports
+import pytest
+from qtpy.QtCore import QModelIndex, QPersistentModelIndex, Qt
+
+# Local imports are done in the tests: importing the plugin package while
+# collecting them breaks the editor tests run before (through runconfig)
+
+
+MAIN = ('a.py', 1, '<module>')
+LEAF = ('a.py', 5, 'leaf')
+FIB = ('b.py', 1, 'fib')
+PROFILER = ('~', 0, "<method 'disable' of '_lsprof.Profiler' objects>")
+
+# (calls, total calls, local time, cumulative time, callers)
+STATS = {MAIN: (1, 1, 0.1, 1.0, {}),
+         LEAF: (3, 3, 0.2, 0.2, {MAIN: (3, 3, 0.2, 0.2)}),
+         FIB: (1, 9, 0.7, 0.7, {MAIN: (1, 1, 0.1, 0.7),
+                                FIB: (8, 8, 0.6, 0.6)}),
+         PROFILER: (1, 1, 0., 0., {})}
+
+
+@pytest.fixture
+def profilergui(qtbot):
+    # The plugin package can't be imported before spyder.plugins, and its
+    # icons need the application to be created first
+    import spyder.plugins  # analysis:ignore
+    from spyder_profiler.widgets import profilergui
+    return profilergui
+
+
+@pytest.fixture
+def model(profilergui):
+    model = profilergui.ProfilerTreeModel()
+    model.set_data(profilergui.CallGraph(STATS))
+    return model
+
+
+def get_rows(model, parent=QModelIndex()):
+    """Return the names of the functions of the rows under *parent*"""
+    return [model.data(model.index(row, model.NAME, parent))
+            for row in range(model.rowCount(parent))]
+
+
+def test_call_graph(profilergui):
+    graph = profilergui.CallGraph(STATS)
+    main, leaf, fib = [graph.index[function]
+                       for function in (MAIN, LEAF, FIB)]
+    assert sorted(graph.get_callees(main)) == sorted([leaf, fib])
+    assert list(graph.get_callees(fib)) == [fib]
+    assert graph.count_callees(leaf) == 0
+    assert graph.find_root() == main
+    assert graph.total_calls[fib] == 9
+
+
+def test_model_tester(qtmodeltester, model):
+    qtmodeltester.check(model)
+
+
+def test_model_expand(model):
+    """Callees are sorted by cumulative time, recursion isn't expanded"""
+    assert get_rows(model) == ['fib', 'leaf']
+    fib = model.index(0, 0)
+    assert model.hasChildren(fib)
+    assert not model.hasChildren(model.index(1, 0))
+    assert get_rows(model, fib) == ['fib']
+    recursion = model.index(0, 0, fib)
+    assert not model.hasChildren(recursion)
+    assert model.flags(recursion) == Qt.NoItemFlags
+    assert model.data(model.index(0, model.FILE_LINE, fib)) == '(recursion)'
+    assert model.parent(recursion) == fib
+    assert model.data(model.index(1, model.FILE_LINE)) == 'a.py : 5'
+    assert model.data(model.index(1, model.CALLS)) == '3'
+
+
+def test_model_sort(model):
+    fib = QPersistentModelIndex(model.index(0, 0))
+    child = QPersistentModelIndex(model.index(0, 0, model.index(0, 0)))
+    model.sort(model.NAME, Qt.AscendingOrder)
+    assert get_rows(model) == ['fib', 'leaf']
+    model.sort(model.CALLS, Qt.AscendingOrder)
+    assert get_rows(model) == ['leaf', 'fib']
+    # Indexes of the nodes created before sorting follow them
+    assert fib.row() == 1
+    assert model.data(QModelIndex(fib)) == 'fib'
+    assert child.parent() == QModelIndex(fib)
+    assert get_rows(model, QModelIndex(fib)) == ['fib']
+
+
+def test_model_compare(model, profilergui):
+    compare_stats = {LEAF: (2, 2, 0.2, 0.3, {}), FIB: (1, 9, 0.7, 0.7, {})}
+    model.set_data(model.graph, compare_stats)
+    assert model.data(model.index(1, model.CALLS_DIFF)) == '+1'
+    assert model.data(model.index(1, model.CUM_TIME_DIFF)) == '-100.00 ms'
+    assert model.data(model.index(0, model.CALLS_DIFF)) == ''
+    assert (model.data(model.index(1, model.CUM_TIME_DIFF),
+                       Qt.ForegroundRole).name() == '#008000')
+    # Functions not in the compared data are new
+    model.set_data(model.graph, {})
+    assert model.data(model.index(1, model.CALLS_DIFF)) == '+3'
+    model.sort(model.CALLS_DIFF, Qt.DescendingOrder)
+    assert get_rows(model) == ['fib', 'leaf']
+
+
+def test_console_error(qtbot, monkeypatch, profilergui):
+    """The waiting message is cleared if the code can't be profiled"""
+    errors = []
+    monkeypatch.setattr(profilergui.QMessageBox, 'critical',
+                        lambda *args: errors.append(args[-1]))
+    widget = profilergui.ProfilerWidget(None)
+    qtbot.addWidget(widget)
+    widget.set_console_profiling()
+    widget.show_console_error("AttributeError: 'IPythonKernel' object has "
+                              "no attribute 'profile_code'")
+    assert widget.datelabel.text() == ''
+    assert 'profile_code' in errors[0]
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for sampling.py
+"""
+
+# Third party imports
+import pytest
+
+# Local imports are done in the tests: importing the plugin package while
+# collecting them breaks the editor tests run before (through runconfig)
+
+
+@pytest.fixture
+def sampling():
+    # The plugin package can't be imported before spyder.plugins
+    import spyder.plugins  # analysis:ignore
+    from spyder_profiler.widgets import sampling
+    return sampling
+
+
+A = ('a.py', 1, 'a')
+B = ('a.py', 5, 'b')
+C = ('c.py', 1, 'c')
+
+
+def test_sampler_sample(sampling, tmpdir):
+    sampler = sampling.Sampler(root_filename=__file__)
+    sampler.sample()
+    sampler.sample()
+    assert sampler.samples == 2
+    (stack, count), = sampler.stacks.items()
+    assert count == 2
+    assert stack[0][0] == __file__
+    assert stack[-1][2] == 'sample'
+
+    filename = tmpdir.join('samples.json').strpath
+    sampler.save(filename)
+    data = sampling.load_samples(filename)
+    assert data['samples'] == 2
+    assert data['stacks'] == [(stack, 2)]
+
+    # Nothing is recorded outside of the root file
+    sampler = sampling.Sampler(root_filename='other.py')
+    sampler.sample()
+    assert sampler.samples == 0
+
+
+def test_build_stack_tree(sampling):
+    tree = sampling.build_stack_tree([((A, B), 3), ((A, C), 1), ((C,), 2)])
+    assert tree.count == 6
+    assert tree.children[A].count == 4
+    assert tree.children[A].children[B].count == 3
+    assert tree.children[A].children[B].parent is tree.children[A]
+    assert tree.get_depth() == 3
+
+
+def test_compare_stack_trees(sampling):
+    tree = sampling.build_stack_tree([((A, B), 3), ((A, C), 1)])
+    other = sampling.build_stack_tree([((A, B), 1), ((C,), 2)])
+    sampling.compare_stack_trees(tree, other)
+    assert tree.other_count == 3
+    assert tree.children[A].other_count == 1
+    assert tree.children[A].children[B].other_count == 1
+    assert tree.children[A].children[C].other_count == 0
+
+
+def test_deep_stack_tree(sampling):
+    stack = tuple(('a.py', line, 'f') for line in range(10000))
+    tree = sampling.build_stack_tree([(stack, 1)])
+    assert tree.get_depth() == 10001
+    sampling.compare_stack_trees(tree, sampling.build_stack_tree([(stack[:5000], 2)]))
+    node = tree
+    while node.children:
+        node, = node.children.values()
+    assert node.other_count == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
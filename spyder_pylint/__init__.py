@@ -1,6 +1,23 @@
 # -*- coding: utf-8 -*-
 
 #==============================================================================
-# The following statement is required to register this 3rd party plugin:
+# The following statements are required to register this 3rd party plugin.
+# The plugin module is only imported when the Static code analysis pane is
+# first shown or one of its actions is used
+# (see spyder.api.plugins.LazyPluginWidget)
 #==============================================================================
-from .pylint import Pylint as PLUGIN_CLASS
+from spyder.config.base import get_translation
+
+_ = get_translation("pylint", "spyder_pylint")
+
+PLUGIN_CLASS_PATH = 'spyder_pylint.pylint.Pylint'
+PLUGIN_CONF_SECTION = 'pylint'
+PLUGIN_TITLE = _("Static code analysis")
+PLUGIN_ICON = 'pylint'
+PLUGIN_ACTIONS = [
+    {'text': _("Run static code analysis"), 'method': 'run_pylint',
+     'menu': 'source_menu_actions', 'separator': True,
+     'shortcut': ("Pylint", "Run analysis"), 'python_only': True},
+    {'text': _("Run static code analysis on project"),
+     'method': 'run_pylint_project', 'menu': 'source_menu_actions'},
+]
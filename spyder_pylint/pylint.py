@@ -16,7 +16,8 @@ import os.path as osp
 
 # Third party imports
 from qtpy.QtCore import Qt, Slot
-from qtpy.QtWidgets import QGroupBox, QInputDialog, QLabel, QVBoxLayout
+from qtpy.QtWidgets import (QGroupBox, QInputDialog, QLabel, QMessageBox,
+                            QVBoxLayout)
 
 # Local imports
 from spyder.config.base import get_translation
@@ -132,6 +133,7 @@ class Pylint(SpyderPluginWidget):
     def register_plugin(self):
         """Register plugin in Spyder's main window"""
         self.pylint.treewidget.sig_edit_goto.connect(self.main.editor.load)
+        self.pylint.projecttree.sig_edit_goto.connect(self.main.editor.load)
         self.pylint.redirect_stdio.connect(
             self.main.redirect_internalshell_stdio)
         self.main.add_dockwidget(self)
@@ -142,7 +144,13 @@ class Pylint(SpyderPluginWidget):
         self.register_shortcut(pylint_act, context="Pylint",
                                name="Run analysis")
         
-        self.main.source_menu_actions += [MENU_SEPARATOR, pylint_act]
+        pylint_project_act = create_action(
+            self, _("Run static code analysis on project"),
+            triggered=self.run_pylint_project)
+        pylint_project_act.setEnabled(PYLINT_PATH is not None)
+
+        self.main.source_menu_actions += [MENU_SEPARATOR, pylint_act,
+                                          pylint_project_act]
         self.main.editor.pythonfile_dependent_actions += [pylint_act]
 
     def refresh_plugin(self):
@@ -185,3 +193,21 @@ class Pylint(SpyderPluginWidget):
             self.dockwidget.setFocus()
             self.dockwidget.raise_()
         self.pylint.analyze(filename)
+
+    @Slot()
+    def run_pylint_project(self):
+        """Run pylint code analysis on all the files of the project"""
+        root = None
+        if self.main.projects is not None:
+            root = self.main.projects.get_active_project_path()
+        if root is None:
+            QMessageBox.warning(self, _("Static code analysis"),
+                                _("There is no open project to analyze."))
+            return
+        if self.get_option('save_before', True):
+            self.main.editor.save_all()
+        if self.dockwidget and not self.ismaximized:
+            self.dockwidget.setVisible(True)
+            self.dockwidget.setFocus()
+            self.dockwidget.raise_()
+        self.pylint.analyze_project(root)
@@ -0,0 +1,636 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Parsing of pylint output and pylint analysis of whole projects
+
+The output of pylint is parsed as it's received. Pylint versions with the
+json reporter give messages in JSON, from which files are rated here.
+
+Files are analyzed by several pylint processes running at the same time,
+and their results are cached by file contents and pylint configuration, so
+that only the files changed since the previous analysis are analyzed again.
+"""
+
+# Standard library imports
+import array
+import ast
+import hashlib
+import json
+import os
+import os.path as osp
+import re
+import tempfile
+import time
+
+# Third party imports
+from qtpy.QtCore import QObject, QProcess, QTextCodec, QThread, Signal
+
+# Local imports
+from spyder.config.base import get_translation
+from spyder.config.user import replace_file
+from spyder.py3compat import configparser, pickle, to_text_string
+from spyder.utils import programs
+
+try:
+    from html import unescape
+except ImportError:
+    # Python 2
+    from HTMLParser import HTMLParser
+    unescape = HTMLParser().unescape
+
+
+try:
+    _ = get_translation("pylint", "spyder_pylint")
+except KeyError as error:
+    import gettext
+    _ = gettext.gettext
+
+
+locale_codec = QTextCodec.codecForLocale()
+
+# Pylint configuration files, besides the ones found in the analyzed
+# packages (see find_pylintrc)
+USER_PYLINTRCS = [osp.join(osp.expanduser('~'), '.pylintrc'),
+                  osp.join(osp.expanduser('~'), '.config', 'pylintrc'),
+                  '/etc/pylintrc']
+
+# Letters of the message categories named by the json reporter
+CATEGORIES = {'convention': 'C', 'refactor': 'R', 'warning': 'W',
+              'error': 'E', 'fatal': 'F'}
+
+# Nodes whose docstring is the first statement
+DOCUMENTED_NODES = (ast.Module, ast.ClassDef, ast.FunctionDef,
+                    getattr(ast, 'AsyncFunctionDef', ast.FunctionDef))
+
+# Python 3 try statements, which astroid splits in two statements when
+# they have both except and finally clauses
+TRY_NODE = getattr(ast, 'Try', None)
+
+# Default value of the pylint evaluation option
+DEFAULT_EVALUATION = ('10.0 - ((float(5 * error + warning + refactor + '
+                      'convention) / statement) * 10)')
+
+
+def has_json_reporter(version):
+    """Return True if pylint *version* has the json reporter"""
+    return (version is not None and
+            programs.check_version(version, '1.4', '>='))
+
+
+def get_pylint_args(version):
+    """
+    Return the pylint arguments giving messages in the format read by
+    the parser returned by get_output_parser, for pylint *version*
+    """
+    if version is None:
+        return []
+    if has_json_reporter(version):
+        return ['--output-format=json']
+    if version.split('.')[0] == '0':
+        return ['-i', 'yes']
+    # Option '-i' (alias for '--include-ids') was removed in pylint 1.0
+    return ["--msg-template='{msg_id}:{line:3d},{column}: {obj}: {msg}"]
+
+
+def get_output_parser(filename, version):
+    """Return a parser of the output of pylint *version* for *filename*"""
+    if has_json_reporter(version):
+        return JSONOutputParser(filename)
+    return TextOutputParser(filename)
+
+
+def count_statements(path):
+    """
+    Return the number of statements of the module or package *path*, as
+    counted by pylint: the statements of astroid, where docstrings aren't
+    statements but except clauses are
+    """
+    if osp.isdir(path):
+        filenames = find_python_files(path)
+    else:
+        filenames = [path]
+    count = 0
+    for filename in filenames:
+        try:
+            with open(filename, 'rb') as fdesc:
+                tree = ast.parse(fdesc.read(), filename)
+        except (IOError, OSError, SyntaxError, TypeError, ValueError):
+            # Not readable or not valid for this Python version
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.stmt, ast.excepthandler)):
+                count += 1
+            if (TRY_NODE is not None and isinstance(node, TRY_NODE) and
+                    node.handlers and node.finalbody):
+                count += 1
+            if (isinstance(node, DOCUMENTED_NODES) and
+                    ast.get_docstring(node, clean=False) is not None):
+                count -= 1
+    return count
+
+
+def get_evaluation(dirname):
+    """
+    Return the evaluation expression rating the files of *dirname*, given
+    by the pylint configuration used there
+    """
+    pylintrc = find_pylintrc(dirname)
+    if pylintrc is not None:
+        parser = configparser.RawConfigParser()
+        try:
+            parser.read(pylintrc)
+        except configparser.Error:
+            return DEFAULT_EVALUATION
+        for section in parser.sections():
+            if parser.has_option(section, 'evaluation'):
+                return parser.get(section, 'evaluation')
+    return DEFAULT_EVALUATION
+
+
+def get_rate(results, statements, evaluation=DEFAULT_EVALUATION):
+    """
+    Return the rate of *results* for code of *statements* statements, with
+    the pylint *evaluation* expression
+    """
+    if not statements:
+        # Pylint doesn't rate code without statements, which is only good
+        # if it has no errors (e.g. not a syntax error)
+        return '0.00' if results.count('E', 'F') else '10.00'
+    stats = {'statement': statements, 'info': 0}
+    for name, category in CATEGORIES.items():
+        stats[name] = results.count(category)
+    try:
+        # As done by pylint
+        note = eval(evaluation, {}, stats)
+    except Exception:
+        note = eval(DEFAULT_EVALUATION, {}, stats)
+    return '%.2f' % note
+
+
+class PylintResults(object):
+    """
+    Messages of a pylint analysis, stored by columns: one item per message
+    in each of categories, lines, columns, msg_ids, modules and messages
+
+    Modules and message ids, which repeat a lot, are shared between
+    messages.
+    """
+
+    def __init__(self):
+        self.categories = bytearray()
+        self.lines = array.array('i')
+        self.columns = array.array('i')
+        self.msg_ids = []
+        self.modules = []
+        self.messages = []
+        self._strings = {}
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_strings')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._strings = {}
+
+    def add(self, category, module, line, column, msg_id, message):
+        """Add a message of *category* ('C', 'R', 'W', 'E' or 'F')"""
+        self.categories.append(ord(category))
+        self.lines.append(line)
+        self.columns.append(column)
+        self.msg_ids.append(self._strings.setdefault(msg_id, msg_id))
+        self.modules.append(self._strings.setdefault(module, module))
+        self.messages.append(message)
+
+    def count(self, *categories):
+        """Return the number of messages of *categories* (all by default)"""
+        if not categories:
+            return len(self)
+        return sum(self.categories.count(category.encode('ascii'))
+                   for category in categories)
+
+    def get_messages(self, *categories):
+        """
+        Return the (module, line, column, message, msg_id) of the messages
+        of *categories*, in the order pylint gave them
+        """
+        codes = set(ord(category) for category in categories)
+        return [(self.modules[index], self.lines[index],
+                 self.columns[index], self.messages[index],
+                 self.msg_ids[index])
+                for index, code in enumerate(self.categories)
+                if code in codes]
+
+
+class PylintOutputParser(object):
+    """
+    Parser of the output of pylint for *filename*, fed with the output as
+    it's received
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.results = PylintResults()
+        self._decoder = locale_codec.makeDecoder()
+
+    def feed(self, data):
+        """Parse the bytes *data* of the output"""
+        self.parse(to_text_string(self._decoder.toUnicode(data)))
+
+    def parse(self, text):
+        raise NotImplementedError
+
+    def finish(self, exit_code):
+        """
+        Return the results and the rate of the analysis, once pylint exited
+        with *exit_code*; the rate is None if the analysis failed
+        """
+        raise NotImplementedError
+
+
+class JSONOutputParser(PylintOutputParser):
+    """
+    Parser of the output of the json reporter: a list of messages, each one
+    being parsed as soon as it's complete
+
+    This reporter doesn't give the rate, so it's computed from the messages
+    and the number of statements of the file.
+    """
+    SEPARATORS = re.compile(r'[\s,]*')
+
+    def __init__(self, filename):
+        PylintOutputParser.__init__(self, filename)
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._started = self._closed = self._invalid = False
+
+    def parse(self, text):
+        buf = self._buffer + text
+        pos = 0
+        while not self._invalid:
+            pos = self.SEPARATORS.match(buf, pos).end()
+            if pos == len(buf) or self._closed:
+                break
+            if not self._started:
+                self._started = True
+                self._invalid = buf[pos] != '['
+                pos += 1
+            elif buf[pos] == ']':
+                self._closed = True
+                pos += 1
+            elif buf[pos] == '{':
+                try:
+                    message, pos = self._json.raw_decode(buf, pos)
+                except ValueError:
+                    # Incomplete message: wait for the rest of the output
+                    break
+                self.add_message(message)
+            else:
+                self._invalid = True
+        # Only the incomplete message is kept
+        self._buffer = buf[pos:]
+
+    def add_message(self, message):
+        category = CATEGORIES.get(message.get('type'))
+        if category is None:
+            # Information messages
+            return
+        msg_id = message.get('message-id') or message.get('symbol', '')
+        text = unescape(message.get('message', ''))
+        if message.get('obj'):
+            text = '%s: %s' % (message['obj'], text)
+        self.results.add(category, message.get('module', ''),
+                         message.get('line') or 0, message.get('column') or 0,
+                         msg_id, text)
+
+    def finish(self, exit_code):
+        if self._started:
+            complete = self._closed and not self._buffer.strip()
+        else:
+            # There's no output if there are no messages
+            complete = True
+        # Pylint exits with a code with bit 1 set if it issued a fatal
+        # message and 32 on usage errors, and with 1 when it crashes
+        failed = (self._invalid or not complete or exit_code & 32 or
+                  (exit_code & 1 and not self.results.count('F')))
+        if failed:
+            return self.results, None
+        return self.results, get_rate(
+                   self.results, count_statements(self.filename),
+                   get_evaluation(osp.dirname(self.filename)))
+
+
+class TextOutputParser(PylintOutputParser):
+    """
+    Parser of the output of the text reporter of old pylint versions, or
+    of pylint versions unknown because they couldn't be found, which gives
+    the rate
+    """
+    MODULE_PREFIX = '************* Module '
+    RATE_PREFIX = 'Your code has been rated at '
+
+    def __init__(self, filename):
+        PylintOutputParser.__init__(self, filename)
+        # Should not be needed - just in case something goes wrong
+        self._module = ''
+        self._line = ''
+        self._rate = None
+
+    def parse(self, text):
+        lines = (self._line + text).split('\n')
+        # The last line isn't complete yet
+        self._line = lines.pop()
+        for line in lines:
+            self.parse_line(line.rstrip('\r'))
+
+    def parse_line(self, line):
+        if line.startswith(self.MODULE_PREFIX):
+            # New module
+            self._module = line[len(self.MODULE_PREFIX):]
+            return
+        if line.startswith(self.RATE_PREFIX):
+            end = line.find('/10')
+            if end > 0:
+                self._rate = line[len(self.RATE_PREFIX):end]
+            return
+        # Supporting option include-ids: ('R3873:' instead of 'R:')
+        if not re.match('^[CRWEF]+([0-9]{4})?:', line):
+            return
+        i1 = line.find(':')
+        msg_id = line[:i1]
+        i2 = line.find(':', i1+1)
+        if i2 == -1:
+            return
+        position = line[i1+1:i2].strip()
+        if not position:
+            return
+        position = position.split(',')
+        try:
+            line_nb = int(position[0])
+            column = int(position[1]) if len(position) > 1 else 0
+        except ValueError:
+            return
+        message = line[i2+1:].strip()
+        if message.startswith(': '):
+            # No object
+            message = message[2:]
+        self.results.add(line[0], self._module, line_nb, column, msg_id,
+                         message)
+
+    def finish(self, exit_code):
+        self.parse_line(self._line.rstrip('\r'))
+        self._line = ''
+        return self.results, self._rate
+
+
+def find_python_files(root):
+    """Return the Python files of the *root* directory, recursively"""
+    filenames = []
+    for dirpath, dirnames, names in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames
+                             if not name.startswith('.') and
+                             name != '__pycache__')
+        filenames += [osp.join(dirpath, name) for name in sorted(names)
+                      if osp.splitext(name)[1] in ('.py', '.pyw')]
+    return filenames
+
+
+def find_pylintrc(dirname):
+    """
+    Return the configuration file used by pylint run in *dirname*, as
+    pylint finds it: in the directory or its parent packages, then given
+    by the PYLINTRC environment variable or in the user's directory
+    """
+    while True:
+        for name in ('pylintrc', '.pylintrc'):
+            if osp.isfile(osp.join(dirname, name)):
+                return osp.join(dirname, name)
+        if not osp.isfile(osp.join(dirname, '__init__.py')):
+            break
+        parent = osp.dirname(dirname)
+        if parent == dirname:
+            break
+        dirname = parent
+    candidates = USER_PYLINTRCS
+    if os.environ.get('PYLINTRC'):
+        candidates = [os.environ['PYLINTRC']] + candidates
+    for filename in candidates:
+        if osp.isfile(filename):
+            return filename
+
+
+def get_config_key(dirname, pylint_version, args):
+    """
+    Return a key identifying the pylint configuration used for the files
+    of *dirname*: pylint version, arguments and configuration file
+    """
+    key = hashlib.sha1()
+    key.update(repr((pylint_version, args)).encode('utf-8'))
+    pylintrc = find_pylintrc(dirname)
+    if pylintrc is not None:
+        with open(pylintrc, 'rb') as fdesc:
+            key.update(fdesc.read())
+    return key.hexdigest()
+
+
+def get_file_key(filename, config_key):
+    """Return the cache key of the results of *filename*"""
+    key = hashlib.sha1()
+    key.update(osp.normcase(osp.abspath(filename)).encode('utf-8'))
+    key.update(config_key.encode('utf-8'))
+    with open(filename, 'rb') as fdesc:
+        key.update(fdesc.read())
+    return key.hexdigest()
+
+
+class PylintCache(object):
+    """
+    Disk cache of the pylint results of files, in *directory*, keeping
+    the *size* most recently used results
+    """
+
+    def __init__(self, directory, size=5000):
+        self.directory = directory
+        self.size = size
+
+    def _filename(self, key):
+        return osp.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """Return the results cached under *key*, or None"""
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as fdesc:
+                data = pickle.load(fdesc)
+            # Record the use, for prune
+            os.utime(filename, None)
+            return data
+        except Exception:
+            # Missing or corrupted entry
+            return None
+
+    def put(self, key, data):
+        """Cache the results *data* under *key*"""
+        filename = self._filename(key)
+        try:
+            if not osp.isdir(osp.dirname(filename)):
+                os.makedirs(osp.dirname(filename))
+            fd, tmpname = tempfile.mkstemp(dir=osp.dirname(filename))
+            with os.fdopen(fd, 'wb') as fdesc:
+                pickle.dump(data, fdesc, 2)
+            replace_file(tmpname, filename)
+        except (IOError, OSError):
+            pass
+
+    def prune(self):
+        """Remove the least recently used results beyond the cache size"""
+        entries = []
+        if not osp.isdir(self.directory):
+            return
+        for dirpath, _dirnames, names in os.walk(self.directory):
+            for name in names:
+                filename = osp.join(dirpath, name)
+                try:
+                    entries.append((os.stat(filename).st_mtime, filename))
+                except OSError:
+                    pass
+        entries.sort(reverse=True)
+        for _mtime, filename in entries[self.size:]:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+class ProjectAnalysis(QObject):
+    """
+    Pylint analysis of several files by up to *workers* pylint processes
+    at the same time, skipping the files whose results are in *cache*
+
+    The results of each file are sent by sig_file_analyzed as soon as
+    they're available, as a (date, rate, previous rate, results) tuple,
+    results being a PylintResults. The previous rate isn't known here.
+    """
+    sig_file_analyzed = Signal(str, object, bool)
+    sig_finished = Signal()
+
+    def __init__(self, parent, pylint_path, cache=None, workers=None):
+        QObject.__init__(self, parent)
+        self.pylint_path = pylint_path
+        self.pylint_version = None
+        self.args = []
+        self.cache = cache
+        self.workers = workers or max(QThread.idealThreadCount(), 1)
+        self.queue = []
+        self.processes = {}
+        self.total = self.done = self.cached = 0
+        # Error output of the files whose analysis failed
+        self.errors = {}
+        self._config_keys = {}
+
+    def is_running(self):
+        return bool(self.queue or self.processes)
+
+    def start(self, filenames, pylint_version):
+        """Analyze *filenames* with pylint *pylint_version*"""
+        self.stop()
+        self.pylint_version = pylint_version
+        self.args = get_pylint_args(pylint_version)
+        self.queue = list(reversed(filenames))
+        self.total = len(filenames)
+        self.done = self.cached = 0
+        self.errors = {}
+        self._config_keys = {}
+        self._start_processes()
+
+    def stop(self):
+        """Stop the analysis"""
+        self.queue = []
+        processes, self.processes = self.processes, {}
+        for process in processes:
+            process.kill()
+            process.waitForFinished()
+
+    def get_file_key(self, filename):
+        dirname = osp.dirname(filename)
+        config_key = self._config_keys.get(dirname)
+        if config_key is None:
+            config_key = self._config_keys[dirname] = get_config_key(
+                dirname, self.pylint_version, self.args)
+        return get_file_key(filename, config_key)
+
+    def _start_processes(self):
+        while self.queue and len(self.processes) < self.workers:
+            filename = self.queue.pop()
+            try:
+                key = self.get_file_key(filename)
+            except (IOError, OSError):
+                # The file was removed
+                self.done += 1
+                continue
+            data = self.cache.get(key) if self.cache is not None else None
+            if data is not None:
+                self.done += 1
+                self.cached += 1
+                self.sig_file_analyzed.emit(filename, data, True)
+                continue
+            if not self._start_process(filename, key):
+                self._file_analyzed(filename, key, PylintResults(), None,
+                                    _("Process failed to start"))
+        if not self.processes:
+            if self.cache is not None:
+                self.cache.prune()
+            self.sig_finished.emit()
+
+    def _start_process(self, filename, key):
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.SeparateChannels)
+        process.setWorkingDirectory(osp.dirname(filename))
+        parser = get_output_parser(filename, self.pylint_version)
+        process.readyReadStandardOutput.connect(
+            lambda process=process, parser=parser:
+            parser.feed(process.readAllStandardOutput().data()))
+        process.finished.connect(
+            lambda exit_code, exit_status, process=process:
+            self._process_finished(process, exit_code, exit_status))
+        process.start(self.pylint_path,
+                      self.args + [osp.basename(filename)])
+        if not process.waitForStarted():
+            process.deleteLater()
+            return False
+        self.processes[process] = (filename, key, parser)
+        return True
+
+    def _process_finished(self, process, exit_code, exit_status):
+        if process not in self.processes:
+            # Killed by stop
+            return
+        filename, key, parser = self.processes.pop(process)
+        parser.feed(process.readAllStandardOutput().data())
+        error_output = to_text_string(locale_codec.toUnicode(
+            process.readAllStandardError().data()))
+        process.deleteLater()
+        if exit_status != QProcess.NormalExit:
+            results, rate = parser.results, None
+        else:
+            results, rate = parser.finish(exit_code)
+        self._file_analyzed(filename, key, results, rate, error_output)
+        self._start_processes()
+
+    def _file_analyzed(self, filename, key, results, rate, error_output):
+        self.done += 1
+        data = (time.localtime(), rate, '', results)
+        if rate is None:
+            self.errors[filename] = (error_output or
+                                     _("Pylint output could not be read"))
+        elif self.cache is not None:
+            self.cache.put(key, data)
+        self.sig_file_analyzed.emit(filename, data, False)
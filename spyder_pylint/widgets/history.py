@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+History of the pylint results of files, stored on disk
+
+Each analyzed file has two files in the history directory:
+
+* a runs file, to which the (date, rate, previous rate, results) tuple of
+  each analysis is appended pickled, and
+* a summary file, with a fixed size record per analysis: its date, rate,
+  number of messages of each category and the position of its results in
+  the runs file.
+
+Showing the results of a file only reads its last summary record and the
+results it points to, and the rates of all its analyses are read from the
+memory-mapped summary file, without loading any results. An index file
+lists the analyzed files, most recently analyzed first.
+"""
+
+# Standard library imports
+import hashlib
+import math
+import mmap
+import os
+import os.path as osp
+import struct
+import tempfile
+import time
+
+# Local imports
+from spyder.config.user import replace_file
+from spyder.py3compat import pickle
+
+from .analysis import PylintResults
+
+
+# Date, rate (NaN if the analysis failed), number of messages of each
+# category, position and size of the results in the runs file
+SUMMARY = struct.Struct('<dd5iqi')
+CATEGORIES = 'CRWEF'
+
+# Versions of the results file saved before the history
+OLD_VERSIONS = ('1.1.0', '1.2.0')
+
+
+def get_rate_value(rate):
+    """Return the value of the *rate* text, NaN if there's none"""
+    try:
+        return float(rate)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def read_old_results(path):
+    """
+    Return the (filename, data) of the results file *path* saved by
+    previous versions, most recently analyzed first
+    """
+    try:
+        with open(path, 'rb') as fdesc:
+            data = pickle.load(fdesc)
+        if data[0] not in OLD_VERSIONS:
+            return []
+        return [(filename, convert_old_data(fdata))
+                for filename, fdata in data[1:]]
+    except Exception:
+        # Unreadable or corrupted results
+        return []
+
+
+def convert_old_data(data):
+    """
+    Return the (date, rate, previous rate, results) *data* of an analysis
+    with results as PylintResults
+
+    Version 1.1.0 stored results as {'C:': [(module, line, message,
+    msg_id), ...], 'R:': ...}.
+    """
+    date, rate, previous, results = data
+    if isinstance(results, dict):
+        old_results, results = results, PylintResults()
+        for key in sorted(old_results):
+            for module, line, message, msg_id in old_results[key]:
+                results.add(key[0], module, line, 0, msg_id, message)
+    return date, rate, previous, results
+
+
+class PylintHistory(object):
+    """
+    Pylint results of the *max_entries* most recently analyzed files, in
+    *directory*, keeping the results of at least their *max_runs* last
+    analyses
+
+    Files are only rewritten to remove old analyses when they have twice
+    as many as *max_runs*.
+    """
+    VERSION = '1.0.0'
+
+    def __init__(self, directory, max_entries=100, max_runs=50):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_runs = max_runs
+        self.filenames = self.load_index()
+
+    # ---- Index
+    @property
+    def index_path(self):
+        return osp.join(self.directory, 'index')
+
+    def load_index(self):
+        """Return the analyzed files, most recently analyzed first"""
+        try:
+            with open(self.index_path, 'rb') as fdesc:
+                data = pickle.load(fdesc)
+            if data[0] == self.VERSION:
+                return data[1]
+        except Exception:
+            # Missing or corrupted index
+            pass
+        return []
+
+    def save_index(self):
+        self.write_file(self.index_path,
+                        pickle.dumps([self.VERSION, self.filenames], 2))
+
+    def write_file(self, filename, data):
+        """Replace the contents of *filename* by *data*"""
+        try:
+            if not osp.isdir(self.directory):
+                os.makedirs(self.directory)
+            fd, tmpname = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'wb') as fdesc:
+                fdesc.write(data)
+            replace_file(tmpname, filename)
+        except (IOError, OSError):
+            pass
+
+    # ---- Files of each analyzed file
+    def get_paths(self, filename):
+        """Return the runs and summary files of *filename*"""
+        key = hashlib.sha1(osp.normcase(filename).encode('utf-8'))
+        name = osp.join(self.directory, key.hexdigest())
+        return name + '.runs', name + '.summary'
+
+    def read_summary(self, filename):
+        """Return the summary records of the analyses of *filename*"""
+        _runs_path, summary_path = self.get_paths(filename)
+        try:
+            with open(summary_path, 'rb') as fdesc:
+                size = os.fstat(fdesc.fileno()).st_size
+                # Ignore an incomplete last record (e.g. after a crash)
+                count = size // SUMMARY.size
+                if not count:
+                    return []
+                data = mmap.mmap(fdesc.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    return [SUMMARY.unpack_from(data, index * SUMMARY.size)
+                            for index in range(count)]
+                finally:
+                    data.close()
+        except (IOError, OSError, ValueError):
+            return []
+
+    def read_last_record(self, filename):
+        """Return the summary record of the last analysis of *filename*"""
+        _runs_path, summary_path = self.get_paths(filename)
+        try:
+            with open(summary_path, 'rb') as fdesc:
+                count = os.fstat(fdesc.fileno()).st_size // SUMMARY.size
+                if not count:
+                    return None
+                fdesc.seek((count - 1) * SUMMARY.size)
+                return SUMMARY.unpack(fdesc.read(SUMMARY.size))
+        except (IOError, OSError, struct.error):
+            return None
+
+    def read_run(self, filename, record):
+        """Return the data of the analysis of *filename* of summary *record*"""
+        runs_path, _summary_path = self.get_paths(filename)
+        offset, length = record[-2:]
+        try:
+            with open(runs_path, 'rb') as fdesc:
+                fdesc.seek(offset)
+                return pickle.loads(fdesc.read(length))
+        except Exception:
+            # Missing or corrupted run
+            return None
+
+    # ---- Public API
+    def get_filenames(self):
+        """Return the analyzed files, most recently analyzed first"""
+        return list(self.filenames)
+
+    def get_data(self, filename):
+        """
+        Return the (date, rate, previous rate, results) of the last analysis
+        of *filename*, or None
+        """
+        filename = osp.abspath(filename)
+        if filename not in self.filenames:
+            return None
+        record = self.read_last_record(filename)
+        if record is None:
+            return None
+        return self.read_run(filename, record)
+
+    def get_trend(self, filename):
+        """
+        Return the (date, rate, counts) of the analyses of *filename*, from
+        the oldest, where the rate is None for failed analyses and counts
+        is the number of messages of each category
+        """
+        trend = []
+        for record in self.read_summary(osp.abspath(filename)):
+            date, rate = record[:2]
+            counts = dict(zip(CATEGORIES, record[2:7]))
+            trend.append((time.localtime(date),
+                          None if math.isnan(rate) else rate, counts))
+        return trend
+
+    def add_data(self, filename, data):
+        """Append the results *data* of an analysis of *filename*"""
+        filename = osp.abspath(filename)
+        date, rate, _previous, results = data
+        runs_path, summary_path = self.get_paths(filename)
+        run = pickle.dumps(data, 2)
+        try:
+            if not osp.isdir(self.directory):
+                os.makedirs(self.directory)
+            with open(runs_path, 'ab') as fdesc:
+                fdesc.seek(0, os.SEEK_END)
+                offset = fdesc.tell()
+                fdesc.write(run)
+            counts = [results.count(category) for category in CATEGORIES]
+            record = SUMMARY.pack(time.mktime(date), get_rate_value(rate),
+                                  *(counts + [offset, len(run)]))
+            with open(summary_path, 'ab') as fdesc:
+                fdesc.write(record)
+        except (IOError, OSError):
+            return
+        if filename in self.filenames:
+            self.filenames.remove(filename)
+        self.filenames.insert(0, filename)
+        for old_filename in self.filenames[self.max_entries:]:
+            self.remove_files(old_filename)
+        del self.filenames[self.max_entries:]
+        self.save_index()
+        if osp.getsize(summary_path) >= 2 * self.max_runs * SUMMARY.size:
+            self.compact(filename)
+
+    def compact(self, filename):
+        """Remove the analyses of *filename* older than the last max_runs"""
+        records = self.read_summary(filename)[-self.max_runs:]
+        runs, summary = [], []
+        offset = 0
+        for record in records:
+            data = self.read_run(filename, record)
+            if data is None:
+                continue
+            run = pickle.dumps(data, 2)
+            runs.append(run)
+            summary.append(SUMMARY.pack(*(record[:-2] +
+                                          (offset, len(run)))))
+            offset += len(run)
+        runs_path, summary_path = self.get_paths(filename)
+        # The summary is replaced last, so that its records never point
+        # beyond the runs file
+        self.write_file(summary_path, b'')
+        self.write_file(runs_path, b''.join(runs))
+        self.write_file(summary_path, b''.join(summary))
+
+    def remove_files(self, filename):
+        for path in self.get_paths(filename):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def remove(self, filenames):
+        """Remove the results of *filenames*"""
+        filenames = [osp.abspath(filename) for filename in filenames]
+        removed = [filename for filename in filenames
+                   if filename in self.filenames]
+        if not removed:
+            return
+        for filename in removed:
+            self.remove_files(filename)
+            self.filenames.remove(filename)
+        self.save_index()
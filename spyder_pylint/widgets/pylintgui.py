@@ -13,6 +13,7 @@
 
 # Standard library imports
 from __future__ import print_function, with_statement
+from bisect import bisect
 import os
 import os.path as osp
 import re
@@ -21,14 +22,14 @@ import time
 
 # Third party imports
 from qtpy.compat import getopenfilename
-from qtpy.QtCore import QByteArray, QProcess, QTextCodec, Signal, Slot
-from qtpy.QtWidgets import (QHBoxLayout, QLabel, QMessageBox, QTreeWidgetItem,
-                            QVBoxLayout, QWidget)
+from qtpy.QtCore import QProcess, QTextCodec, Signal, Slot
+from qtpy.QtWidgets import (QHBoxLayout, QLabel, QMessageBox, QStackedWidget,
+                            QTreeWidgetItem, QVBoxLayout, QWidget)
 
 # Local imports
 from spyder import dependencies
 from spyder.config.base import get_conf_path, get_translation
-from spyder.py3compat import getcwd, pickle, PY3, to_text_string
+from spyder.py3compat import getcwd, PY3, to_text_string
 from spyder.utils import icon_manager as ima
 from spyder.utils import programs
 from spyder.utils.encoding import to_unicode_from_fs
@@ -38,6 +39,10 @@ from spyder.widgets.comboboxes import (is_module_or_package,
 from spyder.widgets.onecolumntree import OneColumnTree
 from spyder.widgets.variableexplorer.texteditor import TextEditor
 
+from .analysis import (find_python_files, get_output_parser, get_pylint_args,
+                       ProjectAnalysis, PylintCache)
+from .history import PylintHistory, read_old_results
+
 
 # This is needed for testing this module as a stand alone script
 try:
@@ -79,9 +84,9 @@ def get_pylint_version():
 
 
 PYLINT_REQVER = '>=0.25'
-PYLINT_VER = get_pylint_version()
 dependencies.add("pylint", _("Static code analysis"),
-                 required_version=PYLINT_REQVER, installed_version=PYLINT_VER)
+                 required_version=PYLINT_REQVER,
+                 installed_version=get_pylint_version)
 
 
 #TODO: display results on 3 columns instead of 1: msg_id, lineno, message
@@ -122,13 +127,13 @@ class ResultsTree(OneColumnTree):
         self.data = {}
         # Populating tree
         results = ((_('Convention'),
-                   ima.icon('convention'), self.results['C:']),
+                   ima.icon('convention'), self.results.get_messages('C')),
                    (_('Refactor'),
-                   ima.icon('refactor'), self.results['R:']),
+                   ima.icon('refactor'), self.results.get_messages('R')),
                    (_('Warning'),
-                   ima.icon('warning'), self.results['W:']),
+                   ima.icon('warning'), self.results.get_messages('W')),
                    (_('Error'),
-                   ima.icon('error'), self.results['E:']))
+                   ima.icon('error'), self.results.get_messages('E', 'F')))
         for title, icon, messages in results:
             title += ' (%d message%s)' % (len(messages),
                                           's' if len(messages)>1 else '')
@@ -137,7 +142,7 @@ class ResultsTree(OneColumnTree):
             if not messages:
                 title_item.setDisabled(True)
             modules = {}
-            for module, lineno, message, msg_id in messages:
+            for module, lineno, _column, message, msg_id in messages:
                 basename = osp.splitext(osp.basename(self.filename))[0]
                 if not module.startswith(basename):
                     # Pylint bug
@@ -173,12 +178,103 @@ class ResultsTree(OneColumnTree):
                 self.data[id(msg_item)] = (modname, lineno)
 
 
+class ProjectResultsTree(OneColumnTree):
+    """
+    Results of the analysis of a project: the files with messages, whose
+    messages are added to the tree only when they're expanded
+    """
+    sig_edit_goto = Signal(str, int, str)
+
+    def __init__(self, parent):
+        OneColumnTree.__init__(self, parent)
+        self.root = None
+        self.filenames = []
+        # Results of the file of each top level item
+        self.files = {}
+        # File and line of each message item
+        self.data = {}
+        self.itemExpanded.connect(self.populate_item)
+        self.set_title('')
+
+    def activated(self, item):
+        """Double-click event"""
+        data = self.data.get(id(item))
+        if data is not None:
+            fname, lineno = data
+            self.sig_edit_goto.emit(fname, lineno, '')
+
+    def clicked(self, item):
+        """Click event"""
+        self.activated(item)
+
+    def clear_results(self):
+        self.clear()
+        self.filenames = []
+        self.files = {}
+        self.data = {}
+
+    def set_root(self, root):
+        """Show the results of the project in the *root* directory"""
+        self.root = root
+        self.clear_results()
+        self.set_title(_('Results for ')+root)
+
+    def add_file(self, filename, data):
+        """Add the *data* of a file, if it has messages"""
+        _date, rate, _previous, results = data
+        count = len(results)
+        if rate is not None and not count:
+            return
+        if rate is None:
+            text = _('%s: analysis failed') % osp.relpath(filename, self.root)
+            icon = ima.icon('error')
+        else:
+            text = '%s: %d message%s (%s/10)' % (
+                osp.relpath(filename, self.root), count,
+                's' if count > 1 else '', rate)
+            for categories, name in (('EF', 'error'), ('W', 'warning'),
+                                     ('R', 'refactor'), ('C', 'convention')):
+                if results.count(*categories):
+                    icon = ima.icon(name)
+                    break
+        index = bisect(self.filenames, filename)
+        self.filenames.insert(index, filename)
+        item = QTreeWidgetItem([text], QTreeWidgetItem.Type)
+        item.setIcon(0, icon)
+        if count:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        self.insertTopLevelItem(index, item)
+        self.files[id(item)] = (filename, results)
+
+    def populate_item(self, item):
+        """Add the messages of a file item when it's expanded"""
+        filename, results = self.files.get(id(item), (None, None))
+        if results is None or item.childCount():
+            return
+        messages = []
+        for categories, name in (('C', 'convention'), ('R', 'refactor'),
+                                 ('W', 'warning'), ('EF', 'error')):
+            messages += [(lineno, column, message, msg_id, name)
+                         for _module, lineno, column, message, msg_id
+                         in results.get_messages(*categories)]
+        for lineno, _column, message, msg_id, name in sorted(messages):
+            if len(msg_id) > 1:
+                text = "[%s] %d : %s" % (msg_id, lineno, message)
+            else:
+                text = "%d : %s" % (lineno, message)
+            msg_item = QTreeWidgetItem(item, [text], QTreeWidgetItem.Type)
+            msg_item.setIcon(0, ima.icon(name))
+            self.data[id(msg_item)] = (filename, lineno)
+
+
 class PylintWidget(QWidget):
     """
     Pylint widget
     """
-    DATAPATH = get_conf_path('pylint.results')
-    VERSION = '1.1.0'
+    DATAPATH = get_conf_path('pylint.history')
+    CACHEPATH = get_conf_path('pylint.cache')
+    # Results saved by previous versions, moved to the history
+    OLD_DATAPATH = get_conf_path('pylint.results')
     redirect_stdio = Signal(bool)
     
     def __init__(self, parent, max_entries=100):
@@ -188,19 +284,16 @@ class PylintWidget(QWidget):
         
         self.output = None
         self.error_output = None
+        self.output_parser = None
+        self.output_data = None
         
         self.max_entries = max_entries
-        self.rdata = []
-        if osp.isfile(self.DATAPATH):
-            try:
-                data = pickle.loads(open(self.DATAPATH, 'rb').read())
-                if data[0] == self.VERSION:
-                    self.rdata = data[1:]
-            except (EOFError, ImportError):
-                pass
+        self.history = PylintHistory(self.DATAPATH, max_entries=max_entries)
+        if osp.isfile(self.OLD_DATAPATH):
+            self.import_old_results()
 
         self.filecombo = PythonModulesComboBox(self)
-        if self.rdata:
+        if self.history.get_filenames():
             self.remove_obsolete_items()
             self.filecombo.addItems(self.get_filenames())
         
@@ -228,6 +321,21 @@ class PylintWidget(QWidget):
                                     tip=_("Complete output"),
                                     triggered=self.show_log)
         self.treewidget = ResultsTree(self)
+        self.projecttree = ProjectResultsTree(self)
+        self.stack = QStackedWidget(self)
+        self.stack.addWidget(self.treewidget)
+        self.stack.addWidget(self.projecttree)
+
+        self.project_analysis = None
+        self.project_rates = []
+        if PYLINT_PATH is not None:
+            self.project_analysis = ProjectAnalysis(
+                self, PYLINT_PATH, cache=PylintCache(self.CACHEPATH))
+            self.project_analysis.sig_file_analyzed.connect(
+                self.project_file_analyzed)
+            self.project_analysis.sig_finished.connect(
+                self.project_finished)
+            self.stop_button.clicked.connect(self.stop_project)
         
         hlayout1 = QHBoxLayout()
         hlayout1.addWidget(self.filecombo)
@@ -245,7 +353,7 @@ class PylintWidget(QWidget):
         layout = QVBoxLayout()
         layout.addLayout(hlayout1)
         layout.addLayout(hlayout2)
-        layout.addWidget(self.treewidget)
+        layout.addWidget(self.stack)
         self.setLayout(layout)
         
         self.process = None
@@ -274,6 +382,7 @@ class PylintWidget(QWidget):
             return
         filename = to_text_string(filename) # filename is a QString instance
         self.kill_if_running()
+        self.stop_project()
         index, _data = self.get_data(filename)
         if index is None:
             self.filecombo.addItem(filename)
@@ -284,6 +393,60 @@ class PylintWidget(QWidget):
         if self.filecombo.is_valid():
             self.start()
 
+    def analyze_project(self, root):
+        """Analyze all the Python files of the project in *root*"""
+        if self.project_analysis is None:
+            return
+        self.kill_if_running()
+        self.stack.setCurrentWidget(self.projecttree)
+        self.projecttree.set_root(root)
+        self.project_rates = []
+        self.output = None
+        self.log_button.setEnabled(False)
+        self.ratelabel.setToolTip('')
+        self.datelabel.setText('')
+        self.set_running_state(True)
+        self.project_analysis.start(
+            find_python_files(root),
+            dependencies.get_installed_version("pylint"))
+
+    def stop_project(self):
+        """Stop the analysis of a project"""
+        if (self.project_analysis is not None and
+                self.project_analysis.is_running()):
+            self.project_analysis.stop()
+            self.project_finished()
+
+    def project_file_analyzed(self, filename, data, cached):
+        """Show the results of a file of the analyzed project"""
+        self.projecttree.add_file(filename, data)
+        if data[1] is not None:
+            self.project_rates.append(float(data[1]))
+        analysis = self.project_analysis
+        self.ratelabel.setText(_('Analyzing project: %d/%d files '
+                                 '(%d unchanged)') % (analysis.done,
+                                                      analysis.total,
+                                                      analysis.cached))
+
+    def project_finished(self):
+        """Show the evaluation of the analyzed project"""
+        self.set_running_state(False)
+        analysis = self.project_analysis
+        text = _('%d/%d files analyzed') % (analysis.done, analysis.total)
+        if self.project_rates:
+            rate = sum(self.project_rates) / len(self.project_rates)
+            text += ', ' + _('average evaluation: %.2f/10') % rate
+        self.ratelabel.setText(text)
+        if analysis.errors:
+            self.output = '\n\n'.join('%s:\n%s' % item
+                                       for item in analysis.errors.items())
+            self.log_button.setEnabled(True)
+        date = to_text_string(time.strftime("%d %b %Y %H:%M",
+                                            time.localtime()),
+                              encoding='utf8')
+        self.datelabel.setText("<span style='color: #444444'><b>%s </b>"
+                               "</span>" % date)
+
     @Slot()
     def select_file(self):
         self.redirect_stdio.emit(False)
@@ -293,34 +456,52 @@ class PylintWidget(QWidget):
         if filename:
             self.analyze(filename)
             
+    def import_old_results(self):
+        """Move the results saved by previous versions to the history"""
+        for filename, data in reversed(read_old_results(self.OLD_DATAPATH)):
+            self.history.add_data(filename, data)
+        try:
+            os.remove(self.OLD_DATAPATH)
+        except OSError:
+            pass
+
     def remove_obsolete_items(self):
         """Removing obsolete items"""
-        self.rdata = [(filename, data) for filename, data in self.rdata
-                      if is_module_or_package(filename)]
+        self.history.remove([filename for filename
+                             in self.history.get_filenames()
+                             if not is_module_or_package(filename)])
         
     def get_filenames(self):
-        return [filename for filename, _data in self.rdata]
+        return self.history.get_filenames()
     
     def get_data(self, filename):
+        """
+        Return the position of *filename* in the history and the data of
+        its last analysis, read from the disk
+        """
         filename = osp.abspath(filename)
-        for index, (fname, data) in enumerate(self.rdata):
-            if fname == filename:
-                return index, data
-        else:
+        filenames = self.history.get_filenames()
+        if filename not in filenames:
             return None, None
+        return filenames.index(filename), self.history.get_data(filename)
             
     def set_data(self, filename, data):
-        filename = osp.abspath(filename)
-        index, _data = self.get_data(filename)
-        if index is not None:
-            self.rdata.pop(index)
-        self.rdata.insert(0, (filename, data))
-        self.save()
-        
-    def save(self):
-        while len(self.rdata) > self.max_entries:
-            self.rdata.pop(-1)
-        pickle.dump([self.VERSION]+self.rdata, open(self.DATAPATH, 'wb'), 2)
+        self.history.add_data(filename, data)
+
+    def get_trend_text(self, filename, count=10):
+        """Return a description of the last *count* analyses of *filename*"""
+        lines = [_("Last analyses:")]
+        for date, rate, counts in reversed(
+                self.history.get_trend(filename)[-count:]):
+            date = to_text_string(time.strftime("%d %b %Y %H:%M", date),
+                                  encoding='utf8')
+            if rate is None:
+                lines.append(_("%s: analysis failed") % date)
+            else:
+                count = sum(counts.values())
+                lines.append('%s: %.2f/10, %d message%s' % (
+                    date, rate, count, 's' if count > 1 else ''))
+        return '\n'.join(lines)
 
     @Slot()
     def show_log(self):
@@ -345,18 +526,11 @@ class PylintWidget(QWidget):
         self.output = ''
         self.error_output = ''
         
-        plver = PYLINT_VER
-        if plver is not None:
-            if plver.split('.')[0] == '0':
-                p_args = ['-i', 'yes']
-            else:
-                # Option '-i' (alias for '--include-ids') was removed in pylint
-                # 1.0
-                p_args = ["--msg-template='{msg_id}:{line:3d},"\
-                          "{column}: {obj}: {msg}"]
-            p_args += [osp.basename(filename)]
-        else:
-            p_args = [osp.basename(filename)]
+        plver = dependencies.get_installed_version("pylint")
+        self.output_parser = get_output_parser(filename, plver)
+        # Raw output, only decoded to be shown by show_log
+        self.output_data = []
+        p_args = get_pylint_args(plver) + [osp.basename(filename)]
         self.process.start(PYLINT_PATH, p_args)
         
         running = self.process.waitForStarted()
@@ -374,76 +548,36 @@ class PylintWidget(QWidget):
             self.process.setReadChannel(QProcess.StandardError)
         else:
             self.process.setReadChannel(QProcess.StandardOutput)
-        qba = QByteArray()
         while self.process.bytesAvailable():
             if error:
-                qba += self.process.readAllStandardError()
+                self.error_output += to_text_string(locale_codec.toUnicode(
+                    self.process.readAllStandardError().data()))
             else:
-                qba += self.process.readAllStandardOutput()
-        text = to_text_string( locale_codec.toUnicode(qba.data()) )
-        if error:
-            self.error_output += text
-        else:
-            self.output += text
+                data = self.process.readAllStandardOutput().data()
+                self.output_parser.feed(data)
+                self.output_data.append(data)
         
     def finished(self, exit_code, exit_status):
         self.set_running_state(False)
-        if not self.output:
+        if exit_status == QProcess.NormalExit:
+            results, rate = self.output_parser.finish(exit_code)
+        else:
+            results, rate = self.output_parser.results, None
+        if rate is None and not self.output_data:
             if self.error_output:
                 QMessageBox.critical(self, _("Error"), self.error_output)
                 print("pylint error:\n\n" + self.error_output, file=sys.stderr)
             return
         
-        # Convention, Refactor, Warning, Error
-        results = {'C:': [], 'R:': [], 'W:': [], 'E:': []}
-        txt_module = '************* Module '
-        
-        module = '' # Should not be needed - just in case something goes wrong
-        for line in self.output.splitlines():
-            if line.startswith(txt_module):
-                # New module
-                module = line[len(txt_module):]
-                continue
-            # Supporting option include-ids: ('R3873:' instead of 'R:')
-            if not re.match('^[CRWE]+([0-9]{4})?:', line):
-                continue
-            i1 = line.find(':')
-            if i1 == -1:
-                continue
-            msg_id = line[:i1]
-            i2 = line.find(':', i1+1)
-            if i2 == -1:
-                continue
-            line_nb = line[i1+1:i2].strip()
-            if not line_nb:
-                continue
-            line_nb = int(line_nb.split(',')[0])
-            message = line[i2+1:]
-            item = (module, line_nb, message, msg_id)
-            results[line[0]+':'].append(item)
-            
-        # Rate
-        rate = None
-        txt_rate = 'Your code has been rated at '
-        i_rate = self.output.find(txt_rate)
-        if i_rate > 0:
-            i_rate_end = self.output.find('/10', i_rate)
-            if i_rate_end > 0:
-                rate = self.output[i_rate+len(txt_rate):i_rate_end]
-        
-        # Previous run
-        previous = ''
-        if rate is not None:
-            txt_prun = 'previous run: '
-            i_prun = self.output.find(txt_prun, i_rate_end)
-            if i_prun > 0:
-                i_prun_end = self.output.find('/10', i_prun)
-                previous = self.output[i_prun+len(txt_prun):i_prun_end]
-            
-        
         filename = to_text_string(self.filecombo.currentText())
+        trend = self.history.get_trend(filename)
+        previous = ''
+        if trend and trend[-1][1] is not None:
+            previous = '%.2f' % trend[-1][1]
         self.set_data(filename, (time.localtime(), rate, previous, results))
-        self.output = self.error_output + self.output
+        self.output = self.error_output + to_text_string(
+            locale_codec.toUnicode(b''.join(self.output_data)))
+        self.output_data = None
         self.show_data(justanalyzed=True)
         
     def kill_if_running(self):
@@ -461,12 +595,18 @@ class PylintWidget(QWidget):
         filename = to_text_string(self.filecombo.currentText())
         if not filename:
             return
+        if (self.project_analysis is not None and
+                self.project_analysis.is_running()):
+            # Don't hide the results of the project being analyzed
+            return
+        self.stack.setCurrentWidget(self.treewidget)
         
         _index, data = self.get_data(filename)
         if data is None:
             text = _('Source code has not been rated yet.')
             self.treewidget.clear_results()
             date_text = ''
+            tooltip = ''
         else:
             datetime, rate, previous_rate, results = data
             if rate is None:
@@ -474,6 +614,7 @@ class PylintWidget(QWidget):
                          '(see output for more details).')
                 self.treewidget.clear_results()
                 date_text = ''
+                tooltip = ''
             else:
                 text_style = "<span style=\'color: #444444\'><b>%s </b></span>"
                 rate_style = "<span style=\'color: %s\'><b>%s</b></span>"
@@ -490,12 +631,14 @@ class PylintWidget(QWidget):
                     text_prun = _('previous run:')
                     text_prun = ' (%s %s/10)' % (text_prun, previous_rate)
                     text += prevrate_style % text_prun
+                tooltip = self.get_trend_text(filename)
                 self.treewidget.set_results(filename, results)
                 date = to_text_string(time.strftime("%d %b %Y %H:%M", datetime),
                                       encoding='utf8')
                 date_text = text_style % date
             
         self.ratelabel.setText(text)
+        self.ratelabel.setToolTip(tooltip)
         self.datelabel.setText(date_text)
 
 
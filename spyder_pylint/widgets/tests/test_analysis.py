@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for analysis.py
+"""
+
+# Standard library imports
+import json
+import os
+import os.path as osp
+import pickle
+import re
+import subprocess
+import sys
+
+# Third party imports
+import pytest
+
+# Local imports
+# The plugin package can't be imported before spyder.plugins
+import spyder.plugins  # analysis:ignore
+from spyder.utils import programs
+from spyder_pylint.widgets import analysis
+from spyder_pylint.widgets.analysis import (count_statements, find_pylintrc,
+                                            get_config_key, get_evaluation,
+                                            get_file_key, get_rate,
+                                            JSONOutputParser, PylintCache,
+                                            PylintResults, ProjectAnalysis,
+                                            TextOutputParser)
+
+
+CODE = u'''"""Module docstring"""
+import os
+
+
+def function(a):
+    """Function docstring"""
+    try:
+        return os.path.join(a)
+    except OSError:
+        pass
+    finally:
+        a = 1
+'''
+
+JSON_OUTPUT = [
+    {"type": "convention", "module": "mod", "obj": "", "line": 1,
+     "column": 0, "path": "mod.py", "symbol": "invalid-name",
+     "message": "Invalid name &quot;x&quot;", "message-id": "C0103"},
+    {"type": "warning", "module": "mod", "obj": "f", "line": 5,
+     "column": 4, "path": "mod.py", "symbol": "unused-variable",
+     "message": "Unused variable 'y'", "message-id": "W0612"},
+    {"type": "error", "module": "mod", "obj": "f", "line": 6,
+     "column": 11, "path": "mod.py", "symbol": "undefined-variable",
+     "message": "Undefined variable 'z'", "message-id": "E0602"},
+]
+
+
+def feed_by_bytes(parser, text):
+    """Feed *text* to *parser* one byte at a time"""
+    data = text.encode('utf-8')
+    for index in range(len(data)):
+        parser.feed(data[index:index + 1])
+
+
+# --- Tests
+# -----------------------------------------------------------------------------
+def test_pylint_results():
+    results = PylintResults()
+    results.add('C', 'mod', 1, 0, 'C0103', 'Invalid name')
+    results.add('E', 'mod', 6, 11, 'E0602', 'Undefined variable')
+    results.add('F', ''.join(['mo', 'd']), 1, 0, 'F0001', 'No module')
+    assert len(results) == 3
+    assert results.count() == 3
+    assert results.count('E', 'F') == 2
+    assert results.get_messages('C') == [('mod', 1, 0, 'Invalid name',
+                                          'C0103')]
+    assert results.modules[2] is results.modules[0]
+    results = pickle.loads(pickle.dumps(results))
+    assert results.count('F') == 1
+    results.add('W', 'mod', 2, 0, 'W0612', 'Unused variable')
+    assert results.count() == 4
+
+
+def test_json_output_parser_by_bytes(tmpdir):
+    filename = tmpdir.join('mod.py')
+    filename.write(u'x = 1\n\ndef f():\n    y = 2\n    return z\n')
+    parser = JSONOutputParser(filename.strpath)
+    feed_by_bytes(parser, json.dumps(JSON_OUTPUT, indent=4))
+    results, rate = parser.finish(2 | 4 | 16)
+    assert results.count() == 3
+    assert results.get_messages('C')[0][3] == u'Invalid name "x"'
+    assert results.get_messages('W')[0][3] == u"f: Unused variable 'y'"
+    # 4 statements (the function counts), 1 error, 1 warning, 1 convention
+    assert rate == '%.2f' % (10 - 7 / 4. * 10)
+
+
+def test_json_output_parser_failures(tmpdir):
+    filename = tmpdir.join('mod.py').strpath
+    parser = JSONOutputParser(filename)
+    parser.feed(b'[{"type": "error"')
+    assert parser.finish(2)[1] is None
+    parser = JSONOutputParser(filename)
+    parser.feed(b'Traceback')
+    assert parser.finish(1)[1] is None
+    # No output for no messages
+    parser = JSONOutputParser(filename)
+    assert parser.finish(0) == (parser.results, '10.00')
+    parser = JSONOutputParser(filename)
+    assert parser.finish(32)[1] is None
+
+
+def test_text_output_parser_by_bytes(tmpdir):
+    output = (u"************* Module mod\n"
+              u"C:  1, 0: Invalid name \"x\" (invalid-name)\n"
+              u"W0612:  4,4: f: Unused variable 'y'\n"
+              u"E:  5,11: f: Undefined variable 'z'\n"
+              u"\n"
+              u"Your code has been rated at 2.50/10\n")
+    parser = TextOutputParser(tmpdir.join('mod.py').strpath)
+    feed_by_bytes(parser, output)
+    results, rate = parser.finish(0)
+    assert rate == '2.50'
+    assert results.count() == 3
+    assert results.get_messages('W') == [('mod', 4, 4,
+                                          "f: Unused variable 'y'", 'W0612')]
+
+
+def test_count_statements(tmpdir):
+    filename = tmpdir.join('mod.py')
+    filename.write(CODE)
+    # import, def, try (split in two by astroid), return, except, pass,
+    # assignment
+    assert count_statements(filename.strpath) == 8
+    tmpdir.join('other.py').write(u'x = 1\n')
+    assert count_statements(tmpdir.strpath) == 9
+
+
+def test_get_rate_evaluation(tmpdir):
+    results = PylintResults()
+    results.add('E', 'mod', 1, 0, 'E0602', 'Undefined variable')
+    results.add('W', 'mod', 1, 0, 'W0612', 'Unused variable')
+    assert get_rate(results, 10) == '4.00'
+    assert get_rate(results, 10, '10.0 - error') == '9.00'
+    # Invalid expressions are ignored
+    assert get_rate(results, 10, '10.0 - nothing') == '4.00'
+    assert get_rate(results, 0) == '0.00'
+    assert get_rate(PylintResults(), 0) == '10.00'
+
+    tmpdir.join('pylintrc').write(u'[REPORTS]\nevaluation=10.0 - error\n')
+    assert get_evaluation(tmpdir.strpath) == '10.0 - error'
+
+
+@pytest.mark.skipif(not programs.is_module_installed('pylint', '>=1.4'),
+                    reason="pylint with the json reporter is not installed")
+def test_json_rate_matches_pylint(tmpdir):
+    filename = tmpdir.join('mod.py')
+    filename.write(CODE + u'\n\nclass A:\n    """A"""\n    def f(self, x):\n'
+                          u'        return x + undefined\n')
+
+    def run_pylint(*args):
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'pylint', '--persistent=n'] + list(args) +
+            [filename.strpath], cwd=tmpdir.strpath, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE)
+        output, _error = process.communicate()
+        return output, process.returncode
+
+    output, _code = run_pylint('--output-format=text', '--score=y')
+    match = re.search(r'rated at (-?[0-9.]+)/10', output.decode('utf-8'))
+    assert match is not None
+    output, code = run_pylint('--output-format=json')
+    parser = JSONOutputParser(filename.strpath)
+    parser.feed(output)
+    _results, rate = parser.finish(code)
+    assert rate == match.group(1)
+
+
+@pytest.fixture
+def no_user_pylintrc(monkeypatch):
+    monkeypatch.setattr(analysis, 'USER_PYLINTRCS', [])
+    monkeypatch.delenv('PYLINTRC', raising=False)
+
+
+def test_config_key(tmpdir, no_user_pylintrc):
+    package = tmpdir.mkdir('package')
+    package.join('__init__.py').write(u'')
+    subpackage = package.mkdir('sub')
+    subpackage.join('__init__.py').write(u'')
+    assert find_pylintrc(subpackage.strpath) is None
+    key = get_config_key(subpackage.strpath, '2.4.0', [])
+    assert get_config_key(subpackage.strpath, '2.4.0', []) == key
+    assert get_config_key(subpackage.strpath, '2.5.0', []) != key
+    assert get_config_key(subpackage.strpath, '2.4.0', ['-j2']) != key
+
+    # The configuration of parent packages is used
+    pylintrc = package.join('pylintrc')
+    pylintrc.write(u'[MESSAGES CONTROL]\ndisable=C\n')
+    assert find_pylintrc(subpackage.strpath) == pylintrc.strpath
+    other_key = get_config_key(subpackage.strpath, '2.4.0', [])
+    assert other_key != key
+    pylintrc.write(u'[MESSAGES CONTROL]\ndisable=W\n')
+    assert get_config_key(subpackage.strpath, '2.4.0', []) != other_key
+    # But not the one of the directory containing the top package
+    tmpdir.join('pylintrc').write(u'')
+    pylintrc.remove()
+    assert get_config_key(subpackage.strpath, '2.4.0', []) == key
+
+
+def test_file_key(tmpdir):
+    filename = tmpdir.join('mod.py')
+    filename.write(u'x = 1\n')
+    key = get_file_key(filename.strpath, 'config')
+    assert get_file_key(filename.strpath, 'config') == key
+    assert get_file_key(filename.strpath, 'other config') != key
+    filename.write(u'x = 2\n')
+    assert get_file_key(filename.strpath, 'config') != key
+
+
+def test_pylint_cache(tmpdir):
+    cache = PylintCache(tmpdir.join('cache').strpath, size=2)
+    assert cache.get('abcd') is None
+    results = PylintResults()
+    results.add('W', 'mod', 1, 0, 'W0612', 'Unused variable')
+    cache.put('abcd', ('date', '9.00', '', results))
+    _date, rate, _previous, results = cache.get('abcd')
+    assert rate == '9.00'
+    assert results.count('W') == 1
+
+    # Corrupted entries are misses
+    tmpdir.join('cache', 'ab', 'abef').write(b'\x80\x02corrupted', 'wb')
+    assert cache.get('abef') is None
+
+    # Only the most recently used entries are kept
+    cache.put('cdef', 'data')
+    cache.put('efab', 'data')
+    for key, mtime in (('abcd', 3), ('abef', 1), ('cdef', 2), ('efab', 4)):
+        os.utime(cache._filename(key), (mtime, mtime))
+    cache.prune()
+    assert [key for key in ('abcd', 'abef', 'cdef', 'efab')
+            if osp.isfile(cache._filename(key))] == ['abcd', 'efab']
+
+
+def test_project_analysis(qtbot, tmpdir, no_user_pylintrc):
+    """Only files changed since the previous analysis are analyzed again"""
+    # Python is run instead of pylint, with the files printing pylint's
+    # text output
+    good = tmpdir.join('good.py')
+    good.write(u'print("************* Module good")\n'
+               u'print("W:  1, 0: Unused variable")\n'
+               u'print("Your code has been rated at 5.00/10")\n')
+    bad = tmpdir.join('bad.py')
+    bad.write(u'import sys\nsys.exit(1)\n')
+    project_analysis = ProjectAnalysis(
+        None, sys.executable, cache=PylintCache(tmpdir.join('cache').strpath),
+        workers=2)
+    analyzed = []
+    project_analysis.sig_file_analyzed.connect(
+        lambda filename, data, cached: analyzed.append(
+            (osp.basename(filename), data[1], data[3].count(), cached)))
+
+    def analyze():
+        del analyzed[:]
+        with qtbot.waitSignal(project_analysis.sig_finished, timeout=20000):
+            project_analysis.start([good.strpath, bad.strpath], None)
+        assert not project_analysis.is_running()
+        return sorted(analyzed)
+
+    assert analyze() == [('bad.py', None, 0, False),
+                         ('good.py', '5.00', 1, False)]
+    assert (project_analysis.total, project_analysis.done,
+            project_analysis.cached) == (2, 2, 0)
+    assert list(project_analysis.errors) == [bad.strpath]
+
+    # Failed analyses aren't cached
+    assert analyze() == [('bad.py', None, 0, False),
+                         ('good.py', '5.00', 1, True)]
+    assert (project_analysis.done, project_analysis.cached) == (2, 1)
+
+    good.write(u'print("Your code has been rated at 7.50/10")\n')
+    assert analyze() == [('bad.py', None, 0, False),
+                         ('good.py', '7.50', 0, False)]
+    assert project_analysis.cached == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for history.py
+"""
+
+# Standard library imports
+import os.path as osp
+import pickle
+import time
+
+# Third party imports
+import pytest
+
+# Local imports
+# The plugin package can't be imported before spyder.plugins
+import spyder.plugins  # analysis:ignore
+from spyder_pylint.widgets.analysis import PylintResults
+from spyder_pylint.widgets.history import (PylintHistory, read_old_results,
+                                           SUMMARY)
+
+
+def make_data(rate, *categories):
+    results = PylintResults()
+    for line, category in enumerate(categories):
+        results.add(category, 'module', line + 1, 0, category + '0001',
+                    'message')
+    return time.localtime(), rate, '', results
+
+
+@pytest.fixture
+def history(tmpdir):
+    return PylintHistory(tmpdir.join('history').strpath, max_entries=2,
+                         max_runs=2)
+
+
+def test_history_add_data(history, tmpdir):
+    filename = tmpdir.join('a.py').strpath
+    assert history.get_data(filename) is None
+    history.add_data(filename, make_data('5.00', 'C', 'C', 'W'))
+    history.add_data(filename, make_data(None, 'E'))
+
+    _date, rate, _previous, results = history.get_data(filename)
+    assert rate is None
+    assert results.get_messages('E') == [('module', 1, 0, 'message',
+                                          'E0001')]
+    trend = history.get_trend(filename)
+    assert [(rate, counts['C'], counts['W'], counts['E'])
+            for _date, rate, counts in trend] == [(5., 2, 1, 0),
+                                                  (None, 0, 0, 1)]
+
+    # The history is kept on disk
+    history = PylintHistory(history.directory)
+    assert history.get_filenames() == [filename]
+    assert len(history.get_trend(filename)) == 2
+
+
+def test_history_max_entries(history, tmpdir):
+    filenames = [tmpdir.join(name).strpath for name in ('a.py', 'b.py',
+                                                        'c.py')]
+    for filename in filenames:
+        history.add_data(filename, make_data('1.00'))
+    assert history.get_filenames() == filenames[:0:-1]
+    assert history.get_data(filenames[0]) is None
+    for path in history.get_paths(filenames[0]):
+        assert not osp.exists(path)
+
+    history.remove([filenames[1]])
+    assert history.get_filenames() == [filenames[2]]
+    assert PylintHistory(history.directory).get_filenames() == [filenames[2]]
+
+
+def test_history_compact(history, tmpdir):
+    """Only the last max_runs analyses are kept once there are twice more"""
+    filename = tmpdir.join('a.py').strpath
+    for rate in range(3):
+        history.add_data(filename, make_data('%d.00' % rate))
+    assert len(history.get_trend(filename)) == 3
+
+    history.add_data(filename, make_data('3.00', 'R'))
+    assert [rate for _date, rate, _counts
+            in history.get_trend(filename)] == [2., 3.]
+    _date, rate, _previous, results = history.get_data(filename)
+    assert rate == '3.00'
+    assert results.count('R') == 1
+    runs_path, summary_path = history.get_paths(filename)
+    assert osp.getsize(summary_path) == 2 * SUMMARY.size
+    assert osp.getsize(runs_path) == sum(
+        record[-1] for record in history.read_summary(filename))
+
+
+def test_history_incomplete_record(history, tmpdir):
+    """A partially written summary record is ignored"""
+    filename = tmpdir.join('a.py').strpath
+    history.add_data(filename, make_data('5.00'))
+    _runs_path, summary_path = history.get_paths(filename)
+    with open(summary_path, 'ab') as fdesc:
+        fdesc.write(b'\0' * (SUMMARY.size // 2))
+    assert len(history.get_trend(filename)) == 1
+    assert history.get_data(filename)[1] == '5.00'
+
+
+def test_read_old_results(tmpdir):
+    path = tmpdir.join('pylint.results').strpath
+    date = time.localtime()
+    old_results = {'C:': [('module', 3, 'message', 'C0103')],
+                   'R:': [], 'W:': [('module', 1, 'other', 'W0611')],
+                   'E:': []}
+    with open(path, 'wb') as fdesc:
+        pickle.dump(['1.1.0', ('b.py', (date, '7.50', '', old_results)),
+                     ('a.py', (date, None, '', old_results))], fdesc, 2)
+    (filename, data), _other = read_old_results(path)
+    assert filename == 'b.py'
+    _date, rate, previous, results = data
+    assert (rate, previous) == ('7.50', '')
+    assert results.get_messages('C', 'W') == [
+        ('module', 3, 0, 'message', 'C0103'),
+        ('module', 1, 0, 'other', 'W0611')]
+
+    with open(path, 'wb') as fdesc:
+        pickle.dump(['1.2.0', ('a.py', data)], fdesc, 2)
+    assert read_old_results(path)[0][1][3].count('W') == 1
+
+    # Unknown versions and corrupted files
+    with open(path, 'wb') as fdesc:
+        pickle.dump(['0.9.0', ('a.py', data)], fdesc, 2)
+    assert read_old_results(path) == []
+    with open(path, 'wb') as fdesc:
+        fdesc.write(b'\x80\x02corrupted')
+    assert read_old_results(path) == []
+    assert read_old_results(tmpdir.join('missing').strpath) == []
+
+
+if __name__ == "__main__":
+    pytest.main()